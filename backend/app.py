@@ -1,10 +1,9 @@
 from dotenv import load_dotenv
 load_dotenv()
-print("🔥🔥🔥 THIS IS MY REAL APP.PY 🔥🔥🔥")
 
 import os
 from datetime import timedelta
-from flask import Flask, send_from_directory
+from flask import Flask
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from flask_login import LoginManager
@@ -18,6 +17,12 @@ from models.admin import Admin
 from models.election import Election
 from models.candidate import Candidate
 from models.vote import Vote          
+from models.result_snapshot import ResultSnapshot
+from models.report_job import ReportJob
+from models.voter_segment import VoterSegment
+from models.election_turnout import ElectionTurnout
+from models.ranked_ballot import RankedBallot
+from models.worker_lease import WorkerLease
 
 
 from routes.voter_routes import voter_bp
@@ -26,6 +31,24 @@ from routes.election_routes import election_bp
 from routes.candidate_routes import candidate_bp
 from routes.vote_routes import vote_bp
 from routes.results_routes import results_bp 
+from routes.report_routes import report_bp
+
+from services.vote_buffer import init_vote_buffer
+from services.election_status import init_status_scheduler
+from services.voter_search import init_voter_search
+from services.query_plans import register_explain_command
+from services.identity import init_identity_cache
+from services.passwords import init_password_hasher, register_password_commands
+from services.symbols import send_symbol
+from services.live_tally import init_live_tally
+from services.db_pool import init_db_pool
+from services.metrics import init_logging, init_metrics
+from services.profiler import init_profiler
+from services.turnout import register_turnout_commands
+from services.report_jobs import register_report_job_commands
+from services.symbols import register_symbol_commands
+from services.analytics import init_analytics
+from migrations import run_migrations
 
 
 app = Flask(__name__)
@@ -39,15 +62,19 @@ os.makedirs(SYMBOLS_DIR, exist_ok=True)
 
 @app.route('/uploads/symbols/<path:filename>')
 def serve_uploaded_symbols(filename):
-    return send_from_directory(SYMBOLS_DIR, filename)
+    # Content-hashed names are cached as immutable (see services/symbols.py)
+    return send_symbol(filename)
+
+# Shared with the ASGI fast paths in asgi.py
+CORS_ORIGINS = [
+    "http://localhost:3000",
+    "http://127.0.0.1:3000",
+    "https://voting-orpin-seven.vercel.app"
+]
 
 CORS(app, resources={
     r"/api/*": {
-        "origins": [
-            "http://localhost:3000",
-            "http://127.0.0.1:3000",
-            "https://voting-orpin-seven.vercel.app"
-        ],
+        "origins": CORS_ORIGINS,
         "methods": ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
         "allow_headers": ["Content-Type", "Authorization"],
         "supports_credentials": True
@@ -56,6 +83,7 @@ CORS(app, resources={
 
 
 app.config.from_object('config.Config')
+init_logging(app)
 
 
 app.config['JWT_TOKEN_LOCATION'] = ['headers']
@@ -72,12 +100,32 @@ login_manager.login_message_category = "info"
 
 @login_manager.user_loader
 def load_user(user_id):
-    return Voter.query.get(int(user_id))   
+    return db.session.get(Voter, int(user_id))
 
 jwt = JWTManager(app)
 db.init_app(app)
+init_db_pool(app)
+init_metrics(app)
+init_profiler(app)
 with app.app_context():
-    db.create_all()
+    run_migrations(db.engine, app.logger)
+
+init_voter_search(app)
+init_identity_cache(app)
+init_password_hasher(app)
+init_analytics(app)
+# Spawned pool children (reports, password hashing) re-run this file as
+# __mp_main__ under `python app.py`; only real server processes get the
+# background threads. uvicorn/gunicorn workers import it as `app`.
+if __name__ != '__mp_main__':
+    init_vote_buffer(app)
+    init_status_scheduler(app)
+    init_live_tally(app)
+register_explain_command(app)
+register_password_commands(app)
+register_turnout_commands(app)
+register_report_job_commands(app)
+register_symbol_commands(app)
 
 app.register_blueprint(voter_bp)
 app.register_blueprint(admin_bp)
@@ -85,6 +133,7 @@ app.register_blueprint(election_bp)
 app.register_blueprint(candidate_bp)
 app.register_blueprint(vote_bp)
 app.register_blueprint(results_bp)
+app.register_blueprint(report_bp)
 
 
 @app.route('/')
@@ -93,9 +142,7 @@ def index():
 
 if __name__ == '__main__':
 
-    print("\n===== REGISTERED ROUTES =====")
-    for rule in app.url_map.iter_rules():
-        print(rule)
+    app.logger.debug("Registered routes:\n" + "\n".join(str(rule) for rule in app.url_map.iter_rules()))
 
     app.run(host='0.0.0.0', port=int(os.environ.get("PORT", 5000)))
     
\ No newline at end of file
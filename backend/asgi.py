@@ -0,0 +1,411 @@
+# asgi.py
+# Optional ASGI entry point:
+#
+#     uvicorn asgi:app --workers 4
+#     gunicorn asgi:app -k uvicorn.workers.UvicornWorker -w 4
+#
+# The read-heavy endpoints below run natively on asyncio with an async DB
+# driver (aiosqlite / aiomysql) and their own connection pool, against the
+# read replicas when SQLALCHEMY_REPLICA_URIS is set. Slow clients and open
+# SSE streams cost a coroutine instead of a whole worker:
+#
+#   GET /api/elections/results/closed
+#   GET /api/elections/<id>/results
+#   GET /api/elections/<id>/results/stream
+#   GET /api/elections/<id>/results/live
+#   GET /api/candidates
+#   GET /uploads/symbols/<content-hashed name>
+#
+# Anything those handlers don't fully cover (JWT-bearing requests, paging
+# arguments, elections without a snapshot yet, legacy symbol names) and every
+# other route falls through to the unchanged Flask app, so behaviour is the
+# same as under `gunicorn app:app`.
+
+import asyncio
+import contextlib
+import json
+import os
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+from a2wsgi import WSGIMiddleware
+from anyio import to_thread
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route
+
+# The wrapped Flask app is served from ASGI_WSGI_THREADS threads (read by
+# config.REQUEST_THREADS, e.g. to let the vote buffer group commits)
+os.environ.setdefault('REQUEST_THREADS', os.environ.get('ASGI_WSGI_THREADS', '10'))
+
+from app import CORS_ORIGINS, app as flask_app
+from extensions import db
+from models.candidate import Candidate
+from models.election import Election
+from models.result_snapshot import ResultSnapshot
+from routes.candidate_routes import CANDIDATE_LIST_FIELDS
+from services.pagination import DEFAULT_LIMIT, page_body, project
+from services.db_pool import configure_sqlite
+from services.live_tally import SUBSCRIBER_QUEUE_SIZE, sse_event
+from services.results import closed_elections_payload, results_etag, snapshot_results
+from services.symbols import HASHED_NAME, IMMUTABLE_MAX_AGE
+
+flask_asgi = WSGIMiddleware(flask_app, workers=flask_app.config['ASGI_WSGI_THREADS'])
+_metrics = flask_app.extensions['request_metrics']
+
+_ASYNC_DRIVERS = {'sqlite': 'sqlite+aiosqlite', 'mysql': 'mysql+aiomysql'}
+
+_sessionmakers = []
+
+
+# ────────────────────────────────────────────────
+# ASYNC DATABASE
+# ────────────────────────────────────────────────
+def async_database_url(url):
+    """sqlite:///x.db → sqlite+aiosqlite:///x.db, mysql+pymysql://… → mysql+aiomysql://…"""
+    url = make_url(url)
+    driver = _ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise RuntimeError(f'No async driver configured for {url.get_backend_name()}')
+    return url.set(drivername=driver)
+
+
+def create_engine_from_config(config, uri):
+    url = async_database_url(uri)
+    engine = create_async_engine(
+        url,
+        pool_size=config['ASYNC_DB_POOL_SIZE'],
+        max_overflow=config['ASYNC_DB_MAX_OVERFLOW'],
+        pool_timeout=config['DB_POOL_TIMEOUT'],
+        pool_recycle=config['ASYNC_DB_POOL_RECYCLE'],
+        pool_pre_ping=True
+    )
+    configure_sqlite(engine.sync_engine, config)
+    return engine
+
+
+@contextlib.asynccontextmanager
+async def lifespan(_):
+    # Everything served here is an anonymous read: use the read replicas
+    # when there are any (see services/replicas.py)
+    config = flask_app.config
+    uris = config['SQLALCHEMY_REPLICA_URIS'] or [config['SQLALCHEMY_DATABASE_URI']]
+    engines = [create_engine_from_config(config, uri) for uri in uris]
+    _sessionmakers[:] = [
+        async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False) for engine in engines
+    ]
+    try:
+        yield
+    finally:
+        for engine in engines:
+            await engine.dispose()
+
+
+def _sessions():
+    return random.choice(_sessionmakers)()
+
+
+# ────────────────────────────────────────────────
+# FAST PATH PLUMBING
+# ────────────────────────────────────────────────
+class FastPath:
+    """
+    ASGI endpoint running `handler(request)`; a None result hands the
+    untouched request to the Flask app instead.
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+
+    async def __call__(self, scope, receive, send):
+        request = Request(scope, receive)
+        response = None
+        started = time.perf_counter()
+        if request.method in ('GET', 'HEAD'):
+            response = await self.handler(request)
+        if response is None:
+            await flask_asgi(scope, receive, send)
+            return
+        _cors(request, response)
+        # Same registry as the Flask endpoints (GET /metrics), as asgi.<handler>
+        _metrics.record(f'asgi.{self.handler.__name__}', request.method, response.status_code,
+                        time.perf_counter() - started)
+        await response(scope, receive, send)
+
+
+def _cors(request, response):
+    # Mirrors the flask_cors settings in app.py for /api/*
+    origin = request.headers.get('origin')
+    if origin in CORS_ORIGINS and request.url.path.startswith('/api/'):
+        response.headers['Access-Control-Allow-Origin'] = origin
+        response.headers['Access-Control-Allow-Credentials'] = 'true'
+        response.headers.append('Vary', 'Origin')
+
+
+def _not_modified(request, etag, last_modified=None):
+    # Same rules as routes/results_routes._not_modified
+    header = request.headers.get('if-none-match')
+    if header:
+        tags = {t.strip().removeprefix('W/').strip('"') for t in header.split(',')}
+        return etag in tags or '*' in tags
+    since = request.headers.get('if-modified-since')
+    if last_modified and since:
+        try:
+            return last_modified <= parsedate_to_datetime(since).replace(tzinfo=None)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _revalidate_headers(etag, last_modified=None):
+    # Same as routes/results_routes._cacheable
+    headers = {'ETag': f'"{etag}"', 'Cache-Control': 'no-cache'}
+    if last_modified:
+        headers['Last-Modified'] = last_modified.strftime('%a, %d %b %Y %H:%M:%S GMT')
+    return headers
+
+
+def _cacheable_json(request, body_fn, etag, last_modified=None):
+    headers = _revalidate_headers(etag, last_modified)
+    if _not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(body_fn(), headers=headers)
+
+
+def _anonymous(request):
+    # verify_jwt_in_request(optional=True) still rejects bad tokens; let Flask do that
+    return 'authorization' not in request.headers
+
+
+# ────────────────────────────────────────────────
+# HANDLERS
+# ────────────────────────────────────────────────
+async def closed_elections(request):
+    if not _anonymous(request):
+        return None
+
+    async with _sessions() as session:
+        elections = (await session.scalars(
+            select(Election)
+            .where(Election.election_status == 'CLOSED')
+            .order_by(Election.end_date.desc())
+        )).all()
+        ids = [e.id for e in elections]
+
+        snapshots = {
+            s.election_id: s for s in (await session.scalars(
+                select(ResultSnapshot).where(ResultSnapshot.election_id.in_(ids))
+            )).all()
+        } if ids else {}
+
+        missing = [i for i in ids if i not in snapshots]
+        live_totals = dict((await session.execute(
+            select(Candidate.election_id, func.sum(Candidate.count))
+            .where(Candidate.election_id.in_(missing))
+            .group_by(Candidate.election_id)
+        )).all()) if missing else {}
+
+    result, etag = closed_elections_payload(elections, snapshots, live_totals)
+    return _cacheable_json(request, lambda: result, etag)
+
+
+async def election_results(request):
+    if not _anonymous(request):
+        return None
+
+    election_id = request.path_params['election_id']
+    async with _sessions() as session:
+        election = await session.get(Election, election_id)
+        if election is None or election.election_status != 'CLOSED':
+            return None
+        snapshot = await session.get(ResultSnapshot, election_id)
+
+    if snapshot is None:
+        # First read after close builds the snapshot: Flask owns that write
+        return None
+
+    search = request.query_params.get('search', '').lower()
+    return _cacheable_json(
+        request,
+        lambda: snapshot_results(election, snapshot, search),
+        results_etag(election, snapshot, search),
+        snapshot.created_at
+    )
+
+
+async def candidates(request):
+    # First page only: cursors, limits and field selection stay in Flask
+    # (services/pagination.py)
+    if set(request.query_params) - {'election_id'}:
+        return None
+
+    query = select(Candidate).order_by(Candidate.id).limit(DEFAULT_LIMIT + 1)
+    election_id = request.query_params.get('election_id')
+    if election_id:
+        try:
+            query = query.where(Candidate.election_id == int(election_id))
+        except ValueError:
+            # Flask's type=int ignores a bad election_id
+            pass
+
+    async with _sessions() as session:
+        rows = (await session.scalars(query)).all()
+
+    fields = list(CANDIDATE_LIST_FIELDS)
+    return JSONResponse(page_body(
+        rows, [(Candidate.id, False)],
+        lambda c: project(c, fields, {'symbol_url': Candidate.get_symbol_url}),
+        DEFAULT_LIMIT
+    ))
+
+
+async def symbol_file(request):
+    filename = request.path_params['filename']
+    if not HASHED_NAME.match(filename):
+        return None
+
+    path = os.path.join(flask_app.config['UPLOAD_FOLDER'], 'symbols', filename)
+    if not os.path.isfile(path):
+        return None
+
+    etag = filename.rsplit('.', 1)[0]
+    headers = {
+        'ETag': f'"{etag}"',
+        'Cache-Control': f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    }
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, headers=headers)
+
+
+class _AsyncListener:
+    """Bridges the publisher thread into an asyncio.Queue on this loop."""
+
+    def __init__(self, loop, limit):
+        self.loop = loop
+        self.limit = limit
+        self.queue = asyncio.Queue()
+
+    def put_nowait(self, event):
+        self.loop.call_soon_threadsafe(self._deliver, event)
+
+    def _deliver(self, event):
+        if self.queue.qsize() >= self.limit:
+            # Slow reader: drop the backlog; None means "resend a snapshot"
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            event = None
+        self.queue.put_nowait(event)
+
+
+async def _subscribe(election_id):
+    """Register an asyncio listener with this worker's TallyPublisher."""
+    publisher = flask_app.extensions['live_tally']
+    listener = _AsyncListener(asyncio.get_running_loop(), SUBSCRIBER_QUEUE_SIZE)
+
+    def subscribe():
+        # The first listener's tally query uses the Flask session
+        with flask_app.app_context():
+            try:
+                return publisher.subscribe(election_id, listener)
+            finally:
+                db.session.remove()
+
+    _, state = await to_thread.run_sync(subscribe)
+    return publisher, listener, state
+
+
+async def _election_exists(election_id):
+    async with _sessions() as session:
+        return await session.get(Election, election_id) is not None
+
+
+async def results_stream(request):
+    if not _anonymous(request):
+        return None
+
+    election_id = request.path_params['election_id']
+    if not await _election_exists(election_id):
+        return None
+
+    publisher, listener, state = await _subscribe(election_id)
+    keepalive = flask_app.config['LIVE_TALLY_KEEPALIVE']
+    lifetime = flask_app.config['LIVE_TALLY_STREAM_SECONDS']
+    resume_from = request.headers.get('last-event-id')
+
+    async def events():
+        try:
+            yield 'retry: 2000\n\n'
+            if resume_from != state.version:
+                yield sse_event(state.snapshot(election_id))
+
+            deadline = time.monotonic() + lifetime
+            while time.monotonic() < deadline:
+                try:
+                    event = await asyncio.wait_for(
+                        listener.queue.get(),
+                        timeout=min(keepalive, max(deadline - time.monotonic(), 0.1))
+                    )
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+                    continue
+                if event is None:
+                    current = publisher.current(election_id) or state
+                    event = current.snapshot(election_id)
+                yield sse_event(event)
+        finally:
+            publisher.unsubscribe(election_id, listener)
+
+    return StreamingResponse(events(), media_type='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
+async def results_poll(request):
+    if not _anonymous(request):
+        return None
+
+    election_id = request.path_params['election_id']
+    try:
+        timeout = min(max(float(request.query_params.get('timeout', 25)), 0), 30)
+    except ValueError:
+        # Flask's 400 response
+        return None
+    if not await _election_exists(election_id):
+        return None
+
+    publisher, listener, state = await _subscribe(election_id)
+    try:
+        since = request.query_params.get('since')
+        if since == state.version and timeout > 0:
+            try:
+                await asyncio.wait_for(listener.queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            state = publisher.current(election_id) or state
+    finally:
+        publisher.unsubscribe(election_id, listener)
+
+    body = state.snapshot(election_id)
+    body['changed'] = body['version'] != since
+    return JSONResponse(body)
+
+
+app = Starlette(
+    routes=[
+        Route('/api/elections/results/closed', FastPath(closed_elections)),
+        Route('/api/elections/{election_id:int}/results', FastPath(election_results)),
+        Route('/api/elections/{election_id:int}/results/stream', FastPath(results_stream)),
+        Route('/api/elections/{election_id:int}/results/live', FastPath(results_poll)),
+        Route('/api/candidates', FastPath(candidates)),
+        Route('/uploads/symbols/{filename:path}', FastPath(symbol_file)),
+        Mount('/', app=flask_asgi),
+    ],
+    lifespan=lifespan
+)
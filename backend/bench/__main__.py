@@ -0,0 +1,157 @@
+# bench/__main__.py
+# Election-day benchmark suite.
+#
+#     cd backend
+#     python -m bench run                          # fresh SQLite stand-in
+#     python -m bench run --database-uri mysql+pymysql://u:p@localhost/voting_bench
+#     python -m bench compare bench/results/OLD.json bench/results/NEW.json
+#
+# `run` seeds N voters, M elections and K candidates into an empty database,
+# drives the scenarios in bench/scenarios.py against the Flask app in-process
+# and writes throughput, p50/p95/p99 latency and SQL statements per request
+# for every endpoint to bench/results/<commit>-<time>.json. `compare` diffs
+# two such files and exits 1 on regressions (more queries per request, or
+# p95 slower than --threshold percent).
+#
+# Server-level numbers (sync workers vs the ASGI entry point) come from
+# bench/asgi_load.py instead.
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BACKEND, 'bench', 'results')
+
+PHASES = ['login_storm', 'candidate_listing', 'vote_submission', 'results_polling', 'pdf_downloads',
+          'analytics']
+
+
+def run(options):
+    from bench import harness, scenarios
+
+    harness.reset_sqlite(options.database_uri)
+    workdir = tempfile.mkdtemp(prefix='voting-bench-')
+    try:
+        app = harness.load_app(options.database_uri, workdir)
+
+        from extensions import db
+        from bench.seed import seed_database
+
+        with app.app_context():
+            plan = seed_database(options.voters, options.active, options.closed,
+                                 options.candidates, seed=options.seed)
+            counter = harness.QueryCounter(db.engines.values())
+
+        report = {
+            'environment': harness.environment(options.database_uri),
+            'parameters': {k: v for k, v in vars(options).items() if k not in ('func', 'output')},
+            'scenarios': {}
+        }
+
+        for name in options.scenarios.split(','):
+            with app.app_context():
+                jobs = scenarios.build(name, plan, options, options.seed)
+            result = harness.run_phase(app, counter, jobs, options.concurrency)
+            report['scenarios'][name] = result
+            print(f"{name}: {result['requests']} requests in {result['wall_s']}s "
+                  f"({result['throughput_rps']} req/s)")
+            for label, stats in result['endpoints'].items():
+                print(f"  {label:58} p50 {stats['p50_ms']:>8} p95 {stats['p95_ms']:>8} "
+                      f"p99 {stats['p99_ms']:>8} ms  q/req {stats['queries_avg']:>5}  "
+                      f"err {stats['errors']}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    output = options.output
+    if not output:
+        env = report['environment']
+        stamp = env['timestamp'].replace(':', '').replace('-', '')[:15]
+        output = os.path.join(RESULTS_DIR, f"{env['commit'] or 'nogit'}-{stamp}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as out:
+        json.dump(report, out, indent=2)
+    print(f'Results written to {output}')
+    return 0
+
+
+def compare(options):
+    with open(options.baseline) as f:
+        old = json.load(f)
+    with open(options.candidate) as f:
+        new = json.load(f)
+
+    print(f"baseline  {old['environment']['commit']}  {old['environment']['timestamp']}")
+    print(f"candidate {new['environment']['commit']}  {new['environment']['timestamp']}")
+
+    regressions = []
+    for name, scenario in new['scenarios'].items():
+        before = old['scenarios'].get(name)
+        if not before:
+            continue
+        print(f'\n{name}')
+        for label, stats in scenario['endpoints'].items():
+            base = before['endpoints'].get(label)
+            if not base:
+                print(f'  {label}: new endpoint')
+                continue
+
+            change = (stats['p95_ms'] - base['p95_ms']) / base['p95_ms'] * 100 if base['p95_ms'] else 0
+            flags = []
+            if stats['queries_avg'] > base['queries_avg']:
+                flags.append(f"queries {base['queries_avg']} → {stats['queries_avg']}")
+            if change > options.threshold and stats['p95_ms'] - base['p95_ms'] > options.min_ms:
+                flags.append(f'p95 +{change:.0f}%')
+            if stats['errors'] > base['errors']:
+                flags.append(f"errors {base['errors']} → {stats['errors']}")
+
+            print(f"  {label:58} p50 {base['p50_ms']:>8} → {stats['p50_ms']:<8} "
+                  f"p95 {base['p95_ms']:>8} → {stats['p95_ms']:<8} "
+                  f"p99 {base['p99_ms']:>8} → {stats['p99_ms']:<8} "
+                  f"q/req {base['queries_avg']} → {stats['queries_avg']}"
+                  + (f"  REGRESSION: {', '.join(flags)}" if flags else ''))
+            if flags:
+                regressions.append((name, label))
+
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m bench', description='Election-day benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    p = commands.add_parser('run', help='seed a database and run the scenarios')
+    p.add_argument('--database-uri', default='sqlite:////tmp/voting-bench.db',
+                   help='must point at an empty scratch database (SQLite files are recreated)')
+    p.add_argument('--voters', type=int, default=2000)
+    p.add_argument('--active', type=int, default=2, help='ACTIVE elections (votes, listings)')
+    p.add_argument('--closed', type=int, default=3, help='CLOSED elections (results, PDFs)')
+    p.add_argument('--candidates', type=int, default=8, help='candidates per election')
+    p.add_argument('--logins', type=int, default=100)
+    p.add_argument('--listing', type=int, default=1500)
+    p.add_argument('--votes', type=int, default=1000)
+    p.add_argument('--reads', type=int, default=3000)
+    p.add_argument('--pdfs', type=int, default=20)
+    p.add_argument('--analytics', type=int, default=50)
+    p.add_argument('--concurrency', type=int, default=8)
+    p.add_argument('--scenarios', default=','.join(PHASES))
+    p.add_argument('--seed', type=int, default=1)
+    p.add_argument('--output', help='JSON path (default bench/results/<commit>-<time>.json)')
+    p.set_defaults(func=run)
+
+    p = commands.add_parser('compare', help='diff two result files')
+    p.add_argument('baseline')
+    p.add_argument('candidate')
+    p.add_argument('--threshold', type=float, default=15.0, help='allowed p95 slowdown in percent')
+    p.add_argument('--min-ms', type=float, default=1.0, help='ignore p95 changes smaller than this')
+    p.set_defaults(func=compare)
+
+    options = parser.parse_args()
+    sys.exit(options.func(options))
+
+
+if __name__ == '__main__':
+    main()
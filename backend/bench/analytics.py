@@ -0,0 +1,121 @@
+# bench/analytics.py
+# Vectorized demographics (services/analytics.py) against the obvious ORM
+# loop, on a large vote table:
+#
+#     cd backend
+#     python -m bench.analytics                       # 1M votes (100k voters × 10 elections)
+#     python -m bench.analytics --voters 20000 --elections 5
+#
+# Both sides tally votes per candidate by voter year and major over every
+# seeded election; the per-(candidate, year, major) counts are checked to
+# match before the timings are reported.
+
+import argparse
+import json
+import shutil
+import tempfile
+import time
+from collections import Counter, defaultdict
+
+from bench import harness
+
+
+def naive_demographics(election_ids):
+    """Row-by-row: ORM entities for every vote and voter, tallied in Python."""
+    from extensions import db
+    from models.vote import Vote
+    from models.voter import Voter
+
+    tallies = defaultdict(Counter)
+    election_totals = Counter()
+    query = db.session.query(Vote, Voter) \
+        .join(Voter, Voter.id == Vote.voter_id) \
+        .filter(Vote.election_id.in_(election_ids)) \
+        .yield_per(10000)
+    for vote, voter in query:
+        tallies[vote.candidate_id][(voter.year, voter.major_norm)] += 1
+        election_totals[vote.election_id] += 1
+
+    # Shares within each segment and overall, as the endpoint reports them
+    segment_totals = Counter()
+    for counts in tallies.values():
+        segment_totals.update(counts)
+    shares = {
+        candidate_id: {
+            segment: round(n * 100 / segment_totals[segment], 2) for segment, n in counts.items()
+        }
+        for candidate_id, counts in tallies.items()
+    }
+    db.session.expunge_all()
+    return tallies, shares, election_totals
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m bench.analytics')
+    parser.add_argument('--database-uri', default='sqlite:////tmp/voting-analytics-bench.db')
+    parser.add_argument('--voters', type=int, default=100000)
+    parser.add_argument('--elections', type=int, default=10, help='closed elections, every voter votes in each')
+    parser.add_argument('--candidates', type=int, default=8)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='write the timings as JSON here')
+    options = parser.parse_args()
+
+    harness.reset_sqlite(options.database_uri)
+    workdir = tempfile.mkdtemp(prefix='voting-analytics-')
+    try:
+        app = harness.load_app(options.database_uri, workdir)
+        from bench.seed import seed_database
+        from services.analytics import demographics, load_votes
+
+        with app.app_context():
+            started = time.perf_counter()
+            plan = seed_database(options.voters, 0, options.elections, options.candidates)
+            print(f"Seeded {options.voters * options.elections} votes in {time.perf_counter() - started:.1f}s")
+            election_ids = plan['closed']
+
+            def timed(fn):
+                best = None
+                for _ in range(options.repeat):
+                    app.extensions['analytics_cache'].clear()
+                    started = time.perf_counter()
+                    result = fn()
+                    elapsed = time.perf_counter() - started
+                    best = elapsed if best is None else min(best, elapsed)
+                return best, result
+
+            naive_s, (tallies, _, _) = timed(lambda: naive_demographics(election_ids))
+            load_s, _ = timed(lambda: load_votes(election_ids, ('year', 'major')))
+            vector_s, (payload, _) = timed(lambda: demographics(election_ids, ('year', 'major')))
+            started = time.perf_counter()
+            demographics(election_ids, ('year', 'major'))
+            cached_s = time.perf_counter() - started
+
+        vectorized = {
+            (c['candidate_id'], (s['year'], s['major'])): c['votes']
+            for e in payload['elections'] for s in e['segments'] for c in s['candidates'] if c['votes']
+        }
+        naive = {(cid, segment): n for cid, counts in tallies.items() for segment, n in counts.items()}
+        if vectorized != naive:
+            raise SystemExit('Vectorized tallies differ from the ORM loop')
+
+        report = {
+            'environment': harness.environment(options.database_uri),
+            'votes': payload['total_votes'],
+            'naive_orm_s': round(naive_s, 3),
+            'vectorized_s': round(vector_s, 3),
+            'vectorized_query_s': round(load_s, 3),
+            'vectorized_tabulate_s': round(vector_s - load_s, 3),
+            'cached_s': round(cached_s, 4),
+            'speedup': round(naive_s / vector_s, 1)
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(json.dumps(report, indent=2))
+    if options.output:
+        with open(options.output, 'w') as out:
+            json.dump(report, out, indent=2)
+
+
+if __name__ == '__main__':
+    main()
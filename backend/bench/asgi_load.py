@@ -0,0 +1,287 @@
+# bench/asgi_load.py
+# Load test: `gunicorn app:app` (sync workers) vs `uvicorn asgi:app`.
+#
+#     cd backend
+#     python -m bench.asgi_load --workers 2 --requests 2000 --concurrency 64 --streams 200
+#
+# Both servers run against the same freshly seeded database (sqlite by
+# default; pass --database-uri for MySQL). Two phases per server:
+#   latency   --requests GETs over the read-only endpoints from
+#             --concurrency clients → p50 / p95 / p99 and errors
+#   capacity  open up to --streams SSE result streams and count how many
+#             get their first event, then time a plain request while they
+#             are all held open
+# Results are printed as a table and optionally written with --json.
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+import httpx
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# ────────────────────────────────────────────────
+# SEEDING
+# ────────────────────────────────────────────────
+def seed(database_uri, elections, candidates):
+    """Closed elections with candidates, votes and result snapshots."""
+    os.environ['SQLALCHEMY_DATABASE_URI'] = database_uri
+    sys.path.insert(0, BACKEND)
+
+    from app import app
+    from extensions import db
+    from models.candidate import Candidate
+    from models.election import Election
+    from services.results import get_snapshot
+    from services.symbols import store_symbol, symbol_variant
+
+    past = datetime.now() - timedelta(days=1)
+    with app.app_context():
+        with open(os.path.join(BACKEND, 'uploads', 'symbols', 'lotus.jpg'), 'rb') as image:
+            symbol, _ = store_symbol(image, 'lotus.jpg')
+
+        ids = []
+        for e in range(elections):
+            election = Election(
+                election_name=f'Bench {e}',
+                election_date=past.date(), election_time=past.time(),
+                end_date=past.date(), end_time=past.time(),
+                result_date=past.date(), result_time=past.time(),
+                election_status='CLOSED'
+            )
+            db.session.add(election)
+            db.session.flush()
+            for c in range(candidates):
+                db.session.add(Candidate(
+                    election_id=election.id, name=f'Candidate {e}-{c}',
+                    roll_no=f'B{election.id}-{c}', major='CSE', course='BE', year=1 + c % 4,
+                    symbol=symbol, email=f'b{election.id}-{c}@bench.local', count=(c * 37) % 101
+                ))
+            ids.append(election.id)
+        db.session.commit()
+
+        for election in Election.query.filter(Election.id.in_(ids)):
+            get_snapshot(election)
+
+    return ids, f"/uploads/{symbol_variant(symbol, 'thumb')}"
+
+
+# ────────────────────────────────────────────────
+# SERVERS
+# ────────────────────────────────────────────────
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(kind, workers, database_uri):
+    port = free_port()
+    if kind == 'gunicorn':
+        command = [shutil.which('gunicorn') or 'gunicorn', 'app:app',
+                   '--workers', str(workers), '--bind', f'127.0.0.1:{port}',
+                   '--log-level', 'warning']
+    else:
+        command = [sys.executable, '-m', 'uvicorn', 'asgi:app',
+                   '--workers', str(workers), '--port', str(port),
+                   '--log-level', 'warning', '--no-access-log']
+
+    env = dict(os.environ, SQLALCHEMY_DATABASE_URI=database_uri)
+    process = subprocess.Popen(command, cwd=BACKEND, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base = f'http://127.0.0.1:{port}'
+
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f'{base}/api/elections/results/closed', timeout=2).status_code == 200:
+                return process, base
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+
+    process.terminate()
+    raise RuntimeError(f'{kind} did not start on port {port}')
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+# ────────────────────────────────────────────────
+# PHASES
+# ────────────────────────────────────────────────
+def percentile(samples, p):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+async def latency_phase(base, paths, total, concurrency, timeout):
+    """
+    `concurrency` clients, each with its own connection like a browser
+    tab (one shared httpx pool hands connections out unfairly and skews
+    the tail), share `total` requests once they are all connected.
+    """
+    latencies = []
+    errors = 0
+    next_request = iter(range(total))
+    connected = 0
+    go = asyncio.Event()
+
+    async def client():
+        nonlocal errors, connected
+        async with httpx.AsyncClient(base_url=base, timeout=timeout) as http:
+            try:
+                await http.get(paths[0])
+            except httpx.HTTPError:
+                pass
+            connected += 1
+            if connected == concurrency:
+                go.set()
+            await go.wait()
+
+            for n in next_request:
+                path = paths[n % len(paths)]
+                started = time.perf_counter()
+                try:
+                    response = await http.get(path)
+                    if response.status_code >= 400:
+                        errors += 1
+                        continue
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append((time.perf_counter() - started) * 1000)
+
+    clients = [asyncio.create_task(client()) for _ in range(concurrency)]
+    await go.wait()
+    started = time.perf_counter()
+    await asyncio.gather(*clients)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'requests': total,
+        'errors': errors,
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50), 2) if latencies else None,
+        'p95_ms': round(percentile(latencies, 95), 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 99), 2) if latencies else None,
+        'mean_ms': round(statistics.fmean(latencies), 2) if latencies else None
+    }
+
+
+async def capacity_phase(base, election_id, streams, timeout):
+    limits = httpx.Limits(max_connections=streams + 1)
+    opened = 0
+    release = asyncio.Event()
+
+    async def hold(http):
+        nonlocal opened
+        try:
+            async with http.stream('GET', f'/api/elections/{election_id}/results/stream') as response:
+                if response.status_code != 200:
+                    return
+                buffer = ''
+                async for chunk in response.aiter_text():
+                    buffer += chunk
+                    if 'event:' in buffer:
+                        break
+                else:
+                    return
+                opened += 1
+                await release.wait()
+        except httpx.HTTPError:
+            pass
+
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=timeout) as http:
+        holders = [asyncio.create_task(hold(http)) for _ in range(streams)]
+        # Give every stream a chance to connect before measuring
+        await asyncio.wait(holders, timeout=timeout)
+
+        started = time.perf_counter()
+        try:
+            probe = (await http.get('/api/elections/results/closed')).status_code
+        except httpx.HTTPError:
+            probe = None
+        probe_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        release.set()
+        for task in holders:
+            task.cancel()
+        await asyncio.gather(*holders, return_exceptions=True)
+
+    return {
+        'streams_requested': streams,
+        'streams_open': opened,
+        'probe_status': probe,
+        'probe_ms': probe_ms
+    }
+
+
+def run(kind, args, paths, election_id):
+    process, base = start_server(kind, args.workers, args.database_uri)
+    try:
+        # Warm up caches and the async pool
+        asyncio.run(latency_phase(base, paths, min(200, args.requests), 4, args.timeout))
+        latency = asyncio.run(latency_phase(base, paths, args.requests, args.concurrency, args.timeout))
+        capacity = asyncio.run(capacity_phase(base, election_id, args.streams, args.timeout))
+    finally:
+        stop_server(process)
+    return {'server': kind, 'workers': args.workers, **latency, **capacity}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='gunicorn app:app vs uvicorn asgi:app')
+    parser.add_argument('--database-uri', default='sqlite:////tmp/voting-bench.db')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--streams', type=int, default=200)
+    parser.add_argument('--elections', type=int, default=20)
+    parser.add_argument('--candidates', type=int, default=12)
+    parser.add_argument('--timeout', type=float, default=10.0)
+    parser.add_argument('--servers', default='gunicorn,uvicorn')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    if args.database_uri.startswith('sqlite:///'):
+        path = args.database_uri[len('sqlite:///'):]
+        if os.path.exists(path):
+            os.remove(path)
+
+    ids, symbol = seed(args.database_uri, args.elections, args.candidates)
+    paths = ['/api/elections/results/closed', '/api/candidates', symbol]
+    for election_id in ids:
+        paths.append(f'/api/elections/{election_id}/results')
+        paths.append(f'/api/candidates?election_id={election_id}')
+
+    results = [run(kind, args, paths, ids[0]) for kind in args.servers.split(',')]
+
+    columns = ['server', 'rps', 'p50_ms', 'p95_ms', 'p99_ms', 'errors', 'streams_open', 'probe_ms']
+    print(' '.join(f'{c:>12}' for c in columns))
+    for row in results:
+        print(' '.join(f'{str(row[c]):>12}' for c in columns))
+
+    if args.json:
+        with open(args.json, 'w') as out:
+            json.dump(results, out, indent=2)
+
+
+if __name__ == '__main__':
+    main()
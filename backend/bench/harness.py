@@ -0,0 +1,158 @@
+# bench/harness.py
+# Runs benchmark jobs against the Flask app in-process and measures them.
+#
+# A job is (label, fn): fn(client) issues one request with a Flask test
+# client and returns the response. Jobs run on a thread pool (one test
+# client per thread); every request is timed and the SQL statements it
+# executes are counted through a cursor event on each engine.
+
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+_WRITES = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+
+class QueryCounter:
+    """Per-thread count of executed statements (and of the writes among them)."""
+
+    def __init__(self, engines):
+        self._local = threading.local()
+        for engine in engines:
+            event.listen(engine, 'before_cursor_execute', self._count)
+
+    def _count(self, conn, cursor, statement, *args):
+        self._local.count = getattr(self._local, 'count', 0) + 1
+        if statement.lstrip().upper().startswith(_WRITES):
+            self._local.writes = self.writes + [statement]
+
+    def reset(self):
+        self._local.count = 0
+        self._local.writes = []
+
+    @property
+    def count(self):
+        return getattr(self._local, 'count', 0)
+
+    @property
+    def writes(self):
+        """Write statements executed since the last reset."""
+        return getattr(self._local, 'writes', [])
+
+
+def reset_sqlite(database_uri):
+    """Start from an empty file for sqlite:/// URIs (other databases must be empty already)."""
+    if database_uri.startswith('sqlite:///'):
+        path = database_uri[len('sqlite:///'):]
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+def load_app(database_uri, workdir):
+    """Import the app against the bench database, with caches and uploads under workdir."""
+    os.environ['SQLALCHEMY_DATABASE_URI'] = database_uri
+    for key in ('REPORT_CACHE_DIR', 'REPORT_JOB_DIR', 'LIVE_TALLY_DIR',
+                'VOTE_JOURNAL_DIR', 'PROFILER_DIR'):
+        os.environ[key] = os.path.join(workdir, key.lower())
+    sys.path.insert(0, BACKEND_DIR)
+
+    from app import app
+    app.config['UPLOAD_FOLDER'] = os.path.join(workdir, 'uploads')
+    return app
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def summarize(samples, wall):
+    """samples: [(ms, queries, status)] for one endpoint."""
+    ms = [s[0] for s in samples]
+    queries = [s[1] for s in samples]
+    statuses = Counter(str(s[2]) for s in samples)
+    return {
+        'requests': len(samples),
+        'errors': sum(1 for s in samples if s[2] is None or s[2] >= 400),
+        'statuses': dict(sorted(statuses.items())),
+        'throughput_rps': round(len(samples) / wall, 1) if wall else None,
+        'p50_ms': round(percentile(ms, 50), 2),
+        'p95_ms': round(percentile(ms, 95), 2),
+        'p99_ms': round(percentile(ms, 99), 2),
+        'mean_ms': round(statistics.fmean(ms), 2),
+        'max_ms': round(max(ms), 2),
+        'queries_avg': round(statistics.fmean(queries), 2),
+        'queries_max': max(queries)
+    }
+
+
+def run_phase(app, counter, jobs, concurrency):
+    """Run jobs on `concurrency` threads; returns the phase summary."""
+    local = threading.local()
+
+    def execute(job):
+        label, fn = job
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = app.test_client()
+
+        counter.reset()
+        started = time.perf_counter()
+        try:
+            response = fn(client)
+            response.get_data()   # streamed bodies (PDFs) are part of the cost
+            status = response.status_code
+            response.close()
+        except Exception:
+            app.logger.exception(f'Benchmark request failed: {label}')
+            status = None
+        return label, (time.perf_counter() - started) * 1000, counter.count, status
+
+    samples = defaultdict(list)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for label, ms, queries, status in pool.map(execute, jobs):
+            samples[label].append((ms, queries, status))
+    wall = time.perf_counter() - started
+
+    total = sum(len(s) for s in samples.values())
+    return {
+        'wall_s': round(wall, 3),
+        'requests': total,
+        'throughput_rps': round(total / wall, 1) if wall else None,
+        'concurrency': concurrency,
+        'endpoints': {label: summarize(s, wall) for label, s in sorted(samples.items())}
+    }
+
+
+def environment(database_uri):
+    """Where the numbers came from, for comparing runs across commits."""
+    def git(*args):
+        try:
+            return subprocess.run(['git', *args], cwd=BACKEND_DIR, capture_output=True,
+                                  text=True, timeout=10).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return ''
+
+    return {
+        'commit': git('rev-parse', '--short', 'HEAD') or None,
+        'dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'database': database_uri.split(':', 1)[0]
+    }
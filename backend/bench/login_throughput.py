@@ -0,0 +1,105 @@
+# bench/login_throughput.py
+# End-to-end POST /api/voter/login throughput (request handling, voter
+# lookup, password verification in the hashing pool, token issue) for a
+# range of pool sizes and request concurrencies:
+#
+#     cd backend
+#     python -m bench.login_throughput
+#     python -m bench.login_throughput --hash-workers 1,2,4 --concurrency 4,16,64 --logins 400
+#
+# `flask password-bench` only times the hash itself; this shows what a
+# login storm sees. Requests beyond PASSWORD_HASH_MAX_PENDING are answered
+# 503 and counted separately. Each pool size stands for the per-process
+# PASSWORD_HASH_WORKERS, i.e. the host's CPUs divided by the gunicorn
+# workers sharing them.
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from bench import harness
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m bench.login_throughput')
+    parser.add_argument('--database-uri', default='sqlite:////tmp/voting-login-bench.db',
+                        help='must point at an empty scratch database (SQLite files are recreated)')
+    parser.add_argument('--voters', type=int, default=500)
+    parser.add_argument('--logins', type=int, default=200, help='logins per run')
+    parser.add_argument('--hash-workers', default=f"1,{os.cpu_count() or 2}",
+                        help='PASSWORD_HASH_WORKERS values to compare')
+    parser.add_argument('--concurrency', default='8,32', help='concurrent login requests')
+    parser.add_argument('--output', help='write the results as JSON here')
+    options = parser.parse_args()
+
+    harness.reset_sqlite(options.database_uri)
+    workdir = tempfile.mkdtemp(prefix='voting-login-')
+    try:
+        app = harness.load_app(options.database_uri, workdir)
+
+        from bench.seed import PASSWORD, seed_database
+        from extensions import db
+        from services.passwords import PasswordHasher, hash_password
+
+        with app.app_context():
+            plan = seed_database(options.voters, 0, 0, 0)
+            counter = harness.QueryCounter(db.engines.values())
+            stored = hash_password(PASSWORD)
+
+        # Single-threaded cost of one verification, for reference
+        hasher = PasswordHasher(workers=1, max_pending=1)
+        started = time.perf_counter()
+        for _ in range(10):
+            hasher.verify(stored, PASSWORD)
+        hash_ms = (time.perf_counter() - started) * 100
+
+        emails = [email for _, email in plan['voters']]
+        jobs = [
+            ('POST /api/voter/login',
+             lambda c, email=emails[n % len(emails)]: c.post(
+                 '/api/voter/login', json={'email': email, 'password': PASSWORD}))
+            for n in range(options.logins)
+        ]
+
+        runs = []
+        for workers in sorted({int(n) for n in options.hash_workers.split(',')}):
+            app.extensions['password_hasher'] = PasswordHasher(
+                workers=workers,
+                max_pending=app.config['PASSWORD_HASH_MAX_PENDING']
+            )
+            for concurrency in [int(n) for n in options.concurrency.split(',')]:
+                phase = harness.run_phase(app, counter, jobs, concurrency)
+                stats = phase['endpoints']['POST /api/voter/login']
+                runs.append({
+                    'hash_workers': workers,
+                    'concurrency': concurrency,
+                    'logins_per_s': round(stats['statuses'].get('200', 0) / phase['wall_s'], 1),
+                    'busy_503': stats['statuses'].get('503', 0),
+                    **{k: stats[k] for k in ('statuses', 'p50_ms', 'p95_ms', 'p99_ms', 'queries_avg')}
+                })
+                run = runs[-1]
+                print(f"  hash workers {workers:>2}  concurrency {concurrency:>3}: "
+                      f"{run['logins_per_s']:>7} logins/s  p50 {run['p50_ms']:>8} p95 {run['p95_ms']:>8} "
+                      f"p99 {run['p99_ms']:>8} ms  503s {run['busy_503']}")
+
+        report = {
+            'environment': harness.environment(options.database_uri),
+            'method': app.config['PASSWORD_HASH_METHOD'],
+            'single_hash_ms': round(hash_ms, 2),
+            'max_pending': app.config['PASSWORD_HASH_MAX_PENDING'],
+            'runs': runs
+        }
+        print(f"One {report['method']} verification: {report['single_hash_ms']} ms")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if options.output:
+        with open(options.output, 'w') as out:
+            json.dump(report, out, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+# bench/ranked.py
+# IRV/STV counting (services/ranked.py) on synthetic ranked ballots, against
+# a per-ballot Python IRV count:
+#
+#     cd backend
+#     python -m bench.ranked                          # 100k ballots × 20 candidates
+#     python -m bench.ranked --ballots 20000 --candidates 8 --seats 3
+#
+# Ballots are packed exactly as RankedBallot stores them, so the timings
+# include decoding. The IRV rounds are checked against the Python count,
+# and the run fails (exit 1) when decoding plus either count takes longer
+# than --budget seconds.
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from bench import harness
+
+
+def synthetic_rankings(ballots, candidates, seed=1):
+    """
+    Candidate id lists (ids 1..candidates) of varying length, with
+    uneven popularity so counts run for many rounds.
+    """
+    rng = np.random.default_rng(seed)
+    popularity = rng.uniform(0, 1.5, candidates)
+    # Gumbel-perturbed scores give a random preference order per ballot
+    scores = popularity + rng.gumbel(size=(ballots, candidates))
+    order = np.argsort(-scores, axis=1) + 1
+    lengths = rng.integers(1, candidates + 1, ballots)
+    return [row[:n].tolist() for row, n in zip(order, lengths)]
+
+
+def naive_irv(rankings, candidate_ids):
+    """Round-by-round IRV with one Python list per ballot; same tie-breaks as the engine."""
+    continuing = list(candidate_ids)
+    history = []
+    while True:
+        tallies = dict.fromkeys(continuing, 0)
+        for ballot in rankings:
+            for candidate_id in ballot:
+                if candidate_id in tallies:
+                    tallies[candidate_id] += 1
+                    break
+        history.append(tallies)
+
+        total = sum(tallies.values())
+        leader = max(continuing, key=lambda c: tallies[c])
+        if len(continuing) <= 1 or tallies[leader] * 2 > total:
+            return leader, history
+
+        fewest = min(tallies.values())
+        tied = [c for c in continuing if tallies[c] == fewest]
+        for past in reversed(history[:-1]):
+            if len(tied) == 1:
+                break
+            lowest = min(past[c] for c in tied)
+            tied = [c for c in tied if past[c] == lowest]
+        continuing.remove(tied[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m bench.ranked')
+    parser.add_argument('--ballots', type=int, default=100000)
+    parser.add_argument('--candidates', type=int, default=20)
+    parser.add_argument('--seats', type=int, default=5, help='seats for the STV count')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=1.0, help='seconds allowed per count')
+    parser.add_argument('--output', help='write the timings as JSON here')
+    options = parser.parse_args()
+
+    from models.ranked_ballot import pack_ranking
+    from services.ranked import ballot_matrix, count_ballots
+
+    candidate_ids = list(range(1, options.candidates + 1))
+    rankings = synthetic_rankings(options.ballots, options.candidates)
+    blobs = [pack_ranking(r) for r in rankings]
+
+    def timed(fn):
+        best = None
+        for _ in range(options.repeat):
+            started = time.perf_counter()
+            result = fn()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    decode_s, _ = timed(lambda: ballot_matrix(blobs, candidate_ids))
+    irv_s, irv = timed(lambda: count_ballots(ballot_matrix(blobs, candidate_ids), candidate_ids))
+    stv_s, stv = timed(lambda: count_ballots(
+        ballot_matrix(blobs, candidate_ids), candidate_ids, options.seats, 'STV'
+    ))
+
+    started = time.perf_counter()
+    winner, history = naive_irv(rankings, candidate_ids)
+    naive_s = time.perf_counter() - started
+
+    engine_rounds = [{t['candidate_id']: t['votes'] for t in r['tallies']} for r in irv['rounds']]
+    if irv['elected'] != [winner] or engine_rounds != history:
+        raise SystemExit('IRV rounds differ from the per-ballot count')
+
+    report = {
+        'environment': harness.environment('none'),
+        'ballots': options.ballots,
+        'candidates': options.candidates,
+        'packed_bytes': sum(len(b) for b in blobs),
+        'decode_s': round(decode_s, 4),
+        'irv_s': round(irv_s, 4),
+        'irv_rounds': len(irv['rounds']),
+        'stv_s': round(stv_s, 4),
+        'stv_seats': stv['seats'],
+        'stv_rounds': len(stv['rounds']),
+        'naive_irv_s': round(naive_s, 3),
+        'speedup': round(naive_s / irv_s, 1),
+        'budget_s': options.budget
+    }
+
+    print(json.dumps(report, indent=2))
+    if options.output:
+        with open(options.output, 'w') as out:
+            json.dump(report, out, indent=2)
+
+    if max(irv_s, stv_s) > options.budget:
+        print(f"Over budget: counts must finish within {options.budget}s", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+# bench/results_history.py
+# Results endpoint latency with a long history of CLOSED elections:
+#
+#     cd backend
+#     python -m bench.results_history                  # 10k closed elections
+#     python -m bench.results_history --elections 2000 --sample 100
+#
+# Times GET /api/elections/results/closed and GET /api/elections/<id>/results
+# (first read of an election, which builds its result snapshot, and repeat
+# reads) plus one pass of the status engine over the whole table. Every
+# write statement is recorded: the run fails (exit 1) when the listing or a
+# repeat read writes anything, or when a results request touches election
+# statuses — transitions belong to the scheduler, not the read path.
+
+import argparse
+import json
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from bench import harness
+
+
+def timed_requests(client, counter, urls):
+    """GET each url once; returns (latencies in ms, statements, write statements)."""
+    latencies, statements, writes = [], [], []
+    for url in urls:
+        counter.reset()
+        started = time.perf_counter()
+        response = client.get(url)
+        response.get_data()
+        latencies.append((time.perf_counter() - started) * 1000)
+        if response.status_code != 200:
+            raise SystemExit(f'GET {url} returned {response.status_code}')
+        statements.append(counter.count)
+        writes += counter.writes
+    return latencies, statements, writes
+
+
+def summarize(latencies, statements, writes):
+    return {
+        'requests': len(latencies),
+        'p50_ms': round(harness.percentile(latencies, 50), 2),
+        'p95_ms': round(harness.percentile(latencies, 95), 2),
+        'p99_ms': round(harness.percentile(latencies, 99), 2),
+        'max_ms': round(max(latencies), 2),
+        'queries_avg': round(statistics.fmean(statements), 2),
+        'writes': len(writes)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m bench.results_history')
+    parser.add_argument('--database-uri', default='sqlite:////tmp/voting-results-bench.db',
+                        help='must point at an empty scratch database (SQLite files are recreated)')
+    parser.add_argument('--elections', type=int, default=10000, help='historical CLOSED elections')
+    parser.add_argument('--voters', type=int, default=20, help='voters, each votes in every election')
+    parser.add_argument('--candidates', type=int, default=3)
+    parser.add_argument('--sample', type=int, default=200, help='elections whose results are read')
+    parser.add_argument('--repeat', type=int, default=20, help='requests for the closed listing')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='write the results as JSON here')
+    options = parser.parse_args()
+
+    harness.reset_sqlite(options.database_uri)
+    workdir = tempfile.mkdtemp(prefix='voting-results-')
+    try:
+        app = harness.load_app(options.database_uri, workdir)
+
+        from bench.seed import seed_database
+        from extensions import db
+        from services.election_status import refresh_election_statuses
+
+        started = time.perf_counter()
+        with app.app_context():
+            plan = seed_database(options.voters, 0, options.elections, options.candidates,
+                                 seed=options.seed)
+            counter = harness.QueryCounter(db.engines.values())
+        print(f"Seeded {len(plan['closed'])} closed elections in {time.perf_counter() - started:.1f}s")
+
+        client = app.test_client()
+        sample = random.Random(options.seed).sample(plan['closed'], min(options.sample, len(plan['closed'])))
+        result_urls = [f'/api/elections/{election_id}/results' for election_id in sample]
+
+        phases = {
+            'closed_listing': timed_requests(client, counter, ['/api/elections/results/closed'] * options.repeat),
+            'results_first_read': timed_requests(client, counter, result_urls),
+            'results_repeat_read': timed_requests(client, counter, result_urls)
+        }
+
+        with app.app_context():
+            counter.reset()
+            started = time.perf_counter()
+            closed_ids, activated = refresh_election_statuses()
+            status_ms = (time.perf_counter() - started) * 1000
+            status_statements = counter.count
+            db.session.remove()
+
+        report = {
+            'environment': harness.environment(options.database_uri),
+            'elections': options.elections,
+            'voters': options.voters,
+            'candidates': options.candidates,
+            'phases': {name: summarize(*samples) for name, samples in phases.items()},
+            'status_refresh': {
+                'ms': round(status_ms, 2),
+                'queries': status_statements,
+                'transitions': len(closed_ids) + activated
+            }
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    for name, stats in report['phases'].items():
+        print(f"  {name:22} p50 {stats['p50_ms']:>8} p95 {stats['p95_ms']:>8} p99 {stats['p99_ms']:>8} ms  "
+              f"q/req {stats['queries_avg']:>5}  writes {stats['writes']}")
+    refresh = report['status_refresh']
+    print(f"  {'status_refresh':22} {refresh['ms']} ms, {refresh['queries']} statements, "
+          f"{refresh['transitions']} transitions")
+
+    if options.output:
+        with open(options.output, 'w') as out:
+            json.dump(report, out, indent=2)
+
+    problems = []
+    for name in ('closed_listing', 'results_repeat_read'):
+        if phases[name][2]:
+            problems.append(f'{name} wrote to the database: {phases[name][2][0]}')
+    for name, (_, _, writes) in phases.items():
+        if any('elections' in w.split('SET')[0] for w in writes if w.lstrip().upper().startswith('UPDATE')):
+            problems.append(f'{name} updated election statuses on the read path')
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
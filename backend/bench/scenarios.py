@@ -0,0 +1,146 @@
+# bench/scenarios.py
+# Election-day traffic, one scenario per phase. Each builder returns the
+# jobs (label, fn(client)) for bench.harness.run_phase; labels are route
+# templates so numbers group per endpoint, not per URL.
+
+import random
+
+from models.voter import Voter
+from services.identity import create_voter_token
+
+from bench.seed import PASSWORD
+
+
+def _tokens(voters):
+    """Access tokens without going through login (inside an app context)."""
+    ids = [voter_id for voter_id, _ in voters]
+    by_id = {v.id: v for v in Voter.query.filter(Voter.id.in_(ids))}
+    return {voter_id: create_voter_token(by_id[voter_id]) for voter_id in ids}
+
+
+def _auth(token):
+    return {'Authorization': f'Bearer {token}'}
+
+
+def login_storm(plan, options, rng):
+    """Everyone logs in at the opening bell (password verification bound)."""
+    voters = rng.sample(plan['voters'], min(options.logins, len(plan['voters'])))
+    return [
+        ('POST /api/voter/login',
+         lambda c, email=email: c.post('/api/voter/login', json={'email': email, 'password': PASSWORD}))
+        for _, email in voters
+    ]
+
+
+def candidate_listing(plan, options, rng):
+    """Ballot pages: candidate lists, with and without the voter's status."""
+    voters = rng.sample(plan['voters'], min(200, len(plan['voters'])))
+    tokens = _tokens(voters)
+    jobs = []
+    for n in range(options.listing):
+        election_id = rng.choice(plan['active'])
+        token = tokens[voters[n % len(voters)][0]]
+        kind = n % 3
+        if kind == 0:
+            jobs.append(('GET /api/candidates?election_id=<id>',
+                         lambda c, e=election_id: c.get(f'/api/candidates?election_id={e}')))
+        elif kind == 1:
+            jobs.append(('GET /api/elections/<id>/candidates-and-vote-status',
+                         lambda c, e=election_id, t=token: c.get(
+                             f'/api/elections/{e}/candidates-and-vote-status', headers=_auth(t))))
+        else:
+            jobs.append(('GET /api/voter/elections-with-candidates',
+                         lambda c, t=token: c.get('/api/voter/elections-with-candidates', headers=_auth(t))))
+    return jobs
+
+
+def vote_submission(plan, options, rng):
+    """One vote per voter, spread over the active elections."""
+    voters = rng.sample(plan['voters'], min(options.votes, len(plan['voters'])))
+    tokens = _tokens(voters)
+    jobs = []
+    for voter_id, _ in voters:
+        election_id = rng.choice(plan['active'])
+        candidate_id = rng.choice(plan['candidates'][election_id])
+        jobs.append(('POST /api/elections/<id>/vote',
+                     lambda c, e=election_id, cid=candidate_id, t=tokens[voter_id]: c.post(
+                         f'/api/elections/{e}/vote', json={'candidate_id': cid}, headers=_auth(t))))
+    return jobs
+
+
+def results_polling(plan, options, rng):
+    """
+    Result-day refreshes. Like browsers, pollers revalidate with the ETag
+    they got last time (→ 304s); live tallies use the long-poll endpoint.
+    """
+    etags = {}
+
+    def conditional(path):
+        def fetch(c):
+            headers = {'If-None-Match': etags[path]} if path in etags else {}
+            response = c.get(path, headers=headers)
+            if response.headers.get('ETag'):
+                etags[path] = response.headers['ETag']
+            return response
+        return fetch
+
+    jobs = []
+    for n in range(options.reads):
+        kind = n % 4
+        if kind == 0:
+            jobs.append(('GET /api/elections/results/closed',
+                         conditional('/api/elections/results/closed')))
+        elif kind in (1, 2):
+            election_id = rng.choice(plan['closed'])
+            jobs.append(('GET /api/elections/<id>/results',
+                         conditional(f'/api/elections/{election_id}/results')))
+        else:
+            election_id = rng.choice(plan['active'])
+            jobs.append(('GET /api/elections/<id>/results/live',
+                         lambda c, e=election_id: c.get(f'/api/elections/{e}/results/live?timeout=0')))
+    return jobs
+
+
+def pdf_downloads(plan, options, rng):
+    """Official reports and winner certificates (first download renders)."""
+    jobs = []
+    for n in range(options.pdfs):
+        election_id = rng.choice(plan['closed'])
+        if n % 2 == 0:
+            jobs.append(('GET /api/elections/<id>/results/export/pdf',
+                         lambda c, e=election_id: c.get(f'/api/elections/{e}/results/export/pdf')))
+        else:
+            candidate_id = rng.choice(plan['candidates'][election_id])
+            jobs.append(('GET /api/elections/<id>/results/winner/<cid>/export/pdf',
+                         lambda c, e=election_id, cid=candidate_id: c.get(
+                             f'/api/elections/{e}/results/winner/{cid}/export/pdf')))
+    return jobs
+
+
+def analytics(plan, options, rng):
+    """Admin demographics over the closed elections (first request per key computes, the rest hit the cache)."""
+    closed = plan['closed']
+    queries = [
+        ','.join(map(str, closed)) + '&by=year,major',
+        ','.join(map(str, closed)) + '&by=course',
+        str(closed[0]) + '&by=year,major,course',
+    ]
+    return [
+        ('GET /api/admin/analytics/demographics',
+         lambda c, q=rng.choice(queries): c.get(f'/api/admin/analytics/demographics?election_ids={q}'))
+        for _ in range(options.analytics)
+    ]
+
+
+SCENARIOS = {
+    'login_storm': login_storm,
+    'candidate_listing': candidate_listing,
+    'vote_submission': vote_submission,
+    'results_polling': results_polling,
+    'pdf_downloads': pdf_downloads,
+    'analytics': analytics
+}
+
+
+def build(name, plan, options, seed):
+    return SCENARIOS[name](plan, options, random.Random(f'{seed}:{name}'))
@@ -0,0 +1,119 @@
+# bench/seed.py
+# Deterministic election-day data for the benchmarks: voters, ACTIVE
+# elections to vote in and CLOSED elections (with votes) to read results of.
+# Rows are bulk-inserted; every voter shares one password hash so seeding
+# 10k voters doesn't mean 10k scrypt runs.
+
+import os
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from extensions import db
+from models.candidate import Candidate
+from models.election import Election
+from models.vote import Vote
+from models.voter import Voter, normalize
+from services.passwords import hash_password
+from services.symbols import store_symbol
+from services.turnout import rebuild_turnout
+
+PASSWORD = 'bench-password'
+
+MAJORS = ['CSE', 'ECE', 'EEE', 'MECH', 'CIVIL', 'IT']
+COURSES = ['BE', 'BTech', 'ME']
+
+_SAMPLE_SYMBOL = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'uploads', 'symbols', 'lotus.jpg'
+)
+
+
+def _election(name, start, end):
+    return Election(
+        election_name=name,
+        election_date=start.date(), election_time=start.time().replace(microsecond=0),
+        end_date=end.date(), end_time=end.time().replace(microsecond=0),
+        result_date=end.date(), result_time=end.time().replace(microsecond=0),
+        election_status='ACTIVE' if end > datetime.now() else 'CLOSED'
+    )
+
+
+def seed_database(voters, active, closed, candidates, seed=1):
+    """
+    Seed an empty database (inside an app context). Returns a plan dict:
+      voters      [(id, email)]
+      active      [election id]   — open for a day, nobody has voted yet
+      closed      [election id]   — ended yesterday, every voter voted
+      candidates  {election id: [candidate id]}
+      symbol      stored symbol path
+    """
+    rng = random.Random(seed)
+    now = datetime.now().replace(microsecond=0)
+
+    with open(_SAMPLE_SYMBOL, 'rb') as image:
+        symbol, _ = store_symbol(image, os.path.basename(_SAMPLE_SYMBOL))
+
+    password = hash_password(PASSWORD)
+    rows = []
+    for n in range(voters):
+        name = f'Bench Voter {n}'
+        major = MAJORS[n % len(MAJORS)]
+        course = COURSES[n % len(COURSES)]
+        rows.append({
+            'student_name': name, 'roll_no': f'BV{n:06d}', 'major': major, 'course': course,
+            'year': 1 + n % 4, 'email': f'voter{n}@bench.local', 'password': password,
+            'student_name_norm': normalize(name), 'major_norm': normalize(major),
+            'course_norm': normalize(course)
+        })
+    for start in range(0, len(rows), 1000):
+        db.session.execute(insert(Voter), rows[start:start + 1000])
+
+    elections = [_election(f'Bench Active {e}', now - timedelta(hours=1), now + timedelta(days=1))
+                 for e in range(active)]
+    elections += [_election(f'Bench Closed {e}', now - timedelta(days=2), now - timedelta(days=1))
+                  for e in range(closed)]
+    db.session.add_all(elections)
+    db.session.flush()
+
+    plan_candidates = {}
+    for election in elections:
+        batch = [
+            Candidate(
+                election_id=election.id, name=f'Candidate {election.id}-{c}',
+                roll_no=f'BC{election.id}-{c}', major=MAJORS[c % len(MAJORS)], course='BE',
+                year=1 + c % 4, symbol=symbol, email=f'candidate{election.id}-{c}@bench.local'
+            )
+            for c in range(candidates)
+        ]
+        db.session.add_all(batch)
+        db.session.flush()
+        plan_candidates[election.id] = [c.id for c in batch]
+
+    voter_ids = [(v.id, v.email) for v in Voter.query.filter(Voter.email.like('%@bench.local'))
+                 .order_by(Voter.id)]
+
+    closed_ids = [e.id for e in elections if e.election_status == 'CLOSED']
+    for election_id in closed_ids:
+        tally = {cid: 0 for cid in plan_candidates[election_id]}
+        votes = []
+        for voter_id, _ in voter_ids:
+            cid = rng.choice(plan_candidates[election_id])
+            tally[cid] += 1
+            votes.append({'voter_id': voter_id, 'election_id': election_id, 'candidate_id': cid})
+        for start in range(0, len(votes), 1000):
+            db.session.execute(insert(Vote), votes[start:start + 1000])
+        for cid, count in tally.items():
+            db.session.query(Candidate).filter_by(id=cid).update({'count': count})
+
+    # Rows went in through bulk INSERTs, so count them in one go
+    rebuild_turnout(db.session.connection(), include_closed=True)
+    db.session.commit()
+
+    return {
+        'voters': voter_ids,
+        'active': [e.id for e in elections if e.election_status == 'ACTIVE'],
+        'closed': closed_ids,
+        'candidates': plan_candidates,
+        'symbol': symbol
+    }
@@ -0,0 +1,184 @@
+# bench/vote_contention.py
+# Sustained vote ingestion at 1, 4 and 16 concurrent worker processes:
+#
+#     cd backend
+#     python -m bench.vote_contention                   # SQLite stand-in
+#     python -m bench.vote_contention --database-uri mysql+pymysql://u:p@localhost/voting_bench
+#     python -m bench.vote_contention --levels 1,4 --threads 8 --write-behind
+#
+# Each level gets its own ACTIVE election with a handful of candidates, so
+# every worker keeps hitting the same few candidate rows. Workers are
+# separate processes (like gunicorn workers), each with its own app and
+# connection pool, POSTing /api/elections/<id>/vote for its share of the
+# voters from --threads request threads once all of them are ready. After
+# each level the tallies are checked against the vote table: any
+# difference is a lost update.
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from bench import harness
+
+
+def _worker(database_uri, workdir, threads, election_id, ballots, barrier, results):
+    """ballots: [(voter id, candidate id)] this process submits."""
+    app = harness.load_app(database_uri, workdir)
+
+    from models.voter import Voter
+    from services.identity import create_voter_token
+
+    with app.app_context():
+        voters = {v.id: v for v in Voter.query.filter(Voter.id.in_([b[0] for b in ballots]))}
+        tokens = {voter_id: create_voter_token(voter) for voter_id, voter in voters.items()}
+
+    local = threading.local()
+
+    def submit(ballot):
+        voter_id, candidate_id = ballot
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = app.test_client()
+        sent = time.perf_counter()
+        response = client.post(
+            f'/api/elections/{election_id}/vote',
+            json={'candidate_id': candidate_id},
+            headers={'Authorization': f'Bearer {tokens[voter_id]}'}
+        )
+        return response.status_code, (time.perf_counter() - sent) * 1000
+
+    barrier.wait()
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        outcomes = list(pool.map(submit, ballots))
+    ended = time.time()
+
+    statuses = Counter(status for status, _ in outcomes)
+    results.put((started, ended, dict(statuses), [ms for _, ms in outcomes]))
+
+
+def run_level(context, options, workdir, election_id, ballots, workers):
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [
+        context.Process(target=_worker, args=(
+            options.database_uri, workdir, options.threads, election_id, ballots[w::workers],
+            barrier, results
+        ))
+        for w in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    outcomes = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    wall = max(o[1] for o in outcomes) - min(o[0] for o in outcomes)
+    statuses = Counter()
+    latencies = []
+    for _, _, counts, samples in outcomes:
+        statuses.update(counts)
+        latencies += samples
+
+    accepted = statuses.get(201, 0)
+    return {
+        'workers': workers,
+        'threads': options.threads,
+        'votes': len(ballots),
+        'accepted': accepted,
+        'statuses': {str(k): v for k, v in sorted(statuses.items())},
+        'wall_s': round(wall, 3),
+        'votes_per_s': round(accepted / wall, 1) if wall else None,
+        'p50_ms': round(harness.percentile(latencies, 50), 2),
+        'p95_ms': round(harness.percentile(latencies, 95), 2),
+        'p99_ms': round(harness.percentile(latencies, 99), 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m bench.vote_contention')
+    parser.add_argument('--database-uri', default='sqlite:////tmp/voting-contention-bench.db',
+                        help='must point at an empty scratch database (SQLite files are recreated)')
+    parser.add_argument('--levels', default='1,4,16', help='concurrent worker processes per run')
+    parser.add_argument('--votes', type=int, default=4000, help='votes per level')
+    parser.add_argument('--candidates', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=1, help='request threads per worker process')
+    parser.add_argument('--write-behind', action='store_true',
+                        help='enable the vote buffer (VOTE_WRITE_BEHIND, needs --threads > 1)')
+    parser.add_argument('--output', help='write the results as JSON here')
+    options = parser.parse_args()
+    if options.write_behind and options.threads < 2:
+        parser.error('--write-behind needs --threads > 1: single-threaded workers have nothing to group')
+
+    levels = [int(n) for n in options.levels.split(',')]
+    harness.reset_sqlite(options.database_uri)
+    workdir = tempfile.mkdtemp(prefix='voting-contention-')
+    # Inherited by the spawned workers
+    os.environ['REQUEST_THREADS'] = str(options.threads)
+
+    try:
+        app = harness.load_app(options.database_uri, workdir)
+        # Only the workers write votes (and own a buffer and journal)
+        if options.write_behind:
+            os.environ['VOTE_WRITE_BEHIND'] = 'True'
+
+        from sqlalchemy import func
+
+        from bench.seed import seed_database
+        from extensions import db
+        from models.candidate import Candidate
+        from models.vote import Vote
+
+        with app.app_context():
+            plan = seed_database(options.votes, len(levels), 0, options.candidates)
+
+        # Workers import the app themselves, as separate gunicorn workers would
+        context = multiprocessing.get_context('spawn')
+        runs = []
+        for workers, election_id in zip(levels, plan['active']):
+            candidates = plan['candidates'][election_id]
+            ballots = [
+                (voter_id, candidates[n % len(candidates)])
+                for n, (voter_id, _) in enumerate(plan['voters'])
+            ]
+            result = run_level(context, options, workdir, election_id, ballots, workers)
+
+            with app.app_context():
+                recorded = db.session.query(func.count(Vote.id)).filter_by(election_id=election_id).scalar()
+                tallied = db.session.query(func.coalesce(func.sum(Candidate.count), 0)) \
+                    .filter_by(election_id=election_id).scalar()
+                db.session.remove()
+            result['recorded'] = recorded
+            result['lost_updates'] = recorded - tallied
+            runs.append(result)
+
+            print(f"{workers:>3} workers × {options.threads} threads: {result['votes_per_s']} votes/s  "
+                  f"p50 {result['p50_ms']} p95 {result['p95_ms']} p99 {result['p99_ms']} ms  "
+                  f"statuses {result['statuses']}  lost updates {result['lost_updates']}")
+
+        report = {
+            'environment': harness.environment(options.database_uri),
+            'write_behind': options.write_behind,
+            'candidates': options.candidates,
+            'runs': runs
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if options.output:
+        with open(options.output, 'w') as out:
+            json.dump(report, out, indent=2)
+
+    if any(r['lost_updates'] or r['recorded'] != r['accepted'] for r in runs):
+        raise SystemExit('Tallies do not match the recorded votes')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+# bench/voter_search.py
+# Indexed voter search (services/voter_search.py) against the leading-wildcard
+# ILIKE filters it replaced, on a large voter table:
+#
+#     cd backend
+#     python -m bench.voter_search                    # 100k voters
+#     python -m bench.voter_search --voters 20000 --repeat 5
+#
+# Each search from the admin voter list is run both ways, for the first page
+# (50 rows, as with ?limit=50) and for every match. Indexed matches are
+# prefix matches, so they must be a subset of the ILIKE '%...%' matches;
+# the run fails otherwise. Query plans are reported alongside the timings.
+
+import argparse
+import json
+import shutil
+import statistics
+import tempfile
+import time
+
+from bench import harness
+
+FIRST_NAMES = ['Arun', 'Priya', 'Karthik', 'Divya', 'Rahul', 'Sneha', 'Vijay', 'Anitha', 'Suresh',
+               'Lakshmi', 'Ganesh', 'Meena', 'Ravi', 'Deepa', 'Manoj', 'Kavya', 'Naveen', 'Pooja',
+               'Sanjay', 'Revathi']
+LAST_NAMES = ['Kumar', 'Raman', 'Iyer', 'Nair', 'Reddy', 'Sharma', 'Pillai', 'Menon', 'Rao',
+              'Krishnan', 'Subramanian', 'Gupta', 'Das', 'Verma', 'Joseph']
+
+SEARCHES = [
+    ('name word', {'student_name': 'karthik'}),
+    ('name two word prefixes', {'student_name': 'priya kri'}),
+    ('roll_no prefix', {'roll_no': 'BV0421'}),
+    ('major', {'major': 'ece'}),
+    ('course and year', {'course': 'btech', 'year': '3'}),
+    ('name and major', {'student_name': 'meena', 'major': 'mech'}),
+]
+
+
+def seed_voters(count):
+    """Bulk-insert voters with varied names (bench.seed names them all alike)."""
+    from sqlalchemy import insert
+
+    from bench.seed import COURSES, MAJORS, PASSWORD
+    from extensions import db
+    from models.voter import Voter, normalize
+    from services.passwords import hash_password
+
+    password = hash_password(PASSWORD)
+    rows = []
+    for n in range(count):
+        name = f'{FIRST_NAMES[n % len(FIRST_NAMES)]} {LAST_NAMES[(n // len(FIRST_NAMES)) % len(LAST_NAMES)]}'
+        major = MAJORS[n % len(MAJORS)]
+        course = COURSES[n % len(COURSES)]
+        rows.append({
+            'student_name': name, 'roll_no': f'BV{n:06d}', 'major': major, 'course': course,
+            'year': 1 + n % 4, 'email': f'voter{n}@bench.local', 'password': password,
+            'student_name_norm': normalize(name), 'major_norm': normalize(major),
+            'course_norm': normalize(course)
+        })
+        if len(rows) == 5000:
+            db.session.execute(insert(Voter), rows)
+            rows = []
+    if rows:
+        db.session.execute(insert(Voter), rows)
+    db.session.commit()
+
+
+def legacy_search(query, args):
+    """The get_voters filters before the search subsystem: ILIKE '%value%'."""
+    from models.voter import Voter
+
+    if args.get('student_name'):
+        query = query.filter(Voter.student_name.ilike(f"%{args['student_name']}%"))
+    if args.get('roll_no'):
+        query = query.filter(Voter.roll_no.ilike(f"%{args['roll_no']}%"))
+    if args.get('year'):
+        query = query.filter(Voter.year == int(args['year']))
+    if args.get('major'):
+        query = query.filter(Voter.major.ilike(f"%{args['major']}%"))
+    if args.get('course'):
+        query = query.filter(Voter.course.ilike(f"%{args['course']}%"))
+    return query
+
+
+def measure(query, repeat):
+    """Median ms for the first page and for all matching ids."""
+    from models.voter import Voter
+
+    ordered = query.with_entities(Voter.id).order_by(Voter.id)
+    page_ms, all_ms = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        ordered.limit(50).all()
+        page_ms.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        ids = [row.id for row in ordered.all()]
+        all_ms.append((time.perf_counter() - started) * 1000)
+
+    return ids, {
+        'page_ms': round(statistics.median(page_ms), 2),
+        'all_ms': round(statistics.median(all_ms), 2),
+        'matches': len(ids)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m bench.voter_search')
+    parser.add_argument('--database-uri', default='sqlite:////tmp/voting-search-bench.db',
+                        help='must point at an empty scratch database (SQLite files are recreated)')
+    parser.add_argument('--voters', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--output', help='write the timings as JSON here')
+    options = parser.parse_args()
+
+    harness.reset_sqlite(options.database_uri)
+    workdir = tempfile.mkdtemp(prefix='voting-search-')
+    try:
+        app = harness.load_app(options.database_uri, workdir)
+
+        from extensions import db
+        from models.voter import Voter
+        from services.query_plans import explain
+        from services.voter_search import apply_voter_search
+
+        with app.app_context():
+            started = time.perf_counter()
+            seed_voters(options.voters)
+            print(f'Seeded {options.voters} voters in {time.perf_counter() - started:.1f}s')
+
+            searches = {}
+            mismatches = []
+            for label, args in SEARCHES:
+                indexed_query = apply_voter_search(Voter.query, args)
+                legacy_query = legacy_search(Voter.query, args)
+
+                indexed_ids, indexed = measure(indexed_query, options.repeat)
+                legacy_ids, legacy = measure(legacy_query, options.repeat)
+                if not indexed_ids or not set(indexed_ids) <= set(legacy_ids):
+                    mismatches.append(label)
+
+                with db.engine.connect() as conn:
+                    indexed['plan'] = explain(conn, indexed_query.with_entities(Voter.id).statement)[0]
+                    legacy['plan'] = explain(conn, legacy_query.with_entities(Voter.id).statement)[0]
+
+                searches[label] = {
+                    'args': args,
+                    'indexed': indexed,
+                    'ilike': legacy,
+                    'speedup_all': round(legacy['all_ms'] / indexed['all_ms'], 1) if indexed['all_ms'] else None
+                }
+                print(f"  {label:24} indexed page {indexed['page_ms']:>7} all {indexed['all_ms']:>8} ms "
+                      f"({indexed['matches']})   ilike page {legacy['page_ms']:>7} all {legacy['all_ms']:>8} ms "
+                      f"({legacy['matches']})")
+            db.session.remove()
+
+        report = {
+            'environment': harness.environment(options.database_uri),
+            'voters': options.voters,
+            'full_text': app.extensions.get('voter_search'),
+            'searches': searches
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if options.output:
+        with open(options.output, 'w') as out:
+            json.dump(report, out, indent=2)
+
+    if mismatches:
+        raise SystemExit(f"Indexed search found nothing, or voters the ILIKE filter did not: {', '.join(mismatches)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -15,3 +15,151 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = os.environ.get('SQL_ECHO', 'False').lower() == 'true'
 
+    # Connection pool, per worker process. Recycle stays below MySQL's
+    # wait_timeout so idle nights don't leave dead connections behind, and
+    # pre-ping replaces any that died anyway. A request that waits longer
+    # than DB_POOL_TIMEOUT for a connection gets a 503 with Retry-After.
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 20))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 10))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 280))
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'True').lower() == 'true'
+    DB_CONNECT_TIMEOUT = int(os.environ.get('DB_CONNECT_TIMEOUT', 10))
+    DB_READ_TIMEOUT = int(os.environ.get('DB_READ_TIMEOUT', 30))
+
+    # SQLite (the voting.db fallback): WAL lets readers run during a write,
+    # busy_timeout makes writers wait for the lock instead of failing
+    SQLITE_WAL = os.environ.get('SQLITE_WAL', 'True').lower() == 'true'
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+
+    # Read replicas (comma-separated URIs). Endpoints marked @read_replica
+    # read from them; a voter who just voted reads from the primary for
+    # REPLICA_STICKY_SECONDS (a claim in the token the vote response returns).
+    SQLALCHEMY_REPLICA_URIS = [
+        uri.strip() for uri in os.environ.get('SQLALCHEMY_REPLICA_URIS', '').split(',') if uri.strip()
+    ]
+    # Bind keys must start with extensions.REPLICA_BIND_PREFIX
+    SQLALCHEMY_BINDS = {f'replica_{i}': uri for i, uri in enumerate(SQLALCHEMY_REPLICA_URIS)}
+    REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 10))
+
+    SQLALCHEMY_ENGINE_OPTIONS = {'pool_pre_ping': DB_POOL_PRE_PING}
+    if SQLALCHEMY_DATABASE_URI.startswith('mysql'):
+        SQLALCHEMY_ENGINE_OPTIONS['connect_args'] = {
+            'connect_timeout': DB_CONNECT_TIMEOUT,
+            'read_timeout': DB_READ_TIMEOUT,
+            'write_timeout': DB_READ_TIMEOUT
+        }
+    if ':memory:' not in SQLALCHEMY_DATABASE_URI and SQLALCHEMY_DATABASE_URI != 'sqlite://':
+        # In-memory SQLite gets a single shared connection (StaticPool) instead
+        SQLALCHEMY_ENGINE_OPTIONS.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE
+        )
+
+    # Threads serving requests in each worker process: asgi.py sets it to its
+    # thread pool size, gunicorn.conf.py to its gthread --threads
+    REQUEST_THREADS = int(os.environ.get('REQUEST_THREADS', 1))
+
+    # Write-behind vote buffer (group commit). Off by default, and only
+    # started when REQUEST_THREADS > 1 (nothing to group otherwise).
+    VOTE_WRITE_BEHIND = os.environ.get('VOTE_WRITE_BEHIND', 'False').lower() == 'true'
+    VOTE_BUFFER_MAX_BATCH = int(os.environ.get('VOTE_BUFFER_MAX_BATCH', 500))
+    VOTE_BUFFER_MAX_LATENCY_MS = float(os.environ.get('VOTE_BUFFER_MAX_LATENCY_MS', 20))
+    VOTE_JOURNAL_DIR = os.environ.get('VOTE_JOURNAL_DIR') or \
+        os.path.join(os.path.abspath(os.path.dirname(__file__)), 'journal')
+    VOTE_JOURNAL_FSYNC = os.environ.get('VOTE_JOURNAL_FSYNC', 'True').lower() == 'true'
+
+    # Election status engine (UPCOMING → ACTIVE → CLOSED)
+    ELECTION_STATUS_SCHEDULER = os.environ.get('ELECTION_STATUS_SCHEDULER', 'True').lower() == 'true'
+    ELECTION_STATUS_MAX_SLEEP = int(os.environ.get('ELECTION_STATUS_MAX_SLEEP', 60))
+
+    # Cached PDF reports (content-addressed) and whether to render them at close
+    REPORT_CACHE_DIR = os.environ.get('REPORT_CACHE_DIR') or \
+        os.path.join(os.path.abspath(os.path.dirname(__file__)), 'cache', 'reports')
+    REPORT_PRERENDER = os.environ.get('REPORT_PRERENDER', 'True').lower() == 'true'
+
+    # Asynchronous report jobs (local process pool, no broker)
+    REPORT_WORKERS = int(os.environ.get('REPORT_WORKERS', 2))
+    REPORT_JOB_DIR = os.environ.get('REPORT_JOB_DIR') or \
+        os.path.join(os.path.abspath(os.path.dirname(__file__)), 'cache', 'jobs')
+    # Finished jobs (rows and files in REPORT_JOB_DIR) are deleted after this
+    REPORT_JOB_RETENTION_HOURS = int(os.environ.get('REPORT_JOB_RETENTION_HOURS', 24))
+    # Jobs still RUNNING after this many seconds are failed (owners on other
+    # hosts can't be checked by pid)
+    REPORT_JOB_TIMEOUT = int(os.environ.get('REPORT_JOB_TIMEOUT', 3600))
+    # Seconds a GET .../export/pdf waits for an uncached render in the pool
+    # before answering 202 with the job to poll instead
+    REPORT_EXPORT_WAIT = float(os.environ.get('REPORT_EXPORT_WAIT', 10))
+
+    # Unreferenced symbol files are only swept (`flask symbols-sweep`) once
+    # no upload has stored them for this long
+    SYMBOL_RETENTION_HOURS = int(os.environ.get('SYMBOL_RETENTION_HOURS', 24))
+
+    # Seconds a list endpoint's include_total=true count is reused
+    PAGINATION_COUNT_TTL = int(os.environ.get('PAGINATION_COUNT_TTL', 30))
+
+    # Per-worker voter identity cache (profile lookups by JWT identity). A
+    # profile update is only invalidated in the worker that handled it, so
+    # other workers may serve the old profile for up to the TTL.
+    IDENTITY_CACHE_SIZE = int(os.environ.get('IDENTITY_CACHE_SIZE', 10000))
+    IDENTITY_CACHE_TTL = int(os.environ.get('IDENTITY_CACHE_TTL', 15))
+
+    # Voter password hashing: any werkzeug method string; older hashes are
+    # upgraded on login. Verification runs in a bounded thread pool per
+    # worker process; by default the CPUs are split across the
+    # WEB_CONCURRENCY gunicorn workers, so the host as a whole runs at most
+    # about one hash per CPU.
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt')
+    PASSWORD_HASH_WORKERS = int(os.environ.get(
+        'PASSWORD_HASH_WORKERS',
+        max(1, (os.cpu_count() or 2) // int(os.environ.get('WEB_CONCURRENCY', 1)))
+    ))
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 64))
+
+    # Bulk voter import: rows per INSERT batch and password-hashing processes
+    VOTER_IMPORT_CHUNK = int(os.environ.get('VOTER_IMPORT_CHUNK', 1000))
+    VOTER_IMPORT_WORKERS = int(os.environ.get('VOTER_IMPORT_WORKERS', os.cpu_count() or 2))
+
+    # Live tally streaming (SSE / long-poll). Workers signal new votes to
+    # each other through files in LIVE_TALLY_DIR.
+    LIVE_TALLY_TICK_MS = int(os.environ.get('LIVE_TALLY_TICK_MS', 250))
+    LIVE_TALLY_MAX_INTERVAL = float(os.environ.get('LIVE_TALLY_MAX_INTERVAL', 5))
+    LIVE_TALLY_DIR = os.environ.get('LIVE_TALLY_DIR') or \
+        os.path.join(os.path.abspath(os.path.dirname(__file__)), 'cache', 'live')
+    LIVE_TALLY_KEEPALIVE = int(os.environ.get('LIVE_TALLY_KEEPALIVE', 15))
+    LIVE_TALLY_STREAM_SECONDS = int(os.environ.get('LIVE_TALLY_STREAM_SECONDS', 300))
+    # Longest a stream or long-poll may hold a Flask request thread; kept
+    # below the gunicorn worker timeout (gunicorn.conf.py). Only asgi.py's
+    # native handlers run streams for the full LIVE_TALLY_STREAM_SECONDS.
+    LIVE_TALLY_WSGI_HOLD_SECONDS = int(os.environ.get('LIVE_TALLY_WSGI_HOLD_SECONDS', 20))
+
+    # ASGI entry point (asgi.py): async DB pool for the read-only fast paths
+    # and threads running the wrapped Flask app for everything else
+    ASYNC_DB_POOL_SIZE = int(os.environ.get('ASYNC_DB_POOL_SIZE', 10))
+    ASYNC_DB_MAX_OVERFLOW = int(os.environ.get('ASYNC_DB_MAX_OVERFLOW', 20))
+    ASYNC_DB_POOL_RECYCLE = int(os.environ.get('ASYNC_DB_POOL_RECYCLE', 280))
+    ASGI_WSGI_THREADS = int(os.environ.get('ASGI_WSGI_THREADS', 10))
+
+    # Instrumentation (services/metrics.py): GET /metrics, bearer token
+    # optional; logs are written by a background thread off LOG_QUEUE_SIZE
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+    LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+
+    # Slow-request profiler (services/profiler.py). Off unless enabled or a
+    # token is set; profiles land in PROFILER_DIR (newest PROFILER_MAX_FILES)
+    PROFILER_ENABLED = os.environ.get('PROFILER_ENABLED', 'False').lower() == 'true'
+    PROFILER_TOKEN = os.environ.get('PROFILER_TOKEN')
+    PROFILER_THRESHOLD_MS = float(os.environ.get('PROFILER_THRESHOLD_MS', 500))
+    PROFILER_SAMPLE_RATE = float(os.environ.get('PROFILER_SAMPLE_RATE', 1.0))
+    PROFILER_INTERVAL_MS = float(os.environ.get('PROFILER_INTERVAL_MS', 5))
+    PROFILER_MAX_FILES = int(os.environ.get('PROFILER_MAX_FILES', 200))
+    PROFILER_DIR = os.environ.get('PROFILER_DIR') or \
+        os.path.join(os.path.abspath(os.path.dirname(__file__)), 'cache', 'profiles')
+
+    # Cross-election demographics (services/analytics.py), cached per worker
+    ANALYTICS_MAX_ELECTIONS = int(os.environ.get('ANALYTICS_MAX_ELECTIONS', 50))
+    ANALYTICS_CACHE_SIZE = int(os.environ.get('ANALYTICS_CACHE_SIZE', 64))
+    ANALYTICS_CACHE_TTL = int(os.environ.get('ANALYTICS_CACHE_TTL', 300))
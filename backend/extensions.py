@@ -1,5 +1,52 @@
 # extensions.py  (create this file in the backend root)
+import random
+
+from flask import g, has_request_context
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+
+# SQLALCHEMY_BINDS keys of the read replicas (see services/replicas.py)
+REPLICA_BIND_PREFIX = 'replica_'
+
+
+class RoutingSession(Session):
+    """
+    Sends SELECTs of requests marked with @read_replica to a replica bind;
+    everything else uses the primary. Once this session has written (or
+    routed anything but a SELECT), the rest of it stays on the primary so
+    a request always reads its own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._replica_allowed(clause):
+            replica = self.info.get('replica')
+            if replica is None:
+                # One replica per session: reads within a request are consistent
+                keys = [k for k in self._db.engines if k and k.startswith(REPLICA_BIND_PREFIX)]
+                replica = self.info['replica'] = random.choice(keys) if keys else False
+            if replica:
+                return self._db.engines[replica]
+
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _replica_allowed(self, clause):
+        if self.info.get('primary'):
+            return False
+        if self._flushing or clause is None or not getattr(clause, 'is_select', False):
+            self.info['primary'] = True
+            return False
+        return has_request_context() and g.get('db_read_replica', False)
+
+    def use_primary(self):
+        """
+        Route the rest of this session to the primary, e.g. before reading
+        something that will be written back. Objects already loaded from a
+        replica are expired so they reload from the primary.
+        """
+        if self.info.get('replica') and not self.info.get('primary'):
+            self.expire_all()
+        self.info['primary'] = True
+
 
 # Create ONE global SQLAlchemy instance
-db = SQLAlchemy()
\ No newline at end of file
+db = SQLAlchemy(session_options={'class_': RoutingSession})
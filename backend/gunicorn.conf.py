@@ -0,0 +1,23 @@
+# gunicorn.conf.py
+# Settings for `gunicorn app:app` (ProcFile). gunicorn reads this file from
+# the working directory on its own; pass -c gunicorn.conf.py elsewhere.
+#
+# Threaded (gthread) workers: an open SSE stream or a waiting long-poll
+# holds one request thread, not the whole worker, and the worker keeps
+# heartbeating the arbiter while it waits. Flask caps both at
+# LIVE_TALLY_WSGI_HOLD_SECONDS, below `timeout`, in case the app is ever
+# run on sync workers again. For many long-lived streams use asgi.py,
+# where they cost a coroutine.
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+worker_class = 'gthread'
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = timeout
+
+# Seen by config.py when the workers import the app (vote buffer,
+# per-thread pools)
+os.environ.setdefault('REQUEST_THREADS', str(threads))
@@ -0,0 +1,69 @@
+# migrations/__init__.py
+# Minimal versioned schema migrations (replaces the bare db.create_all()).
+#
+# Each module in migrations/versions/ named mNNNN_<name>.py defines
+#     VERSION = NNNN
+#     def upgrade(conn): ...
+# and runs once, in order, inside its own transaction. Applied versions are
+# recorded in the schema_version table. Migrations must be idempotent
+# (checkfirst / IF NOT EXISTS) because databases created by the old
+# create_all() already contain some of their objects.
+
+import importlib
+import os
+import pkgutil
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, select
+
+from migrations import versions
+
+_meta = MetaData()
+
+schema_version = Table(
+    'schema_version', _meta,
+    Column('version', Integer, primary_key=True, autoincrement=False),
+    Column('name', String(100), nullable=False),
+    Column('applied_at', DateTime, nullable=False),
+)
+
+
+def _load():
+    modules = []
+    for info in pkgutil.iter_modules([os.path.dirname(versions.__file__)]):
+        if info.name.startswith('m'):
+            modules.append(importlib.import_module(f'migrations.versions.{info.name}'))
+    return sorted(modules, key=lambda m: m.VERSION)
+
+
+def applied_versions(conn):
+    return {row.version for row in conn.execute(select(schema_version.c.version))}
+
+
+def run_migrations(engine, logger=None):
+    """Apply every pending migration. Safe to call on every startup."""
+    _meta.create_all(engine, checkfirst=True)
+
+    for module in _load():
+        with engine.connect() as conn:
+            if module.VERSION in applied_versions(conn):
+                continue
+
+        name = module.__name__.rsplit('.', 1)[-1]
+        try:
+            with engine.begin() as conn:
+                module.upgrade(conn)
+                conn.execute(schema_version.insert().values(
+                    version=module.VERSION,
+                    name=name,
+                    applied_at=datetime.utcnow()
+                ))
+        except Exception:
+            # Another worker starting at the same time may have applied it
+            with engine.connect() as conn:
+                if module.VERSION in applied_versions(conn):
+                    continue
+            raise
+
+        if logger:
+            logger.info(f"Applied migration {name}")
@@ -0,0 +1,14 @@
+# Tables as created by the original db.create_all().
+from extensions import db
+
+VERSION = 1
+
+TABLES = ['admin', 'voter', 'elections', 'candidate', 'vote', 'result_snapshot', 'report_job']
+
+
+def upgrade(conn):
+    db.metadata.create_all(
+        conn,
+        tables=[db.metadata.tables[name] for name in TABLES],
+        checkfirst=True
+    )
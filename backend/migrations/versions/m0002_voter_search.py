@@ -0,0 +1,68 @@
+# Normalized search columns on voter + full-text index on student_name.
+from sqlalchemy import inspect, text
+
+from models.voter import Voter, normalize
+
+VERSION = 2
+
+NORMALIZED = ('student_name_norm', 'major_norm', 'course_norm')
+
+SQLITE_FTS = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS voter_fts USING fts5("
+    "student_name, content='voter', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS voter_fts_ai AFTER INSERT ON voter BEGIN "
+    "INSERT INTO voter_fts(rowid, student_name) VALUES (new.id, new.student_name); END",
+    "CREATE TRIGGER IF NOT EXISTS voter_fts_ad AFTER DELETE ON voter BEGIN "
+    "INSERT INTO voter_fts(voter_fts, rowid, student_name) "
+    "VALUES ('delete', old.id, old.student_name); END",
+    "CREATE TRIGGER IF NOT EXISTS voter_fts_au AFTER UPDATE OF student_name ON voter BEGIN "
+    "INSERT INTO voter_fts(voter_fts, rowid, student_name) "
+    "VALUES ('delete', old.id, old.student_name); "
+    "INSERT INTO voter_fts(rowid, student_name) VALUES (new.id, new.student_name); END",
+    "INSERT INTO voter_fts(voter_fts) VALUES ('rebuild')",
+]
+
+MYSQL_FULLTEXT = "ALTER TABLE voter ADD FULLTEXT INDEX ft_voter_student_name (student_name)"
+
+
+def upgrade(conn):
+    inspector = inspect(conn)
+    existing = {c['name'] for c in inspector.get_columns('voter')}
+
+    for name in NORMALIZED:
+        if name not in existing:
+            length = Voter.__table__.c[name].type.length
+            conn.execute(text(f'ALTER TABLE voter ADD COLUMN {name} VARCHAR({length})'))
+
+    for index in Voter.__table__.indexes:
+        index.create(conn, checkfirst=True)
+
+    # Backfill with the same normalize() the model uses
+    rows = conn.execute(text(
+        'SELECT id, student_name, major, course FROM voter WHERE student_name_norm IS NULL'
+    )).all()
+    if rows:
+        conn.execute(
+            text('UPDATE voter SET student_name_norm = :n, major_norm = :m, course_norm = :c '
+                 'WHERE id = :id'),
+            [
+                {'id': r.id, 'n': normalize(r.student_name),
+                 'm': normalize(r.major), 'c': normalize(r.course)}
+                for r in rows
+            ]
+        )
+
+    dialect = conn.dialect.name
+    if dialect == 'sqlite':
+        # Not every SQLite build has FTS5; search then falls back to the prefix index
+        available = conn.execute(text(
+            "SELECT 1 FROM pragma_compile_options WHERE compile_options = 'ENABLE_FTS5'"
+        )).first()
+        if available:
+            for statement in SQLITE_FTS:
+                conn.execute(text(statement))
+
+    elif dialect == 'mysql':
+        names = {i['name'] for i in inspector.get_indexes('voter')}
+        if 'ft_voter_student_name' not in names:
+            conn.execute(text(MYSQL_FULLTEXT))
@@ -0,0 +1,13 @@
+# Indexes for the hot query shapes: candidates/votes by election and the
+# status engine's scans over open elections.
+from models.candidate import Candidate
+from models.election import Election
+from models.vote import Vote
+
+VERSION = 3
+
+
+def upgrade(conn):
+    for table in (Candidate.__table__, Vote.__table__, Election.__table__):
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
@@ -0,0 +1,45 @@
+# Move symbols uploaded under their original filename to content-addressed
+# names with thumb/medium variants. The old files are left in place for
+# URLs already baked into snapshots and cached reports.
+import os
+
+from flask import current_app
+from sqlalchemy import text
+
+from services.symbols import HASHED_NAME, InvalidSymbol, store_symbol
+
+VERSION = 4
+
+
+def _legacy_file(uploads, symbol):
+    # Same shapes Candidate.get_symbol_url accepts
+    if symbol.startswith('/uploads/'):
+        symbol = symbol[len('/uploads/'):]
+    elif not symbol.startswith('symbols/'):
+        symbol = f'symbols/{symbol}'
+    return os.path.join(uploads, symbol)
+
+
+def upgrade(conn):
+    uploads = current_app.config['UPLOAD_FOLDER']
+    symbols = [row.symbol for row in conn.execute(text('SELECT DISTINCT symbol FROM candidate'))]
+
+    for symbol in symbols:
+        if not symbol or HASHED_NAME.match(symbol.rpartition('/')[2]):
+            continue
+
+        path = _legacy_file(uploads, symbol)
+        if not os.path.isfile(path) or '.' not in os.path.basename(path):
+            continue
+
+        try:
+            with open(path, 'rb') as f:
+                stored, _ = store_symbol(f, os.path.basename(path))
+        except (InvalidSymbol, ValueError):
+            # Unreadable or oversized legacy file: keep serving it as-is
+            continue
+
+        conn.execute(
+            text('UPDATE candidate SET symbol = :new WHERE symbol = :old'),
+            {'new': stored, 'old': symbol}
+        )
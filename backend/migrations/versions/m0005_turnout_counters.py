@@ -0,0 +1,12 @@
+# Turnout counter tables (services/turnout.py), backfilled from voter/vote.
+from models.election_turnout import ElectionTurnout
+from models.voter_segment import VoterSegment
+from services.turnout import rebuild_turnout
+
+VERSION = 5
+
+
+def upgrade(conn):
+    for table in (VoterSegment.__table__, ElectionTurnout.__table__):
+        table.create(conn, checkfirst=True)
+    rebuild_turnout(conn, include_closed=True)
@@ -0,0 +1,25 @@
+# Voting method / seats on elections and the ranked_ballot table.
+from sqlalchemy import inspect, text
+
+from models.election import Election
+from models.ranked_ballot import RankedBallot
+
+VERSION = 6
+
+
+def upgrade(conn):
+    existing = {c['name'] for c in inspect(conn).get_columns('elections')}
+
+    if 'voting_method' not in existing:
+        column = Election.__table__.c.voting_method
+        # Native enum type on PostgreSQL; a no-op elsewhere
+        column.type.create(conn, checkfirst=True)
+        conn.execute(text(
+            f"ALTER TABLE elections ADD COLUMN voting_method "
+            f"{column.type.compile(dialect=conn.dialect)} NOT NULL DEFAULT 'PLURALITY'"
+        ))
+
+    if 'seats' not in existing:
+        conn.execute(text('ALTER TABLE elections ADD COLUMN seats INTEGER NOT NULL DEFAULT 1'))
+
+    RankedBallot.__table__.create(conn, checkfirst=True)
@@ -0,0 +1,12 @@
+# Record which host runs a report job, so liveness checks by pid are only
+# made on that host.
+from sqlalchemy import inspect, text
+
+VERSION = 7
+
+
+def upgrade(conn):
+    existing = {c['name'] for c in inspect(conn).get_columns('report_job')}
+
+    if 'owner_host' not in existing:
+        conn.execute(text('ALTER TABLE report_job ADD COLUMN owner_host VARCHAR(255)'))
@@ -0,0 +1,8 @@
+# Leases that let a single worker run a job shared by all of them.
+from models.worker_lease import WorkerLease
+
+VERSION = 8
+
+
+def upgrade(conn):
+    WorkerLease.__table__.create(conn, checkfirst=True)
@@ -1,10 +1,11 @@
 from extensions import db
+from services.symbols import symbol_variant
 
 class Candidate(db.Model):
     __tablename__ = 'candidate'
 
     id = db.Column(db.Integer, primary_key=True)
-    election_id = db.Column(db.Integer, db.ForeignKey('elections.id'), nullable=False)
+    election_id = db.Column(db.Integer, db.ForeignKey('elections.id'), nullable=False, index=True)
     name = db.Column(db.String(100), nullable=False)
     roll_no = db.Column(db.String(50), nullable=False, unique=True)
     major = db.Column(db.String(50), nullable=False)
@@ -32,23 +33,27 @@ class Candidate(db.Model):
             'symbol_url': self.get_symbol_url()
         }
 
-    def get_symbol_url(self):
+    def get_symbol_url(self, variant='thumb'):
         """
         Returns full public URL for the symbol.
         Assumes files are served from /uploads/symbols/
-        and database stores path like 'symbols/filename.jpg'
+        and database stores path like 'symbols/filename.jpg'.
+        Content-addressed symbols resolve to their resized `variant`
+        ('thumb' or 'medium'); variant=None gives the original.
         """
         if not self.symbol:
             return None
+
+        symbol = symbol_variant(self.symbol, variant) if variant else self.symbol
         
         # If it already starts with /uploads/ → use as is
-        if self.symbol.startswith('/uploads/'):
-            return self.symbol
+        if symbol.startswith('/uploads/'):
+            return symbol
             
         # If it starts with symbols/ → convert to full URL
-        if self.symbol.startswith('symbols/'):
-            filename = self.symbol.replace('symbols/', '', 1)
+        if symbol.startswith('symbols/'):
+            filename = symbol.replace('symbols/', '', 1)
             return f"/uploads/symbols/{filename}"
         
         # Fallback: assume it's just filename
-        return f"/uploads/symbols/{self.symbol}"
\ No newline at end of file
+        return f"/uploads/symbols/{symbol}"
\ No newline at end of file
@@ -2,6 +2,10 @@
 from extensions import db
 from datetime import datetime
 
+VOTING_METHODS = ('PLURALITY', 'IRV', 'STV')
+# Counted from ranked ballots (services/ranked.py)
+RANKED_METHODS = ('IRV', 'STV')
+
 class Election(db.Model):
     __tablename__ = 'elections'
 
@@ -20,6 +24,29 @@ class Election(db.Model):
         nullable=False
     )
 
+    voting_method = db.Column(
+        db.Enum(*VOTING_METHODS, name='voting_method_enum'),
+        default='PLURALITY',
+        server_default='PLURALITY',
+        nullable=False
+    )
+    seats = db.Column(db.Integer, default=1, server_default='1', nullable=False)
+
+    __table_args__ = (
+        # Status engine: open elections ordered by end
+        db.Index('ix_elections_status_end', 'election_status', 'end_date', 'end_time'),
+        # Newest-first listings
+        db.Index('ix_elections_date', 'election_date', 'id'),
+    )
+
+    # Read-only: candidate writes still go through Candidate directly, and
+    # deleting an election keeps its existing (non-cascading) behaviour
+    candidates = db.relationship(
+        'Candidate',
+        viewonly=True,
+        order_by='Candidate.id',
+        lazy='select'
+    )
 
     def __repr__(self):
         return f"<Election {self.election_name} - {self.election_status}>"
@@ -35,4 +62,6 @@ class Election(db.Model):
             'result_date': self.result_date.isoformat() if self.result_date else None,
             'result_time': self.result_time.strftime('%H:%M') if self.result_time else None,
             'election_status': self.election_status,
+            'voting_method': self.voting_method,
+            'seats': self.seats,
         }
\ No newline at end of file
@@ -0,0 +1,20 @@
+# models/election_turnout.py
+from extensions import db
+
+
+class ElectionTurnout(db.Model):
+    """
+    Votes cast per election and voter segment (the voter's year, major and
+    course at the time of voting), bumped in the same transaction as the
+    vote itself (services/turnout.py).
+    """
+    __tablename__ = 'election_turnout'
+
+    election_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    year = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    major = db.Column(db.String(50), primary_key=True)
+    course = db.Column(db.String(50), primary_key=True)
+    votes = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<ElectionTurnout election={self.election_id} {self.year}/{self.major}/{self.course}: {self.votes}>'
@@ -0,0 +1,37 @@
+# models/ranked_ballot.py
+import numpy as np
+
+from extensions import db
+
+# Candidate ids, most preferred first, as little-endian uint32
+RANKING_DTYPE = np.dtype('<u4')
+
+
+def pack_ranking(candidate_ids):
+    return np.asarray(candidate_ids, dtype=RANKING_DTYPE).tobytes()
+
+
+def unpack_ranking(blob):
+    return np.frombuffer(blob, dtype=RANKING_DTYPE)
+
+
+class RankedBallot(db.Model):
+    """
+    The full preference order of a ballot in an IRV/STV election. The
+    voter's first choice is also recorded as an ordinary Vote in the same
+    transaction, so duplicate checks, vote status, live tallies and turnout
+    work unchanged; this row only adds the lower preferences, packed into
+    4 bytes per candidate instead of a row per preference.
+    """
+    __tablename__ = 'ranked_ballot'
+
+    # Election first: counting reads one election's ballots as a range
+    election_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    voter_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    ranking = db.Column(db.LargeBinary, nullable=False)
+
+    def candidate_ids(self):
+        return unpack_ranking(self.ranking).tolist()
+
+    def __repr__(self):
+        return f'<RankedBallot election={self.election_id} voter={self.voter_id}: {self.candidate_ids()}>'
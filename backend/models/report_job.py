@@ -0,0 +1,47 @@
+# models/report_job.py
+from datetime import datetime
+from extensions import db
+
+
+class ReportJob(db.Model):
+    """
+    Asynchronous PDF export. Rows are shared by all workers so any of them
+    can answer status polls and downloads.
+    """
+    __tablename__ = 'report_job'
+
+    id = db.Column(db.String(32), primary_key=True)            # uuid4 hex
+    kind = db.Column(
+        db.Enum('RESULTS', 'WINNER', 'ALL_CLOSED', name='report_job_kind_enum'),
+        nullable=False
+    )
+    election_id = db.Column(db.Integer, nullable=True)
+    candidate_id = db.Column(db.Integer, nullable=True)
+    status = db.Column(
+        db.Enum('PENDING', 'RUNNING', 'DONE', 'FAILED', name='report_job_status_enum'),
+        default='PENDING',
+        nullable=False
+    )
+    owner_host = db.Column(db.String(255), nullable=True)      # host and pid of the
+    owner_pid = db.Column(db.Integer, nullable=True)            # worker running it
+    file_path = db.Column(db.String(500), nullable=True)
+    download_name = db.Column(db.String(255), nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<ReportJob {self.id} {self.kind} {self.status}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'election_id': self.election_id,
+            'candidate_id': self.candidate_id,
+            'status': self.status,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'download_url': f'/api/reports/jobs/{self.id}/download' if self.status == 'DONE' else None
+        }
@@ -0,0 +1,24 @@
+# models/result_snapshot.py
+import json
+from datetime import datetime
+from extensions import db
+
+
+class ResultSnapshot(db.Model):
+    """
+    Frozen tallies of a CLOSED election, computed once and served as-is
+    by the results endpoints and PDF exports.
+    """
+    __tablename__ = 'result_snapshot'
+
+    election_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    payload = db.Column(db.Text, nullable=False)        # JSON: candidates + totals
+    total_votes = db.Column(db.Integer, nullable=False, default=0)
+    etag = db.Column(db.String(64), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ResultSnapshot election={self.election_id}>'
+
+    def data(self):
+        return json.loads(self.payload)
@@ -10,4 +10,6 @@ class Vote(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint('voter_id', 'election_id', name='unique_voter_election'),
+        # Per-election tallies and turnout
+        db.Index('ix_vote_election_candidate', 'election_id', 'candidate_id'),
     )
\ No newline at end of file
@@ -1,6 +1,15 @@
 # models/voter.py
 from extensions import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy.orm import validates
+from werkzeug.security import check_password_hash
+
+from services.passwords import hash_password
+
+
+def normalize(value):
+    """Search form of a text field: trimmed and lowercased."""
+    return value.strip().lower() if isinstance(value, str) else value
+
 
 class Voter(db.Model):
     __tablename__ = 'voter'
@@ -14,6 +23,11 @@ class Voter(db.Model):
     email = db.Column(db.String(100), unique=True, nullable=False)
     password = db.Column(db.String(255), nullable=False)
 
+    # Lowercased copies for indexed prefix/exact search (kept in sync below)
+    student_name_norm = db.Column(db.String(100), index=True)
+    major_norm = db.Column(db.String(50), index=True)
+    course_norm = db.Column(db.String(50), index=True)
+
     def __init__(self, student_name, roll_no, major, course, year, email, password):
         self.student_name = student_name
         self.roll_no = roll_no
@@ -21,7 +35,12 @@ class Voter(db.Model):
         self.course = course
         self.year = year
         self.email = email
-        self.password = generate_password_hash(password)
+        self.password = hash_password(password)
+
+    @validates('student_name', 'major', 'course')
+    def _sync_normalized(self, key, value):
+        setattr(self, f'{key}_norm', normalize(value))
+        return value
 
     def check_password(self, password):
         return check_password_hash(self.password, password)
\ No newline at end of file
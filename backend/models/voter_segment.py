@@ -0,0 +1,19 @@
+# models/voter_segment.py
+from extensions import db
+
+
+class VoterSegment(db.Model):
+    """
+    Registered voters per (year, major, course), kept up to date on every
+    registration, import and profile change (services/turnout.py). Major
+    and course are the normalized (lowercased) forms.
+    """
+    __tablename__ = 'voter_segment'
+
+    year = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    major = db.Column(db.String(50), primary_key=True)
+    course = db.Column(db.String(50), primary_key=True)
+    registered = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<VoterSegment {self.year}/{self.major}/{self.course}: {self.registered}>'
@@ -0,0 +1,18 @@
+# models/worker_lease.py
+from extensions import db
+
+
+class WorkerLease(db.Model):
+    """
+    A named job that only one worker process (on any host) may run at a
+    time, e.g. the election status scheduler. The holder renews it before
+    expires_at; after that any worker may take it over (services/workers.py).
+    """
+    __tablename__ = 'worker_lease'
+
+    name = db.Column(db.String(50), primary_key=True)
+    holder = db.Column(db.String(255), nullable=False)      # host:pid
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f'<WorkerLease {self.name} held by {self.holder} until {self.expires_at}>'
@@ -1,23 +1,23 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app, send_file
 
 # Import shared db and Admin model
 from extensions import db
 from models.admin import Admin
+from services.voter_import import detect_format, import_voters
+from services.analytics import AnalyticsError, demographics, parse_request
+from services.profiler import profiles_authorized
+from services.replicas import read_replica
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/api/admin')
 
 @admin_bp.route('/login', methods=['POST'])
 def admin_login():
     data = request.get_json()
-    
-    # Debug print
-    print("[ADMIN LOGIN ATTEMPT]", data)
 
     email = data.get('email')
     password = data.get('password')
 
     if not email or not password:
-        print("[ADMIN] Missing email or password")
         return jsonify({"message": "Email and password are required"}), 400
 
     # Normalize email
@@ -26,16 +26,12 @@ def admin_login():
     admin = Admin.query.filter_by(email=email).first()
 
     if not admin:
-        print(f"[ADMIN] No user found for email: {email}")
+        current_app.logger.warning(f"Admin login failed, unknown email: {email}")
         return jsonify({"message": "Invalid email or password"}), 401
 
-    # Debug prints for comparison
-    print(f"[ADMIN] Stored password : {admin.password}")
-    print(f"[ADMIN] Entered password : {password}")
-
     # Plain text comparison (as requested)
     if admin.password == password:
-        print("[ADMIN] Login SUCCESS")
+        current_app.logger.info(f"Admin login: {email}")
         return jsonify({
             "success": True,
             "message": "Admin login successful",
@@ -48,7 +44,7 @@ def admin_login():
             }
         }), 200
     else:
-        print("[ADMIN] Password mismatch")
+        current_app.logger.warning(f"Admin login failed, wrong password: {email}")
         return jsonify({"message": "Invalid email or password"}), 401
 @admin_bp.route('/logout', methods=['POST'])
 def admin_logout():
@@ -57,4 +53,70 @@ def admin_logout():
     return jsonify({
         "success": True,
         "message": "Logged out successfully"
-    }), 200
\ No newline at end of file
+    }), 200
+
+
+# ── Bulk voter import (registrar CSV / JSONL) ──
+# multipart/form-data with a `file` field; ?format=csv|jsonl overrides the extension
+@admin_bp.route('/voters/import', methods=['POST'])
+def import_voters_file():
+    file = request.files.get('file')
+    if not file or file.filename == '':
+        return jsonify({"message": "A CSV or JSONL file is required"}), 400
+
+    fmt = detect_format(file.filename, request.args.get('format'))
+    if not fmt:
+        return jsonify({"message": "Unsupported file type. Use CSV or JSONL"}), 400
+
+    try:
+        report = import_voters(file.stream, fmt)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Voter import failed: {str(e)}", exc_info=True)
+        return jsonify({"message": "Voter import failed", "error": str(e)}), 500
+
+    return jsonify(report.to_dict()), 200
+
+
+# ── Database pool health (this worker's pool) ──
+@admin_bp.route('/db/pool', methods=['GET'])
+def db_pool_status():
+    return jsonify(current_app.extensions['db_pool_metrics'].snapshot()), 200
+
+
+# ── Request profiles (services/profiler.py), shared by all workers ──
+# Bearer PROFILER_TOKEN required, as /metrics requires METRICS_TOKEN
+@admin_bp.route('/profiles', methods=['GET'])
+def list_profiles():
+    if not profiles_authorized():
+        return jsonify({"message": "Unauthorized"}), 401
+    return jsonify({"profiles": current_app.extensions['profile_store'].list()}), 200
+
+
+@admin_bp.route('/profiles/<name>', methods=['GET'])
+def download_profile(name):
+    if not profiles_authorized():
+        return jsonify({"message": "Unauthorized"}), 401
+    path = current_app.extensions['profile_store'].path(name)
+    if not path:
+        return jsonify({"message": "Profile not found"}), 404
+    return send_file(path, mimetype='text/plain', as_attachment=True, download_name=name)
+
+
+# ── Cross-election demographics (services/analytics.py) ──
+# GET /api/admin/analytics/demographics?election_ids=1,2,3&by=year,major
+@admin_bp.route('/analytics/demographics', methods=['GET'])
+@read_replica
+def demographics_analytics():
+    try:
+        election_ids, dimensions = parse_request(request.args.get('election_ids'), request.args.get('by'))
+        payload, hit = demographics(election_ids, dimensions)
+    except AnalyticsError as e:
+        return jsonify({"message": str(e)}), 400
+    except Exception as e:
+        current_app.logger.error(f"Demographics analytics failed: {str(e)}", exc_info=True)
+        return jsonify({"message": "Analytics failed", "error": str(e)}), 500
+
+    response = jsonify(payload)
+    response.headers['X-Cache'] = 'HIT' if hit else 'MISS'
+    return response, 200
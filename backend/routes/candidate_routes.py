@@ -1,19 +1,21 @@
 from flask import Blueprint, request, jsonify, current_app
-from werkzeug.utils import secure_filename
 import os
 from extensions import db
 from models.candidate import Candidate
 from models.election import Election
+from services.results import invalidate_snapshot
+from services.pagination import (
+    PaginationError, load_fields, paginate, project, requested_fields
+)
+from services.symbols import (
+    MAX_FILE_SIZE, InvalidSymbol, SymbolTooLarge, allowed_file, store_symbol
+)
+from services.candidate_import import CandidateImportError, import_candidates
+from services.election_queries import upcoming_elections
+from services.replicas import read_replica
 
 candidate_bp = Blueprint('candidates', __name__, url_prefix='/api')
 
-ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
-MAX_FILE_SIZE = 2 * 1024 * 1024  # 2MB
-
-
-def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
-
 
 # GET /api/elections/upcoming
 @candidate_bp.route('/elections/upcoming', methods=['GET'])
@@ -22,7 +24,7 @@ def get_upcoming_elections():
     Returns list of upcoming elections (useful for dropdown when adding candidates)
     """
     try:
-        elections = Election.query.filter_by(election_status='UPCOMING').all()
+        elections = upcoming_elections().all()
         return jsonify([
             {
                 'id': election.id,
@@ -35,20 +37,45 @@ def get_upcoming_elections():
         return jsonify({'error': 'Failed to load upcoming elections'}), 500
 
 
-# GET /api/candidates?election_id=<id>
+# Fields the candidate list can return (field → columns it needs)
+CANDIDATE_LIST_FIELDS = {
+    'id': ('id',),
+    'election_id': ('election_id',),
+    'name': ('name',),
+    'roll_no': ('roll_no',),
+    'major': ('major',),
+    'course': ('course',),
+    'year': ('year',),
+    'symbol': ('symbol',),
+    'email': ('email',),
+    'symbol_url': ('symbol',),
+}
+
+
+# GET /api/candidates?election_id=<id>  (+ ?limit=&cursor=&fields=&include_total=true)
 @candidate_bp.route('/candidates', methods=['GET'])
+@read_replica
 def get_candidates():
     """
     Get all candidates or filter by election_id
     """
     election_id = request.args.get('election_id', type=int)
     try:
+        query = Candidate.query
         if election_id:
-            candidates = Candidate.query.filter_by(election_id=election_id).all()
-        else:
-            candidates = Candidate.query.all()
-        
-        return jsonify([c.to_dict() for c in candidates]), 200
+            query = query.filter_by(election_id=election_id)
+
+        fields = requested_fields(CANDIDATE_LIST_FIELDS)
+        body = paginate(
+            query,
+            [(Candidate.id, False)],
+            lambda c: project(c, fields, {'symbol_url': Candidate.get_symbol_url}),
+            options=[load_fields(Candidate, CANDIDATE_LIST_FIELDS, fields)]
+        )
+
+        return jsonify(body), 200
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"Error fetching candidates: {str(e)}", exc_info=True)
         return jsonify({'error': 'Failed to load candidates'}), 500
@@ -105,15 +132,12 @@ def add_candidate():
         if file_size > MAX_FILE_SIZE:
             return jsonify({'error': 'File too large. Max 2MB allowed'}), 400
 
-        filename = secure_filename(file.filename)
-        symbols_folder = os.path.join(current_app.config['UPLOAD_FOLDER'], 'symbols')
-        os.makedirs(symbols_folder, exist_ok=True)
-
-        save_path = os.path.join(symbols_folder, filename)
-        file.save(save_path)
-
-        # Store relative path (adjust prefix as needed)
-        symbol_path = f'symbols/{filename}'   # frontend will access /symbols/filename
+        # Stored under its content hash, with thumb/medium variants;
+        # relative path like 'symbols/<hash>.png'
+        try:
+            symbol_path, _ = store_symbol(file.stream, file.filename)
+        except InvalidSymbol:
+            return jsonify({'error': 'Symbol is not a valid image'}), 400
 
         # Create candidate
         candidate = Candidate(
@@ -128,6 +152,7 @@ def add_candidate():
         )
 
         db.session.add(candidate)
+        invalidate_snapshot(election_id)
         db.session.commit()
 
         return jsonify({
@@ -144,6 +169,40 @@ def add_candidate():
         return jsonify({'error': 'Internal server error'}), 500
 
 
+# POST /api/candidates/import
+@candidate_bp.route('/candidates/import', methods=['POST'])
+def import_candidates_zip():
+    """
+    Bulk add candidates from a ZIP: manifest.csv (name, email, roll_no, year,
+    course, major, symbol[, election_id]) plus the symbol images it names.
+    Expects multipart/form-data with `file` and optionally `election_id`
+    for rows that don't carry their own. All rows are added or none are.
+    """
+    file = request.files.get('file')
+    if not file or file.filename == '':
+        return jsonify({'error': 'ZIP file is required'}), 400
+
+    try:
+        candidates, errors = import_candidates(file.stream, request.form.get('election_id'))
+    except CandidateImportError as e:
+        return jsonify({'error': str(e)}), 400
+    except SymbolTooLarge:
+        return jsonify({'error': 'File too large. Max 2MB allowed'}), 400
+    except InvalidSymbol:
+        return jsonify({'error': 'Symbol is not a valid image'}), 400
+    except Exception as e:
+        current_app.logger.error(f"Error importing candidates: {str(e)}", exc_info=True)
+        return jsonify({'error': 'Internal server error'}), 500
+
+    if errors:
+        return jsonify({'error': 'No candidates were imported', 'errors': errors}), 400
+
+    return jsonify({
+        'message': f'{len(candidates)} candidates added successfully',
+        'candidates': [c.to_dict() for c in candidates]
+    }), 201
+
+
 # PUT /api/candidates/<id>
 @candidate_bp.route('/candidates/<int:id>', methods=['PUT'])
 def update_candidate(id):
@@ -173,6 +232,7 @@ def update_candidate(id):
 
         # If you later want to allow symbol update, you'd need to accept multipart/form-data here too
 
+        invalidate_snapshot(candidate.election_id)
         db.session.commit()
         return jsonify(candidate.to_dict()), 200
 
@@ -193,17 +253,11 @@ def delete_candidate(id):
     """
     candidate = Candidate.query.get_or_404(id)
     try:
-        # Optional: delete symbol file from disk
-        if candidate.symbol:
-            file_path = os.path.join(
-                current_app.config['UPLOAD_FOLDER'],
-                candidate.symbol.replace('symbols/', '')
-            )
-            if os.path.exists(file_path):
-                os.remove(file_path)
-
         db.session.delete(candidate)
+        invalidate_snapshot(candidate.election_id)
         db.session.commit()
+
+        # Symbol files are shared by content: unused ones go in sweep_symbols()
         return jsonify({'message': 'Candidate deleted successfully'}), 200
 
     except Exception as e:
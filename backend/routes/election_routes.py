@@ -1,12 +1,35 @@
 # backend/routes/election_routes.py
 from flask import Blueprint, request, jsonify, current_app
 from flask_login import login_required  # uncomment when auth is ready
-from models.election import Election
+from models.election import Election, VOTING_METHODS
 from extensions import db
+from services.election_status import election_schedule_changed
+from services.results import invalidate_snapshot
+from services.pagination import (
+    PaginationError, load_fields, paginate, project, requested_fields
+)
 from datetime import datetime
 
 election_bp = Blueprint('elections', __name__, url_prefix='/api/admin')
 
+
+def _voting_rules(data, method='PLURALITY', seats=1):
+    """(voting_method, seats, error message) from the payload over the current values."""
+    method = str(data.get('voting_method') or method).upper()
+    if method not in VOTING_METHODS:
+        return None, None, f'voting_method must be one of {", ".join(VOTING_METHODS)}'
+
+    if 'seats' not in data and method != 'STV':
+        seats = 1
+    try:
+        seats = int(data.get('seats', seats))
+    except (TypeError, ValueError):
+        return None, None, 'seats must be a whole number'
+    if seats < 1 or (method != 'STV' and seats != 1):
+        return None, None, 'seats must be 1, or more for STV elections'
+
+    return method, seats, None
+
 # POST /api/admin/elections - Create new election
 @election_bp.route('/elections', methods=['POST'])
 # @login_required
@@ -24,6 +47,10 @@ def create_election():
         if missing:
             return jsonify({'error': f'Missing required fields: {", ".join(missing)}'}), 400
 
+        voting_method, seats, error = _voting_rules(data)
+        if error:
+            return jsonify({'error': error}), 400
+
         # Parse dates and times
         election_date = datetime.strptime(data['election_date'], '%Y-%m-%d').date()
         election_time = datetime.strptime(data['election_time'], '%H:%M').time()
@@ -40,11 +67,14 @@ def create_election():
             end_time=end_time,
             result_date=result_date,
             result_time=result_time,
-            election_status='UPCOMING'  # default
+            election_status='UPCOMING',  # default
+            voting_method=voting_method,
+            seats=seats
         )
 
         db.session.add(new_election)
         db.session.commit()
+        election_schedule_changed()
 
         return jsonify(new_election.to_dict()), 201
 
@@ -58,13 +88,37 @@ def create_election():
         return jsonify({'error': 'Failed to create election'}), 500
 
 
-# GET /api/admin/elections - List all elections
+# Fields the election list can return (field → columns it needs)
+ELECTION_LIST_FIELDS = {
+    'id': ('id',),
+    'election_name': ('election_name',),
+    'election_date': ('election_date',),
+    'election_time': ('election_time',),
+    'end_date': ('end_date',),
+    'end_time': ('end_time',),
+    'result_date': ('result_date',),
+    'result_time': ('result_time',),
+    'election_status': ('election_status',),
+    'voting_method': ('voting_method',),
+    'seats': ('seats',),
+}
+
+
+# GET /api/admin/elections - List all elections (+ ?limit=&cursor=&fields=&include_total=true)
 @election_bp.route('/elections', methods=['GET'])
 # @login_required
 def get_elections():
     try:
-        elections = Election.query.all()
-        return jsonify([e.to_dict() for e in elections]), 200
+        fields = requested_fields(ELECTION_LIST_FIELDS)
+        body = paginate(
+            Election.query,
+            [(Election.id, False)],
+            lambda e: project(e, fields),
+            options=[load_fields(Election, ELECTION_LIST_FIELDS, fields)]
+        )
+        return jsonify(body), 200
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"Error fetching elections: {str(e)}", exc_info=True)
         return jsonify({'error': 'Failed to fetch elections'}), 500
@@ -104,7 +158,17 @@ def update_election(id):
             if status in ['UPCOMING', 'ACTIVE', 'CLOSED']:
                 election.election_status = status
 
+        if 'voting_method' in data or 'seats' in data:
+            voting_method, seats, error = _voting_rules(data, election.voting_method, election.seats)
+            if error:
+                db.session.rollback()
+                return jsonify({'error': error}), 400
+            election.voting_method = voting_method
+            election.seats = seats
+
+        invalidate_snapshot(election.id)
         db.session.commit()
+        election_schedule_changed()
         return jsonify(election.to_dict()), 200
 
     except ValueError as ve:
@@ -124,6 +188,7 @@ def delete_election(id):
     election = Election.query.get_or_404(id)
     try:
         db.session.delete(election)
+        invalidate_snapshot(election.id)
         db.session.commit()
         return jsonify({'message': 'Election deleted successfully'}), 200
     except Exception as e:
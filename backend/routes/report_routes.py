@@ -0,0 +1,81 @@
+# routes/report_routes.py
+# Asynchronous PDF export jobs: start, poll, download.
+
+import os
+from flask import Blueprint, jsonify, request, send_file, current_app
+from extensions import db
+from models.election import Election
+from models.report_job import ReportJob
+from services.report_jobs import (
+    refresh_job, start_all_closed_job, start_results_job, start_winner_job
+)
+
+report_bp = Blueprint('reports', __name__, url_prefix='/api')
+
+
+def job_accepted(job):
+    response = jsonify(job.to_dict())
+    response.headers['Location'] = f'/api/reports/jobs/{job.id}'
+    return response, 202
+
+
+# POST /api/elections/<id>/results/export/jobs   body: {"candidate_id": 5} for a winner certificate
+@report_bp.route('/elections/<int:election_id>/results/export/jobs', methods=['POST'])
+def start_election_report_job(election_id):
+    election = Election.query.get_or_404(election_id)
+    data = request.get_json(silent=True) or {}
+
+    try:
+        if data.get('candidate_id'):
+            try:
+                job = start_winner_job(election, int(data['candidate_id']))
+            except (LookupError, ValueError):
+                return jsonify({'error': 'Candidate was not declared a winner of this election'}), 404
+        else:
+            job = start_results_job(election)
+
+        return job_accepted(job)
+
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error starting report job: {str(e)}", exc_info=True)
+        return jsonify({'error': 'Failed to start report job'}), 500
+
+
+# POST /api/elections/results/export/jobs - zip of every closed election's report
+@report_bp.route('/elections/results/export/jobs', methods=['POST'])
+def start_all_closed_report_job():
+    try:
+        return job_accepted(start_all_closed_job())
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error starting bulk report job: {str(e)}", exc_info=True)
+        return jsonify({'error': 'Failed to start report job'}), 500
+
+
+# GET /api/reports/jobs/<job_id>
+@report_bp.route('/reports/jobs/<job_id>', methods=['GET'])
+def get_report_job(job_id):
+    job = refresh_job(ReportJob.query.get_or_404(job_id))
+    return jsonify(job.to_dict()), 200
+
+
+# GET /api/reports/jobs/<job_id>/download
+@report_bp.route('/reports/jobs/<job_id>/download', methods=['GET'])
+def download_report_job(job_id):
+    job = refresh_job(ReportJob.query.get_or_404(job_id))
+
+    if job.status != 'DONE':
+        return jsonify({'error': f'Report is not ready (status: {job.status})', 'job': job.to_dict()}), 409
+
+    if not job.file_path or not os.path.exists(job.file_path):
+        # Cached file was purged by an election/candidate edit
+        return jsonify({'error': 'Report is no longer available, start a new export'}), 410
+
+    return send_file(
+        job.file_path,
+        as_attachment=True,
+        download_name=job.download_name,
+        mimetype='application/zip' if job.file_path.endswith('.zip') else 'application/pdf',
+        conditional=True
+    )
@@ -1,92 +1,88 @@
 # routes/results_routes.py
 # (Admin + Voter - Final Combined Version)
 
-from datetime import datetime
-from flask import Blueprint, jsonify, request, send_file
+from flask import Blueprint, Response, current_app, jsonify, request, send_file
 from flask_jwt_extended import verify_jwt_in_request
-from sqlalchemy import func
-from models.election import Election
-from models.candidate import Candidate
-from models.voter import Voter
 from extensions import db
-import io
+from models.election import Election, RANKED_METHODS
+from services.election_queries import candidate_totals, closed_elections, closed_snapshots
+from services.results import (
+    closed_elections_payload, declared_winners, get_snapshot, results_etag, snapshot_results
+)
+from services.live_tally import sse_event
+from services.turnout import election_turnout
+from services.replicas import read_replica
+from services.reports import results_report_spec, winner_certificate_spec
+from services.report_jobs import start_results_job, start_winner_job, wait_for_job
+from routes.report_routes import job_accepted
 import os
-
-
-# For PDF
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import inch
-from reportlab.lib.styles import ParagraphStyle
-from reportlab.lib.pagesizes import A4
-from reportlab.graphics.shapes import Drawing
-from reportlab.graphics.charts.barcharts import VerticalBarChart
-from reportlab.graphics import renderPDF
-from reportlab.graphics.charts.legends import Legend
+import queue
+import time
 
 
 results_bp = Blueprint('results', __name__, url_prefix='/api')
 
 
 # ────────────────────────────────────────────────
-# AUTO CLOSE ELECTIONS
+# CONDITIONAL GET HELPERS
 # ────────────────────────────────────────────────
-def auto_close_elections():
-    now = datetime.now()
-    elections = Election.query.all()
+def _not_modified(etag, last_modified=None):
+    """True when the client's cached copy (If-None-Match / If-Modified-Since) is current."""
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if last_modified and request.if_modified_since:
+        return last_modified <= request.if_modified_since.replace(tzinfo=None)
+    return False
+
+
+def _cacheable(response, etag, last_modified=None):
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    # Let browsers keep the body but revalidate every time (→ 304s)
+    response.cache_control.no_cache = True
+    return response
 
-    for e in elections:
-        if e.end_date and e.end_time:
-            end_datetime = datetime.combine(e.end_date, e.end_time)
-            if now > end_datetime and e.election_status == "ACTIVE":
-                e.election_status = "CLOSED"
-                db.session.commit()
+
+def _not_modified_response(etag, last_modified=None):
+    return _cacheable(Response(status=304), etag, last_modified)
 
 
 # ────────────────────────────────────────────────
 # GET ALL CLOSED ELECTIONS
 # ────────────────────────────────────────────────
 @results_bp.route('/elections/results/closed', methods=['GET'])
+@read_replica
 def get_closed_elections():
 
     verify_jwt_in_request(optional=True)
-    auto_close_elections()
 
-    elections = Election.query.filter_by(election_status="CLOSED") \
-        .order_by(Election.end_date.desc()) \
-        .all()
+    elections = closed_elections().all()
 
-    result = []
+    snapshots = {
+        s.election_id: s for s in closed_snapshots([e.id for e in elections]).all()
+    } if elections else {}
 
-    for e in elections:
-        total_votes = db.session.query(func.sum(Candidate.count)) \
-            .filter(Candidate.election_id == e.id) \
-            .scalar() or 0
+    # Elections nobody has opened yet have no snapshot: total them in one
+    # grouped query rather than building snapshots one by one here
+    missing = [e.id for e in elections if e.id not in snapshots]
+    live_totals = dict(candidate_totals(missing).all()) if missing else {}
 
-        result.append({
-            'id': e.id,
-            'title': e.election_name,
-            'election_date': e.election_date.isoformat(),
-            'election_time': e.election_time.isoformat(),
-            'end_date': e.end_date.isoformat(),
-            'end_time': e.end_time.isoformat(),
-            'result_date': e.result_date.isoformat() if e.result_date else None,
-            'result_time': e.result_time.isoformat() if e.result_time else None,
-            'total_votes': int(total_votes)
-        })
+    result, etag = closed_elections_payload(elections, snapshots, live_totals)
+    if _not_modified(etag):
+        return _not_modified_response(etag)
 
-    return jsonify(result), 200
+    return _cacheable(jsonify(result), etag), 200
 
 
 # ────────────────────────────────────────────────
 # GET DETAILED RESULTS (Admin + Voter)
 # ────────────────────────────────────────────────
 @results_bp.route('/elections/<int:election_id>/results', methods=['GET'])
+@read_replica
 def get_election_results(election_id):
 
     verify_jwt_in_request(optional=True)
-    auto_close_elections()
 
     election = Election.query.get_or_404(election_id)
 
@@ -95,396 +91,216 @@ def get_election_results(election_id):
 
     search = request.args.get("search", "").lower()
 
-    candidates = Candidate.query.filter_by(election_id=election_id).all()
-
-    if search:
-        candidates = [c for c in candidates if search in c.name.lower()]
-
-    total_votes = sum(c.count for c in candidates) or 0
-    
-    total_registered_voters = Voter.query.count()
-
-    # Determine winner / tie
-    if candidates:
-        max_votes = max(c.count for c in candidates)
-        winners = [c for c in candidates if c.count == max_votes]
-    else:
-        max_votes = 0
-        winners = []
-
-    candidate_list = []
-
-    for c in candidates:
-        percentage = (c.count / total_votes * 100) if total_votes > 0 else 0
-
-        is_winner = len(winners) == 1 and c in winners and max_votes > 0
-
-        candidate_list.append({
-            "id": c.id,
-            "name": c.name,
-            "roll_no": c.roll_no,
-            "major": c.major,
-            "course": c.course,
-            "symbol_url": c.get_symbol_url() if hasattr(c, "get_symbol_url") else None,
-            "vote_count": c.count,
-            "percentage": round(percentage, 2),
-            "email": c.email,
-            "is_winner": is_winner
-        })
-
-    # Winner Data
-    winner_data = None
-
-    if max_votes == 0:
-        winner_data = {
-            "message": "No one has voted in this election",
-            "no_votes": True,
-            "tie": False
-        }
-
-    elif len(winners) == 1:
-        w = winners[0]
-
-        margin = 0
-        if len(candidates) > 1:
-            second_count = sorted(
-                [c.count for c in candidates],
-                reverse=True
-            )[1]
-            margin = w.count - second_count
-
-        winner_data = {
-            "name": w.name,
-            "vote_count": w.count,
-            "percentage": round((w.count / total_votes * 100), 2)
-            if total_votes > 0 else 0,
-            "major": w.major,
-            "course": w.course,
-            "margin": margin,
-            "symbol_url": w.get_symbol_url() if hasattr(w, "get_symbol_url") else None,
-
-
-            "tie": False
-        }
-
-    else:
-        winner_data = {
-            "tie": True,
-            "names": [w.name for w in winners],
-            "vote_count": max_votes,
-            "percentage": round((max_votes / total_votes * 100), 2)
-            if total_votes > 0 else 0
-        }
-
-    turnout = (
-        (total_votes / total_registered_voters * 100)
-        if total_registered_voters > 0 else 0
-    )
+    snapshot = get_snapshot(election)
+    etag = results_etag(election, snapshot, search)
 
-    return jsonify({
-        "election": {
-            "id": election.id,
-            "title": election.election_name,
-            "end_date": election.end_date.isoformat()
-        },
-        "candidates": candidate_list,
-        "winner": winner_data,
-        "summary": {
-            "total_registered_voters": total_registered_voters,
-            "total_votes": total_votes,
-            "turnout_percentage": round(turnout, 2)
-        }
-    }), 200
+    if _not_modified(etag, snapshot.created_at):
+        return _not_modified_response(etag, snapshot.created_at)
 
+    payload = snapshot_results(election, snapshot, search)
 
-@results_bp.route('/elections/<int:election_id>/results/export/pdf', methods=['GET'])
-def export_results_pdf(election_id):
+    return _cacheable(jsonify(payload), etag, snapshot.created_at), 200
+
+
+# ────────────────────────────────────────────────
+# RANKED-CHOICE ROUNDS (IRV / STV)
+# ────────────────────────────────────────────────
+@results_bp.route('/elections/<int:election_id>/results/rounds', methods=['GET'])
+@read_replica
+def get_election_rounds(election_id):
+
+    verify_jwt_in_request(optional=True)
 
     election = Election.query.get_or_404(election_id)
-    candidates = Candidate.query.filter_by(election_id=election_id).all()
-
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
-    elements = []
-    styles = getSampleStyleSheet()
-
-    total_votes = sum(c.count for c in candidates)
-
-    # =========================
-    # DETERMINE WINNER
-    # =========================
-    winner = None
-    winners = []
-    margin = 0
-
-    if candidates and total_votes > 0:
-        sorted_candidates = sorted(candidates, key=lambda x: x.count, reverse=True)
-        max_votes = sorted_candidates[0].count
-
-        winners = [c for c in sorted_candidates if c.count == max_votes]
-
-        if len(winners) == 1:
-            winner = winners[0]
-            if len(sorted_candidates) > 1:
-                margin = winner.count - sorted_candidates[1].count
-
-    # =========================
-    # HEADER
-    # =========================
-    elements.append(Paragraph("<b>OFFICIAL ELECTION RESULTS REPORT</b>", styles["Title"]))
-    elements.append(Spacer(1, 0.4 * inch))
-
-    # =========================
-    # ELECTION DETAILS
-    # =========================
-    details_data = [
-        ["Election Name", election.election_name],
-        ["Election Date", f"{election.election_date} {election.election_time}"],
-        ["End Date", f"{election.end_date} {election.end_time}"],
-        ["Result Declared On", f"{election.result_date} {election.result_time}" if election.result_date else "N/A"],
-        ["Status", election.election_status],
-        ["Total Votes Cast", str(total_votes)]
-    ]
-
-    details_table = Table(details_data, colWidths=[2.5 * inch, 3.5 * inch])
-    details_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), colors.whitesmoke),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('LEFTPADDING', (0, 0), (-1, -1), 8),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-    ]))
-
-    elements.append(details_table)
-    elements.append(Spacer(1, 0.5 * inch))
-
-    # =========================
-    # WINNER SECTION
-    # =========================
-    elements.append(Paragraph("<b>WINNER OF THE ELECION: </b>", styles["Heading2"]))
-    elements.append(Spacer(1, 0.3 * inch))
-
-    if total_votes == 0:
-        elements.append(Paragraph("<b>NO VOTES RECORDED</b>", styles["Heading2"]))
-        elements.append(Spacer(1, 0.3 * inch))
-        elements.append(Paragraph(
-            "No one has voted in this election. Therefore, no winner can be declared.",
-            styles["Normal"]
-        ))
-
-    elif len(winners) > 1:
-        tie_text = "Election is TIE between:<br/><br/>"
-
-        for w in winners:
-            tie_text += f"- {w.name} (Roll No: {w.roll_no})<br/>"
-
-        elements.append(Paragraph("<b>TIE RESULT</b>", styles["Heading2"]))
-        elements.append(Spacer(1, 0.3 * inch))
-        elements.append(Paragraph(tie_text, styles["Normal"]))
-
-
-    elif winner:
-        winner_data = [
-            ["Name", winner.name],
-            ["Email", winner.email],
-            ["Course", winner.course],
-            ["Major", winner.major],
-            ["Votes Secured", str(winner.count)],
-            ["Winning Margin", str(margin)]
-        ]
-
-        winner_table = Table(winner_data, colWidths=[2.5 * inch, 3.5 * inch])
-        winner_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.lightgrey),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('LEFTPADDING', (0, 0), (-1, -1), 8),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-        ]))
-
-        elements.append(winner_table)
-        elements.append(Spacer(1, 0.3 * inch))
-
-        # Add Symbol if exists
-        if hasattr(winner, "symbol") and winner.symbol:
-            symbol_path = os.path.join("uploads", winner.symbol)
-            if os.path.exists(symbol_path):
-                elements.append(Paragraph("<b>Symbol of the winner:</b>", styles["Normal"]))
-                elements.append(Spacer(1, 0.2 * inch))
-                img = Image(symbol_path, width=1.5 * inch, height=1.5 * inch)
-                elements.append(img)
-
-    else:
-        elements.append(Paragraph("No votes were cast in this election.", styles["Normal"]))
-
-    elements.append(Spacer(1, 0.6 * inch))
-
-    total_registered_voters = Voter.query.count()
-
-    turnout_percentage = (
-        (total_votes / total_registered_voters * 100)
-        if total_registered_voters > 0 else 0
-    )
 
-    elements.append(Paragraph("<b>ELECTION TURNOUT SUMMARY</b>", styles["Heading2"]))
-    elements.append(Spacer(1, 0.3 * inch))
-
-    turnout_data = [
-        ["Total Registered Voters", str(total_registered_voters)],
-        ["Total Votes Cast", str(total_votes)],
-        ["Turnout Percentage", f"{round(turnout_percentage, 2)} %"]
-    ]
-
-    turnout_table = Table(turnout_data, colWidths=[2.5 * inch, 3.5 * inch])
-    turnout_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), colors.whitesmoke),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-    ]))
-
-    elements.append(turnout_table)
-    elements.append(Spacer(1, 0.5 * inch))
-
-
-    # =========================
-    # FULL RESULTS TABLE
-    # =========================
-    elements.append(Paragraph("<b>DETAILED RESULTS</b>", styles["Heading2"]))
-    elements.append(Spacer(1, 0.3 * inch))
-
-    table_data = [["S.No", "Candidate Name", "Email", "Course", "Votes", "Percentage"]]
-
-    for index, c in enumerate(sorted_candidates, start=1):
-        percentage = (c.count / total_votes * 100) if total_votes > 0 else 0
-
-        table_data.append([
-            str(index),
-            c.name,
-            c.email,
-            c.course,
-            str(c.count),
-            f"{round(percentage, 2)}%"
-        ])
-
-    results_table = Table(table_data, repeatRows=1)
-    results_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('ALIGN', (4, 1), (-1, -1), 'CENTER'),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-    ]))
-
-    elements.append(results_table)
-    elements.append(Spacer(1, 0.6 * inch))
-
-    # =========================
-    # FOOTER
-    # =========================
-    elements.append(Paragraph(
-        f"Report Generated On: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-        styles["Normal"]
-    ))
-
-    elements.append(Spacer(1, 0.2 * inch))
-    elements.append(Paragraph(
-        "This document is system generated and serves as the official election result record.",
-        styles["Italic"]
-    ))
-
-    doc.build(elements)
-    buffer.seek(0)
+    if election.voting_method not in RANKED_METHODS:
+        return jsonify({"error": "Not a ranked-choice election"}), 400
+
+    if election.election_status != "CLOSED":
+        return jsonify({"error": "Results only available for closed elections"}), 403
+
+    # Counted once when the snapshot is built
+    snapshot = get_snapshot(election)
+    etag = results_etag(election, snapshot, 'rounds')
+    if _not_modified(etag, snapshot.created_at):
+        return _not_modified_response(etag, snapshot.created_at)
+
+    data = snapshot.data()
+    payload = {
+        **data['ranked'],
+        'candidates': [{'id': c['id'], 'name': c['name']} for c in data['candidates']]
+    }
+    return _cacheable(jsonify(payload), etag, snapshot.created_at), 200
+
+
+# ────────────────────────────────────────────────
+# TURNOUT (overall + by year / major / course)
+# ────────────────────────────────────────────────
+@results_bp.route('/elections/<int:election_id>/turnout', methods=['GET'])
+@read_replica
+def get_election_turnout(election_id):
+
+    election = Election.query.get_or_404(election_id)
+
+    # Closed: the breakdown frozen into the snapshot. Open: live counters
+    snapshot = get_snapshot(election)
+    turnout = snapshot.data().get('turnout') if snapshot else None
+    if turnout:
+        etag = results_etag(election, snapshot, 'turnout')
+        if _not_modified(etag, snapshot.created_at):
+            return _not_modified_response(etag, snapshot.created_at)
+        return _cacheable(jsonify(turnout), etag, snapshot.created_at), 200
+
+    return jsonify(election_turnout(election.id)), 200
 
+
+def _send_report(pdf, download_name):
+    """Stream a rendered report file with ETag/conditional and Range support."""
     return send_file(
-        buffer,
+        pdf,
         as_attachment=True,
-        download_name=f"{election.election_name}_Official_Results_Report.pdf",
-        mimetype='application/pdf'
+        download_name=download_name,
+        mimetype='application/pdf',
+        conditional=True,
+        etag=os.path.splitext(os.path.basename(pdf))[0]
     )
 
+
+def _export_job(start, download_name):
+    """
+    Render through a report job: the file if it is ready within
+    REPORT_EXPORT_WAIT seconds, else 202 with the job to poll.
+    """
+    try:
+        job = start()
+        path = wait_for_job(job, current_app.config['REPORT_EXPORT_WAIT'])
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error rendering report: {str(e)}", exc_info=True)
+        return jsonify({"error": "Failed to render report"}), 500
+
+    if path is None:
+        return job_accepted(job)
+    return _send_report(path, download_name)
+
+
+@results_bp.route('/elections/<int:election_id>/results/export/pdf', methods=['GET'])
+@read_replica
+def export_results_pdf(election_id):
+
+    election = Election.query.get_or_404(election_id)
+    download_name = f"{election.election_name}_Official_Results_Report.pdf"
+
+    snapshot = get_snapshot(election)
+    if snapshot:
+        spec = results_report_spec(election, snapshot)
+        if os.path.exists(spec.path):
+            return _send_report(spec.path, download_name)
+
+    # Not cached (or still open): render in the report pool, not here
+    return _export_job(lambda: start_results_job(election), download_name)
+
+
 @results_bp.route('/elections/<int:election_id>/results/winner/<int:candidate_id>/export/pdf', methods=['GET'])
+@read_replica
 def export_winner_pdf(election_id, candidate_id):
 
     election = Election.query.get_or_404(election_id)
-    winner = Candidate.query.filter_by(
-        id=candidate_id,
-        election_id=election_id
-    ).first_or_404()
-
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
-    elements = []
-    styles = getSampleStyleSheet()
-
-    # =========================
-    # HEADER
-    # =========================
-    elements.append(Paragraph("<b>OFFICIAL WINNER CERTIFICATE</b>", styles["Title"]))
-    elements.append(Spacer(1, 0.4 * inch))
-
-    # =========================
-    # ELECTION DETAILS
-    # =========================
-    elements.append(Paragraph(f"<b>Election Name:</b> {election.election_name}", styles["Normal"]))
-    elements.append(Paragraph(f"<b>Election Date:</b> {election.election_date} at {election.election_time}", styles["Normal"]))
-    elements.append(Paragraph(f"<b>Election End Date:</b> {election.end_date} at {election.end_time}", styles["Normal"]))
-    elements.append(Paragraph(f"<b>Result Declared :</b> {election.result_date} at {election.result_time}" if election.result_date else "<b>Result Date:</b> N/A", styles["Normal"]))
-    elements.append(Spacer(1, 0.4 * inch))
-
-    # =========================
-    # SYMBOL IMAGE
-    # =========================
-    if hasattr(winner, "symbol") and winner.symbol:
-        symbol_path = os.path.join("uploads", winner.symbol)
-        if os.path.exists(symbol_path):
-            img = Image(symbol_path, width=1.8 * inch, height=1.8 * inch)
-            elements.append(img)
-            elements.append(Spacer(1, 0.3 * inch))
-
-    # =========================
-    # WINNER DETAILS TABLE
-    # =========================
-    winner_data = [
-        ["Name", winner.name],
-        ["Email", winner.email],
-        ["Roll No", winner.roll_no],
-        ["Major", winner.major],
-        ["Course", winner.course],
-        ["Total Votes", str(winner.count)]
-    ]
-
-    winner_table = Table(winner_data, colWidths=[2.5 * inch, 3.5 * inch])
-    winner_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), colors.whitesmoke),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 8),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-    ]))
-
-    elements.append(winner_table)
-    elements.append(Spacer(1, 0.5 * inch))
-
-    elements.append(Paragraph(
-        "This certificate is awarded for securing the highest number of votes "
-        "and being officially declared as the winner of the election.",
-        styles["Italic"]
-    ))
-
-    elements.append(Spacer(1, 1 * inch))
-    elements.append(Paragraph("______________________________", styles["Normal"]))
-    elements.append(Spacer(1, 0.2 * inch))
-    elements.append(Paragraph("Election Authority Signature", styles["Normal"]))
-
-    elements.append(Spacer(1, 0.5 * inch))
-    elements.append(Paragraph(
-        f"Generated On: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-        styles["Normal"]
-    ))
-
-    doc.build(elements)
-    buffer.seek(0)
 
-    return send_file(
-        buffer,
-        as_attachment=True,
-        download_name=f"Winner_{winner.name}_Certificate.pdf",
-        mimetype='application/pdf'
-    )
+    # Only declared winners of a closed election get a certificate
+    snapshot = get_snapshot(election)
+    winners = declared_winners(snapshot.data()) if snapshot else []
+    winner = next((c for c in winners if c['id'] == candidate_id), None)
+    if winner is None:
+        return jsonify({"error": "Candidate was not declared a winner of this election"}), 404
+
+    download_name = f"Winner_{winner['name']}_Certificate.pdf"
+    spec = winner_certificate_spec(election, snapshot, winner)
+    if os.path.exists(spec.path):
+        return _send_report(spec.path, download_name)
+
+    return _export_job(lambda: start_winner_job(election, candidate_id), download_name)
+
+
+# ────────────────────────────────────────────────
+# LIVE TALLIES (SSE + long-poll fallback)
+# ────────────────────────────────────────────────
+@results_bp.route('/elections/<int:election_id>/results/stream', methods=['GET'])
+def stream_election_results(election_id):
+    """
+    text/event-stream of tally changes: a `snapshot` event with every
+    candidate's count, then `delta` events with only the changed counts.
+    Event ids are tally versions, so EventSource reconnects resume from
+    Last-Event-ID. Streams end after LIVE_TALLY_WSGI_HOLD_SECONDS (at most
+    LIVE_TALLY_STREAM_SECONDS) and the browser reconnects, so a request
+    thread is never held past the worker timeout.
+    """
+    verify_jwt_in_request(optional=True)
+    db.get_or_404(Election, election_id)
+
+    publisher = current_app.extensions['live_tally']
+    listener, state = publisher.subscribe(election_id)
+    keepalive = current_app.config['LIVE_TALLY_KEEPALIVE']
+    lifetime = min(current_app.config['LIVE_TALLY_STREAM_SECONDS'],
+                   current_app.config['LIVE_TALLY_WSGI_HOLD_SECONDS'])
+    resume_from = request.headers.get('Last-Event-ID')
+
+    def events():
+        try:
+            yield 'retry: 2000\n\n'
+            if resume_from != state.version:
+                yield sse_event(state.snapshot(election_id))
+
+            deadline = time.monotonic() + lifetime
+            while time.monotonic() < deadline:
+                try:
+                    event = listener.get(timeout=min(keepalive, max(deadline - time.monotonic(), 0.1)))
+                except queue.Empty:
+                    yield ': keepalive\n\n'
+                    continue
+                yield sse_event(event)
+        finally:
+            publisher.unsubscribe(election_id, listener)
+
+    # The database session is released when this view returns; the
+    # generator only reads from the publisher's queue
+    return Response(events(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
+@results_bp.route('/elections/<int:election_id>/results/live', methods=['GET'])
+def poll_election_results(election_id):
+    """
+    Long-poll fallback: ?since=<version> waits up to ?timeout= seconds
+    (max 30, or LIVE_TALLY_WSGI_HOLD_SECONDS if lower) for the tally to
+    move, then returns the current snapshot with `changed` set accordingly.
+    """
+    verify_jwt_in_request(optional=True)
+    db.get_or_404(Election, election_id)
+
+    try:
+        timeout = min(max(float(request.args.get('timeout', 25)), 0), 30,
+                      current_app.config['LIVE_TALLY_WSGI_HOLD_SECONDS'])
+    except ValueError:
+        return jsonify({"error": "timeout must be a number"}), 400
+
+    publisher = current_app.extensions['live_tally']
+    listener, state = publisher.subscribe(election_id)
+    try:
+        since = request.args.get('since')
+        if since == state.version and timeout > 0:
+            # Session not needed while waiting
+            db.session.remove()
+            try:
+                listener.get(timeout=timeout)
+            except queue.Empty:
+                pass
+            state = publisher.current(election_id) or state
+    finally:
+        publisher.unsubscribe(election_id, listener)
+
+    body = state.snapshot(election_id)
+    body['changed'] = body['version'] != since
+    return jsonify(body), 200
@@ -2,8 +2,9 @@
 
 from flask import Blueprint, request, jsonify, current_app
 from extensions import db
-from models.candidate import Candidate
-from models.vote import Vote
+from services.election_queries import election_candidates, voter_ballot
+from services.vote_service import record_vote, DuplicateVote, InvalidBallot, InvalidCandidate
+from services.replicas import sticky_token
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 
@@ -25,13 +26,10 @@ def get_candidates_and_vote_status(election_id):
     """
     try:
         # Fetch all candidates for this election
-        candidates = Candidate.query.filter_by(election_id=election_id).all()
+        candidates = election_candidates(election_id).all()
 
         # Check if user has already voted in this election
-        existing_vote = Vote.query.filter_by(
-            voter_id=current_user_id,
-            election_id=election_id
-        ).first()
+        existing_vote = voter_ballot(current_user_id, election_id).first()
 
         has_voted = existing_vote is not None
 
@@ -59,7 +57,8 @@ def submit_vote(eid):
 
     """
     Submit a vote for a candidate in the given election
-    Expects JSON: {"candidate_id": 123}
+    Expects JSON: {"candidate_id": 123}, or for IRV/STV elections
+    {"ranking": [123, 456, ...]} (most preferred first)
     """
     try:
         data = request.get_json()
@@ -67,44 +66,32 @@ def submit_vote(eid):
             return jsonify({'message': 'Invalid JSON payload'}), 400
 
         candidate_id = data.get('candidate_id')
-        if not candidate_id:
-            return jsonify({'message': 'candidate_id is required'}), 400
-
-        # Make sure candidate exists and belongs to this election
-        candidate = Candidate.query.filter_by(
-            id=candidate_id,
-            election_id=eid
-        ).first()
-
-        if not candidate:
+        ranking = data.get('ranking')
+        if not candidate_id and ranking is None:
+            return jsonify({'message': 'candidate_id or ranking is required'}), 400
+
+        # Append the vote and bump the tally atomically; the unique
+        # constraint and the candidate/election filter do the checking
+        try:
+            record_vote(current_user_id, eid, candidate_id, ranking)
+        except InvalidBallot as e:
+            return jsonify({'message': str(e)}), 400
+        except InvalidCandidate:
             return jsonify({'message': 'Invalid candidate for this election'}), 400
-
-        # Check if user already voted
-        existing_vote = Vote.query.filter_by(
-            voter_id=current_user_id,
-            election_id=eid
-        ).first()
-
-        if existing_vote:
+        except DuplicateVote:
             return jsonify({'message': 'You have already voted in this election'}), 403
 
-        # Record the vote
-        new_vote = Vote(
-            voter_id=current_user_id,
-            election_id=eid,
-            candidate_id=candidate_id
-        )
-        db.session.add(new_vote)
-
-        # Increment vote count
-        candidate.count += 1
-
-        db.session.commit()
-
-        return jsonify({
+        body = {
             'message': 'Vote submitted successfully',
-            'candidate_id': candidate_id
-        }), 201
+            'candidate_id': candidate_id if ranking is None else ranking[0]
+        }
+        if ranking is not None:
+            body['ranking'] = ranking
+        # Reads from the primary for a while (services/replicas.py)
+        token = sticky_token()
+        if token:
+            body['token'] = token
+        return jsonify(body), 201
 
     except Exception as e:
         db.session.rollback()
@@ -1,15 +1,24 @@
 # backend/routes/voter_routes.py
-from flask import Blueprint, request, jsonify
-from werkzeug.security import generate_password_hash, check_password_hash
-from flask_jwt_extended import jwt_required, get_jwt_identity, create_access_token
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from collections import Counter
 from datetime import datetime
+from sqlalchemy.orm import subqueryload
 
 # Import shared db and models
 from extensions import db
 from models.voter import Voter
 from models.election import Election
-from models.candidate import Candidate
-from models.vote import Vote      # ← required for voting
+from services.vote_service import record_vote, DuplicateVote, InvalidBallot, InvalidCandidate
+from services.election_queries import NEWEST_FIRST, election_candidates, voter_ballot
+from services.voter_search import apply_voter_search
+from services.identity import cached_voter_profile, create_voter_token, invalidate_voter
+from services.passwords import PasswordBusy, verify_and_upgrade
+from services.replicas import read_replica, sticky_token
+from services.turnout import count_registrations, move_voter, segment_of
+from services.pagination import (
+    PaginationError, load_fields, paginate, project, requested_fields
+)
 
 voter_bp = Blueprint('voter', __name__, url_prefix='/api/voter')
 
@@ -64,6 +73,7 @@ def register_voter():
 
     try:
         db.session.add(new_voter)
+        count_registrations(Counter([segment_of(year, new_voter.major, new_voter.course)]))
         db.session.commit()
         return jsonify({
             "success": True,
@@ -87,11 +97,22 @@ def voter_login():
 
     voter = Voter.query.filter_by(email=email.strip().lower()).first()
 
-    if not voter or not check_password_hash(voter.password, password):
+    if not voter:
         return jsonify({"message": "Invalid email or password"}), 401
 
-    # Create JWT token
-    access_token = create_access_token(identity=str(voter.id))
+    try:
+        # Hashing runs in a bounded pool; a stale hash is upgraded in place
+        if not verify_and_upgrade(voter, password):
+            return jsonify({"message": "Invalid email or password"}), 401
+    except PasswordBusy:
+        return jsonify({"message": "Too many login attempts right now, please retry"}), 503, \
+            {"Retry-After": "1"}
+
+    if db.session.is_modified(voter):
+        db.session.commit()
+
+    # Create JWT token (carries id/roll_no/year/major as claims)
+    access_token = create_voter_token(voter)
 
     return jsonify({
         "success": True,
@@ -109,77 +130,63 @@ def voter_login():
     }), 200
 
 
+# Fields the voter list can return (field → columns it needs)
+VOTER_LIST_FIELDS = {
+    'id': ('id',),
+    'student_name': ('student_name',),
+    'roll_no': ('roll_no',),
+    'major': ('major',),
+    'course': ('course',),
+    'year': ('year',),
+    'email': ('email',),
+}
+
+
 # ── Get all voters (with optional filtering) ── for Admin ViewVoter
+# Supports ?limit=&cursor=&fields=&include_total=true (see services/pagination.py)
 @voter_bp.route('/voters', methods=['GET'])
+@read_replica
 def get_voters():
-    query = Voter.query
-
-    # Optional query parameters for filtering
-    student_name = request.args.get('student_name')
-    roll_no = request.args.get('roll_no')
-    year = request.args.get('year')
-    major = request.args.get('major')
-    course = request.args.get('course')
-
-    if student_name:
-        query = query.filter(Voter.student_name.ilike(f'%{student_name}%'))
-    if roll_no:
-        query = query.filter(Voter.roll_no.ilike(f'%{roll_no}%'))
-    if year:
-        try:
-            query = query.filter(Voter.year == int(year))
-        except ValueError:
-            pass
-    if major:
-        query = query.filter(Voter.major.ilike(f'%{major}%'))
-    if course:
-        query = query.filter(Voter.course.ilike(f'%{course}%'))
-
-    voters = query.all()
-
-    return jsonify([{
-        "id": v.id,
-        "student_name": v.student_name,
-        "roll_no": v.roll_no,
-        "major": v.major,
-        "course": v.course,
-        "year": v.year,
-        "email": v.email
-    } for v in voters]), 200
+    # Optional filters: student_name (word prefix, full-text), roll_no /
+    # major / course (prefix), year (exact) — see services/voter_search.py
+    query = apply_voter_search(Voter.query, request.args)
+
+    try:
+        fields = requested_fields(VOTER_LIST_FIELDS)
+        body = paginate(
+            query,
+            [(Voter.id, False)],
+            lambda v: project(v, fields),
+            options=[load_fields(Voter, VOTER_LIST_FIELDS, fields)]
+        )
+    except PaginationError as e:
+        return jsonify({"message": str(e)}), 400
+
+    return jsonify(body), 200
 
 
 @voter_bp.route('/profile', methods=['GET'])
 @jwt_required()
 def get_voter_profile():
-    print("=== GET /api/voter/profile called ===")
-    print("Request method:", request.method)
-    print("Request headers:", dict(request.headers))
-    print("JWT identity:", get_jwt_identity())
-    print("Request args:", request.args)
-    print("Request json:", request.get_json(silent=True))
-
     try:
         current_voter_id = get_jwt_identity()
-        voter = Voter.query.get(current_voter_id)
+        # Served from the identity cache; only a miss touches the database
+        voter = cached_voter_profile(current_voter_id)
         
         if not voter:
-            print(f"Voter not found for id: {current_voter_id}")
             return jsonify({"message": "Voter not found"}), 404
 
-        print(f"Returning data for voter: {voter.student_name}")
         return jsonify({
-            "student_name": voter.student_name,
-            "roll_no": voter.roll_no,
-            "major": voter.major,
-            "course": voter.course,
-            "year": voter.year,
-            "email": voter.email
+            "student_name": voter['student_name'],
+            "roll_no": voter['roll_no'],
+            "major": voter['major'],
+            "course": voter['course'],
+            "year": voter['year'],
+            "email": voter['email']
         }), 200
 
     except Exception as e:
-        import traceback
-        print("ERROR IN PROFILE ROUTE:")
-        traceback.print_exc()
+        current_app.logger.error(f"Error fetching voter profile: {str(e)}", exc_info=True)
         return jsonify({
             "msg": "Server error",
             "error": str(e)
@@ -191,12 +198,13 @@ def get_voter_profile():
 @jwt_required()
 def update_voter_profile():
     current_voter_id = get_jwt_identity()
-    voter = Voter.query.get(current_voter_id)
+    voter = db.session.get(Voter, int(current_voter_id))
     
     if not voter:
         return jsonify({"message": "Voter not found"}), 404
 
     data = request.get_json()
+    old_segment = segment_of(voter.year, voter.major, voter.course)
 
     # Only these fields are allowed to be updated by the voter
     allowed_fields = ['student_name', 'roll_no', 'major', 'course', 'year']
@@ -245,7 +253,9 @@ def update_voter_profile():
         }), 200
 
     try:
+        move_voter(old_segment, voter)
         db.session.commit()
+        invalidate_voter(voter.id)
         return jsonify({
             "message": "Profile updated successfully",
             "voter": {
@@ -255,7 +265,9 @@ def update_voter_profile():
                 "course": voter.course,
                 "year": voter.year,
                 "email": voter.email
-            }
+            },
+            # roll_no/year/major claims in the old token are now stale
+            "token": create_voter_token(voter)
         }), 200
     except Exception as e:
         db.session.rollback()
@@ -264,22 +276,33 @@ def update_voter_profile():
 
 # ────────────────────────────────────────────────────────────────
 #  Existing route: list elections + candidates
+#  Supports ?limit=&cursor=&fields=id,election_name,candidates
 # ────────────────────────────────────────────────────────────────
+ELECTION_CANDIDATE_FIELDS = {
+    'id': ('id',),
+    'election_name': ('election_name',),
+    'candidates': (),
+}
+
+
 @voter_bp.route('/elections-with-candidates', methods=['GET'])
 @jwt_required()
 def get_elections_with_candidates():
     try:
         # You can add .filter(Election.election_date >= date.today()) later if needed
-        elections = Election.query.order_by(Election.election_date.desc()).all()
-
-        result = []
-        for election in elections:
-            candidates = Candidate.query.filter_by(election_id=election.id).all()
-
-            election_data = {
-                "id": election.id,
-                "election_name": election.election_name,
-                "candidates": [
+        fields = requested_fields(ELECTION_CANDIDATE_FIELDS)
+
+        options = [load_fields(Election, ELECTION_CANDIDATE_FIELDS, fields, always=('id', 'election_date'))]
+        if 'candidates' in fields:
+            # Candidates for all elections come from one extra SELECT joined
+            # to the election query (selectinload would issue one per 500)
+            options.append(subqueryload(Election.candidates))
+
+        body = paginate(
+            Election.query,
+            NEWEST_FIRST,
+            lambda election: project(election, fields, {
+                "candidates": lambda e: [
                     {
                         "id": c.id,
                         "name": c.name,
@@ -291,16 +314,19 @@ def get_elections_with_candidates():
                         "symbol_url": c.get_symbol_url()
                         # ← uses the property from model
                     }
-                    for c in candidates
+                    for c in e.candidates
                 ]
-            }
-            result.append(election_data)
+            }),
+            options=options
+        )
+
+        return jsonify(body), 200
 
-        return jsonify(result), 200
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
 
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        current_app.logger.error(f"Error fetching elections with candidates: {str(e)}", exc_info=True)
         return jsonify({
             "error": "Failed to load election data",
             "detail": str(e)
@@ -321,12 +347,9 @@ def get_election_vote_status(election_id):
     """
     try:
         election = Election.query.get_or_404(election_id)
-        candidates = Candidate.query.filter_by(election_id=election_id).all()
+        candidates = election_candidates(election_id).all()
 
-        has_voted = Vote.query.filter_by(
-            voter_id=get_jwt_identity(),
-            election_id=election_id
-        ).first() is not None
+        has_voted = voter_ballot(get_jwt_identity(), election_id).first() is not None
 
         return jsonify({
             "election": {
@@ -357,7 +380,7 @@ def get_election_vote_status(election_id):
 
 
 # ────────────────────────────────────────────────────────────────
-#  NEW: Submit vote (increments candidate.count, prevents double vote)
+#  NEW: Submit vote (atomic candidate.count increment, prevents double vote)
 # ────────────────────────────────────────────────────────────────
 @voter_bp.route('/elections/<int:election_id>/vote', methods=['POST'])
 @jwt_required()
@@ -366,15 +389,12 @@ def submit_vote(election_id):
     data = request.get_json(silent=True) or {}
 
     candidate_id = data.get('candidate_id')
-    if not candidate_id:
-        return jsonify({"error": "candidate_id is required"}), 400
+    ranking = data.get('ranking')
+    if not candidate_id and ranking is None:
+        return jsonify({"error": "candidate_id or ranking is required"}), 400
 
     try:
         election = Election.query.get_or_404(election_id)
-        candidate = Candidate.query.get_or_404(candidate_id)
-
-        if candidate.election_id != election_id:
-            return jsonify({"error": "Candidate does not belong to this election"}), 400
 
         # Check voting period
         now = datetime.now()
@@ -384,24 +404,23 @@ def submit_vote(election_id):
         if now < start_dt or now > end_dt:
             return jsonify({"error": "Voting is not open at this time"}), 403
 
-        # Check for existing vote (unique constraint also protects, but we give nice message)
-        if Vote.query.filter_by(voter_id=voter_id, election_id=election_id).first():
+        # Record vote (unique constraint rejects repeats, tally is
+        # incremented with an atomic UPDATE instead of read-modify-write)
+        try:
+            record_vote(voter_id, election_id, candidate_id, ranking)
+        except DuplicateVote:
             return jsonify({"error": "You have already voted in this election"}), 403
+        except InvalidBallot as e:
+            return jsonify({"error": str(e)}), 400
+        except InvalidCandidate:
+            return jsonify({"error": "Candidate does not belong to this election"}), 400
 
-        # Record vote
-        new_vote = Vote(
-            voter_id=voter_id,
-            candidate_id=candidate_id,
-            election_id=election_id
-        )
-
-        # Increment vote count
-        candidate.count = (candidate.count or 0) + 1
-
-        db.session.add(new_vote)
-        db.session.commit()
-
-        return jsonify({"message": "Vote recorded successfully"}), 200
+        body = {"message": "Vote recorded successfully"}
+        # Reads from the primary for a while (services/replicas.py)
+        token = sticky_token()
+        if token:
+            body["token"] = token
+        return jsonify(body), 200
 
     except Exception as e:
         db.session.rollback()
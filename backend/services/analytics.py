@@ -0,0 +1,308 @@
+# services/analytics.py
+# Cross-election demographics: votes per candidate by voter year, major
+# and/or course, with shares and margins, computed on NumPy arrays.
+#
+# For a set of elections two bulk reads fetch plain tuples: (candidate id,
+# voter id) of every vote, and the requested attributes of the voters who
+# cast them. Text attributes are factorized to integer codes, votes are
+# joined to voters with np.searchsorted, every vote is mapped to a
+# (candidate, segment) cell and one np.bincount builds the whole
+# candidate × segment matrix; shares, leaders and margins are then array
+# operations per election instead of a Python loop per vote. Skipping ORM
+# entities and the SQL join's per-row primary key lookups makes it about
+# 20 times faster than an ORM loop (`python -m bench.analytics`).
+#
+# Results are cached per worker (services/cache.py), keyed by the election
+# ids, the requested dimensions and the candidates' current tallies: a new
+# vote changes a tally and so the key, and ANALYTICS_CACHE_TTL bounds how
+# long profile edits (which move voters between segments) can go unnoticed.
+
+import time
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import exists, func, select
+
+from extensions import db
+from models.candidate import Candidate
+from models.election import Election
+from models.vote import Vote
+from models.voter import Voter
+from services.cache import TTLCache
+
+DIMENSIONS = {
+    'year': Voter.year,
+    'major': func.coalesce(Voter.major_norm, ''),
+    'course': func.coalesce(Voter.course_norm, ''),
+}
+DEFAULT_DIMENSIONS = ('year', 'major')
+
+
+class AnalyticsError(ValueError):
+    """Bad election_ids/by argument; the endpoint answers 400."""
+
+
+def parse_request(election_ids_arg, by_arg):
+    """(election ids, dimensions) from the query string, validated."""
+    try:
+        election_ids = sorted({int(v) for v in (election_ids_arg or '').split(',') if v.strip()})
+    except ValueError:
+        raise AnalyticsError("election_ids must be a comma-separated list of ids")
+    if not election_ids:
+        raise AnalyticsError("election_ids is required")
+
+    max_elections = current_app.config['ANALYTICS_MAX_ELECTIONS']
+    if len(election_ids) > max_elections:
+        raise AnalyticsError(f"At most {max_elections} elections per request")
+
+    dimensions = tuple(d.strip() for d in by_arg.split(',') if d.strip()) if by_arg else DEFAULT_DIMENSIONS
+    unknown = [d for d in dimensions if d not in DIMENSIONS]
+    if unknown or not dimensions or len(set(dimensions)) != len(dimensions):
+        raise AnalyticsError(f"by must name distinct fields among {', '.join(DIMENSIONS)}")
+
+    return election_ids, dimensions
+
+
+# ────────────────────────────────────────────────
+# LOADING
+# ────────────────────────────────────────────────
+def _factorize(values, count):
+    """Sorted distinct labels and each value's index into them."""
+    index = {}
+    codes = np.fromiter((index.setdefault(v, len(index)) for v in values), dtype=np.int64, count=count)
+    labels = list(index)
+    order = sorted(range(len(labels)), key=labels.__getitem__)
+    rank = np.empty(len(labels), dtype=np.int64)
+    rank[order] = np.arange(len(labels))
+    return [labels[i] for i in order], rank[codes]
+
+
+def _rows(stmt):
+    """
+    Every row of a SELECT as plain tuples (NumPy is slow to read Row
+    objects), on the session's connection: read replica when routed there,
+    and counted by the statement metrics like any other query.
+    """
+    conn = db.session.connection(bind_arguments={'clause': stmt})
+    return [tuple(row) for row in conn.execute(stmt)]
+
+
+def load_votes(election_ids, dimensions):
+    """
+    Candidate id of every vote in the elections as an array plus, per
+    dimension, (labels, codes) of the voter who cast it.
+    """
+    in_elections = Vote.election_id.in_(election_ids)
+    votes = np.array(
+        _rows(select(Vote.candidate_id, Vote.voter_id).where(in_elections)),
+        dtype=np.int64
+    ).reshape(-1, 2)
+    # Only the voters who voted in these elections (one probe of the
+    # (voter_id, election_id) unique index per voter)
+    voters = _rows(
+        select(Voter.id, *(DIMENSIONS[d] for d in dimensions))
+        .where(exists().where(Vote.voter_id == Voter.id, in_elections))
+        .order_by(Voter.id)
+    )
+
+    count = len(voters)
+    columns = list(zip(*voters)) if voters else [()] * (len(dimensions) + 1)
+    voter_ids = np.fromiter(columns[0], dtype=np.int64, count=count)
+
+    # Join on voter id; votes of since-deleted voters are dropped
+    position = np.minimum(np.searchsorted(voter_ids, votes[:, 1]), max(count - 1, 0))
+    found = voter_ids[position] == votes[:, 1] if count else np.zeros(len(votes), dtype=bool)
+    position = position[found]
+
+    dimension_codes = []
+    for column in columns[1:]:
+        labels, codes = _factorize(column, count)
+        dimension_codes.append((labels, codes[position]))
+    return votes[found, 0], dimension_codes
+
+
+# ────────────────────────────────────────────────
+# TABULATION
+# ────────────────────────────────────────────────
+def _margins(matrix):
+    """Leader index and top-two margin per column of a candidates × n matrix."""
+    if matrix.shape[0] == 0:
+        empty = np.zeros(matrix.shape[1], dtype=np.int64)
+        return empty, empty
+    leader = matrix.argmax(axis=0)
+    if matrix.shape[0] == 1:
+        return leader, matrix[0]
+    top_two = -np.partition(-matrix, 1, axis=0)[:2]
+    return leader, top_two[0] - top_two[1]
+
+
+def _shares(counts, totals):
+    return np.round(np.divide(counts * 100.0, totals, out=np.zeros(counts.shape), where=totals > 0), 2)
+
+
+def _stats(values):
+    if not len(values):
+        return None
+    return {
+        'mean': round(float(values.mean()), 2),
+        'median': round(float(np.median(values)), 2),
+        'min': round(float(values.min()), 2),
+        'max': round(float(values.max()), 2),
+        'std': round(float(values.std()), 2)
+    }
+
+
+def tabulate(elections, candidates, candidate_ids, dimension_codes, dimensions):
+    """
+    elections: [(id, name)]; candidates: [(id, election_id, name)] ordered
+    by id; candidate_ids / dimension_codes: as returned by load_votes.
+    """
+    known_ids = np.array([c[0] for c in candidates], dtype=np.int64)
+    candidate_election = np.array([c[1] for c in candidates], dtype=np.int64)
+    n_candidates = len(candidates)
+
+    # Vote → candidate row (votes for since-deleted candidates are dropped)
+    position = np.minimum(np.searchsorted(known_ids, candidate_ids), max(n_candidates - 1, 0))
+    known = known_ids[position] == candidate_ids if n_candidates else np.zeros(len(candidate_ids), bool)
+
+    sizes = tuple(max(len(labels), 1) for labels, _ in dimension_codes)
+    n_segments = int(np.prod(sizes))
+    segment = np.ravel_multi_index([codes[known] for _, codes in dimension_codes], sizes) \
+        if len(dimension_codes) else np.zeros(int(known.sum()), dtype=np.int64)
+
+    # The whole candidate × segment tally in one pass
+    matrix = np.bincount(position[known] * n_segments + segment, minlength=n_candidates * n_segments) \
+        .reshape(n_candidates, n_segments)
+
+    segment_totals = matrix.sum(axis=0)
+    present = np.flatnonzero(segment_totals)
+    label_codes = np.unravel_index(present, sizes)
+
+    def segment_labels(columns):
+        """{dimension: label} for columns of the `present` segments."""
+        return [
+            {
+                dimension: dimension_codes[d][0][int(label_codes[d][column])]
+                for d, dimension in enumerate(dimensions)
+            }
+            for column in columns
+        ]
+
+    result = []
+    for election_id, election_name in elections:
+        rows = np.flatnonzero(candidate_election == election_id)
+        ids = known_ids[rows].tolist()
+        sub = matrix[rows][:, present]               # candidates × segments with votes overall
+        votes = sub.sum(axis=1)
+        total = int(votes.sum())
+
+        per_segment = sub.sum(axis=0)
+        voted = np.flatnonzero(per_segment)          # segments with votes in this election
+        sub, per_segment = sub[:, voted], per_segment[voted]
+
+        leader, margin = _margins(sub)
+        tied = margin == 0
+        overall_leader, overall_margin = _margins(votes[:, None])
+        margin_share = _shares(margin, per_segment)
+        shares = _shares(sub, per_segment)
+
+        labels = segment_labels(voted)
+        segments = []
+        for s, label in enumerate(labels):
+            segments.append({
+                **label,
+                'votes': int(per_segment[s]),
+                'leader_id': None if tied[s] else ids[int(leader[s])],
+                'margin_votes': int(margin[s]),
+                'margin_percentage': float(margin_share[s]),
+                'candidates': [
+                    {'candidate_id': ids[c], 'votes': int(sub[c, s]), 'percentage': float(shares[c, s])}
+                    for c in range(len(ids))
+                ]
+            })
+
+        led = np.bincount(leader[~tied], minlength=len(ids)) if len(ids) else np.zeros(0, dtype=np.int64)
+        names = {c[0]: c[2] for c in candidates}
+        result.append({
+            'election_id': election_id,
+            'election_name': election_name,
+            'total_votes': total,
+            'candidates': [
+                {
+                    'candidate_id': cid,
+                    'name': names[cid],
+                    'votes': int(votes[c]),
+                    'percentage': float(_shares(votes[c], total)),
+                    'segments_led': int(led[c])
+                }
+                for c, cid in enumerate(ids)
+            ],
+            'margin': {
+                'leader_id': ids[int(overall_leader[0])] if total and overall_margin[0] else None,
+                'votes': int(overall_margin[0]) if len(ids) else 0,
+                'percentage': float(_shares(overall_margin[0], total)) if len(ids) else 0.0
+            },
+            'segment_margins': _stats(margin_share),
+            'segments': segments
+        })
+
+    # Where the votes of the whole election set came from
+    totals = [
+        {**label, 'votes': int(segment_totals[present[s]])}
+        for s, label in enumerate(segment_labels(range(len(present))))
+    ]
+    return {
+        'election_ids': [e[0] for e in elections],
+        'dimensions': list(dimensions),
+        'total_votes': int(segment_totals.sum()),
+        'segments': totals,
+        'elections': result
+    }
+
+
+# ────────────────────────────────────────────────
+# ENTRY POINT
+# ────────────────────────────────────────────────
+def demographics(election_ids, dimensions):
+    """Returns (payload, cache hit?). Raises AnalyticsError for unknown elections."""
+    elections = db.session.execute(
+        select(Election.id, Election.election_name)
+        .where(Election.id.in_(election_ids))
+        .order_by(Election.id)
+    ).all()
+    missing = sorted(set(election_ids) - {e.id for e in elections})
+    if missing:
+        raise AnalyticsError(f"Unknown election ids: {', '.join(map(str, missing))}")
+
+    candidates = db.session.execute(
+        select(Candidate.id, Candidate.election_id, Candidate.name, Candidate.count)
+        .where(Candidate.election_id.in_(election_ids))
+        .order_by(Candidate.id)
+    ).all()
+
+    cache = current_app.extensions['analytics_cache']
+    key = (tuple(election_ids), dimensions, tuple((c.id, c.count or 0) for c in candidates))
+    cached = cache.get(key)
+    if cached is not None:
+        return cached, True
+
+    started = time.perf_counter()
+    candidate_ids, dimension_codes = load_votes(election_ids, dimensions)
+    payload = tabulate(
+        [tuple(e) for e in elections], [(c.id, c.election_id, c.name) for c in candidates],
+        candidate_ids, dimension_codes, dimensions
+    )
+    payload['compute_ms'] = round((time.perf_counter() - started) * 1000, 2)
+
+    cache.put(key, payload)
+    return payload, False
+
+
+def init_analytics(app):
+    # (election ids, dimensions, tallies) → payload
+    cache = TTLCache(
+        maxsize=app.config['ANALYTICS_CACHE_SIZE'],
+        ttl=app.config['ANALYTICS_CACHE_TTL']
+    )
+    app.extensions['analytics_cache'] = cache
+    return cache
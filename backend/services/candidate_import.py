@@ -0,0 +1,178 @@
+# services/candidate_import.py
+# Bulk candidate import from a ZIP holding a manifest CSV and the symbol images.
+#
+# zipfile reads the central directory and then streams each member, so with
+# werkzeug spooling the upload to disk the archive is never held in memory.
+# Every row is validated (same rules as add_candidate) before anything is
+# written; then the symbols are stored by content hash and all candidates are
+# inserted in a single transaction. Any failure leaves no candidates behind
+# (symbols it stored are shared by content, so sweep_symbols() collects them).
+
+import csv
+import io
+import posixpath
+import zipfile
+
+from extensions import db
+from models.candidate import Candidate
+from models.election import Election
+from services.results import invalidate_snapshot
+from services.symbols import (
+    ALLOWED_EXTENSIONS, MAX_FILE_SIZE, allowed_file, store_symbol
+)
+
+MANIFEST_NAME = 'manifest.csv'
+REQUIRED_FIELDS = ['name', 'email', 'roll_no', 'year', 'course', 'major', 'symbol']
+
+
+class CandidateImportError(ValueError):
+    """The archive as a whole is unusable (not a ZIP, no manifest...)."""
+
+
+def _find_manifest(archive):
+    names = [n for n in archive.namelist() if not n.endswith('/')]
+    if MANIFEST_NAME in names:
+        return MANIFEST_NAME
+
+    csvs = [n for n in names if n.lower().endswith('.csv') and not n.startswith('__MACOSX/')]
+    if len(csvs) == 1:
+        return csvs[0]
+    raise CandidateImportError(f'ZIP must contain {MANIFEST_NAME}')
+
+
+def _member(archive, manifest, symbol):
+    """Resolve a manifest symbol path relative to the manifest's folder."""
+    base = posixpath.dirname(manifest)
+    name = posixpath.normpath(posixpath.join(base, symbol.strip().replace('\\', '/')))
+    try:
+        return archive.getinfo(name)
+    except KeyError:
+        return None
+
+
+def _validate(archive, manifest, default_election_id):
+    """Return (rows, errors). Rows hold cleaned values plus their ZipInfo."""
+    rows = []
+    errors = []
+
+    with archive.open(manifest) as raw:
+        reader = csv.DictReader(io.TextIOWrapper(raw, encoding='utf-8-sig'))
+        for number, row in enumerate(reader, start=2):
+            def fail(message):
+                errors.append({'row': number, 'error': message})
+
+            missing = next((f for f in REQUIRED_FIELDS if not (row.get(f) or '').strip()), None)
+            if missing:
+                fail(f'Missing or empty field: {missing}')
+                continue
+
+            try:
+                election_id = int((row.get('election_id') or '').strip() or default_election_id)
+            except (TypeError, ValueError):
+                fail('Missing or invalid election_id')
+                continue
+
+            try:
+                year = int(row['year'])
+                if not (1 <= year <= 5):
+                    fail('Year must be between 1 and 5')
+                    continue
+            except ValueError:
+                fail('Invalid year value')
+                continue
+
+            info = _member(archive, manifest, row['symbol'])
+            if info is None:
+                fail(f"Symbol file not found in ZIP: {row['symbol'].strip()}")
+                continue
+            if not allowed_file(info.filename):
+                fail(f"Invalid file type. Allowed: {', '.join(sorted(ALLOWED_EXTENSIONS))}")
+                continue
+            if info.file_size > MAX_FILE_SIZE:
+                fail('File too large. Max 2MB allowed')
+                continue
+
+            rows.append({
+                'row': number,
+                'election_id': election_id,
+                'name': row['name'].strip(),
+                'email': row['email'].strip(),
+                'roll_no': row['roll_no'].strip(),
+                'course': row['course'].strip(),
+                'major': row['major'].strip(),
+                'year': year,
+                'info': info
+            })
+
+    return rows, errors
+
+
+def _check_uniqueness(rows, errors):
+    """Set-based duplicate and election checks across the whole manifest."""
+    election_ids = {r['election_id'] for r in rows}
+    known = {eid for (eid,) in db.session.query(Election.id).filter(Election.id.in_(election_ids))}
+
+    emails = {r['email'] for r in rows}
+    rolls = {r['roll_no'] for r in rows}
+    taken_emails = {e for (e,) in db.session.query(Candidate.email).filter(Candidate.email.in_(emails))}
+    taken_rolls = {r for (r,) in db.session.query(Candidate.roll_no).filter(Candidate.roll_no.in_(rolls))}
+
+    seen_emails = set()
+    seen_rolls = set()
+    for r in rows:
+        if r['election_id'] not in known:
+            errors.append({'row': r['row'], 'error': 'Invalid election ID'})
+        elif r['email'] in taken_emails or r['email'] in seen_emails:
+            errors.append({'row': r['row'], 'error': f"Email already used: {r['email']}"})
+        elif r['roll_no'] in taken_rolls or r['roll_no'] in seen_rolls:
+            errors.append({'row': r['row'], 'error': f"Roll number already used: {r['roll_no']}"})
+        seen_emails.add(r['email'])
+        seen_rolls.add(r['roll_no'])
+
+
+def import_candidates(stream, default_election_id=None):
+    """
+    Import a candidate ZIP. Returns (created candidates, errors); when
+    errors is non-empty nothing was imported.
+    """
+    try:
+        archive = zipfile.ZipFile(stream)
+    except zipfile.BadZipFile:
+        raise CandidateImportError('File is not a valid ZIP archive')
+
+    with archive:
+        manifest = _find_manifest(archive)
+        rows, errors = _validate(archive, manifest, default_election_id)
+        if not errors and not rows:
+            raise CandidateImportError('Manifest has no candidate rows')
+        if rows:
+            _check_uniqueness(rows, errors)
+        if errors:
+            return [], sorted(errors, key=lambda e: e['row'])
+
+        try:
+            candidates = []
+            for r in rows:
+                with archive.open(r['info']) as image:
+                    symbol, _ = store_symbol(image, r['info'].filename)
+
+                candidates.append(Candidate(
+                    election_id=r['election_id'],
+                    name=r['name'],
+                    roll_no=r['roll_no'],
+                    major=r['major'],
+                    course=r['course'],
+                    year=r['year'],
+                    symbol=symbol,
+                    email=r['email']
+                ))
+
+            db.session.add_all(candidates)
+            for election_id in {r['election_id'] for r in rows}:
+                invalidate_snapshot(election_id)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    return candidates, []
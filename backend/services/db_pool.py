@@ -0,0 +1,135 @@
+# services/db_pool.py
+# Connection pool health for the SQLAlchemy engine.
+#
+# - SQLite connections get WAL and busy_timeout on connect (SQLITE_WAL,
+#   SQLITE_BUSY_TIMEOUT_MS), for the Flask engines and asgi.py's alike.
+# - Pool events feed per-process counters (connects, checkouts, connections
+#   invalidated by pre-ping or errors, checkout timeouts, how long
+#   connections are held), served by GET /api/admin/db/pool. Each gunicorn
+#   worker has its own pool, so the numbers are per worker (see `pid`).
+# - A request that can't get a connection within DB_POOL_TIMEOUT answers
+#   503 + Retry-After instead of a 500.
+
+import os
+import threading
+import time
+
+from flask import jsonify
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+
+from extensions import db
+
+
+def configure_sqlite(engine, config):
+    """Apply the SQLite pragmas to every new connection of `engine`."""
+    if engine.dialect.name != 'sqlite':
+        return
+
+    wal = config.get('SQLITE_WAL', True) and engine.url.database not in (None, '', ':memory:')
+    busy_timeout = int(config.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+
+    @event.listens_for(engine, 'connect')
+    def _pragmas(dbapi_connection, _):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f'PRAGMA busy_timeout = {busy_timeout}')
+            if wal:
+                cursor.execute('PRAGMA journal_mode = WAL')
+                # Durable at checkpoints; the usual pairing with WAL
+                cursor.execute('PRAGMA synchronous = NORMAL')
+        finally:
+            cursor.close()
+
+
+class PoolMetrics:
+    """Thread-safe counters fed by pool events."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.invalidated = 0
+        self.timeouts = 0
+        self.peak_checked_out = 0
+        self.held_total = 0.0
+        self.held_max = 0.0
+        self._checked_out = 0
+
+        event.listen(engine, 'connect', self._on_connect)
+        event.listen(engine, 'checkout', self._on_checkout)
+        event.listen(engine, 'checkin', self._on_checkin)
+        event.listen(engine, 'invalidate', self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, record, proxy):
+        record.info['checked_out_at'] = time.monotonic()
+        with self._lock:
+            self.checkouts += 1
+            self._checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self._checked_out)
+
+    def _on_checkin(self, dbapi_connection, record):
+        started = record.info.pop('checked_out_at', None)
+        if started is None:
+            return
+        held = time.monotonic() - started
+        with self._lock:
+            self._checked_out -= 1
+            self.held_total += held
+            self.held_max = max(self.held_max, held)
+
+    def _on_invalidate(self, dbapi_connection, record, exception):
+        with self._lock:
+            self.invalidated += 1
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self):
+        pool = self.engine.pool
+        with self._lock:
+            data = {
+                'pid': os.getpid(),
+                'pool_class': type(pool).__name__,
+                'status': pool.status(),
+                'connects': self.connects,
+                'checkouts': self.checkouts,
+                'invalidated': self.invalidated,
+                'timeouts': self.timeouts,
+                'peak_checked_out': self.peak_checked_out,
+                'held_avg_ms': round(self.held_total / self.checkouts * 1000, 2) if self.checkouts else 0,
+                'held_max_ms': round(self.held_max * 1000, 2)
+            }
+        # QueuePool only (SQLite in-memory uses StaticPool)
+        for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+            method = getattr(pool, name, None)
+            if callable(method):
+                data[name] = method()
+        return data
+
+
+def init_db_pool(app):
+    """Call right after db.init_app(app), before anything connects."""
+    with app.app_context():
+        engines = dict(db.engines)
+    for engine in engines.values():
+        # Primary and read replicas alike
+        configure_sqlite(engine, app.config)
+    metrics = PoolMetrics(engines[None])
+    app.extensions['db_pool_metrics'] = metrics
+
+    @app.errorhandler(PoolTimeout)
+    def _pool_exhausted(e):
+        metrics.record_timeout()
+        app.logger.error(f"Database pool exhausted: {str(e)}")
+        response = jsonify({"error": "Server busy, please retry"})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+
+    return metrics
@@ -0,0 +1,44 @@
+# services/election_queries.py
+# Queries the election, results and voting routes run on every request.
+# The routes build them here so `flask db-explain` (services/query_plans.py)
+# checks the plans of the exact statements they execute.
+
+from sqlalchemy import func
+
+from extensions import db
+from models.candidate import Candidate
+from models.election import Election
+from models.result_snapshot import ResultSnapshot
+from models.vote import Vote
+
+# Newest-first election listings (served by ix_elections_date)
+NEWEST_FIRST = [(Election.election_date, True), (Election.id, True)]
+
+
+def upcoming_elections():
+    return Election.query.filter_by(election_status='UPCOMING')
+
+
+def closed_elections():
+    """Most recently ended first."""
+    return Election.query.filter_by(election_status='CLOSED').order_by(Election.end_date.desc())
+
+
+def closed_snapshots(election_ids):
+    return ResultSnapshot.query.filter(ResultSnapshot.election_id.in_(election_ids))
+
+
+def candidate_totals(election_ids):
+    """(election_id, votes) for each election, from the candidate tallies."""
+    return db.session.query(Candidate.election_id, func.sum(Candidate.count)) \
+        .filter(Candidate.election_id.in_(election_ids)) \
+        .group_by(Candidate.election_id)
+
+
+def election_candidates(election_id):
+    return Candidate.query.filter_by(election_id=election_id).order_by(Candidate.id)
+
+
+def voter_ballot(voter_id, election_id):
+    """The voter's vote in the election, if any."""
+    return Vote.query.filter_by(voter_id=voter_id, election_id=election_id)
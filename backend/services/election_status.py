@@ -0,0 +1,179 @@
+# services/election_status.py
+# UPCOMING → ACTIVE → CLOSED transitions, driven by the election schedule
+# instead of by whoever happens to hit a results endpoint. Every worker runs
+# a scheduler, but only the holder of the 'election-status' lease applies
+# boundaries, so the UPDATEs and report pre-rendering happen once.
+
+import threading
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import and_, or_, update
+
+from extensions import db
+from models.election import Election
+from services.reports import prerender_reports
+from services.workers import acquire_lease
+
+# Spelled as IN rather than != 'CLOSED' so ix_elections_status_end can serve it
+OPEN_STATUSES = ('UPCOMING', 'ACTIVE')
+
+STATUS_LEASE = 'election-status'
+
+
+def _has_started(now):
+    return or_(
+        Election.election_date < now.date(),
+        and_(Election.election_date == now.date(), Election.election_time <= now.time())
+    )
+
+
+def _has_ended(now):
+    # Matches the voting window check: an election is over once now > end
+    return or_(
+        Election.end_date < now.date(),
+        and_(Election.end_date == now.date(), Election.end_time < now.time())
+    )
+
+
+# The status engine's queries (also checked by `flask db-explain`)
+def due_to_close(now):
+    """Ids of open elections whose end has passed."""
+    return db.session.query(Election.id) \
+        .filter(Election.election_status.in_(OPEN_STATUSES), _has_ended(now))
+
+
+def next_start():
+    """Earliest start among UPCOMING elections."""
+    return db.session.query(Election.election_date, Election.election_time) \
+        .filter(Election.election_status == 'UPCOMING') \
+        .order_by(Election.election_date, Election.election_time) \
+        .limit(1)
+
+
+def next_end():
+    """Earliest end among open elections."""
+    return db.session.query(Election.end_date, Election.end_time) \
+        .filter(Election.election_status.in_(OPEN_STATUSES)) \
+        .order_by(Election.end_date, Election.end_time) \
+        .limit(1)
+
+
+def refresh_election_statuses(now=None):
+    """
+    Apply every due status transition with one bulk UPDATE per target state.
+    Returns (ids of elections that just closed, number activated).
+    """
+    now = now or datetime.now()
+
+    closed_ids = [row.id for row in due_to_close(now)]
+
+    if closed_ids:
+        db.session.execute(
+            update(Election)
+            .where(Election.id.in_(closed_ids))
+            .values(election_status='CLOSED')
+            .execution_options(synchronize_session=False)
+        )
+
+    activated = db.session.execute(
+        update(Election)
+        .where(Election.election_status == 'UPCOMING', _has_started(now), ~_has_ended(now))
+        .values(election_status='ACTIVE')
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    db.session.commit()
+    return closed_ids, activated
+
+
+def next_status_boundary():
+    """Earliest future start/end among elections that can still transition."""
+    candidates = []
+
+    start = next_start().first()
+    if start:
+        candidates.append(datetime.combine(*start))
+
+    end = next_end().first()
+    if end:
+        # Closing is strict (now > end), so wake just past the end time
+        candidates.append(datetime.combine(*end) + timedelta(seconds=1))
+
+    return min(candidates) if candidates else None
+
+
+def run_status_boundary(app, lease_seconds):
+    """
+    One scheduler pass: if this worker holds (or can take) the status lease,
+    apply the due transitions and pre-render reports for elections that just
+    closed. Returns the next boundary, or None when there is none or another
+    worker holds the lease.
+    """
+    if not acquire_lease(STATUS_LEASE, lease_seconds):
+        return None
+
+    closed_ids, activated = refresh_election_statuses()
+    if closed_ids or activated:
+        app.logger.info(f"Election status engine closed {len(closed_ids)}, activated {activated}")
+    if closed_ids and app.config.get('REPORT_PRERENDER'):
+        prerender_reports(closed_ids)
+    return next_status_boundary()
+
+
+class ElectionStatusScheduler:
+    """
+    Background thread that sleeps until the next status boundary (capped at
+    max_sleep so edits made in other workers are picked up), then applies
+    the due transitions. Each worker runs one, but only the lease holder
+    does the work; the lease outlives a few max_sleep cycles so another
+    worker takes over if the holder dies.
+    """
+
+    def __init__(self, app, max_sleep=60):
+        self.app = app
+        self.max_sleep = max_sleep
+        self.lease_seconds = max_sleep * 3
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='election-status', daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        """Recompute the next boundary now (e.g. after an election edit)."""
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.clear()
+            boundary = None
+            with self.app.app_context():
+                try:
+                    boundary = run_status_boundary(self.app, self.lease_seconds)
+                except Exception as e:
+                    db.session.rollback()
+                    self.app.logger.error(f"Election status refresh failed: {str(e)}", exc_info=True)
+                finally:
+                    db.session.remove()
+
+            sleep = self.max_sleep
+            if boundary:
+                sleep = min(max((boundary - datetime.now()).total_seconds(), 0), self.max_sleep)
+
+            self._wake.wait(sleep)
+
+
+def init_status_scheduler(app):
+    if not app.config.get('ELECTION_STATUS_SCHEDULER'):
+        return None
+
+    scheduler = ElectionStatusScheduler(app, max_sleep=app.config['ELECTION_STATUS_MAX_SLEEP'])
+    app.extensions['election_status_scheduler'] = scheduler
+    return scheduler
+
+
+def election_schedule_changed():
+    """Call after creating/editing an election so its status is current."""
+    refresh_election_statuses()
+    scheduler = current_app.extensions.get('election_status_scheduler')
+    if scheduler:
+        scheduler.wake()
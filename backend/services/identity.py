@@ -0,0 +1,76 @@
+# services/identity.py
+# Who is calling, without a database round trip.
+#
+# - Voter tokens carry id, roll_no, year and major as additional claims for
+#   clients that only need those. The API itself only trusts the identity:
+#   claims stay as issued until the voter gets a new token.
+# - Profile data is served from a bounded per-process LRU cache with a TTL
+#   (services/cache.py), keyed by voter id. Invalidation is local: a profile update clears the
+#   entry in the worker that handled it (and returns the new profile), but
+#   other workers keep serving the old one until their entry expires, i.e.
+#   for up to IDENTITY_CACHE_TTL seconds.
+
+from flask import current_app
+from flask_jwt_extended import create_access_token
+
+from extensions import db
+from models.voter import Voter
+from services.cache import TTLCache
+
+PROFILE_FIELDS = ('id', 'student_name', 'roll_no', 'major', 'course', 'year', 'email')
+
+
+def init_identity_cache(app):
+    # voter id → profile dict
+    cache = TTLCache(
+        maxsize=app.config['IDENTITY_CACHE_SIZE'],
+        ttl=app.config['IDENTITY_CACHE_TTL']
+    )
+    app.extensions['identity_cache'] = cache
+    return cache
+
+
+# ────────────────────────────────────────────────
+# TOKENS
+# ────────────────────────────────────────────────
+def voter_claims(voter):
+    return {
+        'voter_id': voter.id,
+        'roll_no': voter.roll_no,
+        'year': voter.year,
+        'major': voter.major
+    }
+
+
+def create_voter_token(voter):
+    return create_access_token(identity=str(voter.id), additional_claims=voter_claims(voter))
+
+
+# ────────────────────────────────────────────────
+# PROFILES
+# ────────────────────────────────────────────────
+def voter_profile(voter):
+    return {field: getattr(voter, field) for field in PROFILE_FIELDS}
+
+
+def cached_voter_profile(voter_id):
+    """Cached profile dict for a voter, or None if the voter does not exist."""
+    voter_id = int(voter_id)
+    cache = current_app.extensions['identity_cache']
+
+    profile = cache.get(voter_id)
+    if profile is not None:
+        return profile
+
+    voter = db.session.get(Voter, voter_id)
+    if voter is None:
+        return None
+
+    profile = voter_profile(voter)
+    cache.put(voter_id, profile)
+    return profile
+
+
+def invalidate_voter(voter_id):
+    """Call after changing a voter's profile fields."""
+    current_app.extensions['identity_cache'].invalidate(int(voter_id))
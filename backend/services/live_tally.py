@@ -0,0 +1,240 @@
+# services/live_tally.py
+# Live vote tallies for open dashboards (SSE / long-poll).
+#
+# One publisher thread per worker computes the tallies of every election
+# that has at least one listener with a single query per tick, and fans the
+# changed counts out to in-memory subscriber queues, so N open dashboards
+# cost one query per tick instead of N.
+#
+# Workers tell each other that votes landed through signal files in
+# LIVE_TALLY_DIR (one per election, touched after each vote commit): a
+# publisher only queries when a signal file's mtime moved, or every
+# LIVE_TALLY_MAX_INTERVAL seconds to pick up admin edits.
+
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+
+from flask import current_app
+
+from extensions import db
+from models.candidate import Candidate
+
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class TallyState:
+    __slots__ = ('counts', 'total', 'version')
+
+    def __init__(self, counts):
+        self.counts = counts
+        self.total = sum(counts.values())
+        # Same counts → same version in every worker, so reconnects
+        # (Last-Event-ID / ?since=) work across workers
+        raw = ','.join(f'{cid}:{n}' for cid, n in sorted(counts.items()))
+        self.version = hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+    def snapshot(self, election_id):
+        return {
+            'type': 'snapshot',
+            'election_id': election_id,
+            'version': self.version,
+            'total_votes': self.total,
+            'counts': {str(cid): n for cid, n in self.counts.items()}
+        }
+
+    def delta(self, election_id, previous):
+        changes = {}
+        for cid, n in self.counts.items():
+            before = previous.counts.get(cid, 0)
+            if n != before:
+                changes[str(cid)] = {'count': n, 'delta': n - before}
+        return {
+            'type': 'delta',
+            'election_id': election_id,
+            'version': self.version,
+            'total_votes': self.total,
+            'changes': changes,
+            'removed': [str(cid) for cid in previous.counts if cid not in self.counts]
+        }
+
+
+def sse_event(event):
+    """Format a tally event as a text/event-stream message (id = version)."""
+    return f"id: {event['version']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+def _query_tallies(election_ids):
+    """Current counts for several elections in one indexed query."""
+    counts = {eid: {} for eid in election_ids}
+    rows = db.session.query(Candidate.election_id, Candidate.id, Candidate.count) \
+        .filter(Candidate.election_id.in_(election_ids))
+    for election_id, candidate_id, count in rows:
+        counts[election_id][candidate_id] = count or 0
+    return {eid: TallyState(c) for eid, c in counts.items()}
+
+
+class TallyPublisher:
+
+    def __init__(self, app, tick=0.25, max_interval=5.0, signal_dir=None):
+        self.app = app
+        self.tick = tick
+        self.max_interval = max_interval
+        self.signal_dir = signal_dir
+
+        self._lock = threading.Lock()
+        self._subscribers = {}     # election id → set of queues
+        self._states = {}          # election id → TallyState
+        self._signals = {}         # election id → last seen signal mtime
+        self._refreshed = {}       # election id → monotonic time of last query
+        self._dirty = set()        # elections poked by a vote in this worker
+        self._wake = threading.Event()
+
+        if signal_dir:
+            os.makedirs(signal_dir, exist_ok=True)
+
+        self._thread = threading.Thread(target=self._run, name='live-tally', daemon=True)
+        self._thread.start()
+
+    # ── Subscribers ──
+    def subscribe(self, election_id, listener=None):
+        """
+        Register a listener; returns (queue, current TallyState). `listener`
+        may be any object with put_nowait() (e.g. an asyncio bridge);
+        by default a bounded queue.Queue is created.
+        """
+        q = listener if listener is not None else queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.setdefault(election_id, set()).add(q)
+            state = self._states.get(election_id)
+
+        if state is None:
+            # First listener in this worker: compute once, then the publisher owns it
+            state = _query_tallies([election_id])[election_id]
+            with self._lock:
+                state = self._states.setdefault(election_id, state)
+                self._refreshed.setdefault(election_id, time.monotonic())
+                self._signals.setdefault(election_id, self._signal_mtime(election_id))
+
+        self._wake.set()
+        return q, state
+
+    def unsubscribe(self, election_id, q):
+        with self._lock:
+            listeners = self._subscribers.get(election_id)
+            if listeners:
+                listeners.discard(q)
+                if not listeners:
+                    del self._subscribers[election_id]
+                    self._states.pop(election_id, None)
+                    self._signals.pop(election_id, None)
+                    self._refreshed.pop(election_id, None)
+
+    def current(self, election_id):
+        with self._lock:
+            return self._states.get(election_id)
+
+    # ── Vote notifications ──
+    def _signal_path(self, election_id):
+        return os.path.join(self.signal_dir, f'{election_id}.signal')
+
+    def _signal_mtime(self, election_id):
+        if not self.signal_dir:
+            return None
+        try:
+            return os.stat(self._signal_path(election_id)).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def announce(self, election_id):
+        """A vote for this election committed: tell this and other workers."""
+        if self.signal_dir:
+            path = self._signal_path(election_id)
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                open(path, 'a').close()
+
+        with self._lock:
+            if election_id in self._subscribers:
+                self._dirty.add(election_id)
+                self._wake.set()
+
+    # ── Publisher loop ──
+    def _due(self, now):
+        due = []
+        with self._lock:
+            for election_id in self._subscribers:
+                mtime = self._signal_mtime(election_id)
+                if (election_id in self._dirty
+                        or mtime != self._signals.get(election_id)
+                        or now - self._refreshed.get(election_id, 0) >= self.max_interval):
+                    due.append(election_id)
+                    self._signals[election_id] = mtime
+            self._dirty.difference_update(due)
+        return due
+
+    def _publish(self, states, now):
+        with self._lock:
+            for election_id, state in states.items():
+                listeners = self._subscribers.get(election_id)
+                if not listeners:
+                    continue
+                previous = self._states.get(election_id)
+                self._states[election_id] = state
+                self._refreshed[election_id] = now
+                if previous is not None and previous.version == state.version:
+                    continue
+
+                event = state.delta(election_id, previous) if previous else state.snapshot(election_id)
+                for q in list(listeners):
+                    try:
+                        q.put_nowait(event)
+                    except queue.Full:
+                        # Slow reader: drop its backlog, resync with a snapshot
+                        with q.mutex:
+                            q.queue.clear()
+                        q.put_nowait(state.snapshot(election_id))
+
+    def _run(self):
+        while True:
+            with self._lock:
+                idle = not self._subscribers
+            if idle:
+                self._wake.wait()
+            self._wake.clear()
+
+            now = time.monotonic()
+            due = self._due(now)
+            if due:
+                with self.app.app_context():
+                    try:
+                        self._publish(_query_tallies(due), now)
+                    except Exception as e:
+                        db.session.rollback()
+                        self.app.logger.error(f"Live tally refresh failed: {str(e)}", exc_info=True)
+                    finally:
+                        db.session.remove()
+
+            self._wake.wait(self.tick)
+
+
+def init_live_tally(app):
+    publisher = TallyPublisher(
+        app,
+        tick=app.config['LIVE_TALLY_TICK_MS'] / 1000.0,
+        max_interval=app.config['LIVE_TALLY_MAX_INTERVAL'],
+        signal_dir=app.config['LIVE_TALLY_DIR']
+    )
+    app.extensions['live_tally'] = publisher
+    return publisher
+
+
+def announce_vote(election_id):
+    """Call after a vote commits."""
+    publisher = current_app.extensions.get('live_tally')
+    if publisher:
+        publisher.announce(int(election_id))
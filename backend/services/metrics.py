@@ -0,0 +1,256 @@
+# services/metrics.py
+# Request instrumentation and logging.
+#
+# - Every request is recorded under its endpoint (blueprint.view, e.g.
+#   "results.get_election_results"): a latency histogram, how many SQL
+#   statements it executed and how long they took (cursor events on every
+#   engine, primary and replicas). Requests that match no route share the
+#   "<unmatched>" label so the number of series stays bounded.
+# - GET /metrics serves them in the Prometheus text format together with
+#   the connection pool counters from services/db_pool.py. Like the pool,
+#   the numbers are per worker process (see voting_worker_info).
+#   METRICS_TOKEN, when set, must be sent as a bearer token.
+# - Log records go through a QueueHandler; a single listener thread does
+#   the actual writing, so a slow stdout never stalls a request. When the
+#   queue is full records are dropped (and counted) rather than blocking.
+
+import atexit
+import hmac
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from collections import defaultdict
+from logging.handlers import QueueHandler, QueueListener
+
+from flask import Response, g, has_request_context, request
+from flask.logging import default_handler
+from sqlalchemy import event
+
+from extensions import db
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+
+LOG_FORMAT = '%(asctime)s %(levelname)s [%(process)d] %(name)s: %(message)s'
+
+
+# ────────────────────────────────────────────────
+# Logging
+# ────────────────────────────────────────────────
+
+class _DroppingQueueHandler(QueueHandler):
+    """Never blocks the caller: a full queue drops the record."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def init_logging(app):
+    """Route the root logger (and with it app.logger, werkzeug, ...) through a queue."""
+    handler = _DroppingQueueHandler(queue.Queue(maxsize=app.config['LOG_QUEUE_SIZE']))
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(logging.Formatter(LOG_FORMAT))
+    listener = QueueListener(handler.queue, output, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(app.config['LOG_LEVEL'])
+    # Flask's own stderr handler would write synchronously alongside ours
+    app.logger.removeHandler(default_handler)
+    app.logger.setLevel(app.config['LOG_LEVEL'])
+
+    app.extensions['log_queue_handler'] = handler
+    return handler
+
+
+# ────────────────────────────────────────────────
+# Request metrics
+# ────────────────────────────────────────────────
+
+class _Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+
+class RequestMetrics:
+    """Thread-safe per-endpoint counters and histograms for this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = defaultdict(int)          # (endpoint, method, status) → count
+        self.latency = {}                         # (endpoint, method) → _Histogram
+        self.statements = {}                      # endpoint → _Histogram
+        self.db_seconds = defaultdict(float)      # endpoint → seconds
+
+    def record(self, endpoint, method, status, seconds, statements=None, db_seconds=0.0):
+        with self._lock:
+            self.requests[(endpoint, method, str(status))] += 1
+            hist = self.latency.get((endpoint, method))
+            if hist is None:
+                hist = self.latency[(endpoint, method)] = _Histogram(LATENCY_BUCKETS)
+            hist.observe(seconds)
+            # The ASGI fast paths use the async engines, which aren't counted
+            if statements is not None:
+                hist = self.statements.get(endpoint)
+                if hist is None:
+                    hist = self.statements[endpoint] = _Histogram(STATEMENT_BUCKETS)
+                hist.observe(statements)
+                self.db_seconds[endpoint] += db_seconds
+
+    def render(self, pool=None, dropped_logs=0):
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+
+        def header(name, kind, text):
+            lines.append(f'# HELP {name} {text}')
+            lines.append(f'# TYPE {name} {kind}')
+
+        def histogram(name, labels, hist):
+            cumulative = 0
+            for bound, count in zip(hist.buckets, hist.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{_labels(labels, le=_number(bound))} {cumulative}')
+            lines.append(f'{name}_bucket{_labels(labels, le="+Inf")} {hist.count}')
+            lines.append(f'{name}_sum{_labels(labels)} {_number(hist.sum)}')
+            lines.append(f'{name}_count{_labels(labels)} {hist.count}')
+
+        with self._lock:
+            header('voting_worker_info', 'gauge', 'Worker process serving this scrape.')
+            lines.append(f'voting_worker_info{_labels({"pid": os.getpid()})} 1')
+
+            header('voting_http_requests_total', 'counter', 'Requests by endpoint, method and status.')
+            for (endpoint, method, status), count in sorted(self.requests.items()):
+                labels = {'endpoint': endpoint, 'method': method, 'status': status}
+                lines.append(f'voting_http_requests_total{_labels(labels)} {count}')
+
+            header('voting_http_request_duration_seconds', 'histogram', 'Request latency.')
+            for (endpoint, method), hist in sorted(self.latency.items()):
+                histogram('voting_http_request_duration_seconds',
+                          {'endpoint': endpoint, 'method': method}, hist)
+
+            header('voting_db_statements_per_request', 'histogram', 'SQL statements executed per request.')
+            for endpoint, hist in sorted(self.statements.items()):
+                histogram('voting_db_statements_per_request', {'endpoint': endpoint}, hist)
+
+            header('voting_db_time_seconds_total', 'counter', 'Time spent executing SQL, by endpoint.')
+            for endpoint, seconds in sorted(self.db_seconds.items()):
+                lines.append(f'voting_db_time_seconds_total{_labels({"endpoint": endpoint})} '
+                             f'{_number(seconds)}')
+
+        if pool:
+            for key, kind, text in (
+                ('checkedout', 'gauge', 'Connections currently checked out.'),
+                ('peak_checked_out', 'gauge', 'Most connections checked out at once.'),
+                ('connects', 'counter', 'New DB connections opened.'),
+                ('checkouts', 'counter', 'Connection checkouts.'),
+                ('invalidated', 'counter', 'Connections invalidated (pre-ping, errors).'),
+                ('timeouts', 'counter', 'Requests that timed out waiting for a connection.')
+            ):
+                if key in pool:
+                    name = f'voting_db_pool_{key}' + ('_total' if kind == 'counter' else '')
+                    header(name, kind, text)
+                    lines.append(f'{name} {pool[key]}')
+
+        header('voting_log_records_dropped_total', 'counter', 'Log records dropped on a full queue.')
+        lines.append(f'voting_log_records_dropped_total {dropped_logs}')
+        return '\n'.join(lines) + '\n'
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _labels(labels, **extra):
+    labels = {**labels, **extra}
+    escaped = (
+        f'{key}="' + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for key, value in labels.items()
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+def _instrument_engine(engine):
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _started(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('metrics_started', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _finished(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info['metrics_started'].pop()
+        # Background threads (vote buffer, scheduler) aren't attributed to a request
+        if has_request_context():
+            g.metrics_statements = g.get('metrics_statements', 0) + 1
+            g.metrics_db_seconds = g.get('metrics_db_seconds', 0.0) + time.perf_counter() - started
+
+    @event.listens_for(engine, 'handle_error')
+    def _failed(context):
+        # Failed statements never reach after_cursor_execute
+        if context.connection is not None:
+            stack = context.connection.info.get('metrics_started')
+            if stack:
+                stack.pop()
+
+
+def init_metrics(app):
+    """Call after db.init_app(app)."""
+    metrics = RequestMetrics()
+    app.extensions['request_metrics'] = metrics
+
+    with app.app_context():
+        for engine in db.engines.values():
+            _instrument_engine(engine)
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _record(response):
+        started = g.pop('metrics_started', None)
+        if started is not None:
+            metrics.record(
+                request.endpoint or '<unmatched>', request.method, response.status_code,
+                time.perf_counter() - started,
+                g.pop('metrics_statements', 0), g.pop('metrics_db_seconds', 0.0)
+            )
+        return response
+
+    def metrics_endpoint():
+        token = app.config.get('METRICS_TOKEN')
+        if token:
+            supplied = request.headers.get('Authorization', '').removeprefix('Bearer ')
+            if not hmac.compare_digest(supplied.encode(), token.encode()):
+                return Response('Unauthorized\n', status=401, mimetype='text/plain')
+
+        pool = app.extensions.get('db_pool_metrics')
+        logs = app.extensions.get('log_queue_handler')
+        body = metrics.render(pool.snapshot() if pool else None, logs.dropped if logs else 0)
+        return Response(body, mimetype='text/plain; version=0.0.4')
+
+    app.add_url_rule('/metrics', 'metrics', metrics_endpoint, methods=['GET'])
+    return metrics
@@ -0,0 +1,200 @@
+# services/pagination.py
+# Keyset (cursor) pagination, `fields=` projection and cached totals for
+# the list endpoints.
+#
+# Every list response is one page, DEFAULT_LIMIT rows unless `limit` asks
+# for another size (at most MAX_LIMIT), so no response grows with the table:
+#   {"items": [...], "next_cursor": "...", "limit": n, "total": n?}
+# Clients pass `next_cursor` back as `cursor` for the following page;
+# `total` is only computed when `include_total=true` is passed.
+
+import base64
+import json
+import threading
+import time
+from datetime import date, datetime, time as dt_time
+
+from flask import current_app, request
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import load_only
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+_PAGING_ARGS = {'limit', 'cursor', 'fields', 'include_total'}
+
+_count_cache = {}
+_count_lock = threading.Lock()
+
+
+class PaginationError(ValueError):
+    """Bad limit/cursor/fields argument; endpoints answer 400."""
+
+
+# ────────────────────────────────────────────────
+# FIELD SELECTION
+# ────────────────────────────────────────────────
+def requested_fields(allowed):
+    """
+    Fields named in `fields=a,b,c` (in `allowed` order), or all of `allowed`.
+    `allowed` maps field name → model column names needed to produce it.
+    """
+    raw = request.args.get('fields')
+    if not raw:
+        return list(allowed)
+
+    wanted = {f.strip() for f in raw.split(',') if f.strip()}
+    unknown = wanted - set(allowed)
+    if unknown:
+        raise PaginationError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+
+    return [f for f in allowed if f in wanted]
+
+
+def load_fields(model, allowed, fields, always=('id',)):
+    """load_only() option that fetches just the columns `fields` need."""
+    columns = set(always)
+    for field in fields:
+        columns.update(allowed[field])
+    return load_only(*[getattr(model, c) for c in sorted(columns)])
+
+
+def project(row, fields, computed=None):
+    """
+    Serialize only `fields` of a row. Dates come out as ISO strings and
+    times as HH:MM, as in the models' to_dict().
+    """
+    computed = computed or {}
+    data = {}
+    for field in fields:
+        value = computed[field](row) if field in computed else getattr(row, field)
+        if isinstance(value, (date, datetime)):
+            value = value.isoformat()
+        elif isinstance(value, dt_time):
+            value = value.strftime('%H:%M')
+        data[field] = value
+    return data
+
+
+# ────────────────────────────────────────────────
+# CURSORS
+# ────────────────────────────────────────────────
+def _encode_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(column, value):
+    python_type = getattr(column.type, 'python_type', None)
+    if value is not None and python_type is date:
+        return date.fromisoformat(value)
+    if value is not None and python_type is datetime:
+        return datetime.fromisoformat(value)
+    return value
+
+
+def encode_cursor(values):
+    raw = json.dumps([_encode_value(v) for v in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, order):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not isinstance(values, list) or len(values) != len(order):
+            raise ValueError
+        return [_decode_value(col, v) for (col, _), v in zip(order, values)]
+    except (ValueError, TypeError):
+        raise PaginationError('Invalid cursor')
+
+
+def _after(order, values):
+    """WHERE clause selecting rows strictly after `values` in `order`."""
+    clauses = []
+    for i, (column, descending) in enumerate(order):
+        equal = [order[j][0] == values[j] for j in range(i)]
+        beyond = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*equal, beyond))
+    return or_(*clauses)
+
+
+# ────────────────────────────────────────────────
+# TOTALS
+# ────────────────────────────────────────────────
+def _cached_total(query):
+    """COUNT(*) of the filtered query, cached per endpoint + filter args."""
+    filters = tuple(sorted(
+        (k, v) for k, v in request.args.items(multi=True) if k not in _PAGING_ARGS
+    ))
+    key = (request.endpoint, filters)
+    ttl = current_app.config.get('PAGINATION_COUNT_TTL', 30)
+    now = time.monotonic()
+
+    with _count_lock:
+        hit = _count_cache.get(key)
+    if hit and hit[0] > now:
+        return hit[1]
+
+    total = query.order_by(None).count()
+
+    with _count_lock:
+        if len(_count_cache) > 1024:
+            _count_cache.clear()
+        _count_cache[key] = (now + ttl, total)
+    return total
+
+
+# ────────────────────────────────────────────────
+# ENTRY POINT
+# ────────────────────────────────────────────────
+def order_query(query, order):
+    """ORDER BY for a paginate() order list."""
+    return query.order_by(*[col.desc() if desc else col.asc() for col, desc in order])
+
+
+def page_body(rows, order, serialize, limit):
+    """Response envelope for up to limit + 1 rows fetched in `order`."""
+    # The extra row only tells us whether there is a next page
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    body = {
+        'items': [serialize(row) for row in rows],
+        'next_cursor': None,
+        'limit': limit
+    }
+    if has_more:
+        last = rows[-1]
+        body['next_cursor'] = encode_cursor([getattr(last, col.key) for col, _ in order])
+    return body
+
+
+def paginate(query, order, serialize, options=()):
+    """
+    Run `query` (filters only, no ORDER BY) one keyset page at a time.
+
+    order:     [(column, descending), ...] ending in a unique column
+    serialize: row → dict
+    options:   loader options (e.g. load_fields / subqueryload)
+    """
+    ordered = order_query(query.options(*options), order)
+
+    try:
+        limit = int(request.args.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise PaginationError('limit must be a number')
+    limit = max(1, min(limit, MAX_LIMIT))
+
+    page_query = ordered
+    cursor = request.args.get('cursor')
+    if cursor:
+        page_query = page_query.filter(_after(order, decode_cursor(cursor, order)))
+
+    body = page_body(page_query.limit(limit + 1).all(), order, serialize, limit)
+
+    if request.args.get('include_total', '').lower() == 'true':
+        body['total'] = _cached_total(query)
+
+    return body
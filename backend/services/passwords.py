@@ -0,0 +1,138 @@
+# services/passwords.py
+# Voter password hashing with a configurable algorithm/cost.
+#
+# - PASSWORD_HASH_METHOD is any werkzeug method string ('scrypt',
+#   'scrypt:16384:8:1', 'pbkdf2:sha256:260000', ...). Stored hashes made
+#   with other parameters still verify and are rehashed on the next login.
+# - Verification runs in a bounded thread pool (hashlib's scrypt/pbkdf2
+#   release the GIL), so each worker process runs at most
+#   PASSWORD_HASH_WORKERS hashes at once. The bound is per process: the
+#   default divides the CPUs among the WEB_CONCURRENCY gunicorn workers.
+#   The request thread still waits for its hash, so the pool limits CPU
+#   use, not blocked request threads. Once PASSWORD_HASH_MAX_PENDING logins
+#   are waiting, new ones get PasswordBusy (503) instead of queueing.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash, generate_password_hash
+
+DEFAULT_METHOD = 'scrypt'
+
+_prefixes = {}
+_prefix_lock = threading.Lock()
+
+
+class PasswordBusy(RuntimeError):
+    """Too many password checks already queued; endpoints answer 503."""
+
+
+def _method():
+    if has_app_context():
+        return current_app.config.get('PASSWORD_HASH_METHOD', DEFAULT_METHOD)
+    return DEFAULT_METHOD
+
+
+def hash_password(password, method=None):
+    return generate_password_hash(password, method=method or _method())
+
+
+def _method_prefix(method):
+    """Fully expanded parameters for a method ('scrypt' → 'scrypt:32768:8:1')."""
+    with _prefix_lock:
+        prefix = _prefixes.get(method)
+    if prefix is None:
+        prefix = generate_password_hash('', method=method).split('$', 1)[0]
+        with _prefix_lock:
+            _prefixes[method] = prefix
+    return prefix
+
+
+def needs_rehash(stored, method=None):
+    """True if `stored` was hashed with different parameters than configured."""
+    return stored.split('$', 1)[0] != _method_prefix(method or _method())
+
+
+# ────────────────────────────────────────────────
+# BOUNDED VERIFICATION POOL
+# ────────────────────────────────────────────────
+class PasswordHasher:
+
+    def __init__(self, workers=4, max_pending=64):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordBusy()
+        try:
+            return self._executor.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def verify(self, stored, password):
+        return self._run(check_password_hash, stored, password)
+
+    def hash(self, password, method):
+        return self._run(generate_password_hash, password, method)
+
+
+def init_password_hasher(app):
+    hasher = PasswordHasher(
+        workers=app.config['PASSWORD_HASH_WORKERS'],
+        max_pending=app.config['PASSWORD_HASH_MAX_PENDING']
+    )
+    app.extensions['password_hasher'] = hasher
+    return hasher
+
+
+def verify_and_upgrade(voter, password):
+    """
+    Check a voter's password in the hashing pool. On success, if the stored
+    hash uses old parameters, replace it (the caller commits). Raises
+    PasswordBusy when the pool is saturated.
+    """
+    hasher = current_app.extensions['password_hasher']
+    if not hasher.verify(voter.password, password):
+        return False
+
+    method = _method()
+    if needs_rehash(voter.password, method):
+        voter.password = hasher.hash(password, method)
+    return True
+
+
+# ────────────────────────────────────────────────
+# TUNING
+# ────────────────────────────────────────────────
+def register_password_commands(app):
+    @app.cli.command('password-bench')
+    def password_bench():
+        """
+        Raw verifications/second of PASSWORD_HASH_METHOD through the hashing
+        pool. End-to-end login throughput: python -m bench.login_throughput.
+        """
+        method = _method()
+        stored = hash_password('benchmark-password', method)
+        hasher = current_app.extensions['password_hasher']
+        # Twice the pool size keeps it saturated without tripping max_pending
+        threads = app.config['PASSWORD_HASH_WORKERS'] * 2
+        per_thread = 10
+
+        def login_storm():
+            for _ in range(per_thread):
+                hasher.verify(stored, 'benchmark-password')
+
+        started = time.perf_counter()
+        workers = [threading.Thread(target=login_storm) for _ in range(threads)]
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+        total = threads * per_thread
+        print(f'{_method_prefix(method)}: {total} verifications in {elapsed:.2f}s '
+              f'= {total / elapsed:.1f}/s with {app.config["PASSWORD_HASH_WORKERS"]} workers')
@@ -0,0 +1,232 @@
+# services/profiler.py
+# Opt-in sampling profiler for slow requests.
+#
+# - PROFILER_ENABLED: every request (or a PROFILER_SAMPLE_RATE fraction of
+#   them) is sampled while its view runs; the profile is kept only if the
+#   request took longer than PROFILER_THRESHOLD_MS.
+# - PROFILER_TOKEN: a request carrying `X-Profile: <token>` is always
+#   profiled and kept, whatever the threshold (and even with
+#   PROFILER_ENABLED off), so one slow call can be reproduced on demand.
+#
+# One sampler thread reads the stacks of the threads serving profiled
+# requests from sys._current_frames() every PROFILER_INTERVAL_MS; the
+# request threads themselves do nothing but register. Profiles are written
+# as collapsed stacks ("frame;frame;frame count" per line), which
+# flamegraph.pl, speedscope and inferno read directly, to PROFILER_DIR,
+# keeping the newest PROFILER_MAX_FILES. With both settings off no hooks
+# are installed at all.
+#
+# GET /api/admin/profiles[/<name>] lists and downloads them with
+# `Authorization: Bearer <PROFILER_TOKEN>`; without a token configured they
+# are not served at all.
+
+import hmac
+import os
+import random
+import re
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from flask import current_app, g, request
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_NAME = re.compile(r'^[\w.\-]+\.collapsed$')
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_STDLIB_DIR = sysconfig.get_paths()['stdlib']
+
+
+def _frame_label(code):
+    filename = code.co_filename
+    if filename.startswith(_BACKEND_DIR):
+        filename = os.path.relpath(filename, _BACKEND_DIR)
+    elif 'site-packages' + os.sep in filename:
+        # .../site-packages/flask/app.py → flask/app.py
+        filename = filename.split('site-packages' + os.sep)[-1]
+    elif filename.startswith(_STDLIB_DIR):
+        filename = os.path.relpath(filename, _STDLIB_DIR)
+    return f'{code.co_name} ({filename}:{code.co_firstlineno})'.replace(';', ':')
+
+
+class _Profile:
+    __slots__ = ('stacks', 'samples')
+
+    def __init__(self):
+        self.stacks = Counter()
+        self.samples = 0
+
+
+class SamplingProfiler:
+    """Samples the stacks of registered threads until they unregister."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._active = {}                 # thread id → _Profile
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._labels = {}                 # code object → label, computed once
+        self._thread = None
+
+    def start(self):
+        profile = _Profile()
+        with self._lock:
+            self._active[threading.get_ident()] = profile
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+                self._thread.start()
+        self._wake.set()
+        return profile
+
+    def stop(self):
+        with self._lock:
+            return self._active.pop(threading.get_ident(), None)
+
+    def _run(self):
+        own = threading.get_ident()
+        while True:
+            self._wake.wait()
+            with self._lock:
+                active = dict(self._active)
+                if not active:
+                    self._wake.clear()
+                    continue
+
+            frames = sys._current_frames()
+            for thread_id, profile in active.items():
+                frame = frames.get(thread_id)
+                if frame is None or thread_id == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = self._labels.get(code)
+                    if label is None:
+                        label = self._labels[code] = _frame_label(code)
+                    stack.append(label)
+                    frame = frame.f_back
+                profile.stacks[';'.join(reversed(stack))] += 1
+                profile.samples += 1
+            del frames
+            time.sleep(self.interval)
+
+
+class ProfileStore:
+    """Rotating directory of collapsed-stack files."""
+
+    def __init__(self, directory, max_files):
+        self.directory = directory
+        self.max_files = max_files
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def save(self, endpoint, elapsed_ms, profile):
+        stamp = datetime.now().strftime('%Y%m%dT%H%M%S%f')
+        safe_endpoint = re.sub(r'[^\w.\-]', '_', endpoint)
+        name = f'{stamp}-{safe_endpoint}-{int(elapsed_ms)}ms-{os.getpid()}.collapsed'
+        path = os.path.join(self.directory, name)
+
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as out:
+            for stack, count in profile.stacks.most_common():
+                out.write(f'{stack} {count}\n')
+        os.replace(tmp, path)
+        self._rotate()
+        return name
+
+    def _rotate(self):
+        with self._lock:
+            names = sorted(self.list_names())
+            for name in names[:max(0, len(names) - self.max_files)]:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass    # another worker got there first
+
+    def list_names(self):
+        return [n for n in os.listdir(self.directory) if PROFILE_NAME.match(n)]
+
+    def list(self):
+        profiles = []
+        for name in sorted(self.list_names(), reverse=True):
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            profiles.append({
+                "name": name,
+                "size": stat.st_size,
+                "created": datetime.fromtimestamp(stat.st_mtime).isoformat(timespec='seconds'),
+                "download_url": f"/api/admin/profiles/{name}"
+            })
+        return profiles
+
+    def path(self, name):
+        """Absolute path of a stored profile, None for unknown or unsafe names."""
+        if not PROFILE_NAME.match(name):
+            return None
+        path = os.path.join(self.directory, name)
+        return path if os.path.isfile(path) else None
+
+
+def profiles_authorized():
+    """Whether the request carries PROFILER_TOKEN as its bearer token."""
+    token = current_app.config.get('PROFILER_TOKEN')
+    if not token:
+        return False
+    supplied = request.headers.get('Authorization', '').removeprefix('Bearer ')
+    return hmac.compare_digest(supplied.encode(), token.encode())
+
+
+def init_profiler(app):
+    enabled = app.config['PROFILER_ENABLED']
+    token = app.config.get('PROFILER_TOKEN')
+
+    store = ProfileStore(app.config['PROFILER_DIR'], app.config['PROFILER_MAX_FILES'])
+    app.extensions['profile_store'] = store
+    if not enabled and not token:
+        return None
+
+    profiler = SamplingProfiler(app.config['PROFILER_INTERVAL_MS'] / 1000)
+    threshold_ms = app.config['PROFILER_THRESHOLD_MS']
+    sample_rate = app.config['PROFILER_SAMPLE_RATE']
+    app.extensions['request_profiler'] = profiler
+
+    def _forced():
+        supplied = request.headers.get(PROFILE_HEADER)
+        return bool(token and supplied and hmac.compare_digest(supplied.encode(), token.encode()))
+
+    @app.before_request
+    def _start_profile():
+        forced = _forced()
+        if forced or (enabled and random.random() < sample_rate):
+            g.profile_forced = forced
+            g.profile_started = time.perf_counter()
+            g.profile = profiler.start()
+
+    @app.after_request
+    def _finish_profile(response):
+        profile = g.pop('profile', None)
+        if profile is None:
+            return response
+        profiler.stop()
+        elapsed_ms = (time.perf_counter() - g.pop('profile_started')) * 1000
+        # A forced profile is kept even if the request finished between two samples
+        if g.pop('profile_forced') or (profile.samples and elapsed_ms >= threshold_ms):
+            try:
+                name = store.save(request.endpoint or '<unmatched>', elapsed_ms, profile)
+                response.headers['X-Profile-Id'] = name
+            except OSError as e:
+                app.logger.error(f"Could not save request profile: {str(e)}", exc_info=True)
+        return response
+
+    @app.teardown_request
+    def _drop_profile(exc):
+        # after_request didn't run (the request failed before a response)
+        if g.pop('profile', None) is not None:
+            profiler.stop()
+
+    return profiler
@@ -0,0 +1,99 @@
+# services/query_plans.py
+# EXPLAIN the queries on request and scheduler hot paths and flag any that
+# fall back to a full table scan. The statements are built by the same
+# functions the routes and the status engine call, not written out again
+# here. Run with `flask --app app db-explain` (exits non-zero on a scan so it
+# can gate deploys after a schema change); tests/test_query_plans.py runs
+# the same check.
+
+from datetime import datetime
+
+from extensions import db
+from models.election import Election
+from models.voter import Voter
+from services.election_queries import (
+    NEWEST_FIRST, candidate_totals, closed_elections, closed_snapshots,
+    election_candidates, upcoming_elections, voter_ballot
+)
+from services.election_status import due_to_close, next_end, next_start
+from services.pagination import DEFAULT_LIMIT, order_query
+from services.vote_buffer import existing_votes
+from services.voter_search import apply_voter_search
+
+
+def hot_queries():
+    """(label, statement) for every query on a request or scheduler hot path (needs an app context)."""
+    now = datetime.now()
+    queries = [
+        ('upcoming elections', upcoming_elections()),
+        ('closed elections', closed_elections()),
+        ('snapshots of closed elections', closed_snapshots([1, 2])),
+        ('vote totals of closed elections', candidate_totals([1, 2])),
+        ('newest elections page', order_query(Election.query, NEWEST_FIRST).limit(DEFAULT_LIMIT + 1)),
+        ('candidates of an election', election_candidates(1)),
+        ('voter ballot in an election', voter_ballot(1, 1)),
+        ('duplicate vote check', existing_votes([(1, 1), (2, 1), (3, 2)])),
+        ('elections due to close', due_to_close(now)),
+        ('next election start', next_start()),
+        ('next election end', next_end()),
+        ('voter name search', apply_voter_search(Voter.query, {'student_name': 'arun kum'})),
+        ('voter roll_no prefix', apply_voter_search(Voter.query, {'roll_no': 'CS'})),
+        ('voter major prefix', apply_voter_search(Voter.query, {'major': 'comp'})),
+    ]
+    return [(label, query.statement) for label, query in queries]
+
+
+def _sqlite_plan(conn, sql):
+    rows = conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {sql}').all()
+    details = [row[-1] for row in rows]
+    # SEARCH is an index lookup; SCAN reads the whole table (or a whole
+    # index). "SCAN n CONSTANT ROWS" is just an IN list, and a "VIRTUAL
+    # TABLE INDEX" scan is an FTS5 MATCH served by the full-text index.
+    # An index walked in ORDER BY order under a LIMIT stops after LIMIT rows.
+    index_walk = ' LIMIT ' in sql and not any('TEMP B-TREE' in d for d in details)
+    scans = [d for d in details
+             if d.startswith('SCAN ') and 'CONSTANT ROW' not in d and 'VIRTUAL TABLE INDEX' not in d
+             and not (index_walk and ' INDEX ' in d)]
+    return details, scans
+
+
+def _mysql_plan(conn, sql):
+    rows = conn.exec_driver_sql(f'EXPLAIN {sql}').mappings().all()
+    details = [f"{r['table']}: type={r['type']} key={r['key']}" for r in rows]
+    scans = [d for d, r in zip(details, rows) if r['type'] == 'ALL']
+    return details, scans
+
+
+def explain(conn, statement):
+    """(plan lines, full-scan lines) for a SELECT on this connection."""
+    sql = str(statement.compile(dialect=conn.dialect, compile_kwargs={'literal_binds': True}))
+    plan = _sqlite_plan if conn.dialect.name == 'sqlite' else _mysql_plan
+    return plan(conn, sql)
+
+
+def explain_hot_queries(engine):
+    """Return [(label, plan lines, full-scan lines)] for hot_queries()."""
+    report = []
+
+    with engine.connect() as conn:
+        for label, statement in hot_queries():
+            details, scans = explain(conn, statement)
+            report.append((label, details, scans))
+
+    return report
+
+
+def register_explain_command(app):
+    @app.cli.command('db-explain')
+    def db_explain():
+        """EXPLAIN the hot queries; exit 1 if any does a full table scan."""
+        failed = False
+        for label, details, scans in explain_hot_queries(db.engine):
+            status = 'FULL SCAN' if scans else 'ok'
+            print(f'[{status}] {label}')
+            for line in details:
+                print(f'    {line}')
+            failed = failed or bool(scans)
+
+        if failed:
+            raise SystemExit(1)
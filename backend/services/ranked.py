@@ -0,0 +1,235 @@
+# services/ranked.py
+# Instant-runoff (IRV) and single transferable vote (STV) counts over
+# ranked ballots, on NumPy arrays.
+#
+# An election's ballots are decoded into one ballots × depth int32 matrix
+# of candidate positions (-1 after a ballot's last preference), so a count
+# never builds a Python object per ballot. Per ballot the count keeps
+# three flat arrays: the rank it has reached, the candidate it currently
+# sits with (-1 once exhausted) and its weight. Tallies are one
+# np.bincount; when a candidate is elected or eliminated only the ballots
+# sitting with them move on to their next continuing preference, and the
+# tallies are adjusted by a bincount of just those ballots.
+#
+# Weights are integers in 1/SCALE of a vote, so surplus transfers are
+# truncated to five decimals (as in Scottish STV) and every tally stays
+# exact. STV uses the Droop quota and transfers the whole surplus of an
+# elected candidate at a reduced value (weighted inclusive Gregory).
+# Elimination ties go to whoever had fewer votes in the latest round where
+# the tied candidates differed, and failing that to the later candidate.
+
+import numpy as np
+from sqlalchemy import and_, select
+
+from extensions import db
+from models.candidate import Candidate
+from models.ranked_ballot import RANKING_DTYPE, RankedBallot, pack_ranking
+from models.vote import Vote
+
+SCALE = 100000
+
+
+# ────────────────────────────────────────────────
+# BALLOTS
+# ────────────────────────────────────────────────
+def ballot_matrix(blobs, candidate_ids):
+    """
+    Packed rankings → ballots × depth matrix of indexes into candidate_ids
+    (sorted). Preferences for unknown (deleted) candidates become
+    len(candidate_ids), which is never continuing and so is skipped.
+    """
+    candidate_ids = np.asarray(candidate_ids, dtype=np.int64)
+    n_candidates = len(candidate_ids)
+
+    lengths = np.fromiter((len(b) // RANKING_DTYPE.itemsize for b in blobs), dtype=np.int64, count=len(blobs))
+    flat = np.frombuffer(b''.join(blobs), dtype=RANKING_DTYPE).astype(np.int64)
+
+    if n_candidates:
+        index = np.minimum(np.searchsorted(candidate_ids, flat), n_candidates - 1)
+        index[candidate_ids[index] != flat] = n_candidates
+    else:
+        index = np.full(len(flat), n_candidates, dtype=np.int64)
+
+    depth = int(lengths.max()) if len(lengths) else 0
+    ballots = np.full((len(blobs), max(depth, 1)), -1, dtype=np.int32)
+    rows = np.repeat(np.arange(len(blobs)), lengths)
+    starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    ballots[rows, np.arange(len(flat)) - starts] = index
+    return ballots
+
+
+def load_ballots(election_id):
+    """
+    Every ballot of an election as packed rankings. Votes cast with a
+    single candidate_id (no RankedBallot row) count as one-preference
+    ballots.
+    """
+    ranked = db.session.execute(
+        select(RankedBallot.ranking).where(RankedBallot.election_id == election_id)
+    ).scalars().all()
+
+    single = db.session.execute(
+        select(Vote.candidate_id)
+        .outerjoin(RankedBallot, and_(
+            RankedBallot.election_id == Vote.election_id,
+            RankedBallot.voter_id == Vote.voter_id
+        ))
+        .where(Vote.election_id == election_id, RankedBallot.voter_id.is_(None))
+    ).scalars().all()
+
+    return ranked + [pack_ranking([candidate_id]) for candidate_id in single]
+
+
+# ────────────────────────────────────────────────
+# COUNTING
+# ────────────────────────────────────────────────
+def _advance(ballots, rows, position, current, continuing):
+    """Move each ballot in rows to its next continuing preference (or exhaust it)."""
+    depth = ballots.shape[1]
+    while rows.size:
+        at = position[rows]
+        choice = np.where(at < depth, ballots[rows, np.minimum(at, depth - 1)], -1)
+        # -1 (no more preferences) indexes the trailing False slot
+        settled = (choice < 0) | continuing[choice]
+        current[rows[settled]] = choice[settled]
+        rows = rows[~settled]
+        position[rows] += 1
+
+
+def _tally(current, weight, n_candidates):
+    live = current >= 0
+    counts = np.bincount(current[live], weights=weight[live], minlength=n_candidates + 1)
+    # Integer weights: the float sums are exact well beyond any election size
+    return np.rint(counts[:n_candidates]).astype(np.int64)
+
+
+def _votes(value):
+    value = int(value)
+    return value // SCALE if value % SCALE == 0 else round(value / SCALE, 5)
+
+
+def _lowest(candidates, tallies, history):
+    """Candidate to eliminate: fewest votes, ties broken on earlier rounds."""
+    tied = candidates[tallies[candidates] == tallies[candidates].min()]
+    for past in reversed(history[:-1]):
+        if len(tied) == 1:
+            break
+        tied = tied[past[tied] == past[tied].min()]
+    return int(tied[-1])
+
+
+def count_ballots(ballots, candidate_ids, seats=1, method='IRV'):
+    """
+    Run an IRV (one seat, majority of continuing votes) or STV (Droop
+    quota) count. ballots: as returned by ballot_matrix.
+
+    Returns {'method', 'seats', 'ballots', 'quota', 'elected', 'rounds'};
+    each round lists the tallies it started from, who was elected or
+    eliminated, and where their ballots went.
+    """
+    candidate_ids = [int(c) for c in candidate_ids]
+    n_candidates = len(candidate_ids)
+    n_ballots = len(ballots)
+    seats = 1 if method == 'IRV' else max(min(seats, n_candidates), 1)
+
+    # Two trailing False slots: unknown candidates and (via index -1) exhausted
+    continuing = np.zeros(n_candidates + 2, dtype=bool)
+    continuing[:n_candidates] = True
+    eliminated = np.zeros(n_candidates, dtype=bool)
+
+    position = np.zeros(n_ballots, dtype=np.int64)
+    current = np.full(n_ballots, -1, dtype=np.int64)
+    weight = np.full(n_ballots, SCALE, dtype=np.int64)
+    _advance(ballots, np.arange(n_ballots), position, current, continuing)
+    tallies = _tally(current, weight, n_candidates)
+
+    total = n_ballots * SCALE
+    quota = (n_ballots // (seats + 1) + 1) * SCALE if method == 'STV' else None
+    elected, rounds, history = [], [], []
+
+    def transfer(candidate, kind, new_weight=None):
+        moved = np.flatnonzero(current == candidate)
+        if new_weight is not None:
+            weight[moved] = new_weight(weight[moved])
+        value = int(weight[moved].sum())
+        _advance(ballots, moved, position, current, continuing)
+        gained = _tally(current[moved], weight[moved], n_candidates)
+        tallies[:] += gained
+        return {
+            'from': candidate_ids[candidate],
+            'type': kind,
+            'votes': _votes(value),
+            'to': [
+                {'candidate_id': candidate_ids[c], 'votes': _votes(gained[c])}
+                for c in np.flatnonzero(gained)
+            ],
+            'exhausted': _votes(value - gained.sum())
+        }
+
+    while n_ballots and len(elected) < seats:
+        hopeful = np.flatnonzero(continuing[:n_candidates])
+        in_count = np.flatnonzero(~eliminated)
+        record = {
+            'round': len(rounds) + 1,
+            'tallies': [
+                {'candidate_id': candidate_ids[c], 'votes': _votes(tallies[c])}
+                for c in in_count
+            ],
+            'exhausted': _votes(total - tallies.sum()),
+            'elected': [],
+            'eliminated': [],
+            'transfers': []
+        }
+        rounds.append(record)
+        history.append(tallies.copy())
+
+        # No more candidates than open seats: the rest are elected as they stand
+        if len(hopeful) <= seats - len(elected):
+            winners = hopeful[np.argsort(-tallies[hopeful], kind='stable')]
+            elected += [int(c) for c in winners]
+            record['elected'] = [candidate_ids[c] for c in winners]
+            break
+
+        threshold = quota if quota is not None else tallies[hopeful].sum() // 2 + 1
+        reached = hopeful[tallies[hopeful] >= threshold]
+        if reached.size:
+            reached = reached[np.argsort(-tallies[reached], kind='stable')]
+            continuing[reached] = False
+            elected += [int(c) for c in reached]
+            record['elected'] = [candidate_ids[c] for c in reached]
+
+            for c in reached:
+                surplus = int(tallies[c] - threshold)
+                if len(elected) >= seats or surplus <= 0:
+                    continue
+                held = int(tallies[c])
+                record['transfers'].append(
+                    transfer(c, 'surplus', lambda w, s=surplus, h=held: w * s // h)
+                )
+                tallies[c] = threshold
+        else:
+            loser = _lowest(hopeful, tallies, history)
+            continuing[loser] = False
+            eliminated[loser] = True
+            record['eliminated'] = [candidate_ids[loser]]
+            record['transfers'].append(transfer(loser, 'elimination'))
+            tallies[loser] = 0
+
+    return {
+        'method': method,
+        'seats': seats,
+        'ballots': n_ballots,
+        'quota': _votes(quota) if quota is not None else None,
+        'elected': [candidate_ids[c] for c in elected],
+        'rounds': rounds
+    }
+
+
+def count_election(election):
+    """Round-by-round count of an IRV/STV election from its stored ballots."""
+    candidate_ids = db.session.execute(
+        select(Candidate.id).where(Candidate.election_id == election.id).order_by(Candidate.id)
+    ).scalars().all()
+
+    ballots = ballot_matrix(load_ballots(election.id), candidate_ids)
+    return count_ballots(ballots, candidate_ids, election.seats or 1, election.voting_method)
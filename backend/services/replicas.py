@@ -0,0 +1,85 @@
+# services/replicas.py
+# Read-replica routing for read-heavy endpoints.
+#
+# Replicas are SQLALCHEMY_BINDS entries built from SQLALCHEMY_REPLICA_URIS
+# (config.py); extensions.RoutingSession sends the SELECTs of requests
+# marked with @read_replica to one of them. Without replicas configured the
+# decorator does nothing.
+#
+# Read-your-writes: after a voter casts a vote, their requests read from the
+# primary for REPLICA_STICKY_SECONDS, longer than the expected replication
+# lag. The vote response carries the voter's token re-issued with a
+# `primary_until` claim, so the marker travels with the voter's requests
+# and every worker on every host honours it without shared state.
+
+import time
+from datetime import timedelta
+from functools import wraps
+
+from flask import current_app, g, has_request_context
+from flask_jwt_extended import create_access_token, get_jwt, get_jwt_identity, verify_jwt_in_request
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
+
+from extensions import db
+
+STICKY_CLAIM = 'primary_until'
+
+# Claims flask-jwt-extended sets on every token itself
+_RESERVED_CLAIMS = {'sub', 'iat', 'nbf', 'exp', 'jti', 'type', 'fresh', 'csrf'}
+
+
+def replicas_configured(app=None):
+    return bool((app or current_app).config.get('SQLALCHEMY_BINDS'))
+
+
+def stick_to_primary():
+    """Route the calling voter's reads to the primary for a while (after a write); see sticky_token()."""
+    if replicas_configured() and has_request_context():
+        g.primary_until = int(time.time()) + current_app.config['REPLICA_STICKY_SECONDS']
+
+
+def sticky_token():
+    """
+    The caller's access token re-issued with the primary_until claim if
+    this request called stick_to_primary(), else None. The new token
+    expires when the old one would have.
+    """
+    until = g.get('primary_until')
+    if until is None:
+        return None
+
+    claims = get_jwt()
+    extra = {k: v for k, v in claims.items() if k not in _RESERVED_CLAIMS}
+    extra[STICKY_CLAIM] = until
+    return create_access_token(
+        identity=get_jwt_identity(),
+        additional_claims=extra,
+        expires_delta=timedelta(seconds=max(claims['exp'] - int(time.time()), 1))
+    )
+
+
+def _is_sticky():
+    """True if the request carries a valid token whose primary_until hasn't passed; never raises."""
+    try:
+        verify_jwt_in_request(optional=True)
+        until = get_jwt().get(STICKY_CLAIM)
+    except (JWTExtendedException, PyJWTError):
+        # The view decides what a bad token means
+        return False
+    return until is not None and until > time.time()
+
+
+def read_replica(view):
+    """Serve this view's SELECTs from a replica unless the caller just voted."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if replicas_configured():
+            g.db_read_replica = not _is_sticky()
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def use_primary():
+    """Send the rest of this request's queries to the primary."""
+    db.session().use_primary()
@@ -0,0 +1,309 @@
+# services/report_jobs.py
+# Asynchronous PDF exports. ReportLab rendering is CPU-bound, so jobs run in
+# a local process pool instead of on request threads; job state lives in the
+# report_job table so every worker can answer polls and downloads. Finished
+# jobs and their files are deleted after REPORT_JOB_RETENTION_HOURS.
+
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime, timedelta
+
+from flask import current_app
+from werkzeug.utils import secure_filename
+
+from extensions import db
+from models.election import Election
+from models.report_job import ReportJob
+from services.reports import (
+    ReportSpec, render_results_pdf, report_election_info,
+    results_report_spec, winner_certificate_spec, write_report
+)
+from services.results import declared_winners, get_snapshot, tally_election
+from services.workers import HOSTNAME, pid_alive
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+# Renders this process dispatched and hasn't recorded yet: job id → Future
+_futures = {}
+
+# Seconds between opportunistic cleanups in each worker
+_CLEANUP_INTERVAL = 600
+_last_cleanup = None
+
+
+def _get_executor():
+    """One pool per worker process, created lazily (and again after a fork)."""
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ProcessPoolExecutor(
+                max_workers=current_app.config['REPORT_WORKERS'],
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def write_report_archive(entries, zip_path):
+    """Render any missing reports and bundle them; runs in the pool."""
+    os.makedirs(os.path.dirname(zip_path), exist_ok=True)
+    tmp = f'{zip_path}.{os.getpid()}.tmp'
+
+    # PDFs are already compressed, so store them as-is
+    with zipfile.ZipFile(tmp, 'w', zipfile.ZIP_STORED) as archive:
+        for spec, arcname in entries:
+            if not os.path.exists(spec.path):
+                write_report(spec)
+            archive.write(spec.path, arcname)
+
+    os.replace(tmp, zip_path)
+    return zip_path
+
+
+def _job_file(job_id, extension):
+    return os.path.join(current_app.config['REPORT_JOB_DIR'], f'{job_id}.{extension}')
+
+
+def _finish(app, job_id, future):
+    """Pool completion callback: record the outcome on the job row."""
+    with app.app_context():
+        try:
+            job = db.session.get(ReportJob, job_id)
+            try:
+                job.file_path = future.result()
+                job.status = 'DONE'
+            except Exception as e:
+                app.logger.error(f"Report job {job_id} failed: {str(e)}", exc_info=True)
+                job.status = 'FAILED'
+                job.error = str(e)
+
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+        finally:
+            db.session.remove()
+            _futures.pop(job_id, None)
+
+
+def _fail(job, error):
+    job.status = 'FAILED'
+    job.error = error
+    job.finished_at = datetime.utcnow()
+    db.session.commit()
+
+
+def _mark_running(job):
+    _cleanup_now_and_then()
+    job.status = 'RUNNING'
+    job.owner_host = HOSTNAME
+    job.owner_pid = os.getpid()
+    db.session.add(job)
+    # Commit before submitting so the callback always finds the row
+    db.session.commit()
+
+
+def _submit(app, job_id, fn, *args):
+    future = _get_executor().submit(fn, *args)
+    _futures[job_id] = future
+    future.add_done_callback(lambda f: _finish(app, job_id, f))
+
+
+def _dispatch(job, fn, *args):
+    _mark_running(job)
+    _submit(current_app._get_current_object(), job.id, fn, *args)
+    return job
+
+
+def _start(job, spec):
+    if os.path.exists(spec.path):
+        # Already in the report cache: nothing to render
+        job.status = 'DONE'
+        job.file_path = spec.path
+        job.finished_at = datetime.utcnow()
+        db.session.add(job)
+        db.session.commit()
+        return job
+
+    return _dispatch(job, write_report, spec)
+
+
+def start_results_job(election):
+    job = ReportJob(
+        id=uuid.uuid4().hex,
+        kind='RESULTS',
+        election_id=election.id,
+        download_name=f"{election.election_name}_Official_Results_Report.pdf"
+    )
+
+    snapshot = get_snapshot(election)
+    if snapshot:
+        spec = results_report_spec(election, snapshot)
+    else:
+        # Open election: one-off render of the live tallies, not cached
+        spec = ReportSpec(
+            _job_file(job.id, 'pdf'),
+            render_results_pdf,
+            (report_election_info(election), tally_election(election.id),
+             current_app.config['UPLOAD_FOLDER'])
+        )
+
+    return _start(job, spec)
+
+
+def start_winner_job(election, candidate_id):
+    """Raises LookupError unless the candidate is a declared winner of the (closed) election."""
+    snapshot = get_snapshot(election)
+    winners = declared_winners(snapshot.data()) if snapshot else []
+
+    winner = next((c for c in winners if c['id'] == candidate_id), None)
+    if winner is None:
+        raise LookupError(candidate_id)
+
+    job = ReportJob(
+        id=uuid.uuid4().hex,
+        kind='WINNER',
+        election_id=election.id,
+        candidate_id=candidate_id,
+        download_name=f"Winner_{winner['name']}_Certificate.pdf"
+    )
+
+    return _start(job, winner_certificate_spec(election, snapshot, winner))
+
+
+def start_all_closed_job():
+    """
+    Zip of the official report of every closed election. Returns at once:
+    snapshots are built (or reused) on a background thread, which then hands
+    the rendering and zipping to the pool.
+    """
+    job = ReportJob(
+        id=uuid.uuid4().hex,
+        kind='ALL_CLOSED',
+        download_name='Closed_Election_Results.zip'
+    )
+    _mark_running(job)
+
+    threading.Thread(
+        target=_archive_closed_elections,
+        args=(current_app._get_current_object(), job.id, _job_file(job.id, 'zip')),
+        name=f'report-job-{job.id}',
+        daemon=True
+    ).start()
+    return job
+
+
+def _archive_closed_elections(app, job_id, zip_path):
+    with app.app_context():
+        try:
+            entries = []
+            for election in Election.query.filter_by(election_status='CLOSED').order_by(Election.id).all():
+                spec = results_report_spec(election, get_snapshot(election))
+                arcname = f"{election.id}_{secure_filename(election.election_name)}_Official_Results_Report.pdf"
+                entries.append((spec, arcname))
+
+            _submit(app, job_id, write_report_archive, entries, zip_path)
+        except Exception as e:
+            db.session.rollback()
+            app.logger.error(f"Report job {job_id} failed: {str(e)}", exc_info=True)
+            _fail(db.session.get(ReportJob, job_id), str(e))
+        finally:
+            db.session.remove()
+
+
+def wait_for_job(job, timeout):
+    """
+    File of a finished job, waiting up to `timeout` seconds for a render
+    this process dispatched; None while it is still running. A failed
+    render raises its error (the job row records it too).
+    """
+    future = _futures.get(job.id)
+    if future is not None:
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            return None
+
+    # Cached, or recorded by _finish already
+    db.session.refresh(job)
+    if job.status == 'FAILED':
+        raise RuntimeError(job.error)
+    return job.file_path if job.status == 'DONE' else None
+
+
+def refresh_job(job):
+    """
+    Fail jobs whose worker died mid-render, so pollers don't wait forever.
+    A dead owner is only detectable on its own host; elsewhere the job is
+    failed once it has run longer than REPORT_JOB_TIMEOUT.
+    """
+    if job.status != 'RUNNING':
+        return job
+
+    timeout = timedelta(seconds=current_app.config['REPORT_JOB_TIMEOUT'])
+    if job.owner_host == HOSTNAME and job.owner_pid and not pid_alive(job.owner_pid):
+        _fail(job, 'Worker exited before the report was finished')
+    elif job.created_at < datetime.utcnow() - timeout:
+        _fail(job, 'Report did not finish in time')
+    return job
+
+
+# ────────────────────────────────────────────────
+# RETENTION
+# ────────────────────────────────────────────────
+def cleanup_report_jobs(now=None):
+    """
+    Delete finished jobs older than REPORT_JOB_RETENTION_HOURS, and files in
+    this host's REPORT_JOB_DIR not modified since then (job PDFs and zips,
+    and temp files left by crashed renders). Reports in the shared report
+    cache are left alone. Returns (rows, files) deleted.
+    """
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(hours=current_app.config['REPORT_JOB_RETENTION_HOURS'])
+
+    rows = ReportJob.query.filter(
+        ReportJob.status.in_(('DONE', 'FAILED')),
+        ReportJob.finished_at < cutoff
+    ).delete(synchronize_session=False)
+    db.session.commit()
+
+    files = 0
+    job_dir = current_app.config['REPORT_JOB_DIR']
+    # File mtimes are epoch seconds; cutoff is naive UTC
+    expires = time.time() - (datetime.utcnow() - cutoff).total_seconds()
+    if os.path.isdir(job_dir):
+        for entry in os.scandir(job_dir):
+            try:
+                if entry.is_file() and entry.stat().st_mtime < expires:
+                    os.remove(entry.path)
+                    files += 1
+            except FileNotFoundError:
+                continue    # another worker got there first
+
+    return rows, files
+
+
+def _cleanup_now_and_then():
+    """Run cleanup_report_jobs from job starts, at most every _CLEANUP_INTERVAL per worker."""
+    global _last_cleanup
+    if _last_cleanup is not None and time.monotonic() - _last_cleanup < _CLEANUP_INTERVAL:
+        return
+    _last_cleanup = time.monotonic()
+    try:
+        cleanup_report_jobs()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Report job cleanup failed: {str(e)}", exc_info=True)
+
+
+def register_report_job_commands(app):
+    @app.cli.command('report-jobs-cleanup')
+    def report_jobs_cleanup():
+        """Delete expired report jobs and their files."""
+        rows, files = cleanup_report_jobs()
+        print(f'Deleted {rows} report jobs and {files} files')
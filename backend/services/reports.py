@@ -0,0 +1,511 @@
+# services/reports.py
+# ReportLab rendering of the official results report and winner
+# certificates, plus the on-disk cache the export endpoints serve from.
+#
+# The render functions only take plain dicts (no ORM objects or app
+# context) so they can run anywhere, including outside the request.
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import threading
+from collections import namedtuple
+from datetime import datetime
+
+from flask import current_app
+
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.lib.pagesizes import A4
+
+from models.election import Election
+from services.results import declared_winners, get_snapshot
+from services.symbols import symbol_file
+
+# Bump when the report layout changes so cached files are not reused
+RENDER_VERSION = 3
+
+
+def report_election_info(election):
+    """The election fields printed on reports, as strings."""
+    return {
+        'id': election.id,
+        'election_name': election.election_name,
+        'election_date': str(election.election_date),
+        'election_time': str(election.election_time),
+        'end_date': str(election.end_date),
+        'end_time': str(election.end_time),
+        'result_date': str(election.result_date) if election.result_date else None,
+        'result_time': str(election.result_time) if election.result_time else None,
+        'election_status': election.election_status,
+    }
+
+
+# ────────────────────────────────────────────────
+# RENDERING
+# ────────────────────────────────────────────────
+def _winner_elements(winner_data, winner, uploads_dir, styles):
+    """Details table of one winner, followed by their symbol if it exists."""
+    elements = []
+    winner_table = Table(winner_data, colWidths=[2.5 * inch, 3.5 * inch])
+    winner_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), colors.lightgrey),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('LEFTPADDING', (0, 0), (-1, -1), 8),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+    ]))
+
+    elements.append(winner_table)
+    elements.append(Spacer(1, 0.3 * inch))
+
+    # Add Symbol if exists
+    if winner.get("symbol"):
+        symbol_path = symbol_file(uploads_dir, winner["symbol"])
+        if os.path.exists(symbol_path):
+            elements.append(Paragraph("<b>Symbol of the winner:</b>", styles["Normal"]))
+            elements.append(Spacer(1, 0.2 * inch))
+            img = Image(symbol_path, width=1.5 * inch, height=1.5 * inch)
+            elements.append(img)
+    return elements
+
+
+def _rounds_table(candidates, ranked):
+    """Candidates × rounds tallies of an IRV/STV count ('-' once out of the count)."""
+    rounds = ranked['rounds']
+    table_data = [["Candidate"] + [f"R{r['round']}" for r in rounds]]
+    tallies = [{t['candidate_id']: t['votes'] for t in r['tallies']} for r in rounds]
+
+    for c in candidates:
+        table_data.append([c['name']] + [str(t[c['id']]) if c['id'] in t else "-" for t in tallies])
+    table_data.append(["Exhausted"] + [str(r['exhausted']) for r in rounds])
+
+    rounds_table = Table(table_data, repeatRows=1)
+    rounds_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+    ]))
+    return rounds_table
+
+
+def render_results_pdf(election, data, uploads_dir):
+    """
+    Official results report. `data` is a results snapshot payload; for
+    IRV/STV elections the winners come from its ranked count.
+    """
+    candidates = data['candidates']
+    ranked = data.get('ranked')
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    elements = []
+    styles = getSampleStyleSheet()
+
+    total_votes = data['total_votes']
+
+    # =========================
+    # DETERMINE WINNER
+    # =========================
+    winner = None
+    winners = []
+    margin = 0
+    sorted_candidates = sorted(candidates, key=lambda x: x['count'], reverse=True)
+
+    if ranked is not None:
+        # The rounds decide; counts are first preferences only
+        elected = declared_winners(data)
+    elif candidates and total_votes > 0:
+        max_votes = sorted_candidates[0]['count']
+
+        winners = [c for c in sorted_candidates if c['count'] == max_votes]
+
+        if len(winners) == 1:
+            winner = winners[0]
+            if len(sorted_candidates) > 1:
+                margin = winner['count'] - sorted_candidates[1]['count']
+
+    # =========================
+    # HEADER
+    # =========================
+    elements.append(Paragraph("<b>OFFICIAL ELECTION RESULTS REPORT</b>", styles["Title"]))
+    elements.append(Spacer(1, 0.4 * inch))
+
+    # =========================
+    # ELECTION DETAILS
+    # =========================
+    details_data = [
+        ["Election Name", election['election_name']],
+        ["Election Date", f"{election['election_date']} {election['election_time']}"],
+        ["End Date", f"{election['end_date']} {election['end_time']}"],
+        ["Result Declared On", f"{election['result_date']} {election['result_time']}" if election['result_date'] else "N/A"],
+        ["Status", election['election_status']],
+        ["Total Votes Cast", str(total_votes)]
+    ]
+
+    details_table = Table(details_data, colWidths=[2.5 * inch, 3.5 * inch])
+    details_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), colors.whitesmoke),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('LEFTPADDING', (0, 0), (-1, -1), 8),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+    ]))
+
+    elements.append(details_table)
+    elements.append(Spacer(1, 0.5 * inch))
+
+    # =========================
+    # WINNER SECTION
+    # =========================
+    elements.append(Paragraph("<b>WINNER OF THE ELECION: </b>", styles["Heading2"]))
+    elements.append(Spacer(1, 0.3 * inch))
+
+    if total_votes == 0:
+        elements.append(Paragraph("<b>NO VOTES RECORDED</b>", styles["Heading2"]))
+        elements.append(Spacer(1, 0.3 * inch))
+        elements.append(Paragraph(
+            "No one has voted in this election. Therefore, no winner can be declared.",
+            styles["Normal"]
+        ))
+
+    elif ranked is not None:
+        elements.append(Paragraph(
+            f"Decided by {ranked['method']} count over {len(ranked['rounds'])} round(s)"
+            + (f", quota {ranked['quota']}" if ranked['quota'] is not None else "") + ".",
+            styles["Normal"]
+        ))
+        elements.append(Spacer(1, 0.3 * inch))
+
+        if not elected:
+            elements.append(Paragraph("No candidate was elected.", styles["Normal"]))
+
+        for w in elected:
+            winner_data = [
+                ["Name", w['name']],
+                ["Email", w['email']],
+                ["Course", w['course']],
+                ["Major", w['major']],
+                ["Elected In", f"Round {w['round']} of {len(ranked['rounds'])}"],
+                [f"Votes In Round {w['round']}", str(w['round_votes'])]
+            ]
+            elements += _winner_elements(winner_data, w, uploads_dir, styles)
+            elements.append(Spacer(1, 0.3 * inch))
+
+    elif len(winners) > 1:
+        tie_text = "Election is TIE between:<br/><br/>"
+
+        for w in winners:
+            tie_text += f"- {w['name']} (Roll No: {w['roll_no']})<br/>"
+
+        elements.append(Paragraph("<b>TIE RESULT</b>", styles["Heading2"]))
+        elements.append(Spacer(1, 0.3 * inch))
+        elements.append(Paragraph(tie_text, styles["Normal"]))
+
+
+    elif winner:
+        winner_data = [
+            ["Name", winner['name']],
+            ["Email", winner['email']],
+            ["Course", winner['course']],
+            ["Major", winner['major']],
+            ["Votes Secured", str(winner['count'])],
+            ["Winning Margin", str(margin)]
+        ]
+        elements += _winner_elements(winner_data, winner, uploads_dir, styles)
+
+    else:
+        elements.append(Paragraph("No votes were cast in this election.", styles["Normal"]))
+
+    elements.append(Spacer(1, 0.6 * inch))
+
+    total_registered_voters = data['total_registered_voters']
+
+    turnout_percentage = (
+        (total_votes / total_registered_voters * 100)
+        if total_registered_voters > 0 else 0
+    )
+
+    elements.append(Paragraph("<b>ELECTION TURNOUT SUMMARY</b>", styles["Heading2"]))
+    elements.append(Spacer(1, 0.3 * inch))
+
+    turnout_data = [
+        ["Total Registered Voters", str(total_registered_voters)],
+        ["Total Votes Cast", str(total_votes)],
+        ["Turnout Percentage", f"{round(turnout_percentage, 2)} %"]
+    ]
+
+    turnout_table = Table(turnout_data, colWidths=[2.5 * inch, 3.5 * inch])
+    turnout_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), colors.whitesmoke),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ]))
+
+    elements.append(turnout_table)
+    elements.append(Spacer(1, 0.5 * inch))
+
+
+    # =========================
+    # FULL RESULTS TABLE
+    # =========================
+    elements.append(Paragraph("<b>DETAILED RESULTS</b>", styles["Heading2"]))
+    elements.append(Spacer(1, 0.3 * inch))
+
+    votes_heading = "First Preferences" if ranked is not None else "Votes"
+    table_data = [["S.No", "Candidate Name", "Email", "Course", votes_heading, "Percentage"]]
+
+    for index, c in enumerate(sorted_candidates, start=1):
+        percentage = (c['count'] / total_votes * 100) if total_votes > 0 else 0
+
+        table_data.append([
+            str(index),
+            c['name'],
+            c['email'],
+            c['course'],
+            str(c['count']),
+            f"{round(percentage, 2)}%"
+        ])
+
+    results_table = Table(table_data, repeatRows=1)
+    results_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('ALIGN', (4, 1), (-1, -1), 'CENTER'),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ]))
+
+    elements.append(results_table)
+    elements.append(Spacer(1, 0.6 * inch))
+
+    if ranked is not None and ranked['rounds']:
+        elements.append(Paragraph("<b>ROUND-BY-ROUND COUNT</b>", styles["Heading2"]))
+        elements.append(Spacer(1, 0.3 * inch))
+        elements.append(_rounds_table(sorted_candidates, ranked))
+        elements.append(Spacer(1, 0.6 * inch))
+
+    # =========================
+    # FOOTER
+    # =========================
+    elements.append(Paragraph(
+        f"Report Generated On: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        styles["Normal"]
+    ))
+
+    elements.append(Spacer(1, 0.2 * inch))
+    elements.append(Paragraph(
+        "This document is system generated and serves as the official election result record.",
+        styles["Italic"]
+    ))
+
+    doc.build(elements)
+
+    return buffer.getvalue()
+
+
+def render_winner_pdf(election, winner, uploads_dir):
+    """
+    Winner certificate for one row of declared_winners(): ranked winners
+    carry the round that elected them and their votes in it.
+    """
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    elements = []
+    styles = getSampleStyleSheet()
+
+    # =========================
+    # HEADER
+    # =========================
+    elements.append(Paragraph("<b>OFFICIAL WINNER CERTIFICATE</b>", styles["Title"]))
+    elements.append(Spacer(1, 0.4 * inch))
+
+    # =========================
+    # ELECTION DETAILS
+    # =========================
+    elements.append(Paragraph(f"<b>Election Name:</b> {election['election_name']}", styles["Normal"]))
+    elements.append(Paragraph(f"<b>Election Date:</b> {election['election_date']} at {election['election_time']}", styles["Normal"]))
+    elements.append(Paragraph(f"<b>Election End Date:</b> {election['end_date']} at {election['end_time']}", styles["Normal"]))
+    elements.append(Paragraph(f"<b>Result Declared :</b> {election['result_date']} at {election['result_time']}" if election['result_date'] else "<b>Result Date:</b> N/A", styles["Normal"]))
+    elements.append(Spacer(1, 0.4 * inch))
+
+    # =========================
+    # SYMBOL IMAGE
+    # =========================
+    if winner.get("symbol"):
+        symbol_path = symbol_file(uploads_dir, winner["symbol"])
+        if os.path.exists(symbol_path):
+            img = Image(symbol_path, width=1.8 * inch, height=1.8 * inch)
+            elements.append(img)
+            elements.append(Spacer(1, 0.3 * inch))
+
+    # =========================
+    # WINNER DETAILS TABLE
+    # =========================
+    winner_data = [
+        ["Name", winner['name']],
+        ["Email", winner['email']],
+        ["Roll No", winner['roll_no']],
+        ["Major", winner['major']],
+        ["Course", winner['course']],
+    ]
+    if 'round' in winner:
+        winner_data += [
+            ["Elected In Round", str(winner['round'])],
+            [f"Votes In Round {winner['round']}", str(winner['round_votes'])]
+        ]
+    else:
+        winner_data.append(["Total Votes", str(winner['count'])])
+
+    winner_table = Table(winner_data, colWidths=[2.5 * inch, 3.5 * inch])
+    winner_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), colors.whitesmoke),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('LEFTPADDING', (0, 0), (-1, -1), 8),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+    ]))
+
+    elements.append(winner_table)
+    elements.append(Spacer(1, 0.5 * inch))
+
+    if 'round' in winner:
+        awarded_for = "being elected in the ranked-choice count"
+    else:
+        awarded_for = "securing the highest number of votes"
+    elements.append(Paragraph(
+        f"This certificate is awarded for {awarded_for} "
+        "and being officially declared as the winner of the election.",
+        styles["Italic"]
+    ))
+
+    elements.append(Spacer(1, 1 * inch))
+    elements.append(Paragraph("______________________________", styles["Normal"]))
+    elements.append(Spacer(1, 0.2 * inch))
+    elements.append(Paragraph("Election Authority Signature", styles["Normal"]))
+
+    elements.append(Spacer(1, 0.5 * inch))
+    elements.append(Paragraph(
+        f"Generated On: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        styles["Normal"]
+    ))
+
+    doc.build(elements)
+
+    return buffer.getvalue()
+
+
+# ────────────────────────────────────────────────
+# CONTENT-ADDRESSED CACHE
+# ────────────────────────────────────────────────
+# Files live at REPORT_CACHE_DIR/<election_id>/<sha256 of render inputs>.pdf,
+# so any change to the election, tallies or layout produces a new key and a
+# stale file can never be served. The per-election directory only exists so
+# edits can purge old files.
+
+_flight_guard = threading.Lock()
+_flight_locks = {}
+
+
+def _cache_key(kind, election, source):
+    raw = json.dumps({
+        'version': RENDER_VERSION,
+        'kind': kind,
+        'election': election,
+        'source': source
+    }, sort_keys=True)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class ReportSpec(namedtuple('ReportSpec', 'path render args')):
+    """
+    Everything needed to produce one report file. `render` is a module-level
+    function and `args` plain data, so a spec can be handed to another
+    process (see services/report_jobs.py).
+    """
+
+
+def write_report(spec):
+    """Render `spec` to its path atomically, so readers never see partial files."""
+    os.makedirs(os.path.dirname(spec.path), exist_ok=True)
+    tmp = f'{spec.path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(spec.render(*spec.args))
+    os.replace(tmp, spec.path)
+    return spec.path
+
+
+def _cache_path(election_id, key):
+    return os.path.join(current_app.config['REPORT_CACHE_DIR'], str(election_id), f'{key}.pdf')
+
+
+def _cached_pdf(spec):
+    """
+    Path of the cached PDF for `spec`, rendering it on first use. Concurrent
+    requests for the same file in this worker wait for a single render.
+    """
+    if os.path.exists(spec.path):
+        return spec.path
+
+    with _flight_guard:
+        lock = _flight_locks.setdefault(spec.path, threading.Lock())
+
+    with lock:
+        if not os.path.exists(spec.path):
+            write_report(spec)
+
+    with _flight_guard:
+        _flight_locks.pop(spec.path, None)
+
+    return spec.path
+
+
+def results_report_spec(election, snapshot):
+    info = report_election_info(election)
+    key = _cache_key('results', info, snapshot.etag)
+    return ReportSpec(
+        _cache_path(election.id, key),
+        render_results_pdf,
+        (info, snapshot.data(), current_app.config['UPLOAD_FOLDER'])
+    )
+
+
+def winner_certificate_spec(election, snapshot, winner):
+    info = report_election_info(election)
+    key = _cache_key('winner', info, winner)
+    return ReportSpec(
+        _cache_path(election.id, key),
+        render_winner_pdf,
+        (info, winner, current_app.config['UPLOAD_FOLDER'])
+    )
+
+
+def results_report_path(election, snapshot):
+    """Cached official results report of a closed election."""
+    return _cached_pdf(results_report_spec(election, snapshot))
+
+
+def winner_certificate_path(election, snapshot, winner):
+    """Cached certificate for one declared winner of a closed election."""
+    return _cached_pdf(winner_certificate_spec(election, snapshot, winner))
+
+
+def purge_reports(election_id):
+    folder = os.path.join(current_app.config['REPORT_CACHE_DIR'], str(election_id))
+    shutil.rmtree(folder, ignore_errors=True)
+
+
+def prerender_reports(election_ids):
+    """Render reports for elections that just closed, before anyone asks."""
+    for election in Election.query.filter(Election.id.in_(election_ids)).all():
+        snapshot = get_snapshot(election)
+        if snapshot is None:
+            continue
+
+        results_report_path(election, snapshot)
+
+        for winner in declared_winners(snapshot.data()):
+            winner_certificate_path(election, snapshot, winner)
@@ -0,0 +1,347 @@
+# services/results.py
+# Election tallies and the immutable snapshots served for closed elections.
+
+import hashlib
+import json
+from datetime import datetime
+
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from models.election import Election, RANKED_METHODS
+from models.result_snapshot import ResultSnapshot
+from services.election_queries import election_candidates
+from services.ranked import count_election
+from services.replicas import use_primary
+from services.turnout import election_turnout
+
+
+def tally_election(election_id):
+    """Current candidate tallies for an election as plain dicts."""
+    candidates = election_candidates(election_id).all()
+
+    rows = [
+        {
+            'id': c.id,
+            'name': c.name,
+            'roll_no': c.roll_no,
+            'major': c.major,
+            'course': c.course,
+            'year': c.year,
+            'email': c.email,
+            'symbol': c.symbol,
+            'symbol_url': c.get_symbol_url(),
+            'count': c.count or 0
+        }
+        for c in candidates
+    ]
+
+    # Counter rows (services/turnout.py), frozen into the snapshot at close
+    turnout = election_turnout(election_id)
+
+    data = {
+        'candidates': rows,
+        'total_votes': sum(c['count'] for c in rows),
+        'total_registered_voters': turnout['total_registered_voters'],
+        'turnout': turnout
+    }
+
+    # IRV/STV: counts above are first preferences; the rounds decide
+    election = db.session.get(Election, election_id)
+    if election is not None and election.voting_method in RANKED_METHODS:
+        data['ranked'] = count_election(election)
+
+    return data
+
+
+def get_snapshot(election):
+    """
+    Return the ResultSnapshot for a CLOSED election, creating it on first
+    use. Returns None for elections that are still open.
+
+    Snapshots are permanent, so a missing one is built from the primary
+    even in @read_replica views: a lagging replica may not have every
+    vote counted at close yet.
+    """
+    if election.election_status != 'CLOSED':
+        return None
+
+    snapshot = db.session.get(ResultSnapshot, election.id)
+    if snapshot:
+        return snapshot
+
+    use_primary()
+    snapshot = db.session.get(ResultSnapshot, election.id)
+    if snapshot:
+        return snapshot
+
+    data = tally_election(election.id)
+    payload = json.dumps(data, sort_keys=True)
+
+    snapshot = ResultSnapshot(
+        election_id=election.id,
+        payload=payload,
+        total_votes=data['total_votes'],
+        etag=hashlib.sha256(payload.encode('utf-8')).hexdigest(),
+        created_at=datetime.utcnow().replace(microsecond=0)
+    )
+
+    try:
+        db.session.add(snapshot)
+        db.session.commit()
+    except IntegrityError:
+        # Another request built it first
+        db.session.rollback()
+        snapshot = db.session.get(ResultSnapshot, election.id)
+
+    return snapshot
+
+
+def invalidate_snapshot(election_id):
+    """Drop the snapshot and cached reports after an admin edit; both are rebuilt on next read."""
+    # Imported here: services.reports builds on this module
+    from services.reports import purge_reports
+
+    ResultSnapshot.query.filter_by(election_id=election_id).delete()
+    purge_reports(election_id)
+
+
+def closed_elections_payload(elections, snapshots, live_totals):
+    """
+    Rows for the closed elections list and their combined ETag.
+    snapshots: election id → ResultSnapshot; live_totals: election id →
+    vote sum for elections that have no snapshot yet.
+    """
+    result = []
+    etag_source = hashlib.sha256()
+
+    for e in elections:
+        snapshot = snapshots.get(e.id)
+        if snapshot:
+            total_votes = snapshot.total_votes
+            etag_source.update(f"{e.id}:{snapshot.etag};".encode('utf-8'))
+        else:
+            total_votes = live_totals.get(e.id) or 0
+            etag_source.update(f"{e.id}:live:{total_votes};".encode('utf-8'))
+        # Admin edits to a closed election change the row but not its tallies
+        etag_source.update(_election_fingerprint(e).encode('utf-8'))
+
+        result.append({
+            'id': e.id,
+            'title': e.election_name,
+            'election_date': e.election_date.isoformat(),
+            'election_time': e.election_time.isoformat(),
+            'end_date': e.end_date.isoformat(),
+            'end_time': e.end_time.isoformat(),
+            'result_date': e.result_date.isoformat() if e.result_date else None,
+            'result_time': e.result_time.isoformat() if e.result_time else None,
+            'total_votes': int(total_votes)
+        })
+
+    return result, etag_source.hexdigest()
+
+
+def _election_fingerprint(election):
+    """The election fields results payloads serve, as one string."""
+    return json.dumps([
+        election.election_name, election.voting_method, election.seats,
+        *(str(v) for v in (election.election_date, election.election_time, election.end_date,
+                           election.end_time, election.result_date, election.result_time))
+    ])
+
+
+def results_etag(election, snapshot, search=''):
+    """
+    ETag of a payload built from the snapshot and the election row: the
+    snapshot's tallies alone would not change when an admin edits the
+    title or dates of a closed election.
+    """
+    source = f"{snapshot.etag}:{_election_fingerprint(election)}:{search}"
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+def snapshot_results(election, snapshot, search=''):
+    """Results page payload from a snapshot, optionally filtered by candidate name."""
+    data = snapshot.data()
+    candidates = data['candidates']
+
+    if search:
+        candidates = [c for c in candidates if search in c['name'].lower()]
+
+    return build_results(election, candidates, data['total_registered_voters'], data.get('ranked'))
+
+
+def _elected_in(ranked, candidate_id):
+    """(round record, candidate id → votes in it) of the round that elected the candidate."""
+    decided = next(r for r in ranked['rounds'] if candidate_id in r['elected'])
+    return decided, {t['candidate_id']: t['votes'] for t in decided['tallies']}
+
+
+def declared_winners(data):
+    """
+    Candidate rows declared elected in a results payload (snapshot or
+    tally_election). IRV/STV: the count's `elected`, in order, each with
+    the `round` that elected them and their `round_votes` in it. Plurality:
+    every candidate with the most votes (all of them on a tie), or nobody
+    without votes.
+    """
+    candidates = data['candidates']
+    ranked = data.get('ranked')
+    if ranked is not None:
+        rows = {c['id']: c for c in candidates}
+        winners = []
+        for candidate_id in ranked['elected']:
+            if candidate_id in rows:
+                decided, votes = _elected_in(ranked, candidate_id)
+                winners.append({
+                    **rows[candidate_id],
+                    'round': decided['round'],
+                    'round_votes': votes[candidate_id]
+                })
+        return winners
+
+    top = max((c['count'] for c in candidates), default=0)
+    leaders = [c for c in candidates if c['count'] == top]
+    return leaders if top > 0 else []
+
+
+def _ranked_winner(ranked, winners):
+    """Winner block for an IRV/STV count: the first candidate elected, as of that round."""
+    if not winners:
+        return None
+
+    order = ranked['elected']
+    winners = sorted(winners, key=lambda c: order.index(c['id']))
+    w = winners[0]
+
+    decided, votes = _elected_in(ranked, w['id'])
+    runner_up = max((v for cid, v in votes.items() if cid != w['id']), default=0)
+    in_play = sum(votes.values())
+
+    return {
+        "name": w['name'],
+        "vote_count": votes[w['id']],
+        "percentage": round(votes[w['id']] / in_play * 100, 2) if in_play else 0,
+        "major": w['major'],
+        "course": w['course'],
+        "margin": round(votes[w['id']] - runner_up, 5),
+        "symbol_url": w['symbol_url'],
+        "tie": False,
+        "method": ranked['method'],
+        "round": decided['round'],
+        "elected": [c['name'] for c in winners]
+    }
+
+
+def build_results(election, candidates, total_registered_voters, ranked=None):
+    """
+    Results payload for the results page, from snapshot candidate rows.
+    ranked: the IRV/STV count (services/ranked.py) for ranked elections.
+    """
+    total_votes = sum(c['count'] for c in candidates) or 0
+
+    # Determine winner / tie
+    if ranked is not None:
+        max_votes = max((c['count'] for c in candidates), default=0)
+        winners = [c for c in candidates if c['id'] in ranked['elected']]
+    elif candidates:
+        max_votes = max(c['count'] for c in candidates)
+        winners = [c for c in candidates if c['count'] == max_votes]
+    else:
+        max_votes = 0
+        winners = []
+
+    candidate_list = []
+
+    for c in candidates:
+        percentage = (c['count'] / total_votes * 100) if total_votes > 0 else 0
+
+        if ranked is not None:
+            is_winner = c in winners
+        else:
+            is_winner = len(winners) == 1 and c in winners and max_votes > 0
+
+        candidate_list.append({
+            "id": c['id'],
+            "name": c['name'],
+            "roll_no": c['roll_no'],
+            "major": c['major'],
+            "course": c['course'],
+            "symbol_url": c['symbol_url'],
+            "vote_count": c['count'],
+            "percentage": round(percentage, 2),
+            "email": c['email'],
+            "is_winner": is_winner
+        })
+
+    # Winner Data
+    if max_votes == 0:
+        winner_data = {
+            "message": "No one has voted in this election",
+            "no_votes": True,
+            "tie": False
+        }
+
+    elif ranked is not None:
+        winner_data = _ranked_winner(ranked, winners)
+
+    elif len(winners) == 1:
+        w = winners[0]
+
+        margin = 0
+        if len(candidates) > 1:
+            second_count = sorted(
+                [c['count'] for c in candidates],
+                reverse=True
+            )[1]
+            margin = w['count'] - second_count
+
+        winner_data = {
+            "name": w['name'],
+            "vote_count": w['count'],
+            "percentage": round((w['count'] / total_votes * 100), 2)
+            if total_votes > 0 else 0,
+            "major": w['major'],
+            "course": w['course'],
+            "margin": margin,
+            "symbol_url": w['symbol_url'],
+            "tie": False
+        }
+
+    else:
+        winner_data = {
+            "tie": True,
+            "names": [w['name'] for w in winners],
+            "vote_count": max_votes,
+            "percentage": round((max_votes / total_votes * 100), 2)
+            if total_votes > 0 else 0
+        }
+
+    turnout = (
+        (total_votes / total_registered_voters * 100)
+        if total_registered_voters > 0 else 0
+    )
+
+    payload = {
+        "election": {
+            "id": election.id,
+            "title": election.election_name,
+            "end_date": election.end_date.isoformat()
+        },
+        "candidates": candidate_list,
+        "winner": winner_data,
+        "summary": {
+            "total_registered_voters": total_registered_voters,
+            "total_votes": total_votes,
+            "turnout_percentage": round(turnout, 2)
+        }
+    }
+    if ranked is not None:
+        payload["ranked"] = {
+            "method": ranked['method'],
+            "seats": ranked['seats'],
+            "quota": ranked['quota'],
+            "elected": ranked['elected'],
+            "rounds": len(ranked['rounds'])
+        }
+    return payload
@@ -0,0 +1,254 @@
+# services/symbols.py
+# Candidate symbol storage. Files are named by the SHA-256 of their content,
+# so identical uploads share one file and different uploads with the same
+# original filename can no longer overwrite each other.
+#
+# Next to each original, resized variants are written once at upload time:
+#   <hash>.<ext>          original, as uploaded
+#   <hash>-thumb.webp     candidate lists and cards
+#   <hash>-medium.webp    PDF reports and detail views
+# A hashed name never changes content, so they are served with an immutable
+# Cache-Control and the name as a strong ETag.
+#
+# Deleting a candidate never unlinks its symbol: an identical upload may be
+# reusing the file before its candidate row is committed. sweep_symbols()
+# removes files no candidate references that nobody has stored for
+# SYMBOL_RETENTION_HOURS; store_symbol touches a file it reuses, under a
+# directory lock the sweep takes exclusively.
+
+import fcntl
+import hashlib
+import os
+import re
+import time
+import uuid
+from contextlib import contextmanager
+
+from flask import current_app, send_from_directory
+from PIL import Image, UnidentifiedImageError
+
+ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
+MAX_FILE_SIZE = 2 * 1024 * 1024  # 2MB
+
+# Longest edge in pixels (thumb covers the 192px CSS card at 2x)
+VARIANTS = {'thumb': 384, 'medium': 768}
+VARIANT_FORMAT = 'webp'
+VARIANT_QUALITY = 82
+
+HASHED_NAME = re.compile(r'^(?P<digest>[0-9a-f]{32})(?:-(?P<variant>[a-z]+))?\.[a-z0-9]+$')
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+_CHUNK = 64 * 1024
+
+
+class SymbolTooLarge(ValueError):
+    pass
+
+
+class InvalidSymbol(ValueError):
+    """The upload has an allowed extension but is not a readable image."""
+
+
+def allowed_file(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+
+
+def symbols_dir():
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], 'symbols')
+
+
+@contextmanager
+def _locked(folder, exclusive=False):
+    """Shared for storing (uploads don't block each other), exclusive for the sweep."""
+    with open(os.path.join(folder, '.lock'), 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+# ────────────────────────────────────────────────
+# NAMES
+# ────────────────────────────────────────────────
+def symbol_variant(symbol, variant):
+    """
+    Stored path of a variant ('symbols/<hash>-thumb.webp'). Symbols saved
+    before content addressing have no variants and are returned unchanged.
+    """
+    if not symbol:
+        return symbol
+    folder, _, name = symbol.rpartition('/')
+    match = HASHED_NAME.match(name)
+    if not match or variant not in VARIANTS:
+        return symbol
+    name = f"{match.group('digest')}-{variant}.{VARIANT_FORMAT}"
+    return f'{folder}/{name}' if folder else name
+
+
+def symbol_file(uploads_dir, symbol, variant='medium'):
+    """Filesystem path of a variant, falling back to the original."""
+    path = os.path.join(uploads_dir, symbol_variant(symbol, variant))
+    if os.path.exists(path):
+        return path
+    return os.path.join(uploads_dir, symbol)
+
+
+# ────────────────────────────────────────────────
+# STORING
+# ────────────────────────────────────────────────
+def _write_variants(original, digest, folder):
+    try:
+        with Image.open(original) as image:
+            image.load()
+            # Palette/CMYK images can't be saved as WebP directly
+            mode = 'RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB'
+            image = image.convert(mode)
+
+            for variant, edge in VARIANTS.items():
+                target = os.path.join(folder, f'{digest}-{variant}.{VARIANT_FORMAT}')
+                if os.path.exists(target):
+                    continue
+                resized = image.copy()
+                resized.thumbnail((edge, edge), Image.LANCZOS)
+                tmp = f'{target}.{uuid.uuid4().hex}.tmp'
+                resized.save(tmp, format=VARIANT_FORMAT, quality=VARIANT_QUALITY, method=4)
+                os.replace(tmp, target)
+    except (UnidentifiedImageError, OSError) as e:
+        raise InvalidSymbol(str(e))
+
+
+def store_symbol(stream, filename):
+    """
+    Copy an image stream into uploads/symbols under its content hash, write
+    its variants, and return (stored path like 'symbols/<hash>.png',
+    created). `created` is False when an identical file was already there;
+    it is touched so the sweep leaves it alone.
+    Raises SymbolTooLarge past MAX_FILE_SIZE (checked while reading, so a
+    lying header can't get more through) and InvalidSymbol for non-images.
+    """
+    folder = symbols_dir()
+    os.makedirs(folder, exist_ok=True)
+
+    extension = filename.rsplit('.', 1)[1].lower()
+    tmp = os.path.join(folder, f'.upload-{uuid.uuid4().hex}.tmp')
+    hasher = hashlib.sha256()
+    size = 0
+
+    try:
+        with open(tmp, 'wb') as out:
+            while True:
+                chunk = stream.read(_CHUNK)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > MAX_FILE_SIZE:
+                    raise SymbolTooLarge(filename)
+                hasher.update(chunk)
+                out.write(chunk)
+
+        digest = hasher.hexdigest()[:32]
+        final = os.path.join(folder, f'{digest}.{extension}')
+
+        with _locked(folder):
+            try:
+                os.utime(final)
+                created = False
+            except FileNotFoundError:
+                created = True
+
+            # Variants first: a file under a hashed name is always complete
+            _write_variants(tmp, digest, folder)
+            if created:
+                os.replace(tmp, final)
+        return f'symbols/{digest}.{extension}', created
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _files_of(symbol):
+    yield symbol
+    for variant in VARIANTS:
+        path = symbol_variant(symbol, variant)
+        if path != symbol:
+            yield path
+
+
+def remove_symbols(paths):
+    """Delete stored symbols and their variants."""
+    uploads = current_app.config['UPLOAD_FOLDER']
+    for symbol in paths:
+        for path in _files_of(symbol):
+            full = os.path.join(uploads, path)
+            if os.path.exists(full):
+                os.remove(full)
+
+
+def sweep_symbols():
+    """
+    Delete content-addressed symbols (with their variants) that no candidate
+    references and that haven't been stored for SYMBOL_RETENTION_HOURS, and
+    upload temp files left that long. Returns the number of symbols deleted.
+    """
+    # Imported here: models.candidate builds on this module
+    from models.candidate import Candidate
+
+    folder = symbols_dir()
+    if not os.path.isdir(folder):
+        return 0
+
+    expires = time.time() - current_app.config['SYMBOL_RETENTION_HOURS'] * 3600
+    # Read before the files: a candidate committed after this stored (and
+    # so touched) its symbol first, and the mtime check below sees that
+    used = {symbol for symbol, in Candidate.query.with_entities(Candidate.symbol).distinct()}
+
+    def stale(path):
+        try:
+            return os.stat(path).st_mtime < expires
+        except FileNotFoundError:
+            return False    # another worker got there first
+
+    removed = 0
+    with _locked(folder, exclusive=True):
+        for entry in os.scandir(folder):
+            if entry.name.startswith('.upload-') and stale(entry.path):
+                os.remove(entry.path)
+                continue
+
+            match = HASHED_NAME.match(entry.name)
+            symbol = f'symbols/{entry.name}'
+            if not match or match.group('variant') or symbol in used or not stale(entry.path):
+                continue
+            remove_symbols([symbol])
+            removed += 1
+
+    return removed
+
+
+def register_symbol_commands(app):
+    @app.cli.command('symbols-sweep')
+    def symbols_sweep():
+        """Delete symbol files no candidate uses any more."""
+        print(f'Deleted {sweep_symbols()} unused symbols')
+
+
+# ────────────────────────────────────────────────
+# SERVING
+# ────────────────────────────────────────────────
+def send_symbol(filename):
+    """Response for /uploads/symbols/<filename>."""
+    match = HASHED_NAME.match(filename)
+    if not match:
+        # Pre-hashing upload: the name may be reused, so keep revalidation
+        return send_from_directory(symbols_dir(), filename)
+
+    response = send_from_directory(
+        symbols_dir(), filename,
+        etag=filename.rsplit('.', 1)[0],
+        max_age=IMMUTABLE_MAX_AGE
+    )
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
@@ -0,0 +1,230 @@
+# services/turnout.py
+# Incrementally maintained turnout, overall and per voter segment.
+#
+# Two counter tables replace counting the voter and vote tables on every
+# results read:
+#   voter_segment     registered voters per (year, major, course)
+#   election_turnout  votes per (election, year, major, course)
+# Registrations, imports and profile changes adjust voter_segment; every
+# vote bumps election_turnout in the same transaction as the Vote row, so
+# the counters commit or roll back with the data they count. Both updates
+# are single upserts (ON CONFLICT / ON DUPLICATE KEY), safe across workers.
+#
+# Every voter is eligible for every election, so an election's turnout is
+# its votes over all registered voters; a segment's is the segment's votes
+# over the segment's registered voters. Votes count in the voter's segment
+# at the time of voting: a profile change moves the voter's registration,
+# and their votes in elections that are still open, to the new segment;
+# CLOSED elections keep the turnout they closed with. `flask
+# turnout-rebuild` recomputes voter_segment and the open elections' rows
+# should they ever drift (e.g. rows edited by hand); closed elections'
+# rows are left alone, as the segments they were cast in are not recorded.
+
+from collections import Counter
+
+from sqlalchemy import delete, func, literal, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from extensions import db
+from models.election import Election
+from models.election_turnout import ElectionTurnout
+from models.vote import Vote
+from models.voter import Voter, normalize
+from models.voter_segment import VoterSegment
+
+SEGMENT_KEYS = ('year', 'major', 'course')
+
+_INSERTS = {'sqlite': sqlite_insert, 'postgresql': postgresql_insert, 'mysql': mysql_insert}
+
+
+def segment_of(year, major, course):
+    """Counter key for a voter's year, major and course."""
+    return int(year), normalize(major) or '', normalize(course) or ''
+
+
+def _add_counts(dialect, table, column, source):
+    """
+    INSERT rows (a list of dicts or a SELECT) into a counter table, adding
+    to `column` where the row already exists.
+    """
+    insert = _INSERTS.get(dialect)
+    if insert is None:
+        raise RuntimeError(f"Turnout counters are not supported on {dialect}")
+
+    if isinstance(source, list):
+        stmt = insert(table).values(source)
+    else:
+        stmt = insert(table).from_select([c.name for c in table.columns], source)
+
+    if dialect == 'mysql':
+        return stmt.on_duplicate_key_update({column: table.c[column] + stmt.inserted[column]})
+    return stmt.on_conflict_do_update(
+        index_elements=[c.name for c in table.primary_key],
+        set_={column: table.c[column] + stmt.excluded[column]}
+    )
+
+
+def _dialect():
+    return db.session.connection().dialect.name
+
+
+# ────────────────────────────────────────────────
+# Write side (call inside the caller's transaction)
+# ────────────────────────────────────────────────
+def count_registrations(deltas):
+    """deltas: Counter of segment_of(...) → change in registered voters."""
+    rows = [
+        {'year': year, 'major': major, 'course': course, 'registered': n}
+        for (year, major, course), n in sorted(deltas.items()) if n
+    ]
+    if rows:
+        # Sorted so concurrent upserts lock rows in the same order
+        db.session.execute(_add_counts(_dialect(), VoterSegment.__table__, 'registered', rows))
+
+
+def move_voter(old_segment, voter):
+    """
+    After a profile change: the voter, and their votes in elections that
+    are not CLOSED yet, now count in the new segment.
+    """
+    new_segment = segment_of(voter.year, voter.major, voter.course)
+    if new_segment == old_segment:
+        return
+
+    count_registrations(Counter({old_segment: -1, new_segment: 1}))
+
+    election_ids = [
+        e for (e,) in db.session.query(Vote.election_id)
+        .join(Election, Election.id == Vote.election_id)
+        .filter(Vote.voter_id == voter.id, Election.election_status != 'CLOSED')
+    ]
+    rows = [
+        {'election_id': election_id, **dict(zip(SEGMENT_KEYS, segment)), 'votes': n}
+        for election_id in sorted(election_ids)
+        for segment, n in sorted({old_segment: -1, new_segment: 1}.items())
+    ]
+    if rows:
+        db.session.execute(_add_counts(_dialect(), ElectionTurnout.__table__, 'votes', rows))
+
+
+def _votes_select(election_id, voter_ids):
+    major = func.coalesce(Voter.major_norm, '')
+    course = func.coalesce(Voter.course_norm, '')
+    return select(literal(election_id), Voter.year, major, course, func.count()) \
+        .where(Voter.id.in_(voter_ids)) \
+        .group_by(Voter.year, major, course)
+
+
+def count_votes(election_id, voter_ids):
+    """
+    Add newly recorded votes to election_turnout. The segments are read
+    from the voter rows inside the same INSERT ... SELECT, so this is one
+    statement whatever the batch size.
+    """
+    if voter_ids:
+        db.session.execute(_add_counts(
+            _dialect(), ElectionTurnout.__table__, 'votes', _votes_select(election_id, sorted(voter_ids))
+        ))
+
+
+def rebuild_turnout(conn, include_closed=False):
+    """
+    Recompute voter_segment, and election_turnout for elections that are
+    not CLOSED, from voter and vote (on `conn`). include_closed counts
+    closed elections by current segments too, for backfilling empty tables.
+    """
+    segments = VoterSegment.__table__
+    turnout = ElectionTurnout.__table__
+    major = func.coalesce(Voter.major_norm, '')
+    course = func.coalesce(Voter.course_norm, '')
+    rebuilt_votes = select(Vote.election_id, Voter.year, major, course, func.count()) \
+        .join(Voter, Voter.id == Vote.voter_id) \
+        .group_by(Vote.election_id, Voter.year, major, course)
+    stale_rows = delete(turnout)
+    if not include_closed:
+        closed = select(Election.id).where(Election.election_status == 'CLOSED')
+        rebuilt_votes = rebuilt_votes.where(Vote.election_id.not_in(closed))
+        stale_rows = stale_rows.where(turnout.c.election_id.not_in(closed))
+
+    conn.execute(delete(segments))
+    conn.execute(stale_rows)
+    conn.execute(segments.insert().from_select(
+        ['year', 'major', 'course', 'registered'],
+        select(Voter.year, major, course, func.count()).group_by(Voter.year, major, course)
+    ))
+    conn.execute(turnout.insert().from_select(
+        ['election_id', 'year', 'major', 'course', 'votes'], rebuilt_votes
+    ))
+
+
+# ────────────────────────────────────────────────
+# Read side
+# ────────────────────────────────────────────────
+def total_registered_voters():
+    segments = VoterSegment.__table__
+    return int(db.session.execute(
+        select(func.coalesce(func.sum(segments.c.registered), 0))
+    ).scalar())
+
+
+def _percentage(votes, registered):
+    return round(votes / registered * 100, 2) if registered > 0 else 0
+
+
+def election_turnout(election_id):
+    """
+    Turnout of an election overall and broken down by year, major, course
+    and by full segment, from the counter rows only.
+    """
+    segments = VoterSegment.__table__
+    registered = {
+        (row.year, row.major, row.course): row.registered
+        for row in db.session.execute(select(segments)) if row.registered
+    }
+    votes = {
+        (row.year, row.major, row.course): row.votes
+        for row in db.session.execute(
+            select(ElectionTurnout).where(ElectionTurnout.election_id == election_id)
+        ).scalars() if row.votes
+    }
+
+    def breakdown(keys):
+        groups = {}
+        for segment in registered.keys() | votes.keys():
+            key = tuple(segment[SEGMENT_KEYS.index(k)] for k in keys)
+            group = groups.setdefault(key, [0, 0])
+            group[0] += registered.get(segment, 0)
+            group[1] += votes.get(segment, 0)
+        return [
+            {
+                **dict(zip(keys, key)),
+                'registered': r,
+                'votes': v,
+                'turnout_percentage': _percentage(v, r)
+            }
+            for key, (r, v) in sorted(groups.items())
+        ]
+
+    total_registered = sum(registered.values())
+    total_votes = sum(votes.values())
+    return {
+        'election_id': election_id,
+        'total_registered_voters': total_registered,
+        'total_votes': total_votes,
+        'turnout_percentage': _percentage(total_votes, total_registered),
+        'by_year': breakdown(('year',)),
+        'by_major': breakdown(('major',)),
+        'by_course': breakdown(('course',)),
+        'segments': breakdown(SEGMENT_KEYS)
+    }
+
+
+def register_turnout_commands(app):
+    @app.cli.command('turnout-rebuild')
+    def turnout_rebuild():
+        """Recompute the turnout counters (closed elections excepted) from voter and vote."""
+        with db.engine.begin() as conn:
+            rebuild_turnout(conn)
+        print(f'Turnout counters rebuilt: {total_registered_voters()} registered voters')
@@ -0,0 +1,370 @@
+# services/vote_buffer.py
+# Optional write-behind buffer for vote submissions.
+#
+# Validated votes are appended to a local journal, queued, and written by a
+# single flusher thread that commits many Vote rows plus the aggregated
+# Candidate.count deltas in one transaction. Callers block until the batch
+# containing their vote has committed, so an acknowledged vote is always in
+# the database; the journal lets votes that were accepted but not yet
+# flushed be replayed if the worker dies. Votes whose flush failed (the
+# caller got an error) are marked as such in the journal and never replayed.
+#
+# Journal records are only written to the OS under the journal lock; the
+# flusher fsyncs once per batch before writing it to the database (group
+# commit), so request threads never wait on the disk while holding the lock.
+#
+# Grouping needs several request threads per worker process (gunicorn
+# gthread workers, or asgi.py's thread pool): with one thread there is never
+# more than one vote to group, and each vote would only pay the batching
+# delay and a journal fsync on top of its commit. init_vote_buffer therefore
+# refuses to start unless REQUEST_THREADS > 1. A batch is flushed as soon as
+# every request thread is waiting on it, since no further vote can arrive.
+
+import atexit
+import itertools
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+from sqlalchemy import and_, insert, or_, update
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from models.candidate import Candidate
+from models.vote import Vote
+from services.turnout import count_votes
+from services.vote_service import cast_vote, DuplicateVote, InvalidCandidate
+from services.workers import pid_alive
+
+
+def existing_votes(pairs):
+    """
+    (voter_id, election_id) of the given pairs that already have a vote. The
+    filter is grouped per election so each branch is an index lookup (a
+    row-value IN is scanned on SQLite).
+    """
+    by_election = {}
+    for voter_id, election_id in pairs:
+        by_election.setdefault(election_id, []).append(voter_id)
+
+    return db.session.query(Vote.voter_id, Vote.election_id).filter(or_(*[
+        and_(Vote.election_id == election_id, Vote.voter_id.in_(voter_ids))
+        for election_id, voter_ids in by_election.items()
+    ]))
+
+
+class _PendingVote:
+    __slots__ = ('seq', 'voter_id', 'election_id', 'candidate_id', 'queued_at', 'done', 'error')
+
+    def __init__(self, voter_id, election_id, candidate_id, seq=None):
+        self.seq = seq
+        self.voter_id = int(voter_id)
+        self.election_id = int(election_id)
+        self.candidate_id = int(candidate_id)
+        self.queued_at = time.monotonic()
+        self.done = threading.Event()
+        self.error = None
+
+    def to_json(self):
+        return json.dumps({
+            'seq': self.seq,
+            'voter_id': self.voter_id,
+            'election_id': self.election_id,
+            'candidate_id': self.candidate_id
+        })
+
+
+def _journal_owner(filename):
+    """'<pid>.journal' and 'recover-<pid>-<n>.journal' are owned by <pid>."""
+    stem = filename[:-len('.journal')]
+    if stem.startswith('recover-'):
+        stem = stem.split('-')[1]
+    return int(stem) if stem.isdigit() else None
+
+
+def apply_votes(entries):
+    """
+    Write a batch of votes in one transaction.
+
+    Repeat votes (inside the batch or already in the table) are marked with
+    DuplicateVote instead of failing the batch. If another worker races us
+    and the unique constraint still fires, the batch falls back to the
+    per-vote path so every entry gets its own outcome.
+    """
+    accepted = []
+    seen = set()
+    for entry in entries:
+        key = (entry.voter_id, entry.election_id)
+        if key in seen:
+            entry.error = DuplicateVote()
+        else:
+            seen.add(key)
+            accepted.append(entry)
+
+    if not accepted:
+        return
+
+    existing = set(existing_votes(seen).all())
+
+    rows = []
+    for entry in accepted:
+        if (entry.voter_id, entry.election_id) in existing:
+            entry.error = DuplicateVote()
+        else:
+            rows.append(entry)
+
+    if not rows:
+        db.session.rollback()
+        return
+
+    try:
+        db.session.execute(insert(Vote), [
+            {
+                'voter_id': e.voter_id,
+                'election_id': e.election_id,
+                'candidate_id': e.candidate_id
+            }
+            for e in rows
+        ])
+
+        deltas = Counter((e.candidate_id, e.election_id) for e in rows)
+        for (candidate_id, election_id), n in deltas.items():
+            db.session.execute(
+                update(Candidate)
+                .where(Candidate.id == candidate_id, Candidate.election_id == election_id)
+                .values(count=Candidate.count + n)
+                .execution_options(synchronize_session=False)
+            )
+
+        voters_by_election = {}
+        for e in rows:
+            voters_by_election.setdefault(e.election_id, []).append(e.voter_id)
+        for election_id, voter_ids in voters_by_election.items():
+            count_votes(election_id, voter_ids)
+
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        for entry in rows:
+            try:
+                cast_vote(entry.voter_id, entry.election_id, entry.candidate_id)
+            except Exception as e:
+                # One entry's failure doesn't decide the others' outcome
+                db.session.rollback()
+                entry.error = e
+
+
+def _failed(entry):
+    """True when the vote was not written and the caller gets an error for it."""
+    return entry.error is not None and not isinstance(entry.error, (DuplicateVote, InvalidCandidate))
+
+
+class VoteBuffer:
+
+    def __init__(self, app, max_batch=500, max_latency=0.02, journal_dir=None, fsync=True,
+                 request_threads=None):
+        self.app = app
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self.journal_dir = journal_dir
+        self.fsync = fsync
+        # No more votes can arrive once this many callers are waiting
+        self.request_threads = request_threads or max_batch
+        self._seq = itertools.count(1)
+
+        self._queue = []
+        self._cond = threading.Condition()
+        self._journal_lock = threading.Lock()
+        self._journal = None
+        self._stopped = False
+
+        if journal_dir:
+            os.makedirs(journal_dir, exist_ok=True)
+            self.recover()
+            self._journal = open(self._journal_path(), 'a', encoding='utf-8')
+
+        self._thread = threading.Thread(target=self._run, name='vote-buffer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _journal_path(self):
+        return os.path.join(self.journal_dir, f'{os.getpid()}.journal')
+
+    # ── Public API ──
+    def submit(self, voter_id, election_id, candidate_id):
+        """Queue a validated vote and block until its batch has committed."""
+        with self._journal_lock:
+            entry = _PendingVote(voter_id, election_id, candidate_id, seq=next(self._seq))
+            self._append_journal(entry.to_json())
+
+            with self._cond:
+                if self._stopped:
+                    raise RuntimeError('Vote buffer is shut down')
+                self._queue.append(entry)
+                if len(self._queue) in (1, self._flush_at()):
+                    self._cond.notify()
+
+        entry.done.wait()
+        if entry.error:
+            raise entry.error
+
+    def close(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join(timeout=5)
+
+        if self._journal:
+            with self._journal_lock:
+                empty = self._journal.tell() == 0
+                self._journal.close()
+                self._journal = None
+            if empty:
+                os.remove(self._journal_path())
+
+    def _append_journal(self, line):
+        """Append one record (caller holds _journal_lock); _sync_journal makes it durable."""
+        if not self._journal:
+            return
+        self._journal.write(line + '\n')
+        self._journal.flush()
+
+    def _sync_journal(self):
+        """fsync everything appended so far: one call covers a whole batch."""
+        if self._journal and self.fsync:
+            os.fsync(self._journal.fileno())
+
+    # ── Flusher ──
+    def _flush_at(self):
+        return min(self.max_batch, self.request_threads)
+
+    def _next_batch(self):
+        with self._cond:
+            while not self._queue and not self._stopped:
+                self._cond.wait()
+
+            if self._queue:
+                deadline = self._queue[0].queued_at + self.max_latency
+                while len(self._queue) < self._flush_at() and not self._stopped:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+            batch = self._queue[:self.max_batch]
+            del self._queue[:self.max_batch]
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+
+            # Every vote in the batch was appended before it was queued
+            self._sync_journal()
+
+            with self.app.app_context():
+                try:
+                    apply_votes(batch)
+                except Exception as e:
+                    db.session.rollback()
+                    self.app.logger.error(f"Vote batch flush failed: {str(e)}", exc_info=True)
+                    for entry in batch:
+                        entry.error = entry.error or e
+                finally:
+                    db.session.remove()
+
+            # Callers of failed votes get an error (and may retry): make sure
+            # recovery never writes those votes behind their back
+            failed = [entry.seq for entry in batch if _failed(entry)]
+            if failed:
+                with self._journal_lock:
+                    self._append_journal(json.dumps({'failed': failed}))
+                self._sync_journal()
+
+            for entry in batch:
+                entry.done.set()
+
+            self._checkpoint()
+
+    def _checkpoint(self):
+        """Everything journaled has been flushed: start a fresh journal."""
+        if not self._journal:
+            return
+        with self._journal_lock:
+            with self._cond:
+                if not self._queue:
+                    self._journal.seek(0)
+                    self._journal.truncate()
+
+    # ── Crash recovery ──
+    def recover(self):
+        """Replay journals left behind by workers that are no longer running."""
+        for filename in sorted(os.listdir(self.journal_dir)):
+            if not filename.endswith('.journal'):
+                continue
+            owner = _journal_owner(filename)
+            if owner is None or (owner != os.getpid() and pid_alive(owner)):
+                continue
+
+            # Claim the file so concurrent workers don't replay it twice
+            claimed = os.path.join(
+                self.journal_dir,
+                f'recover-{os.getpid()}-{time.monotonic_ns()}.journal'
+            )
+            try:
+                os.rename(os.path.join(self.journal_dir, filename), claimed)
+            except FileNotFoundError:
+                continue
+
+            entries = []
+            failed = set()
+            with open(claimed, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        row = json.loads(line)
+                    except ValueError:
+                        continue    # torn final write
+                    if 'failed' in row:
+                        failed.update(row['failed'])
+                        continue
+                    entries.append(_PendingVote(
+                        row['voter_id'], row['election_id'], row['candidate_id'], seq=row.get('seq')
+                    ))
+            entries = [e for e in entries if e.seq is None or e.seq not in failed]
+
+            with self.app.app_context():
+                for start in range(0, len(entries), self.max_batch):
+                    apply_votes(entries[start:start + self.max_batch])
+                db.session.remove()
+
+            if entries:
+                self.app.logger.info(f"Replayed {len(entries)} journaled votes from {filename}")
+            os.remove(claimed)
+
+
+def init_vote_buffer(app):
+    """Attach a VoteBuffer to the app when VOTE_WRITE_BEHIND is enabled."""
+    if not app.config.get('VOTE_WRITE_BEHIND'):
+        return None
+
+    if app.config['REQUEST_THREADS'] < 2:
+        app.logger.error(
+            "VOTE_WRITE_BEHIND needs several request threads per worker process "
+            "(REQUEST_THREADS > 1, e.g. gunicorn gthread workers); votes are written directly"
+        )
+        return None
+
+    buffer = VoteBuffer(
+        app,
+        max_batch=app.config['VOTE_BUFFER_MAX_BATCH'],
+        max_latency=app.config['VOTE_BUFFER_MAX_LATENCY_MS'] / 1000.0,
+        journal_dir=app.config['VOTE_JOURNAL_DIR'],
+        fsync=app.config['VOTE_JOURNAL_FSYNC'],
+        request_threads=app.config['REQUEST_THREADS']
+    )
+    app.extensions['vote_buffer'] = buffer
+    return buffer
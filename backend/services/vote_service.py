@@ -0,0 +1,146 @@
+# services/vote_service.py
+# Shared vote ingestion path used by both submit_vote endpoints.
+
+from flask import current_app
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from models.candidate import Candidate
+from models.election import Election, RANKED_METHODS
+from models.ranked_ballot import RankedBallot, pack_ranking
+from models.vote import Vote
+from services.live_tally import announce_vote
+from services.replicas import stick_to_primary
+from services.turnout import count_votes
+
+
+class DuplicateVote(Exception):
+    """The voter already has a vote recorded for this election."""
+
+
+class InvalidCandidate(Exception):
+    """The candidate does not exist or belongs to another election."""
+
+
+class InvalidBallot(Exception):
+    """A malformed ranking, or a ranking for a plurality election."""
+
+
+def cast_vote(voter_id, election_id, candidate_id, ranking=None):
+    """
+    Record one vote and bump the candidate tally in a single transaction.
+
+    The vote row is appended first and the `unique_voter_election`
+    constraint decides whether this is a repeat vote, so there is no
+    pre-check SELECT. The tally is then incremented with an atomic
+    `UPDATE candidate SET count = count + 1`, which never reads the row
+    into Python and therefore cannot lose updates across workers.
+
+    For ranked ballots candidate_id is the first preference and the full
+    ranking is stored alongside in a RankedBallot row.
+    """
+    db.session.add(Vote(
+        voter_id=voter_id,
+        election_id=election_id,
+        candidate_id=candidate_id
+    ))
+    if ranking is not None:
+        db.session.add(RankedBallot(
+            election_id=election_id,
+            voter_id=voter_id,
+            ranking=pack_ranking(ranking)
+        ))
+
+    try:
+        db.session.flush()
+    except IntegrityError:
+        db.session.rollback()
+        raise DuplicateVote()
+
+    result = db.session.execute(
+        update(Candidate)
+        .where(Candidate.id == candidate_id, Candidate.election_id == election_id)
+        .values(count=Candidate.count + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+    # The candidate filter doubles as the ownership check
+    if result.rowcount != 1:
+        db.session.rollback()
+        raise InvalidCandidate()
+
+    count_votes(election_id, [voter_id])
+    db.session.commit()
+
+
+def record_vote(voter_id, election_id, candidate_id, ranking=None):
+    """
+    Entry point for the vote endpoints.
+
+    Uses the write-behind buffer when it is enabled (see
+    services/vote_buffer.py), otherwise writes the vote directly.
+    Ranked ballots always take the direct path.
+    """
+    if ranking is not None:
+        record_ranked_vote(voter_id, election_id, ranking)
+        return
+
+    buffer = current_app.extensions.get('vote_buffer')
+    if buffer is None:
+        cast_vote(voter_id, election_id, candidate_id)
+        _after_vote(voter_id, election_id)
+        return
+
+    # The buffer only takes validated votes; tallies are applied in bulk
+    valid = db.session.query(Candidate.id).filter_by(
+        id=candidate_id,
+        election_id=election_id
+    ).first()
+
+    # Don't hold a read transaction open while waiting for the group commit
+    db.session.commit()
+
+    if not valid:
+        raise InvalidCandidate()
+
+    buffer.submit(voter_id, election_id, candidate_id)
+    _after_vote(voter_id, election_id)
+
+
+def _parse_ranking(ranking):
+    if not isinstance(ranking, list) or not ranking:
+        raise InvalidBallot('ranking must be a non-empty list of candidate ids')
+    try:
+        candidate_ids = [int(c) for c in ranking]
+    except (TypeError, ValueError):
+        raise InvalidBallot('ranking must be a non-empty list of candidate ids')
+    if len(set(candidate_ids)) != len(candidate_ids):
+        raise InvalidBallot('ranking lists a candidate more than once')
+    return candidate_ids
+
+
+def record_ranked_vote(voter_id, election_id, ranking):
+    """Validate a ranking (every entry a candidate of this IRV/STV election) and record it."""
+    candidate_ids = _parse_ranking(ranking)
+
+    method = db.session.query(Election.voting_method).filter_by(id=election_id).scalar()
+    if method not in RANKED_METHODS:
+        raise InvalidBallot('This election does not accept ranked ballots')
+
+    known = db.session.query(func.count(Candidate.id)).filter(
+        Candidate.id.in_(candidate_ids),
+        Candidate.election_id == election_id
+    ).scalar()
+    if known != len(candidate_ids):
+        db.session.rollback()
+        raise InvalidCandidate()
+
+    cast_vote(voter_id, election_id, candidate_ids[0], candidate_ids)
+    _after_vote(voter_id, election_id)
+
+
+def _after_vote(voter_id, election_id):
+    announce_vote(election_id)
+    # The voter's next reads (vote status, tallies) must see this vote
+    stick_to_primary()
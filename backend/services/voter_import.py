@@ -0,0 +1,245 @@
+# services/voter_import.py
+# Bulk voter import from the registrar's CSV / JSONL export.
+#
+# The upload is read row by row (werkzeug spools large uploads to disk), so
+# memory stays flat regardless of file size. Rows are handled in chunks:
+#   validate (same rules as /api/voter/register) → drop duplicates within the
+#   file and against the voter table with one IN query per column →
+#   hash passwords in a process pool → one executemany INSERT → commit.
+# The pool is started on the first import and reused by later ones.
+# Bad rows are reported individually and never abort the load.
+
+import codecs
+import csv
+import json
+import multiprocessing
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from flask import current_app
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from models.voter import Voter, normalize
+from services.passwords import hash_password
+from services.turnout import count_registrations, segment_of
+
+REQUIRED_FIELDS = ['student_name', 'roll_no', 'major', 'course', 'year', 'email', 'password']
+
+# Errors listed in the response; the rest are only counted
+MAX_REPORTED_ERRORS = 1000
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    """One hashing pool per worker process, created lazily (and again after a fork)."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ProcessPoolExecutor(
+                max_workers=current_app.config['VOTER_IMPORT_WORKERS'],
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            _pool_pid = os.getpid()
+        return _pool
+
+
+class ImportReport:
+
+    def __init__(self):
+        self.inserted = 0
+        self.error_count = 0
+        self.errors = []
+
+    def error(self, row, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row, 'message': message})
+
+    def to_dict(self):
+        return {
+            'inserted': self.inserted,
+            'failed': self.error_count,
+            'errors': sorted(self.errors, key=lambda e: e['row'] or 0),
+            'errors_truncated': self.error_count > len(self.errors)
+        }
+
+
+# ────────────────────────────────────────────────
+# READING
+# ────────────────────────────────────────────────
+def read_rows(stream, fmt):
+    """Yield (row number, dict) from a binary upload stream without loading it whole."""
+    text = codecs.getreader('utf-8-sig')(stream)
+
+    if fmt == 'jsonl':
+        for number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield number, row if isinstance(row, dict) else None
+        return
+
+    # Row 1 is the header
+    for number, row in enumerate(csv.DictReader(text), start=2):
+        yield number, row
+
+
+def detect_format(filename, requested=None):
+    fmt = (requested or '').lower()
+    if not fmt and filename:
+        fmt = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if fmt in ('jsonl', 'ndjson'):
+        return 'jsonl'
+    if fmt in ('csv', ''):
+        return 'csv'
+    return None
+
+
+# ────────────────────────────────────────────────
+# VALIDATION (mirrors register_voter)
+# ────────────────────────────────────────────────
+def clean_row(row):
+    """Return (values, None) or (None, error message)."""
+    if row is None:
+        return None, "Malformed row"
+
+    for field in REQUIRED_FIELDS:
+        value = row.get(field)
+        if value is None or not str(value).strip():
+            return None, f"{field} is required"
+
+    try:
+        year = int(row['year'])
+        if year < 1 or year > 5:
+            return None, "Year must be between 1 and 5"
+    except (ValueError, TypeError):
+        return None, "Invalid year format"
+
+    return {
+        'student_name': str(row['student_name']).strip(),
+        'roll_no': str(row['roll_no']).strip().upper(),
+        'major': str(row['major']).strip(),
+        'course': str(row['course']).strip(),
+        'year': year,
+        'email': str(row['email']).strip().lower(),
+        'password': str(row['password'])
+    }, None
+
+
+# ────────────────────────────────────────────────
+# IMPORT
+# ────────────────────────────────────────────────
+def _existing(column, values):
+    if not values:
+        return set()
+    return {v for (v,) in db.session.query(column).filter(column.in_(values))}
+
+
+def _segment(record):
+    return segment_of(record['year'], record['major'], record['course'])
+
+
+def _insert_chunk(chunk, pool, chunksize, method, report):
+    """chunk: [(row number, values)] already free of in-file duplicates."""
+    taken_emails = _existing(Voter.email, [v['email'] for _, v in chunk])
+    taken_rolls = _existing(Voter.roll_no, [v['roll_no'] for _, v in chunk])
+
+    fresh = []
+    for number, values in chunk:
+        if values['email'] in taken_emails:
+            report.error(number, "Email already registered")
+        elif values['roll_no'] in taken_rolls:
+            report.error(number, "Roll number already registered")
+        else:
+            fresh.append((number, values))
+
+    if not fresh:
+        db.session.rollback()
+        return
+
+    hashes = pool.map(
+        hash_password, [v['password'] for _, v in fresh], repeat(method), chunksize=chunksize
+    )
+
+    records = []
+    for (number, values), password in zip(fresh, hashes):
+        records.append(dict(
+            values,
+            password=password,
+            # Bulk INSERT bypasses the model's @validates hook
+            student_name_norm=normalize(values['student_name']),
+            major_norm=normalize(values['major']),
+            course_norm=normalize(values['course'])
+        ))
+
+    try:
+        db.session.execute(insert(Voter), records)
+        count_registrations(Counter(_segment(r) for r in records))
+        db.session.commit()
+        report.inserted += len(records)
+    except IntegrityError:
+        # Someone registered one of these meanwhile: retry row by row
+        db.session.rollback()
+        for (number, _), record in zip(fresh, records):
+            try:
+                db.session.execute(insert(Voter), [record])
+                count_registrations(Counter([_segment(record)]))
+                db.session.commit()
+                report.inserted += 1
+            except IntegrityError:
+                db.session.rollback()
+                report.error(number, "Email or roll number already registered")
+
+
+def import_voters(stream, fmt):
+    """Import every row of an uploaded file; returns an ImportReport."""
+    report = ImportReport()
+    chunk_size = current_app.config['VOTER_IMPORT_CHUNK']
+    workers = current_app.config['VOTER_IMPORT_WORKERS']
+    method = current_app.config['PASSWORD_HASH_METHOD']
+    # A few map() tasks per worker per chunk keeps IPC overhead low
+    chunksize = max(1, chunk_size // (workers * 4))
+
+    seen_emails = set()
+    seen_rolls = set()
+    chunk = []
+
+    pool = _get_pool()
+    try:
+        for number, row in read_rows(stream, fmt):
+            values, message = clean_row(row)
+            if message:
+                report.error(number, message)
+                continue
+
+            if values['email'] in seen_emails:
+                report.error(number, "Email appears earlier in the file")
+                continue
+            if values['roll_no'] in seen_rolls:
+                report.error(number, "Roll number appears earlier in the file")
+                continue
+            seen_emails.add(values['email'])
+            seen_rolls.add(values['roll_no'])
+
+            chunk.append((number, values))
+            if len(chunk) >= chunk_size:
+                _insert_chunk(chunk, pool, chunksize, method, report)
+                chunk = []
+    except (UnicodeDecodeError, csv.Error) as e:
+        report.error(None, f"Could not read file: {str(e)}")
+
+    if chunk:
+        _insert_chunk(chunk, pool, chunksize, method, report)
+
+    return report
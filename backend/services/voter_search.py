@@ -0,0 +1,108 @@
+# services/voter_search.py
+# Indexed voter search for the admin voter list.
+#
+# - roll_no / major / course: prefix match as a B-tree range scan
+#   (col >= 'abc' AND col < 'abd') on roll_no and the lowercased *_norm columns
+# - student_name: word-prefix full-text search (SQLite FTS5 or MySQL FULLTEXT),
+#   falling back to a prefix range on student_name_norm
+#
+# The FTS index is maintained by the database (triggers on SQLite, InnoDB on
+# MySQL), so registrations and profile updates keep it in sync automatically.
+# The columns and indexes themselves are created by the migrations package.
+
+import re
+
+from flask import current_app
+from sqlalchemy import column, inspect, text
+
+from extensions import db
+from models.voter import Voter, normalize
+
+# InnoDB ignores shorter tokens unless innodb_ft_min_token_size is lowered
+_MYSQL_MIN_TOKEN = 3
+
+
+# ────────────────────────────────────────────────
+# SETUP
+# ────────────────────────────────────────────────
+def detect_fulltext_backend(engine):
+    """
+    Full-text backend created by the voter_search migration: 'fts5',
+    'mysql' or None (name search then uses the prefix index).
+    """
+    inspector = inspect(engine)
+    dialect = engine.dialect.name
+
+    if dialect == 'sqlite' and 'voter_fts' in inspector.get_table_names():
+        return 'fts5'
+
+    if dialect == 'mysql':
+        names = {i['name'] for i in inspector.get_indexes('voter')}
+        if 'ft_voter_student_name' in names:
+            return 'mysql'
+
+    return None
+
+
+def init_voter_search(app):
+    with app.app_context():
+        app.extensions['voter_search'] = detect_fulltext_backend(db.engine)
+
+
+# ────────────────────────────────────────────────
+# QUERYING
+# ────────────────────────────────────────────────
+def _prefix(col, value):
+    """col LIKE 'value%' written as a range so any B-tree index can serve it."""
+    upper = value[:-1] + chr(ord(value[-1]) + 1)
+    return (col >= value) & (col < upper)
+
+
+def _name_tokens(value):
+    return [t for t in re.split(r'\W+', value.lower()) if t]
+
+
+def _name_filter(value):
+    tokens = _name_tokens(value)
+    backend = current_app.extensions.get('voter_search')
+
+    if tokens and backend == 'fts5':
+        # Every word must match as a prefix: "arun kum" → "arun"* "kum"*
+        match = ' '.join('"' + t.replace('"', '""') + '"*' for t in tokens)
+        return Voter.id.in_(
+            text('SELECT rowid FROM voter_fts WHERE voter_fts MATCH :name_match')
+            .bindparams(name_match=match)
+            .columns(column('rowid'))
+        )
+
+    if tokens and backend == 'mysql' and min(len(t) for t in tokens) >= _MYSQL_MIN_TOKEN:
+        match = ' '.join(f'+{t}*' for t in tokens)
+        return text('MATCH (voter.student_name) AGAINST (:name_match IN BOOLEAN MODE)') \
+            .bindparams(name_match=match)
+
+    return _prefix(Voter.student_name_norm, normalize(value))
+
+
+def apply_voter_search(query, args):
+    """Apply the get_voters filter arguments to a Voter query."""
+    student_name = (args.get('student_name') or '').strip()
+    roll_no = (args.get('roll_no') or '').strip()
+    year = args.get('year')
+    major = (args.get('major') or '').strip()
+    course = (args.get('course') or '').strip()
+
+    if student_name:
+        query = query.filter(_name_filter(student_name))
+    if roll_no:
+        query = query.filter(_prefix(Voter.roll_no, roll_no.upper()))
+    if year:
+        try:
+            query = query.filter(Voter.year == int(year))
+        except ValueError:
+            pass
+    if major:
+        query = query.filter(_prefix(Voter.major_norm, normalize(major)))
+    if course:
+        query = query.filter(_prefix(Voter.course_norm, normalize(course)))
+
+    return query
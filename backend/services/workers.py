@@ -0,0 +1,60 @@
+# services/workers.py
+# Helpers for state shared between gunicorn worker processes.
+
+import os
+import socket
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, or_, update
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from models.worker_lease import WorkerLease
+
+# pids only mean something on the host that issued them
+HOSTNAME = socket.gethostname()
+
+
+def pid_alive(pid):
+    """True if a process with this pid is still running on this host."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def process_name():
+    """host:pid of this worker process."""
+    return f'{HOSTNAME}:{os.getpid()}'
+
+
+def acquire_lease(name, seconds, holder=None):
+    """
+    Take or renew the named lease for `seconds`. True if `holder` (this
+    process by default) now holds it: it was free, expired or already
+    ours. Commits the session.
+    """
+    holder = holder or process_name()
+    now = datetime.utcnow()
+    lease = WorkerLease.__table__
+    values = {'holder': holder, 'expires_at': now + timedelta(seconds=seconds)}
+
+    taken = db.session.execute(
+        update(lease)
+        .where(lease.c.name == name, or_(lease.c.holder == holder, lease.c.expires_at < now))
+        .values(**values)
+    ).rowcount
+
+    if not taken:
+        try:
+            db.session.execute(insert(lease).values(name=name, **values))
+        except IntegrityError:
+            # Held by someone else (or they inserted it first)
+            db.session.rollback()
+            return False
+
+    db.session.commit()
+    return True
@@ -0,0 +1,173 @@
+# tests/conftest.py
+# The app is imported once per test session against a scratch SQLite file
+# (background threads off), so run from backend/:
+#
+#     python -m pytest tests
+
+import itertools
+import os
+import sys
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, time, timedelta
+
+import pytest
+from sqlalchemy import event, insert
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='session')
+def app(tmp_path_factory):
+    workdir = tmp_path_factory.mktemp('app')
+    os.environ['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{workdir / 'test.db'}"
+    # A "replica" bind on the same file: reads are routed as in production
+    # and always see the data (tests/test_replicas.py tells them apart)
+    os.environ['SQLALCHEMY_REPLICA_URIS'] = f"sqlite:///{workdir / 'test.db'}"
+    for key in ('REPORT_CACHE_DIR', 'REPORT_JOB_DIR', 'LIVE_TALLY_DIR',
+                'VOTE_JOURNAL_DIR', 'PROFILER_DIR'):
+        os.environ[key] = str(workdir / key.lower())
+    os.environ['ELECTION_STATUS_SCHEDULER'] = 'False'
+    os.environ['REPORT_PRERENDER'] = 'False'
+    # Registrations hash passwords; the production cost only slows tests down
+    os.environ['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:1000'
+    sys.path.insert(0, BACKEND_DIR)
+
+    from app import app
+    app.config['UPLOAD_FOLDER'] = str(workdir / 'uploads')
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def voter_headers(app):
+    from extensions import db
+    from models.voter import Voter
+    from services.identity import create_voter_token
+    from services.turnout import count_registrations, segment_of
+
+    with app.app_context():
+        voter = Voter.query.filter_by(email='test-voter@example.com').first()
+        if voter is None:
+            voter = Voter('Test Voter', 'TV0001', 'CSE', 'BE', 2, 'test-voter@example.com', 'password')
+            db.session.add(voter)
+            count_registrations(Counter([segment_of(voter.year, voter.major, voter.course)]))
+            db.session.commit()
+        return {'Authorization': f'Bearer {create_voter_token(voter)}'}
+
+
+@pytest.fixture
+def count_statements(app):
+    """count_statements() -> context manager yielding a list of executed SQL statements."""
+    from extensions import db
+
+    @contextmanager
+    def counting():
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        with app.app_context():
+            engines = list(db.engines.values())
+        for engine in engines:
+            event.listen(engine, 'before_cursor_execute', record)
+        try:
+            yield statements
+        finally:
+            for engine in engines:
+                event.remove(engine, 'before_cursor_execute', record)
+
+    return counting
+
+
+@pytest.fixture
+def elections(app):
+    """
+    grow(total, status) bulk-inserts elections (three candidates each) until
+    the table holds `total`. Everything is deleted again after the test.
+    """
+    from extensions import db
+    from models.candidate import Candidate
+    from models.election import Election
+    from models.result_snapshot import ResultSnapshot
+
+    def grow(total, status='CLOSED'):
+        with app.app_context():
+            have = Election.query.count()
+            if total <= have:
+                return
+
+            end = date.today() - timedelta(days=1)
+            db.session.execute(insert(Election), [
+                {
+                    'election_name': f'Election {n}',
+                    'election_date': end - timedelta(days=1), 'election_time': time(9),
+                    'end_date': end, 'end_time': time(17),
+                    'result_date': end, 'result_time': time(18),
+                    'election_status': status
+                }
+                for n in range(have, total)
+            ])
+            new_ids = [row.id for row in db.session.query(Election.id).order_by(Election.id).offset(have)]
+            db.session.execute(insert(Candidate), [
+                {
+                    'election_id': election_id, 'name': f'Candidate {election_id}-{c}',
+                    'roll_no': f'C{election_id}-{c}', 'major': 'CSE', 'course': 'BE', 'year': 1,
+                    'symbol': 'symbols/test.jpg', 'email': f'c{election_id}-{c}@example.com',
+                    'count': c
+                }
+                for election_id in new_ids for c in range(3)
+            ])
+            db.session.commit()
+
+    yield grow
+
+    with app.app_context():
+        for model in (ResultSnapshot, Candidate, Election):
+            db.session.query(model).delete()
+        db.session.commit()
+
+
+@pytest.fixture
+def voters(app):
+    """
+    register(n, year=, major=, course=) registers n voters through the API
+    and returns their ids. They are deleted with their votes after the
+    test, and the turnout tables are rebuilt.
+    """
+    from extensions import db
+    from models.ranked_ballot import RankedBallot
+    from models.vote import Vote
+    from models.voter import Voter
+    from services.turnout import rebuild_turnout
+
+    client = app.test_client()
+    serial = itertools.count(1)
+
+    def register(n, year=1, major='CSE', course='BE'):
+        ids = []
+        for _ in range(n):
+            k = next(serial)
+            response = client.post('/api/voter/register', json={
+                'student_name': f'Fixture Voter {k}', 'roll_no': f'FX{k:05d}',
+                'major': major, 'course': course, 'year': year,
+                'email': f'fixture{k}@voters.test', 'password': 'password'
+            })
+            assert response.status_code == 201, response.get_json()
+            ids.append(response.get_json()['voter_id'])
+        return ids
+
+    yield register
+
+    with app.app_context():
+        created = db.session.query(Voter.id).filter(Voter.email.like('%@voters.test'))
+        for model in (Vote, RankedBallot):
+            db.session.query(model).filter(model.voter_id.in_(created)).delete(synchronize_session=False)
+        db.session.query(Voter).filter(Voter.email.like('%@voters.test')).delete(synchronize_session=False)
+        rebuild_turnout(db.session.connection(), include_closed=True)
+        db.session.commit()
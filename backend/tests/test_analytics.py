@@ -0,0 +1,163 @@
+# tests/test_analytics.py
+# Demographics analytics: tabulate() against hand-counted answers, and the
+# endpoint against a plain recount of the vote table.
+
+from collections import Counter
+from datetime import date, time, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import update
+
+from extensions import db
+from models.candidate import Candidate
+from models.election import Election
+from models.vote import Vote
+from models.voter import Voter
+from services.analytics import tabulate
+from services.identity import create_voter_token
+
+
+def codes(*values):
+    return np.array(values, dtype=np.int64)
+
+
+# ────────────────────────────────────────────────
+# TABULATION
+# ────────────────────────────────────────────────
+def test_tabulate_known_answer():
+    # Year 1 votes A A B, year 2 votes B B; one vote for a deleted candidate (9)
+    candidates = [(1, 10, 'A'), (2, 10, 'B')]
+    candidate_ids = codes(1, 1, 2, 2, 2, 9)
+    years = ([1, 2], codes(0, 0, 0, 1, 1, 0))
+
+    payload = tabulate([(10, 'Council')], candidates, candidate_ids, [years], ('year',))
+
+    assert payload['total_votes'] == 5
+    assert payload['segments'] == [{'year': 1, 'votes': 3}, {'year': 2, 'votes': 2}]
+
+    election, = payload['elections']
+    assert election['total_votes'] == 5
+    assert [(c['candidate_id'], c['votes'], c['percentage'], c['segments_led'])
+            for c in election['candidates']] == [(1, 2, 40.0, 1), (2, 3, 60.0, 1)]
+    assert election['margin'] == {'leader_id': 2, 'votes': 1, 'percentage': 20.0}
+
+    first, second = election['segments']
+    assert (first['year'], first['votes'], first['leader_id'], first['margin_votes']) == (1, 3, 1, 1)
+    assert first['margin_percentage'] == 33.33
+    assert [c['percentage'] for c in first['candidates']] == [66.67, 33.33]
+    assert (second['year'], second['leader_id'], second['margin_votes'], second['margin_percentage']) == \
+        (2, 2, 2, 100.0)
+    assert (election['segment_margins']['min'], election['segment_margins']['max']) == (33.33, 100.0)
+
+
+def test_tabulate_ties_and_separate_elections():
+    candidates = [(1, 10, 'A'), (2, 10, 'B'), (3, 11, 'C')]
+    # Election 10 ties 1–1 among CSE voters; election 11 only has ECE votes
+    candidate_ids = codes(1, 2, 3, 3)
+    majors = (['cse', 'ece'], codes(0, 0, 1, 1))
+
+    payload = tabulate([(10, 'Tied'), (11, 'Solo')], candidates, candidate_ids, [majors], ('major',))
+    tied, solo = payload['elections']
+
+    assert tied['margin'] == {'leader_id': None, 'votes': 0, 'percentage': 0.0}
+    segment, = tied['segments']
+    assert (segment['major'], segment['leader_id'], segment['margin_votes']) == ('cse', None, 0)
+    assert [c['segments_led'] for c in tied['candidates']] == [0, 0]
+
+    # A lone candidate's margin is their whole vote
+    segment, = solo['segments']
+    assert (segment['major'], segment['leader_id'], segment['margin_percentage']) == ('ece', 3, 100.0)
+    assert solo['margin'] == {'leader_id': 3, 'votes': 2, 'percentage': 100.0}
+
+
+# ────────────────────────────────────────────────
+# ENDPOINT
+# ────────────────────────────────────────────────
+@pytest.fixture
+def open_elections(app, elections):
+    """Two elections open for voting: {election_id: [candidate ids]}."""
+    elections(2, status='ACTIVE')
+    today = date.today()
+    with app.app_context():
+        db.session.execute(update(Election).values(
+            election_date=today - timedelta(days=1), election_time=time(0),
+            end_date=today + timedelta(days=1), end_time=time(23, 59)
+        ))
+        db.session.commit()
+        return {
+            election.id: [c.id for c in Candidate.query.filter_by(election_id=election.id).order_by(Candidate.id)]
+            for election in Election.query.order_by(Election.id)
+        }
+
+
+@pytest.fixture
+def vote(app, client):
+    def cast(voter_id, election_id, candidate_id):
+        with app.app_context():
+            token = create_voter_token(db.session.get(Voter, voter_id))
+        response = client.post(f'/api/voter/elections/{election_id}/vote', json={'candidate_id': candidate_id},
+                               headers={'Authorization': f'Bearer {token}'})
+        assert response.status_code == 200, response.get_json()
+    return cast
+
+
+def recount(app, election_id):
+    """(candidate id, year, major) → votes, straight from the tables."""
+    with app.app_context():
+        rows = db.session.query(Vote.candidate_id, Voter.year, Voter.major_norm) \
+            .join(Voter, Voter.id == Vote.voter_id).filter(Vote.election_id == election_id)
+        return Counter(tuple(row) for row in rows)
+
+
+def reported(election):
+    return Counter({
+        (c['candidate_id'], s['year'], s['major']): c['votes']
+        for s in election['segments'] for c in s['candidates'] if c['votes']
+    })
+
+
+def test_demographics_match_a_recount(app, client, open_elections, voters, vote):
+    (first, first_candidates), (second, second_candidates) = open_elections.items()
+    cse_1 = voters(3, year=1, major='CSE')
+    ece_2 = voters(2, year=2, major='ECE')
+    for n, voter_id in enumerate(cse_1 + ece_2):
+        vote(voter_id, first, first_candidates[n % 2])
+    for voter_id in ece_2:
+        vote(voter_id, second, second_candidates[2])
+
+    url = '/api/admin/analytics/demographics'
+    query = {'election_ids': f'{second},{first}', 'by': 'year,major'}
+    response = client.get(url, query_string=query)
+    assert response.status_code == 200, response.get_json()
+    assert response.headers['X-Cache'] == 'MISS'
+    payload = response.get_json()
+
+    assert payload['election_ids'] == [first, second]
+    by_id = {e['election_id']: e for e in payload['elections']}
+    for election_id in (first, second):
+        assert reported(by_id[election_id]) == recount(app, election_id)
+    assert payload['total_votes'] == 7
+    assert {(s['year'], s['major'], s['votes']) for s in payload['segments']} == {(1, 'cse', 3), (2, 'ece', 4)}
+
+    assert client.get(url, query_string=query).headers['X-Cache'] == 'HIT'
+
+    # A new vote changes the tallies, so the cached payload no longer applies
+    late, = voters(1, year=3, major='CSE')
+    vote(late, second, second_candidates[0])
+    response = client.get(url, query_string=query)
+    assert response.headers['X-Cache'] == 'MISS'
+    assert reported({e['election_id']: e for e in response.get_json()['elections']}[second]) == \
+        recount(app, second)
+
+
+def test_demographics_rejects_bad_arguments(client, open_elections):
+    url = '/api/admin/analytics/demographics'
+    first = next(iter(open_elections))
+
+    assert client.get(url).status_code == 400
+    assert client.get(url, query_string={'election_ids': 'x'}).status_code == 400
+    assert client.get(url, query_string={'election_ids': first, 'by': 'height'}).status_code == 400
+    response = client.get(url, query_string={'election_ids': f'{first},999999'})
+    assert response.status_code == 400
+    assert '999999' in response.get_json()['message']
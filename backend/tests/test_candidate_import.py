@@ -0,0 +1,132 @@
+# tests/test_candidate_import.py
+# Candidate ZIP import is all or nothing: a bad row, a bad image or a
+# failure while inserting leaves the candidate table as it was.
+
+import csv
+import io
+import os
+import time
+import zipfile
+
+import pytest
+from PIL import Image
+
+from extensions import db
+from models.candidate import Candidate
+from models.election import Election
+from services import candidate_import
+from services.symbols import sweep_symbols
+
+FIELDS = ['name', 'email', 'roll_no', 'year', 'course', 'major', 'symbol']
+
+
+def png(color):
+    buf = io.BytesIO()
+    Image.new('RGB', (8, 8), color).save(buf, format='PNG')
+    return buf.getvalue()
+
+
+def archive(rows, files):
+    manifest = io.StringIO()
+    writer = csv.DictWriter(manifest, fieldnames=FIELDS)
+    writer.writeheader()
+    writer.writerows(rows)
+
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w') as zf:
+        zf.writestr('manifest.csv', manifest.getvalue())
+        for name, data in files.items():
+            zf.writestr(name, data)
+    buf.seek(0)
+    return buf
+
+
+def row(k, symbol='a.png', **overrides):
+    return {
+        'name': f'Imported {k}', 'email': f'imported{k}@example.com', 'roll_no': f'IMP{k}',
+        'year': 2, 'course': 'BE', 'major': 'CSE', 'symbol': symbol, **overrides
+    }
+
+
+@pytest.fixture
+def election_id(app, elections):
+    elections(1)
+    with app.app_context():
+        return db.session.query(Election.id).scalar()
+
+
+@pytest.fixture
+def upload(app, client, election_id, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, 'UPLOAD_FOLDER', str(tmp_path))
+
+    def post(zip_file):
+        return client.post('/api/candidates/import', data={
+            'file': (zip_file, 'candidates.zip'), 'election_id': str(election_id)
+        }, content_type='multipart/form-data')
+    return post
+
+
+def candidate_emails(app):
+    with app.app_context():
+        return {email for email, in db.session.query(Candidate.email)}
+
+
+def symbol_files(app):
+    folder = os.path.join(app.config['UPLOAD_FOLDER'], 'symbols')
+    return {name for name in os.listdir(folder) if not name.startswith('.')} if os.path.isdir(folder) else set()
+
+
+def test_import_adds_every_row(app, upload):
+    response = upload(archive([row(1), row(2, symbol='b.png')], {'a.png': png('red'), 'b.png': png('blue')}))
+
+    assert response.status_code == 201, response.get_json()
+    added = response.get_json()['candidates']
+    assert {c['email'] for c in added} == {'imported1@example.com', 'imported2@example.com'}
+    assert {'imported1@example.com', 'imported2@example.com'} <= candidate_emails(app)
+
+
+def test_invalid_rows_import_nothing(app, upload):
+    before = candidate_emails(app), symbol_files(app)
+    taken = next(iter(before[0]))
+
+    response = upload(archive(
+        [row(1), row(2, email=taken), row(3, year=9), row(4, symbol='missing.png')],
+        {'a.png': png('green')}
+    ))
+
+    assert response.status_code == 400
+    assert [e['row'] for e in response.get_json()['errors']] == [3, 4, 5]
+    assert (candidate_emails(app), symbol_files(app)) == before
+
+
+def test_bad_image_imports_nothing(app, upload):
+    before = candidate_emails(app)
+
+    response = upload(archive([row(1), row(2, symbol='b.png')], {'a.png': png('white'), 'b.png': b'not an image'}))
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Symbol is not a valid image'
+    assert candidate_emails(app) == before
+
+
+def test_failed_insert_rolls_back(app, upload, monkeypatch):
+    before = candidate_emails(app), symbol_files(app)
+
+    def fail(election_id):
+        raise RuntimeError('database went away')
+    monkeypatch.setattr(candidate_import, 'invalidate_snapshot', fail)
+
+    response = upload(archive([row(1), row(2, symbol='b.png')], {'a.png': png('black'), 'b.png': png('yellow')}))
+
+    assert response.status_code == 500
+    assert candidate_emails(app) == before[0]
+
+    # The stored symbols are unreferenced, so the sweep collects them
+    stored = symbol_files(app) - before[1]
+    assert stored
+    old = time.time() - (app.config['SYMBOL_RETENTION_HOURS'] + 1) * 3600
+    for name in stored:
+        os.utime(os.path.join(app.config['UPLOAD_FOLDER'], 'symbols', name), (old, old))
+    with app.app_context():
+        sweep_symbols()
+    assert symbol_files(app) == before[1]
@@ -0,0 +1,77 @@
+# tests/test_election_status.py
+# Every worker runs a status scheduler; only the one holding the
+# 'election-status' lease may apply a boundary.
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from extensions import db
+from models.election import Election
+from models.worker_lease import WorkerLease
+from services import election_status
+from services.election_status import STATUS_LEASE, run_status_boundary
+from services.workers import acquire_lease
+
+
+@pytest.fixture
+def lease(app):
+    with app.app_context():
+        WorkerLease.query.delete()
+        db.session.commit()
+    yield
+    with app.app_context():
+        WorkerLease.query.delete()
+        db.session.commit()
+
+
+@pytest.fixture
+def due(app, elections, monkeypatch):
+    """One ACTIVE election past its end, and a record of pre-rendered ids."""
+    elections(1, status='ACTIVE')
+    rendered = []
+    monkeypatch.setitem(app.config, 'REPORT_PRERENDER', True)
+    monkeypatch.setattr(election_status, 'prerender_reports', rendered.extend)
+    return rendered
+
+
+def statuses():
+    return [status for status, in db.session.query(Election.election_status)]
+
+
+def test_lease_is_exclusive_until_it_expires(app, lease):
+    with app.app_context():
+        assert acquire_lease('job', 60, holder='a:1')
+        assert acquire_lease('job', 60, holder='a:1')  # renewal
+        assert not acquire_lease('job', 60, holder='b:2')
+
+        db.session.execute(update(WorkerLease).values(expires_at=datetime.utcnow() - timedelta(seconds=1)))
+        db.session.commit()
+        assert acquire_lease('job', 60, holder='b:2')
+        assert not acquire_lease('job', 60, holder='a:1')
+
+
+def test_only_the_lease_holder_applies_a_boundary(app, lease, due):
+    with app.app_context():
+        assert acquire_lease(STATUS_LEASE, 60, holder='other-host:1')
+
+        assert run_status_boundary(app, 60) is None
+        assert statuses() == ['ACTIVE']
+        assert due == []
+
+
+def test_boundary_runs_once_the_lease_is_free(app, lease, due):
+    with app.app_context():
+        acquire_lease(STATUS_LEASE, 60, holder='other-host:1')
+        db.session.execute(update(WorkerLease).values(expires_at=datetime.utcnow() - timedelta(seconds=1)))
+        db.session.commit()
+        election_id = db.session.query(Election.id).scalar()
+
+        run_status_boundary(app, 60)
+        assert statuses() == ['CLOSED']
+        assert due == [election_id]
+
+        # Still ours: the next pass just renews and finds nothing due
+        run_status_boundary(app, 60)
+        assert due == [election_id]
@@ -0,0 +1,115 @@
+# tests/test_live_tally.py
+# Live tallies: the SSE stream opens with a snapshot (skipped when the
+# client resumes at the current version) and then sends deltas; the
+# long-poll endpoint waits for the tally to move past ?since=.
+
+import threading
+from datetime import date, time, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from extensions import db
+from models.candidate import Candidate
+from models.election import Election
+from models.voter import Voter
+from services.identity import create_voter_token
+
+
+@pytest.fixture
+def open_election(app, elections):
+    """(election_id, [candidate ids]) of an election open for voting."""
+    elections(1, status='ACTIVE')
+    today = date.today()
+    with app.app_context():
+        db.session.execute(update(Election).values(
+            election_date=today - timedelta(days=1), election_time=time(0),
+            end_date=today + timedelta(days=1), end_time=time(23, 59)
+        ))
+        db.session.commit()
+        election_id = db.session.query(Election.id).scalar()
+        return election_id, [c.id for c in Candidate.query.filter_by(election_id=election_id)]
+
+
+@pytest.fixture
+def vote(app, voters):
+    """vote(election_id, candidate_id) casts one vote as a new voter."""
+    client = app.test_client()
+
+    def cast(election_id, candidate_id):
+        voter_id, = voters(1)
+        with app.app_context():
+            token = create_voter_token(db.session.get(Voter, voter_id))
+        response = client.post(f'/api/voter/elections/{election_id}/vote',
+                               json={'candidate_id': candidate_id},
+                               headers={'Authorization': f'Bearer {token}'})
+        assert response.status_code == 200, response.get_json()
+
+    return cast
+
+
+def counts(app, election_id):
+    with app.app_context():
+        return {str(c.id): c.count for c in Candidate.query.filter_by(election_id=election_id)}
+
+
+def test_long_poll_returns_when_a_vote_lands(app, client, open_election, vote):
+    election_id, candidate_ids = open_election
+
+    first = client.get(f'/api/elections/{election_id}/results/live').get_json()
+    assert first['changed'] is True
+    assert first['counts'] == counts(app, election_id)
+
+    unchanged = client.get(f'/api/elections/{election_id}/results/live',
+                           query_string={'since': first['version'], 'timeout': 0}).get_json()
+    assert unchanged['changed'] is False
+    assert unchanged['version'] == first['version']
+
+    timer = threading.Timer(0.3, vote, (election_id, candidate_ids[0]))
+    timer.start()
+    try:
+        moved = client.get(f'/api/elections/{election_id}/results/live',
+                           query_string={'since': first['version'], 'timeout': 10}).get_json()
+    finally:
+        timer.join()
+
+    assert moved['changed'] is True
+    assert moved['total_votes'] == first['total_votes'] + 1
+    assert moved['counts'][str(candidate_ids[0])] == first['counts'][str(candidate_ids[0])] + 1
+
+
+def test_stream_sends_a_snapshot_then_deltas(app, client, open_election, vote, monkeypatch):
+    election_id, candidate_ids = open_election
+    monkeypatch.setitem(app.config, 'LIVE_TALLY_WSGI_HOLD_SECONDS', 10)
+
+    response = client.get(f'/api/elections/{election_id}/results/stream', buffered=False)
+    assert response.mimetype == 'text/event-stream'
+    chunks = (chunk.decode() for chunk in response.response)
+    try:
+        assert next(chunks).startswith('retry:')
+        snapshot = next(chunks)
+        assert snapshot.startswith('id: ') and 'event: snapshot' in snapshot
+
+        vote(election_id, candidate_ids[1])
+        delta = next(chunks)
+        while delta.startswith(':'):    # keepalive
+            delta = next(chunks)
+    finally:
+        response.close()
+
+    assert 'event: delta' in delta
+    assert f'"{candidate_ids[1]}": {{"count": ' in delta
+    assert '"delta": 1' in delta
+
+
+def test_stream_resumed_at_the_current_version_skips_the_snapshot(app, client, open_election, monkeypatch):
+    election_id, _ = open_election
+    monkeypatch.setitem(app.config, 'LIVE_TALLY_WSGI_HOLD_SECONDS', 1)
+    monkeypatch.setitem(app.config, 'LIVE_TALLY_KEEPALIVE', 1)
+    version = client.get(f'/api/elections/{election_id}/results/live').get_json()['version']
+
+    body = client.get(f'/api/elections/{election_id}/results/stream',
+                      headers={'Last-Event-ID': version}).get_data(as_text=True)
+
+    assert body.startswith('retry:')
+    assert 'event: snapshot' not in body
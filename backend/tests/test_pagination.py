@@ -0,0 +1,48 @@
+# tests/test_pagination.py
+# List endpoints return one bounded page even when the client sends no
+# paging arguments, and next_cursor walks the rest of the table.
+
+from services.pagination import DEFAULT_LIMIT
+
+
+def walk(client, url, headers=None):
+    items, pages, cursor = [], 0, None
+    while True:
+        response = client.get(url, query_string={'cursor': cursor} if cursor else {}, headers=headers)
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        assert len(body['items']) <= DEFAULT_LIMIT
+        items.extend(body['items'])
+        pages += 1
+        cursor = body['next_cursor']
+        if not cursor:
+            return items, pages
+
+
+def test_election_list_without_args_is_one_page(client, elections):
+    elections(DEFAULT_LIMIT * 2 + 5)
+    body = client.get('/api/admin/elections').get_json()
+    assert len(body['items']) == DEFAULT_LIMIT
+    assert body['limit'] == DEFAULT_LIMIT
+    assert body['next_cursor']
+
+
+def test_next_cursor_walks_every_row_once(client, elections, voter_headers):
+    total = DEFAULT_LIMIT * 2 + 5
+    elections(total)
+    for url, headers in (('/api/admin/elections', None),
+                         ('/api/candidates', None),
+                         ('/api/voter/elections-with-candidates', voter_headers)):
+        items, pages = walk(client, url, headers)
+        ids = [item['id'] for item in items]
+        assert len(ids) == len(set(ids)), url
+        assert pages == -(-len(ids) // DEFAULT_LIMIT), url
+    assert len(walk(client, '/api/admin/elections')[0]) == total
+    assert len(walk(client, '/api/candidates')[0]) == total * 3
+
+
+def test_limit_and_total(client, elections):
+    elections(7)
+    body = client.get('/api/admin/elections?limit=3&include_total=true').get_json()
+    assert len(body['items']) == 3
+    assert body['total'] == 7
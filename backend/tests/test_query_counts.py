@@ -0,0 +1,33 @@
+# tests/test_query_counts.py
+# Election listings must run a fixed number of SQL statements however many
+# elections exist (no per-election lazy loads or N+1 queries).
+
+SIZES = (10, 100, 1000, 10000)
+
+
+def statements_per_size(client, count_statements, elections, url, headers=None):
+    counts = {}
+    for size in SIZES:
+        elections(size)
+        with count_statements() as statements:
+            response = client.get(url, headers=headers)
+        assert response.status_code == 200, response.get_json()
+        counts[size] = len(statements)
+    return counts
+
+
+def test_elections_with_candidates_statement_count_is_constant(client, count_statements, elections, voter_headers):
+    counts = statements_per_size(client, count_statements, elections,
+                                 '/api/voter/elections-with-candidates', voter_headers)
+    assert len(set(counts.values())) == 1, counts
+
+
+def test_closed_elections_statement_count_is_constant(client, count_statements, elections):
+    counts = statements_per_size(client, count_statements, elections, '/api/elections/results/closed')
+    assert len(set(counts.values())) == 1, counts
+
+
+def test_closed_elections_lists_every_election(client, elections):
+    elections(10000)
+    response = client.get('/api/elections/results/closed')
+    assert len(response.get_json()) == 10000
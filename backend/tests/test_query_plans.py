@@ -0,0 +1,24 @@
+# tests/test_query_plans.py
+# The hot-path queries, compiled from the builders the routes use, must be
+# served by indexes (the same check as `flask db-explain`).
+
+
+def test_hot_queries_cover_the_election_listings(app):
+    from extensions import db
+    from services.query_plans import explain_hot_queries
+
+    with app.app_context():
+        labels = [label for label, _, _ in explain_hot_queries(db.engine)]
+
+    assert 'upcoming elections' in labels
+    assert 'closed elections' in labels
+
+
+def test_hot_queries_do_not_scan_tables(app):
+    from extensions import db
+    from services.query_plans import explain_hot_queries
+
+    with app.app_context():
+        scans = {label: scans for label, _, scans in explain_hot_queries(db.engine) if scans}
+
+    assert scans == {}
@@ -0,0 +1,244 @@
+# tests/test_ranked.py
+# Known-answer IRV/STV counts on small textbook profiles, run through
+# count_election against stored ballots, plus the /results/rounds endpoint.
+
+import pytest
+from sqlalchemy import insert, update
+
+from extensions import db
+from models.candidate import Candidate
+from models.election import Election
+from models.ranked_ballot import RankedBallot, pack_ranking, unpack_ranking
+from models.vote import Vote
+from services.ranked import ballot_matrix, count_ballots, count_election
+
+
+@pytest.fixture
+def ranked_election(app, elections):
+    """
+    setup(method, seats, names, profile) → (election_id, {name: candidate id}).
+    profile: [(ballots, 'ABC'), ...], one letter per candidate in order of
+    preference. One-preference ballots are stored as a plain Vote only.
+    """
+    created = []
+
+    def setup(method, seats, names, profile, status='CLOSED'):
+        elections(1, status=status)
+        with app.app_context():
+            election_id = db.session.query(Election.id).scalar()
+            db.session.execute(update(Election).values(voting_method=method, seats=seats))
+            db.session.query(Candidate).delete()
+            db.session.execute(insert(Candidate), [
+                {
+                    'election_id': election_id, 'name': name, 'roll_no': f'R-{name}',
+                    'major': 'CSE', 'course': 'BE', 'year': 1, 'symbol': 'symbols/test.jpg',
+                    'email': f'{name.lower()}@ranked.test', 'count': 0
+                }
+                for name in names
+            ])
+            ids = {c.name: c.id for c in Candidate.query.filter_by(election_id=election_id)}
+
+            voter_id = 0
+            votes, ballots = [], []
+            for n, order in profile:
+                ranking = [ids[name] for name in order]
+                for _ in range(n):
+                    voter_id += 1
+                    votes.append({'voter_id': voter_id, 'election_id': election_id,
+                                  'candidate_id': ranking[0]})
+                    if len(ranking) > 1:
+                        ballots.append({'election_id': election_id, 'voter_id': voter_id,
+                                        'ranking': pack_ranking(ranking)})
+            db.session.execute(insert(Vote), votes)
+            if ballots:
+                db.session.execute(insert(RankedBallot), ballots)
+            db.session.commit()
+            created.append(election_id)
+            return election_id, ids
+
+    yield setup
+
+    with app.app_context():
+        for model in (Vote, RankedBallot):
+            db.session.query(model).filter(model.election_id.in_(created)).delete(synchronize_session=False)
+        db.session.commit()
+
+
+def count(app, election_id):
+    with app.app_context():
+        return count_election(db.session.get(Election, election_id))
+
+
+def tallies(record, ids):
+    names = {v: k for k, v in ids.items()}
+    return {names[t['candidate_id']]: t['votes'] for t in record['tallies']}
+
+
+# ────────────────────────────────────────────────
+# BALLOT PACKING
+# ────────────────────────────────────────────────
+def test_pack_ranking_round_trip():
+    blob = pack_ranking([30, 10, 20])
+    assert len(blob) == 3 * 4
+    assert unpack_ranking(blob).tolist() == [30, 10, 20]
+    assert RankedBallot(ranking=blob).candidate_ids() == [30, 10, 20]
+
+
+def test_ballot_matrix_pads_and_skips_unknown_candidates():
+    matrix = ballot_matrix([pack_ranking([30, 99, 10]), pack_ranking([20])], [10, 20, 30])
+    # 99 is no longer a candidate: index 3 is never continuing
+    assert matrix.tolist() == [[2, 3, 0], [1, -1, -1]]
+
+    result = count_ballots(matrix, [10, 20, 30])
+    assert result['rounds'][0]['tallies'] == [
+        {'candidate_id': 10, 'votes': 0},
+        {'candidate_id': 20, 'votes': 1},
+        {'candidate_id': 30, 'votes': 1},
+    ]
+
+
+# ────────────────────────────────────────────────
+# IRV
+# ────────────────────────────────────────────────
+def test_irv_tennessee_capital(app, ranked_election):
+    # Memphis leads on first preferences, Knoxville wins in the last round
+    election_id, ids = ranked_election('IRV', 1, ['M', 'N', 'C', 'K'], [
+        (42, 'MNCK'), (26, 'NCKM'), (15, 'CKNM'), (17, 'KCNM'),
+    ])
+    result = count(app, election_id)
+
+    assert result['elected'] == [ids['K']]
+    assert result['quota'] is None
+    assert result['ballots'] == 100
+
+    first, second, third = result['rounds']
+    assert tallies(first, ids) == {'M': 42, 'N': 26, 'C': 15, 'K': 17}
+    assert first['eliminated'] == [ids['C']]
+    assert first['transfers'] == [{
+        'from': ids['C'], 'type': 'elimination', 'votes': 15,
+        'to': [{'candidate_id': ids['K'], 'votes': 15}], 'exhausted': 0
+    }]
+    assert tallies(second, ids) == {'M': 42, 'N': 26, 'K': 32}
+    assert second['eliminated'] == [ids['N']]
+    assert tallies(third, ids) == {'M': 42, 'K': 58}
+    assert third['elected'] == [ids['K']]
+
+
+def test_irv_exhausted_ballots_leave_the_majority(app, ranked_election):
+    election_id, ids = ranked_election('IRV', 1, ['A', 'B', 'C'], [
+        (5, 'A'), (4, 'BA'), (3, 'C'),
+    ])
+    result = count(app, election_id)
+
+    first, second = result['rounds']
+    assert first['eliminated'] == [ids['C']]
+    assert first['transfers'][0]['to'] == []
+    assert first['transfers'][0]['exhausted'] == 3
+    # 5 of the 9 continuing votes is a majority, though not of all 12
+    assert second['exhausted'] == 3
+    assert tallies(second, ids) == {'A': 5, 'B': 4}
+    assert result['elected'] == [ids['A']]
+
+
+def test_irv_tie_goes_to_the_earlier_round(app, ranked_election):
+    election_id, ids = ranked_election('IRV', 1, ['A', 'B', 'C', 'D'], [
+        (6, 'A'), (2, 'AB'), (5, 'B'), (4, 'CB'), (1, 'DC'), (2, 'DA'),
+    ])
+    result = count(app, election_id)
+
+    rounds = result['rounds']
+    assert rounds[0]['eliminated'] == [ids['D']]
+    # B and C tie on 5; C had fewer in round 1
+    assert tallies(rounds[1], ids) == {'A': 10, 'B': 5, 'C': 5}
+    assert rounds[1]['eliminated'] == [ids['C']]
+    # One of C's ballots exhausts, so 10 of the remaining 19 is a majority
+    assert tallies(rounds[2], ids) == {'A': 10, 'B': 9}
+    assert rounds[2]['exhausted'] == 1
+    assert rounds[2]['elected'] == [ids['A']]
+
+
+def test_irv_full_tie_eliminates_the_later_candidate(app, ranked_election):
+    election_id, ids = ranked_election('IRV', 1, ['A', 'B', 'C'], [
+        (2, 'A'), (2, 'B'), (3, 'C'),
+    ])
+    result = count(app, election_id)
+
+    assert result['rounds'][0]['eliminated'] == [ids['B']]
+    assert result['elected'] == [ids['C']]
+
+
+# ────────────────────────────────────────────────
+# STV
+# ────────────────────────────────────────────────
+def test_stv_surplus_transfer(app, ranked_election):
+    election_id, ids = ranked_election('STV', 2, ['A', 'B', 'C'], [
+        (6, 'AB'), (2, 'AC'), (4, 'C'), (4, 'B'),
+    ])
+    result = count(app, election_id)
+
+    # Droop quota: 16 // (2 + 1) + 1
+    assert result['quota'] == 6
+    first, second, third = result['rounds']
+    assert tallies(first, ids) == {'A': 8, 'B': 4, 'C': 4}
+    assert first['elected'] == [ids['A']]
+    # A's surplus of 2 moves at 2/8 = 0.25 per ballot
+    assert first['transfers'] == [{
+        'from': ids['A'], 'type': 'surplus', 'votes': 2,
+        'to': [{'candidate_id': ids['B'], 'votes': 1.5}, {'candidate_id': ids['C'], 'votes': 0.5}],
+        'exhausted': 0
+    }]
+    assert tallies(second, ids) == {'A': 6, 'B': 5.5, 'C': 4.5}
+    assert second['eliminated'] == [ids['C']]
+    assert second['transfers'][0]['exhausted'] == 4.5
+    assert third['elected'] == [ids['B']]
+    assert result['elected'] == [ids['A'], ids['B']]
+
+
+def test_stv_surplus_weights_are_exact(app, ranked_election):
+    # Thirds truncate to five decimals and the tallies still add up
+    election_id, ids = ranked_election('STV', 2, ['A', 'B', 'C', 'D'], [
+        (7, 'AB'), (2, 'AC'), (3, 'C'), (2, 'D'),
+    ])
+    result = count(app, election_id)
+
+    assert result['quota'] == 5
+    transfer = result['rounds'][0]['transfers'][0]
+    assert transfer['to'] == [
+        {'candidate_id': ids['B'], 'votes': 3.11108},
+        {'candidate_id': ids['C'], 'votes': 0.88888},
+    ]
+    second = result['rounds'][1]
+    total = sum(t['votes'] for t in second['tallies']) + second['exhausted']
+    assert total == pytest.approx(14)
+    assert tallies(second, ids)['C'] == pytest.approx(3.88888)
+
+
+# ────────────────────────────────────────────────
+# ENDPOINT
+# ────────────────────────────────────────────────
+def test_rounds_endpoint(app, client, ranked_election):
+    election_id, ids = ranked_election('IRV', 1, ['M', 'N', 'C', 'K'], [
+        (42, 'MNCK'), (26, 'NCKM'), (15, 'CKNM'), (17, 'KCNM'),
+    ])
+
+    response = client.get(f'/api/elections/{election_id}/results/rounds')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['method'] == 'IRV'
+    assert body['elected'] == [ids['K']]
+    assert [r['round'] for r in body['rounds']] == [1, 2, 3]
+    assert {c['name'] for c in body['candidates']} == set(ids)
+
+    again = client.get(f'/api/elections/{election_id}/results/rounds',
+                       headers={'If-None-Match': response.headers['ETag']})
+    assert again.status_code == 304
+
+
+def test_rounds_endpoint_rejects_open_and_plurality_elections(app, client, elections, ranked_election):
+    election_id, _ = ranked_election('IRV', 1, ['A', 'B'], [(1, 'AB')], status='ACTIVE')
+    assert client.get(f'/api/elections/{election_id}/results/rounds').status_code == 403
+
+    with app.app_context():
+        db.session.execute(update(Election).values(voting_method='PLURALITY', election_status='CLOSED'))
+        db.session.commit()
+    assert client.get(f'/api/elections/{election_id}/results/rounds').status_code == 400
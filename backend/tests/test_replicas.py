@@ -0,0 +1,176 @@
+# tests/test_replicas.py
+# Read-replica routing. conftest binds a "replica" to the test database
+# file itself, so both engines see the same rows and the tests only look
+# at which engine ran a request's SELECTs: @read_replica views read from
+# the replica, writes and anything a voter reads right after voting from
+# the primary.
+
+import time
+from contextlib import contextmanager
+from datetime import date, time as dt_time, timedelta
+
+import pytest
+from flask import g
+from flask_jwt_extended import decode_token
+from sqlalchemy import event, update
+
+from extensions import db
+from models.candidate import Candidate
+from models.election import Election
+from models.result_snapshot import ResultSnapshot
+from models.voter import Voter
+from services.identity import create_voter_token
+from services.replicas import STICKY_CLAIM
+
+
+@pytest.fixture
+def routed(app):
+    """routed() → context manager yielding the set of bind keys that ran a SELECT (None = primary)."""
+    @contextmanager
+    def recording():
+        used = set()
+        with app.app_context():
+            engines = dict(db.engines)
+        listeners = {}
+        for key, engine in engines.items():
+            def record(conn, cursor, statement, *args, key=key):
+                if statement.lstrip().upper().startswith('SELECT'):
+                    used.add(key)
+            listeners[key] = record
+            event.listen(engine, 'before_cursor_execute', record)
+        try:
+            yield used
+        finally:
+            for key, engine in engines.items():
+                event.remove(engine, 'before_cursor_execute', listeners[key])
+    return recording
+
+
+@pytest.fixture
+def open_election(app, elections):
+    """(election_id, candidate_id) of an election open for voting."""
+    elections(1, status='ACTIVE')
+    today = date.today()
+    with app.app_context():
+        db.session.execute(update(Election).values(
+            election_date=today - timedelta(days=1), election_time=dt_time(0),
+            end_date=today + timedelta(days=1), end_time=dt_time(23, 59)
+        ))
+        db.session.commit()
+        candidate = Candidate.query.first()
+        return candidate.election_id, candidate.id
+
+
+def voter_token(app, voter_id):
+    with app.app_context():
+        return create_voter_token(db.session.get(Voter, voter_id))
+
+
+def bearer(token):
+    return {'Authorization': f'Bearer {token}'}
+
+
+def test_marked_reads_go_to_the_replica(client, elections, routed):
+    elections(1)
+    with routed() as used:
+        assert client.get('/api/candidates').status_code == 200
+    assert used == {'replica_0'}
+
+    # Not marked with @read_replica
+    with routed() as used:
+        assert client.get('/api/admin/elections').status_code == 200
+    assert used == {None}
+
+
+def test_writes_stay_on_the_primary(app, client, voters, open_election, routed):
+    election_id, candidate_id = open_election
+    voter_id, = voters(1)
+
+    with routed() as used:
+        response = client.post(f'/api/voter/elections/{election_id}/vote', json={'candidate_id': candidate_id},
+                               headers=bearer(voter_token(app, voter_id)))
+    assert response.status_code == 200
+    assert used == {None}
+
+
+def test_session_reads_its_own_writes(app, elections, routed):
+    elections(1)
+    with app.test_request_context(), routed() as used:
+        g.db_read_replica = True
+        election = db.session.query(Election).first()
+        assert used == {'replica_0'}
+
+        used.clear()
+        election.election_name = 'Renamed'
+        db.session.flush()
+        db.session.query(Election).count()
+        assert used == {None}
+        db.session.rollback()
+
+
+def test_missing_snapshot_is_built_from_the_primary(app, client, elections, routed):
+    elections(1)
+    with app.app_context():
+        election_id = db.session.query(Election.id).scalar()
+
+    with routed() as used:
+        assert client.get(f'/api/elections/{election_id}/results').status_code == 200
+    # Election and snapshot lookup on the replica, the tally on the primary
+    assert used == {'replica_0', None}
+
+    with routed() as used:
+        assert client.get(f'/api/elections/{election_id}/results').status_code == 200
+    assert used == {'replica_0'}
+
+    with app.app_context():
+        assert db.session.get(ResultSnapshot, election_id) is not None
+
+
+def test_vote_returns_a_token_pinned_to_the_primary(app, client, voters, open_election):
+    election_id, candidate_id = open_election
+    voter_id, = voters(1)
+    token = voter_token(app, voter_id)
+
+    response = client.post(f'/api/voter/elections/{election_id}/vote',
+                           json={'candidate_id': candidate_id}, headers=bearer(token))
+    assert response.status_code == 200, response.get_json()
+
+    with app.app_context():
+        old = decode_token(token)
+        new = decode_token(response.get_json()['token'])
+    assert new['sub'] == old['sub']
+    assert new['roll_no'] == old['roll_no']
+    # Not a session extension: expires with the token it replaces
+    assert new['exp'] <= old['exp']
+    assert time.time() < new[STICKY_CLAIM] <= time.time() + app.config['REPLICA_STICKY_SECONDS']
+
+
+def test_pinned_token_reads_from_the_primary(app, client, voters, open_election, routed):
+    election_id, candidate_id = open_election
+    voter_id, = voters(1)
+    token = voter_token(app, voter_id)
+    url = f'/api/elections/{election_id}/turnout'
+
+    pinned = client.post(f'/api/elections/{election_id}/vote',
+                         json={'candidate_id': candidate_id}, headers=bearer(token)).get_json()['token']
+
+    with routed() as used:
+        assert client.get(url, headers=bearer(pinned)).status_code == 200
+    assert used == {None}
+
+    with routed() as used:
+        assert client.get(url, headers=bearer(token)).status_code == 200
+    assert used == {'replica_0'}
+
+
+def test_pin_expires(app, client, voters, open_election, routed, monkeypatch):
+    election_id, candidate_id = open_election
+    voter_id, = voters(1)
+    pinned = client.post(f'/api/elections/{election_id}/vote', json={'candidate_id': candidate_id},
+                         headers=bearer(voter_token(app, voter_id))).get_json()['token']
+
+    later = time.time() + app.config['REPLICA_STICKY_SECONDS'] + 1
+    monkeypatch.setattr('services.replicas.time.time', lambda: later)
+    with routed() as used:
+        client.get(f'/api/elections/{election_id}/turnout', headers=bearer(pinned))
+    assert used == {'replica_0'}
@@ -0,0 +1,68 @@
+# tests/test_report_exports.py
+# Direct PDF exports render in the report pool: the file when it is ready
+# within REPORT_EXPORT_WAIT, else 202 with the job; cached files are sent
+# without a job.
+
+import time
+
+import pytest
+
+from extensions import db
+from models.election import Election
+from models.report_job import ReportJob
+
+
+@pytest.fixture
+def export_wait(app):
+    """export_wait(seconds) sets REPORT_EXPORT_WAIT; jobs are deleted afterwards."""
+    saved = app.config['REPORT_EXPORT_WAIT']
+    yield lambda seconds: app.config.update(REPORT_EXPORT_WAIT=seconds)
+    app.config['REPORT_EXPORT_WAIT'] = saved
+    with app.app_context():
+        ReportJob.query.delete()
+        db.session.commit()
+
+
+def first_election(app):
+    with app.app_context():
+        return db.session.query(Election.id).order_by(Election.id).scalar()
+
+
+def job_count(app):
+    with app.app_context():
+        return ReportJob.query.count()
+
+
+def test_open_election_export_renders_in_the_pool(app, client, elections, export_wait):
+    elections(1, status='ACTIVE')
+    export_wait(30)
+
+    response = client.get(f'/api/elections/{first_election(app)}/results/export/pdf')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/pdf'
+    assert response.data.startswith(b'%PDF')
+
+
+def test_slow_export_answers_202_with_the_job(app, client, elections, export_wait):
+    elections(1, status='CLOSED')
+    export_wait(0)
+    url = f'/api/elections/{first_election(app)}/results/export/pdf'
+
+    response = client.get(url)
+    assert response.status_code == 202
+    job = response.get_json()
+    assert response.headers['Location'] == f"/api/reports/jobs/{job['id']}"
+
+    deadline = time.monotonic() + 30
+    while job['status'] in ('PENDING', 'RUNNING') and time.monotonic() < deadline:
+        time.sleep(0.1)
+        job = client.get(response.headers['Location']).get_json()
+    assert job['status'] == 'DONE'
+    assert client.get(job['download_url']).data.startswith(b'%PDF')
+
+    # The closed report landed in the cache: served directly from now on
+    jobs = job_count(app)
+    cached = client.get(url)
+    assert cached.status_code == 200
+    assert cached.data.startswith(b'%PDF')
+    assert job_count(app) == jobs
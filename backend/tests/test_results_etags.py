@@ -0,0 +1,40 @@
+# tests/test_results_etags.py
+# Conditional GETs on closed election results must not answer 304 once an
+# admin has edited the election, even though its tallies are unchanged.
+
+
+def _closed_election_id(app, elections):
+    from models.election import Election
+
+    elections(1)
+    with app.app_context():
+        return Election.query.filter_by(election_status='CLOSED').first().id
+
+
+def test_results_etag_changes_when_a_closed_election_is_renamed(app, client, elections):
+    election_id = _closed_election_id(app, elections)
+    first = client.get(f'/api/elections/{election_id}/results')
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+
+    assert client.get(f'/api/elections/{election_id}/results',
+                      headers={'If-None-Match': etag}).status_code == 304
+
+    response = client.put(f'/api/admin/elections/{election_id}', json={'election_name': 'Renamed'})
+    assert response.status_code == 200, response.get_json()
+
+    second = client.get(f'/api/elections/{election_id}/results', headers={'If-None-Match': etag})
+    assert second.status_code == 200
+    assert second.get_json()['election']['title'] == 'Renamed'
+    assert second.headers['ETag'] != etag
+
+
+def test_closed_list_etag_changes_when_a_closed_election_is_renamed(app, client, elections):
+    election_id = _closed_election_id(app, elections)
+    etag = client.get('/api/elections/results/closed').headers['ETag']
+
+    client.put(f'/api/admin/elections/{election_id}', json={'election_name': 'Renamed again'})
+
+    response = client.get('/api/elections/results/closed', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert [e['title'] for e in response.get_json() if e['id'] == election_id] == ['Renamed again']
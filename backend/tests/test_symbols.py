@@ -0,0 +1,80 @@
+# tests/test_symbols.py
+# Symbol files are shared by content, so deleting a candidate leaves its
+# file to sweep_symbols(), which only takes files that are unreferenced
+# and haven't been stored for SYMBOL_RETENTION_HOURS.
+
+import io
+import os
+import time
+
+import pytest
+from PIL import Image
+
+from extensions import db
+from models.candidate import Candidate
+from services.symbols import VARIANTS, store_symbol, sweep_symbols, symbol_variant
+
+
+def png(color):
+    buf = io.BytesIO()
+    Image.new('RGB', (8, 8), color).save(buf, format='PNG')
+    buf.seek(0)
+    return buf
+
+
+@pytest.fixture
+def uploads(app, elections, tmp_path, monkeypatch):
+    elections(1)
+    monkeypatch.setitem(app.config, 'UPLOAD_FOLDER', str(tmp_path))
+    return str(tmp_path)
+
+
+def files(uploads, symbol):
+    return [os.path.join(uploads, symbol)] + \
+        [os.path.join(uploads, symbol_variant(symbol, v)) for v in VARIANTS]
+
+
+def age(uploads, symbol, hours):
+    then = time.time() - hours * 3600
+    for path in files(uploads, symbol):
+        os.utime(path, (then, then))
+
+
+def test_delete_leaves_the_file_to_the_sweep(app, client, uploads):
+    with app.app_context():
+        symbol, created = store_symbol(png('red'), 'red.png')
+        assert created
+        candidate = Candidate.query.first()
+        candidate.symbol = symbol
+        db.session.commit()
+        candidate_id = candidate.id
+
+    assert client.delete(f'/api/candidates/{candidate_id}').status_code == 200
+    assert all(os.path.exists(path) for path in files(uploads, symbol))
+
+    with app.app_context():
+        # Freshly stored: an upload may be about to reference it
+        assert sweep_symbols() == 0
+
+        age(uploads, symbol, app.config['SYMBOL_RETENTION_HOURS'] + 1)
+        assert sweep_symbols() == 1
+    assert not any(os.path.exists(path) for path in files(uploads, symbol))
+
+
+def test_sweep_keeps_referenced_and_reused_symbols(app, uploads):
+    retention = app.config['SYMBOL_RETENTION_HOURS']
+    with app.app_context():
+        used, _ = store_symbol(png('green'), 'green.png')
+        Candidate.query.first().symbol = used
+        db.session.commit()
+        age(uploads, used, retention + 1)
+
+        reused, _ = store_symbol(png('blue'), 'blue.png')
+        age(uploads, reused, retention + 1)
+        # An identical upload, its candidate not committed yet
+        again, created = store_symbol(png('blue'), 'other-name.png')
+        assert (again, created) == (reused, False)
+
+        assert sweep_symbols() == 0
+    assert os.path.exists(os.path.join(uploads, used))
+    assert os.path.exists(os.path.join(uploads, reused))
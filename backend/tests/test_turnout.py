@@ -0,0 +1,106 @@
+# tests/test_turnout.py
+# The turnout counters must agree with a recount of the vote and voter
+# tables: votes in open elections follow a voter who changes segment,
+# closed elections keep the turnout they closed with.
+
+from collections import Counter
+from datetime import date, time, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from extensions import db
+from models.candidate import Candidate
+from models.election import Election
+from models.vote import Vote
+from models.voter import Voter
+from services.identity import create_voter_token
+from services.turnout import election_turnout, segment_of
+
+
+@pytest.fixture
+def open_elections(app, elections):
+    """Two elections open for voting: [(election_id, candidate_id), ...]."""
+    elections(2, status='ACTIVE')
+    today = date.today()
+    with app.app_context():
+        db.session.execute(update(Election).values(
+            election_date=today - timedelta(days=1), election_time=time(0),
+            end_date=today + timedelta(days=1), end_time=time(23, 59)
+        ))
+        db.session.commit()
+        return [
+            (election.id, Candidate.query.filter_by(election_id=election.id).first().id)
+            for election in Election.query.order_by(Election.id)
+        ]
+
+
+def headers(app, voter_id):
+    with app.app_context():
+        return {'Authorization': f'Bearer {create_voter_token(db.session.get(Voter, voter_id))}'}
+
+
+def counted(election_id):
+    turnout = election_turnout(election_id)
+    return {(s['year'], s['major'], s['course']): s['votes'] for s in turnout['segments'] if s['votes']}
+
+
+def recounted(election_id):
+    """Votes per segment by each voter's current profile."""
+    return dict(Counter(
+        segment_of(voter.year, voter.major, voter.course)
+        for voter in Voter.query.join(Vote, Vote.voter_id == Voter.id).filter(Vote.election_id == election_id)
+    ))
+
+
+def registered():
+    turnout = election_turnout(0)
+    return {(s['year'], s['major'], s['course']): s['registered'] for s in turnout['segments'] if s['registered']}
+
+
+def test_turnout_follows_segment_changes_until_close(app, client, voters, open_elections):
+    (closing, closing_candidate), (staying, staying_candidate) = open_elections
+    movers = voters(2, year=1, major='CSE', course='BE')
+    others = voters(1, year=2, major='ECE', course='BE')
+
+    for voter_id in movers + others:
+        for election_id, candidate_id in open_elections:
+            response = client.post(f'/api/voter/elections/{election_id}/vote',
+                                   json={'candidate_id': candidate_id}, headers=headers(app, voter_id))
+            assert response.status_code == 200, response.get_json()
+
+    with app.app_context():
+        assert counted(closing) == recounted(closing) == {(1, 'cse', 'be'): 2, (2, 'ece', 'be'): 1}
+        assert counted(staying) == recounted(staying)
+        frozen = counted(closing)
+
+    response = client.put(f'/api/admin/elections/{closing}', json={'election_status': 'CLOSED'})
+    assert response.status_code == 200, response.get_json()
+
+    for voter_id in movers:
+        response = client.put('/api/voter/profile', json={'year': 3, 'major': 'Physics'},
+                              headers=headers(app, voter_id))
+        assert response.status_code == 200, response.get_json()
+
+    with app.app_context():
+        # Open: the votes moved with the voters
+        assert counted(staying) == recounted(staying) == {(3, 'physics', 'be'): 2, (2, 'ece', 'be'): 1}
+        # Closed: unchanged, though a recount by today's profiles differs
+        assert counted(closing) == frozen != recounted(closing)
+        assert election_turnout(closing)['total_votes'] == 3
+
+        expected = Counter(segment_of(v.year, v.major, v.course) for v in Voter.query)
+        assert registered() == dict(expected)
+
+
+def test_closed_turnout_endpoint_serves_the_closing_breakdown(app, client, voters, open_elections):
+    (election_id, candidate_id), _ = open_elections
+    voter_id, = voters(1, year=4, major='Maths', course='BSc')
+    client.post(f'/api/voter/elections/{election_id}/vote',
+                json={'candidate_id': candidate_id}, headers=headers(app, voter_id))
+    client.put(f'/api/admin/elections/{election_id}', json={'election_status': 'CLOSED'})
+    client.put('/api/voter/profile', json={'year': 5}, headers=headers(app, voter_id))
+
+    body = client.get(f'/api/elections/{election_id}/turnout').get_json()
+    segments = {(s['year'], s['major'], s['course']): s['votes'] for s in body['segments'] if s['votes']}
+    assert segments == {(4, 'maths', 'bsc'): 1}
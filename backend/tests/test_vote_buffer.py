@@ -0,0 +1,172 @@
+# tests/test_vote_buffer.py
+# Write-behind vote buffer: grouped flushes, duplicate handling, the
+# per-vote fallback and journal replay. After every scenario the Vote rows
+# and the Candidate.count tallies must agree.
+
+import json
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+from sqlalchemy import func, update
+
+from extensions import db
+from models.candidate import Candidate
+from models.election_turnout import ElectionTurnout
+from models.vote import Vote
+from services import vote_buffer
+from services.vote_buffer import VoteBuffer, _PendingVote, apply_votes
+from services.vote_service import DuplicateVote, InvalidCandidate, cast_vote
+
+
+@pytest.fixture
+def election(app, elections):
+    """(election_id, [candidate ids]) of an active election with zeroed tallies."""
+    elections(2, status='ACTIVE')
+    with app.app_context():
+        candidates = Candidate.query.order_by(Candidate.election_id, Candidate.id).all()
+        election_id = candidates[0].election_id
+        db.session.execute(update(Candidate).values(count=0))
+        db.session.commit()
+        return election_id, [c.id for c in candidates if c.election_id == election_id]
+
+
+def votes_by_candidate(election_id):
+    return dict(db.session.query(Vote.candidate_id, func.count())
+                .filter(Vote.election_id == election_id).group_by(Vote.candidate_id))
+
+
+def assert_tallies_match(election_id):
+    votes = votes_by_candidate(election_id)
+    counts = {c.id: c.count for c in Candidate.query.filter_by(election_id=election_id)}
+    assert counts == {cid: votes.get(cid, 0) for cid in counts}
+    turnout = db.session.query(func.sum(ElectionTurnout.votes)) \
+        .filter(ElectionTurnout.election_id == election_id).scalar() or 0
+    assert turnout == sum(votes.values())
+
+
+def test_concurrent_submits_share_one_batch_and_fsync(app, election, voters, tmp_path, monkeypatch):
+    election_id, candidates = election
+    voter_ids = voters(8)
+
+    fsyncs = []
+    real_fsync = vote_buffer.os.fsync
+    monkeypatch.setattr(vote_buffer.os, 'fsync', lambda fd: (fsyncs.append(fd), real_fsync(fd)))
+
+    buffer = VoteBuffer(app, max_latency=2.0, journal_dir=str(tmp_path), request_threads=len(voter_ids))
+    errors = []
+
+    def vote(voter_id, candidate_id):
+        try:
+            buffer.submit(voter_id, election_id, candidate_id)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [
+        threading.Thread(target=vote, args=(voter_id, candidates[n % len(candidates)]))
+        for n, voter_id in enumerate(voter_ids)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    buffer.close()
+
+    assert errors == []
+    # Every request thread was waiting, so the eight votes were one batch
+    assert len(fsyncs) == 1
+    with app.app_context():
+        assert sum(votes_by_candidate(election_id).values()) == len(voter_ids)
+        assert_tallies_match(election_id)
+
+
+def test_repeat_vote_through_buffer_is_rejected(app, election, voters, tmp_path):
+    election_id, candidates = election
+    voter_id, = voters(1)
+
+    buffer = VoteBuffer(app, max_latency=0, journal_dir=str(tmp_path), request_threads=2)
+    try:
+        buffer.submit(voter_id, election_id, candidates[0])
+        with pytest.raises(DuplicateVote):
+            buffer.submit(voter_id, election_id, candidates[1])
+    finally:
+        buffer.close()
+
+    with app.app_context():
+        assert votes_by_candidate(election_id) == {candidates[0]: 1}
+        assert_tallies_match(election_id)
+
+
+def test_bulk_apply_marks_repeats_in_batch(app, election, voters):
+    election_id, candidates = election
+    first, second = voters(2)
+    entries = [
+        _PendingVote(first, election_id, candidates[0]),
+        _PendingVote(first, election_id, candidates[1]),
+        _PendingVote(second, election_id, candidates[1]),
+    ]
+
+    with app.app_context():
+        apply_votes(entries)
+        assert [type(e.error) for e in entries] == [type(None), DuplicateVote, type(None)]
+        assert votes_by_candidate(election_id) == {candidates[0]: 1, candidates[1]: 1}
+        assert_tallies_match(election_id)
+
+
+def test_integrity_error_falls_back_to_cast_vote(app, election, voters, monkeypatch):
+    election_id, candidates = election
+    raced, fresh, wrong = voters(3)
+
+    with app.app_context():
+        other_candidate = Candidate.query.filter(Candidate.election_id != election_id).first().id
+        # Another worker wrote this vote after our duplicate check
+        cast_vote(raced, election_id, candidates[0])
+        monkeypatch.setattr(vote_buffer, 'existing_votes',
+                            lambda pairs: db.session.query(Vote.voter_id, Vote.election_id).filter(Vote.id < 0))
+
+        entries = [
+            _PendingVote(raced, election_id, candidates[1]),
+            _PendingVote(fresh, election_id, candidates[2]),
+            _PendingVote(wrong, election_id, other_candidate),
+        ]
+        apply_votes(entries)
+
+        assert isinstance(entries[0].error, DuplicateVote)
+        assert entries[1].error is None
+        assert isinstance(entries[2].error, InvalidCandidate)
+        assert votes_by_candidate(election_id) == {candidates[0]: 1, candidates[2]: 1}
+        assert_tallies_match(election_id)
+
+
+def test_recover_replays_dead_workers_journal(app, election, voters, tmp_path):
+    election_id, candidates = election
+    replayed, failed, live = voters(3)
+
+    worker = subprocess.Popen([sys.executable, '-c', 'pass'])
+    worker.wait()
+
+    def record(seq, voter_id, candidate_id):
+        return json.dumps({'seq': seq, 'voter_id': voter_id,
+                           'election_id': election_id, 'candidate_id': candidate_id})
+
+    dead_journal = tmp_path / f'{worker.pid}.journal'
+    dead_journal.write_text('\n'.join([
+        record(1, replayed, candidates[0]),
+        record(2, failed, candidates[1]),
+        json.dumps({'failed': [2]}),
+        '{"seq": 3, "voter',        # torn final write
+    ]))
+    # A running worker's journal is not ours to replay
+    live_journal = tmp_path / f'{os.getppid()}.journal'
+    live_journal.write_text(record(1, live, candidates[2]) + '\n')
+
+    buffer = VoteBuffer(app, journal_dir=str(tmp_path), request_threads=2)
+    buffer.close()
+
+    assert not dead_journal.exists()
+    assert live_journal.exists()
+    with app.app_context():
+        assert votes_by_candidate(election_id) == {candidates[0]: 1}
+        assert_tallies_match(election_id)
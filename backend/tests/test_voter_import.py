@@ -0,0 +1,65 @@
+# tests/test_voter_import.py
+# Bulk voter import: per-row errors, duplicates within the file and against
+# the voter table, and one hashing pool reused across imports.
+
+import io
+
+from models.voter import Voter
+from services import voter_import
+from services.turnout import election_turnout
+
+HEADER = 'student_name,roll_no,major,course,year,email,password\n'
+
+
+def upload(client, text, filename='voters.csv'):
+    return client.post('/api/admin/voters/import',
+                       data={'file': (io.BytesIO(text.encode('utf-8')), filename)},
+                       content_type='multipart/form-data')
+
+
+def test_csv_import_reports_bad_rows_and_duplicates(app, client, voters):
+    voters(1)   # fixture1@voters.test is already registered
+
+    response = upload(client, HEADER + ''.join([
+        'Asha Rao,imp1,CSE,BE,1,Asha@Voters.Test,pw\n',            # 2: ok
+        'No Mail,IMP2,CSE,BE,1,,pw\n',                               # 3
+        'Old Timer,IMP3,CSE,BE,9,old@voters.test,pw\n',              # 4
+        'Same Mail,IMP4,CSE,BE,1,asha@voters.test,pw\n',             # 5
+        'Same Roll,IMP1,CSE,BE,1,roll@voters.test,pw\n',             # 6
+        'Taken,IMP5,CSE,BE,1,fixture1@voters.test,pw\n',             # 7
+        'Ravi Kumar,IMP6,ECE,MTech,2,ravi@voters.test,pw\n',         # 8: ok
+    ]))
+    assert response.status_code == 200, response.get_json()
+    body = response.get_json()
+
+    assert body['inserted'] == 2
+    assert body['failed'] == 5
+    assert body['errors_truncated'] is False
+    assert body['errors'] == [
+        {'row': 3, 'message': 'email is required'},
+        {'row': 4, 'message': 'Year must be between 1 and 5'},
+        {'row': 5, 'message': 'Email appears earlier in the file'},
+        {'row': 6, 'message': 'Roll number appears earlier in the file'},
+        {'row': 7, 'message': 'Email already registered'},
+    ]
+
+    with app.app_context():
+        asha = Voter.query.filter_by(email='asha@voters.test').one()
+        assert asha.roll_no == 'IMP1'
+        assert asha.major_norm == 'cse'
+        assert asha.check_password('pw')
+        segments = {(s['year'], s['major'], s['course']): s['registered']
+                    for s in election_turnout(0)['segments']}
+        assert segments[(2, 'ece', 'mtech')] >= 1
+
+
+def test_imports_share_one_pool(app, client, voters):
+    voters(0)
+    first = upload(client, HEADER + 'One,IMP7,CSE,BE,1,one@voters.test,pw\n').get_json()
+    pool = voter_import._pool
+    second = upload(client, '{"student_name": "Two", "roll_no": "IMP8", "major": "CSE", "course": "BE", '
+                            '"year": 1, "email": "two@voters.test", "password": "pw"}\n',
+                    filename='voters.jsonl').get_json()
+
+    assert (first['inserted'], second['inserted']) == (1, 1)
+    assert pool is not None and voter_import._pool is pool
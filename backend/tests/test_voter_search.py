@@ -0,0 +1,63 @@
+# tests/test_voter_search.py
+# The admin voter search reads the FTS5 index for names; the triggers the
+# voter_search migration created must keep it in step with registrations
+# and profile edits.
+
+import pytest
+
+from extensions import db
+from models.voter import Voter
+from services.identity import create_voter_token
+
+
+@pytest.fixture
+def search(client):
+    """search(**filters) → ids of the voters GET /api/voter/voters returns."""
+    def found(**filters):
+        response = client.get('/api/voter/voters', query_string={'limit': 200, **filters})
+        assert response.status_code == 200, response.get_json()
+        return {v['id'] for v in response.get_json()['items']}
+    return found
+
+
+def test_test_database_uses_fts5(app):
+    assert app.extensions['voter_search'] == 'fts5'
+
+
+def test_registered_voters_are_searchable(voters, search):
+    ids = set(voters(2, major='Mechanical'))
+
+    assert ids <= search(student_name='fixture')
+    # Every word matches as a prefix, in any order
+    assert ids <= search(student_name='vot fix')
+    assert ids <= search(student_name='Fixture', major='mech')
+    assert not ids & search(student_name='fixture', major='civil')
+
+
+def test_profile_rename_updates_the_index(app, client, voters, search):
+    voter_id, other_id = voters(2)
+    with app.app_context():
+        token = create_voter_token(db.session.get(Voter, voter_id))
+
+    response = client.put('/api/voter/profile', json={'student_name': 'Zebediah Quorn'},
+                          headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 200, response.get_json()
+
+    assert search(student_name='zeb') == {voter_id}
+    assert search(student_name='quorn zebediah') == {voter_id}
+    assert voter_id not in search(student_name='fixture')
+    assert other_id in search(student_name='fixture')
+
+    with app.app_context():
+        db.session.delete(db.session.get(Voter, voter_id))
+        db.session.commit()
+    assert search(student_name='zeb') == set()
+
+
+def test_prefix_fallback_matches_fts(app, voters, search, monkeypatch):
+    ids = set(voters(3))
+    with_fts = search(student_name='fixture vo')
+
+    monkeypatch.setitem(app.extensions, 'voter_search', None)
+    assert search(student_name='fixture vo') == with_fts
+    assert ids <= with_fts
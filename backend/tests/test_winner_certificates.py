@@ -0,0 +1,41 @@
+# tests/test_winner_certificates.py
+# Winner certificates are issued for every top candidate of a closed
+# plurality election (each of them on a tie) and for nobody else.
+
+from sqlalchemy import update
+
+from extensions import db
+from models.candidate import Candidate
+
+
+def certificate(client, election_id, candidate_id):
+    return client.get(f'/api/elections/{election_id}/results/winner/{candidate_id}/export/pdf')
+
+
+def test_tied_leaders_each_get_a_certificate(app, client, elections):
+    elections(1)
+    with app.app_context():
+        candidates = Candidate.query.order_by(Candidate.id).all()
+        election_id = candidates[0].election_id
+        for candidate, count in zip(candidates, (5, 5, 2)):
+            db.session.execute(update(Candidate).where(Candidate.id == candidate.id).values(count=count))
+        db.session.commit()
+        ids = [c.id for c in candidates]
+
+    for candidate_id in ids[:2]:
+        response = certificate(client, election_id, candidate_id)
+        assert response.status_code == 200
+        assert response.mimetype == 'application/pdf'
+
+    assert certificate(client, election_id, ids[2]).status_code == 404
+
+
+def test_no_certificate_without_votes(app, client, elections):
+    elections(1)
+    with app.app_context():
+        candidate = Candidate.query.order_by(Candidate.id).first()
+        election_id, candidate_id = candidate.election_id, candidate.id
+        db.session.execute(update(Candidate).values(count=0))
+        db.session.commit()
+
+    assert certificate(client, election_id, candidate_id).status_code == 404
@@ -19,4 +19,44 @@ API.interceptors.request.use(
   (error) => Promise.reject(error)
 );
 
+// List endpoints answer one page at a time:
+//   { items: [...], next_cursor: "..." | null, limit, total? }
+export const fetchPage = async (url, params = {}, cursor = null) => {
+  const res = await API.get(url, {
+    params: cursor ? { ...params, cursor } : params,
+  });
+  return res.data;
+};
+
+// Follows next_cursor until the list is exhausted. Each request stays one
+// bounded page; use fetchPage directly where the view can page itself.
+export const fetchAllPages = async (url, params = {}) => {
+  let items = [];
+  let cursor = null;
+  do {
+    const page = await fetchPage(url, params, cursor);
+    items = items.concat(page.items);
+    cursor = page.next_cursor;
+  } while (cursor);
+  return items;
+};
+
+// PDF exports answer 200 with the file, or 202 with a report job when the
+// render takes longer: poll the job, then download its file.
+export const downloadReport = async (url) => {
+  let res = await API.get(url, { responseType: 'blob' });
+  if (res.status === 202) {
+    let job = JSON.parse(await res.data.text());
+    while (job.status === 'PENDING' || job.status === 'RUNNING') {
+      await new Promise((resolve) => setTimeout(resolve, 1000));
+      job = (await API.get(`/api/reports/jobs/${job.id}`)).data;
+    }
+    if (job.status !== 'DONE') {
+      throw new Error(job.error || 'Report could not be generated');
+    }
+    res = await API.get(job.download_url, { responseType: 'blob' });
+  }
+  window.open(window.URL.createObjectURL(res.data), '_blank');
+};
+
 export default API;
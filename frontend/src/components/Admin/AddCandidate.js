@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
-import API from "../../api";
+import API, { fetchAllPages } from "../../api";
 
 function AddCandidate() {
   const navigate = useNavigate();
@@ -27,8 +27,7 @@ function AddCandidate() {
         setLoading(true);
         setMessage({ text: '', type: 'success' });
 
-        const response = await API.get('/api/admin/elections');
-setElections(response.data || []);
+        setElections(await fetchAllPages('/api/admin/elections'));
 
       } catch (err) {
         console.error('Error fetching elections:', err);
@@ -8,7 +8,7 @@ import {
   Legend,
   Title,
 } from "chart.js";
-import API from "../../api";
+import API, { downloadReport } from "../../api";
 
 ChartJS.register(ArcElement, Tooltip, Legend, Title);
 
@@ -82,22 +82,17 @@ const ResultManagement = () => {
   return `${API.defaults.baseURL.replace('/api', '')}${url}`;
 };
 
- const BASE_URL = API.defaults.baseURL.replace('/api', ''); // backend server
 
 const downloadPDF = () => {
-  window.open(
-    `${BASE_URL}/api/elections/${selectedElection}/results/export/pdf`,
-    "_blank"
-  );
+  downloadReport(`/api/elections/${selectedElection}/results/export/pdf`)
+    .catch((err) => alert(err.message || "Could not download the report"));
 };
 
 const downloadWinnerPDF = () => {
   if (!selectedElection || !winnerDetails) return;
 
-  window.open(
-    `${BASE_URL}/api/elections/${selectedElection}/results/winner/${winnerDetails.id}/export/pdf`,
-    "_blank"
-  );
+  downloadReport(`/api/elections/${selectedElection}/results/winner/${winnerDetails.id}/export/pdf`)
+    .catch((err) => alert(err.message || "Could not download the certificate"));
 };
 
 
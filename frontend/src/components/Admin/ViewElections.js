@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
-import API from '../../api';
+import API, { fetchAllPages } from '../../api';
 
 const ViewElections = () => {
   const [elections, setElections] = useState([]);
@@ -32,8 +32,7 @@ const ViewElections = () => {
   const fetchElections = async () => {
     setLoading(true);
     try {
-      const res = await API.get('/api/admin/elections');
-let data = res.data;
+      let data = await fetchAllPages('/api/admin/elections');
 
 
       const now = new Date();
@@ -81,8 +80,7 @@ let data = res.data;
   const fetchCandidates = async (electionId) => {
     setLoading(true);
     try {
-      const res = await API.get(`/api/candidates?election_id=${electionId}`);
-const data = res.data;
+      const data = await fetchAllPages('/api/candidates', { election_id: electionId });
 
       setCandidates(data);
     } catch (err) {
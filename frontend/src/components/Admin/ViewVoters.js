@@ -1,12 +1,15 @@
 import React, { useState, useEffect } from 'react';
 import axios from 'axios';
 import { ArrowLeftIcon } from '@heroicons/react/24/outline';
-import API from '../../api';
+import { fetchPage } from '../../api';
 const ViewVoter = () => {
   const [currentPage, setCurrentPage] = useState(1);
 const votersPerPage = 3;
 
   const [voters, setVoters] = useState([]);
+  const [total, setTotal] = useState(0);
+  // cursors[i] fetches page i + 1; page 1 has no cursor
+  const [cursors, setCursors] = useState([null]);
   const [selectedVoter, setSelectedVoter] = useState(null);
   const [filters, setFilters] = useState({
     student_name: '',
@@ -18,29 +21,37 @@ const votersPerPage = 3;
 
   useEffect(() => {
   if (!selectedVoter) {
-    fetchVoters();
-    setCurrentPage(1); // Reset to first page when filters change
+    fetchVoters(null, 1); // Back to the first page when filters change
   }
 }, [filters, selectedVoter]);
 
 
-  const fetchVoters = async () => {
+  const fetchVoters = async (cursor, page) => {
     try {
-      const params = new URLSearchParams(
-        Object.fromEntries(Object.entries(filters).filter(([_, v]) => v !== ''))
-      );
-      const response = await API.get('/api/voter/voters', { params });
-      setVoters(response.data);
+      const params = {
+        ...Object.fromEntries(Object.entries(filters).filter(([_, v]) => v !== '')),
+        limit: votersPerPage,
+        include_total: 'true',
+      };
+      const data = await fetchPage('/api/voter/voters', params, cursor);
+      setVoters(data.items);
+      setTotal(data.total ?? data.items.length);
+      setCursors((prev) => {
+        const next = page === 1 ? [null] : prev.slice(0, page);
+        next[page] = data.next_cursor;
+        return next;
+      });
+      setCurrentPage(page);
     } catch (error) {
       console.error('Error fetching voters:', error);
     }
   };
-  // Pagination Logic
-const indexOfLastVoter = currentPage * votersPerPage;
-const indexOfFirstVoter = indexOfLastVoter - votersPerPage;
-const currentVoters = voters.slice(indexOfFirstVoter, indexOfLastVoter);
+  // Pagination Logic: the server returns one page at a time
+const currentVoters = voters;
 
-const totalPages = Math.ceil(voters.length / votersPerPage);
+const totalPages = Math.max(1, Math.ceil(total / votersPerPage));
+
+const goToPage = (page) => fetchVoters(cursors[page - 1], page);
 
 
   const handleFilterChange = (e) => {
@@ -204,10 +215,10 @@ const totalPages = Math.ceil(voters.length / votersPerPage);
               )}
             </div>
             {/* Pagination Controls */}
-{voters.length > votersPerPage && (
+{total > votersPerPage && (
   <div className="flex justify-center items-center gap-4 mt-8">
     <button
-      onClick={() => setCurrentPage((prev) => prev - 1)}
+      onClick={() => goToPage(currentPage - 1)}
       disabled={currentPage === 1}
       className={`px-4 py-2 rounded-lg font-medium transition ${
         currentPage === 1
@@ -223,8 +234,8 @@ const totalPages = Math.ceil(voters.length / votersPerPage);
     </span>
 
     <button
-      onClick={() => setCurrentPage((prev) => prev + 1)}
-      disabled={currentPage === totalPages}
+      onClick={() => goToPage(currentPage + 1)}
+      disabled={currentPage === totalPages || !cursors[currentPage]}
       className={`px-4 py-2 rounded-lg font-medium transition ${
         currentPage === totalPages
           ? 'bg-gray-200 text-gray-400 cursor-not-allowed'
@@ -2,7 +2,7 @@
 import React, { useState, useEffect } from 'react';
 import axios from 'axios';
 import { useNavigate } from 'react-router-dom';
-import API from '../../api';
+import API, { fetchAllPages } from '../../api';
 
 const VoterViewCandidates = () => {
   const navigate = useNavigate();
@@ -16,13 +16,7 @@ const VoterViewCandidates = () => {
       try {
         setLoading(true);
 
-        const response = await API.get(
-  '/api/voter/elections-with-candidates'
-);
-
-
-        const data = Array.isArray(response.data) ? response.data : [];
-        setElections(data);
+        setElections(await fetchAllPages('/api/voter/elections-with-candidates'));
         setError(null);
       } catch (err) {
         console.error("Failed to load dashboard:", err);
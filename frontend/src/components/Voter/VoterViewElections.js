@@ -1,7 +1,7 @@
 // src/components/VoterViewElections.js
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
-import API from '../../api';
+import API, { fetchAllPages } from '../../api';
 
 const VoterViewElections = () => {
   const navigate = useNavigate();
@@ -30,8 +30,7 @@ const VoterViewElections = () => {
 
   const fetchElections = async () => {
     try {
-      const res = await API.get('/api/admin/elections');
-const data = res.data;
+      const data = await fetchAllPages('/api/admin/elections');
 
 
       const valid = data.filter(el => {
@@ -273,10 +272,14 @@ console.log("API Response:", data);
         <button
           onClick={async () => {
             try {
-              await API.post(
+              const res = await API.post(
                 `/api/elections/${selectedElection.id}/vote`,
                 { candidate_id: selectedCandidateId }
               );
+              // Re-issued so the next reads see this vote (read replicas)
+              if (res.data.token) {
+                localStorage.setItem("token", res.data.token);
+              }
               setMessage("Vote submitted successfully ✅");
               setHasVoted(true);
             } catch (err) {
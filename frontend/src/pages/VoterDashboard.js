@@ -71,6 +71,11 @@ const VoterDashboard = () => {
     try {
       const res = await API.put("/api/voter/profile", formData);
 
+      // Token claims (roll_no, year, major) are reissued on update
+      if (res.data.token) {
+        localStorage.setItem("token", res.data.token);
+      }
+
       const updatedVoter = res.data.voter || res.data;
       setVoter(updatedVoter);
       setFormData(updatedVoter);